@@ -0,0 +1,26 @@
+-- 006_field_characteristics_columns.sql
+-- Purpose: Store field boundaries and characteristics on farm_fields and expose
+-- the characteristics used by the field list filters as indexed columns.
+
+BEGIN;
+
+ALTER TABLE farm_fields
+    ADD COLUMN IF NOT EXISTS boundary_json JSONB,
+    ADD COLUMN IF NOT EXISTS characteristics_json JSONB;
+
+-- Generated from characteristics_json so irrigation filters run in SQL
+ALTER TABLE farm_fields
+    ADD COLUMN IF NOT EXISTS irrigation_available BOOLEAN
+    GENERATED ALWAYS AS ((characteristics_json ->> 'irrigation_available')::boolean) STORED;
+
+-- soil_type is written from characteristics on create/update; backfill older rows
+UPDATE farm_fields
+SET soil_type = characteristics_json ->> 'soil_type'
+WHERE soil_type IS NULL AND characteristics_json ? 'soil_type';
+
+CREATE INDEX IF NOT EXISTS idx_farm_fields_soil_type ON farm_fields(soil_type);
+CREATE INDEX IF NOT EXISTS idx_farm_fields_irrigation ON farm_fields(irrigation_available);
+-- Keyset pagination of a farm's fields by name
+CREATE INDEX IF NOT EXISTS idx_farm_fields_location_name ON farm_fields(location_id, field_name, id);
+
+COMMIT;
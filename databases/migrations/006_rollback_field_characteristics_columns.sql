@@ -0,0 +1,11 @@
+-- 006_rollback_field_characteristics_columns.sql
+-- Purpose: Roll back the changes applied in 006_field_characteristics_columns.sql
+
+DROP INDEX IF EXISTS idx_farm_fields_location_name;
+DROP INDEX IF EXISTS idx_farm_fields_irrigation;
+DROP INDEX IF EXISTS idx_farm_fields_soil_type;
+
+ALTER TABLE farm_fields
+    DROP COLUMN IF EXISTS irrigation_available,
+    DROP COLUMN IF EXISTS characteristics_json,
+    DROP COLUMN IF EXISTS boundary_json;
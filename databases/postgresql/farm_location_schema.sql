@@ -43,6 +43,9 @@ CREATE TABLE farm_fields (
     size_acres DECIMAL(10, 2),
     soil_type VARCHAR(50),
     notes TEXT,
+    boundary_json JSONB,
+    characteristics_json JSONB,
+    irrigation_available BOOLEAN GENERATED ALWAYS AS ((characteristics_json ->> 'irrigation_available')::boolean) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -72,6 +75,9 @@ CREATE INDEX idx_farm_locations_verified ON farm_locations(verified);
 -- Farm Fields indexes
 CREATE INDEX idx_farm_fields_location_id ON farm_fields(location_id);
 CREATE INDEX idx_farm_fields_type ON farm_fields(field_type);
+CREATE INDEX idx_farm_fields_soil_type ON farm_fields(soil_type);
+CREATE INDEX idx_farm_fields_irrigation ON farm_fields(irrigation_available);
+CREATE INDEX idx_farm_fields_location_name ON farm_fields(location_id, field_name, id);
 
 -- Geocoding Cache indexes
 CREATE INDEX idx_geocoding_cache_hash ON geocoding_cache(query_hash);
@@ -9,7 +9,7 @@ SQLAlchemy models for farm location database tables.
 
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, DateTime, Text, 
-    ForeignKey, CheckConstraint, UniqueConstraint, Index, DECIMAL
+    ForeignKey, CheckConstraint, UniqueConstraint, Index, DECIMAL, Computed
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
@@ -103,6 +103,13 @@ class FarmField(Base):
     size_acres = Column(DECIMAL(10, 2))
     soil_type = Column(String(50))
     notes = Column(Text)
+    boundary_json = Column(JSONB)
+    characteristics_json = Column(JSONB)
+    # Derived from characteristics_json so list filters run in SQL
+    irrigation_available = Column(
+        Boolean,
+        Computed("(characteristics_json ->> 'irrigation_available')::boolean", persisted=True)
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -115,6 +122,9 @@ class FarmField(Base):
         CheckConstraint("size_acres IS NULL OR size_acres > 0", name='positive_size_acres'),
         Index('idx_farm_fields_location_id', 'location_id'),
         Index('idx_farm_fields_type', 'field_type'),
+        Index('idx_farm_fields_soil_type', 'soil_type'),
+        Index('idx_farm_fields_irrigation', 'irrigation_available'),
+        Index('idx_farm_fields_location_name', 'location_id', 'field_name', 'id'),
     )
     
     def __repr__(self):
@@ -6,6 +6,7 @@ agricultural explanations, and context management.
 """
 
 import asyncio
+import json
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -224,6 +225,11 @@ async def chat(
         )
 
 
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event; JSON keeps multi-line chunks inside a single data field."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @router.post("/chat/stream")
 async def chat_stream(
     request: ChatRequest,
@@ -232,41 +238,38 @@ async def chat_stream(
     """
     Generate streaming conversational response with context awareness.
     
-    This endpoint provides real-time streaming responses with comprehensive
-    context management for better user experience during agricultural interactions.
+    Responds with server-sent events: `token` events carry content chunks as
+    they arrive, `metadata` events report agricultural topics and flags as soon
+    as they are detected, and a final `done` event carries the full response
+    with confidence, usage estimate and time to first token. Failures are
+    reported as an `error` event.
     """
     try:
         # Generate session ID if not provided
         session_id = request.session_id or str(uuid.uuid4())
         
         async def generate_stream():
-            try:
-                # Create context-aware request
-                context_request = ContextAwareRequest(
-                    user_id=request.user_id,
-                    session_id=session_id,
-                    message=request.message,
-                    use_case="conversation",
-                    agricultural_context=request.agricultural_context,
-                    context_preferences=request.context_preferences
-                )
-                
-                # Stream context-aware response
-                async for chunk in context_service.stream_response(context_request):
-                    yield f"data: {chunk}\n\n"
-                
-                yield "data: [DONE]\n\n"
-                
-            except Exception as e:
-                logger.error(f"Context-aware streaming failed: {e}")
-                yield f"data: Error: {str(e)}\n\n"
+            # Create context-aware request
+            context_request = ContextAwareRequest(
+                user_id=request.user_id,
+                session_id=session_id,
+                message=request.message,
+                use_case="conversation",
+                agricultural_context=request.agricultural_context,
+                context_preferences=request.context_preferences
+            )
+            
+            # Stream context-aware response
+            async for event in context_service.stream_response_events(context_request):
+                yield _format_sse(event["event"], event["data"])
         
         return StreamingResponse(
             generate_stream(),
-            media_type="text/plain",
+            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
                 "X-Session-ID": session_id
             }
         )
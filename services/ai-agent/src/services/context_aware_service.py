@@ -146,7 +146,8 @@ class ContextAwareService:
                 session_id=request.session_id,
                 message=enhanced_request.messages[-1]["content"],
                 agricultural_context=enhanced_request.agricultural_context,
-                use_case=request.use_case
+                use_case=request.use_case,
+                question_type=question_classification.get('category_name')
             )
             
             # Store response context
@@ -191,6 +192,28 @@ class ContextAwareService:
         Yields:
             Response chunks
         """
+        async for event in self.stream_response_events(request):
+            if event["event"] == "token":
+                yield event["data"]["content"]
+            elif event["event"] == "error":
+                yield f"Error: {event['data']['message']}"
+    
+    async def stream_response_events(self, request: ContextAwareRequest) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream context-aware response as token, metadata and done events.
+        
+        The enhanced prompt is trimmed to the LLM service's context window
+        budget, question classification runs while tokens are streaming, and
+        the response context is stored once the completion finishes.
+        
+        Args:
+            request: Context-aware request
+            
+        Yields:
+            {"event": ..., "data": ...} dicts; failures end the stream with an
+            "error" event
+        """
+        classification_task = None
         try:
             # Get context (similar to process_request but for streaming)
             context_data = await self.context_manager.get_relevant_context(
@@ -208,32 +231,53 @@ class ContextAwareService:
             enhanced_request = await self._prepare_enhanced_request(
                 request, context_data, conversation
             )
+            enhanced_request = enhanced_request.copy(update={
+                "stream": True,
+                "max_prompt_tokens": self.llm_service.config.context_window_tokens
+            })
             
-            # Stream response
-            full_response = ""
-            async for chunk in self.llm_service._generate_streaming_response(
-                enhanced_request, conversation, request.message, 
-                enhanced_request.agricultural_context
-            ):
-                full_response += chunk
-                yield chunk
+            # Classification is only needed after the stream, so overlap it with generation
+            classification_task = asyncio.create_task(
+                self.llm_service.classify_question(request.message)
+            )
             
-            # Store context after streaming completes
-            question_classification = await self.llm_service.classify_question(request.message)
+            done_data = None
+            async for event in self.llm_service.openrouter_client.stream_events(enhanced_request):
+                if event["event"] == "done":
+                    done_data = event["data"]
+                else:
+                    yield event
             
-            # Create mock LLM response for context storage
-            mock_response = type('MockResponse', (), {
-                'content': full_response,
-                'model': 'streaming',
-                'confidence_score': 0.8,
-                'agricultural_metadata': {}
-            })()
+            llm_response = LLMResponse(**done_data)
             
-            await self._store_response_context(request, mock_response, question_classification)
+            question_classification = await classification_task
+            stored_contexts = await self._store_response_context(
+                request, llm_response, question_classification
+            )
+            
+            conversation.add_message("user", request.message)
+            conversation.add_message("assistant", llm_response.content, {
+                "model": llm_response.model,
+                "confidence": llm_response.confidence_score,
+                "question_type": question_classification.get('category_name')
+            })
+            
+            yield {
+                "event": "done",
+                "data": {
+                    **done_data,
+                    "question_type": question_classification.get('category_name'),
+                    "context_stored": stored_contexts
+                }
+            }
             
         except Exception as e:
             logger.error(f"Error streaming context-aware response: {e}")
-            yield f"Error: {str(e)}"
+            yield {"event": "error", "data": {"message": str(e)}}
+        finally:
+            # Client disconnected or generation failed before classification was awaited
+            if classification_task is not None and not classification_task.done():
+                classification_task.cancel()
     
     async def _prepare_enhanced_request(self,
                                       request: ContextAwareRequest,
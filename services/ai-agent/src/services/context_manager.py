@@ -6,8 +6,12 @@ for enhanced AI interactions with memory and continuity.
 """
 
 import asyncio
+import heapq
 import logging
-from typing import Dict, List, Optional, Any, Union
+import math
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -17,6 +21,9 @@ from pydantic import BaseModel, Field, validator
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_EPOCH = datetime(1970, 1, 1)
+
 
 class ContextType(str, Enum):
     """Types of context that can be managed."""
@@ -36,6 +43,15 @@ class ContextPriority(str, Enum):
     LOW = "low"              # Nice to have for personalization
 
 
+# Numeric rank for ordering; the enum values themselves sort alphabetically
+PRIORITY_RANK: Dict[ContextPriority, int] = {
+    ContextPriority.CRITICAL: 3,
+    ContextPriority.HIGH: 2,
+    ContextPriority.MEDIUM: 1,
+    ContextPriority.LOW: 0,
+}
+
+
 class ContextScope(str, Enum):
     """Scope of context information."""
     GLOBAL = "global"         # Available across all sessions
@@ -97,6 +113,159 @@ class ContextEntry(BaseModel):
         self.last_accessed = datetime.utcnow()
 
 
+def tokenize_context_text(text: str) -> Set[str]:
+    """Lower-cased word and number tokens, e.g. 'Soil pH 6.2' -> {'soil', 'ph', '6.2'}."""
+    return set(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def _iter_data_text(value: Any) -> Iterable[str]:
+    """Yield the keys and scalar values of nested context data as strings."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield str(key)
+            yield from _iter_data_text(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _iter_data_text(item)
+    elif value is not None:
+        yield str(value)
+
+
+def _relevance_key(entry: ContextEntry) -> Tuple[int, int, datetime]:
+    """Ranking key: priority, then access count, then recency."""
+    return PRIORITY_RANK[entry.priority], entry.access_count, entry.updated_at
+
+
+@dataclass
+class UserContextIndex:
+    """Secondary indexes over one user's context entries, maintained on store and remove."""
+    by_type: Dict[ContextType, Set[str]] = field(default_factory=dict)
+    by_tag: Dict[str, Set[str]] = field(default_factory=dict)
+    by_priority: Dict[ContextPriority, Set[str]] = field(default_factory=dict)
+    by_token: Dict[str, Set[str]] = field(default_factory=dict)
+    entry_tokens: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def add(self, entry: ContextEntry):
+        tokens = tokenize_context_text(entry.summary or "")
+        for text in _iter_data_text(entry.data):
+            tokens |= tokenize_context_text(text)
+
+        self.by_type.setdefault(entry.context_type, set()).add(entry.id)
+        self.by_priority.setdefault(entry.priority, set()).add(entry.id)
+        for tag in entry.tags:
+            self.by_tag.setdefault(tag, set()).add(entry.id)
+        for token in tokens:
+            self.by_token.setdefault(token, set()).add(entry.id)
+        self.entry_tokens[entry.id] = tokens
+
+    def remove(self, entry: ContextEntry):
+        self._discard(self.by_type, entry.context_type, entry.id)
+        self._discard(self.by_priority, entry.priority, entry.id)
+        for tag in entry.tags:
+            self._discard(self.by_tag, tag, entry.id)
+        for token in self.entry_tokens.pop(entry.id, ()):
+            self._discard(self.by_token, token, entry.id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], key: Any, context_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(context_id)
+            if not ids:
+                del index[key]
+
+    def candidates(self,
+                   query_tokens: Optional[Set[str]] = None,
+                   tags: Optional[List[str]] = None,
+                   context_types: Optional[List[ContextType]] = None,
+                   priority_min: Optional[ContextPriority] = None) -> Optional[Set[str]]:
+        """
+        Context IDs passing every given filter, or None if no filter was given.
+
+        Tags and types match any of the listed values; query tokens must all be present.
+        """
+        filters: List[Set[str]] = []
+        if context_types:
+            filters.append(set().union(*(self.by_type.get(ct, set()) for ct in context_types)))
+        if tags:
+            filters.append(set().union(*(self.by_tag.get(tag, set()) for tag in tags)))
+        if priority_min:
+            min_rank = PRIORITY_RANK[priority_min]
+            filters.append(set().union(*(
+                ids for priority, ids in self.by_priority.items() if PRIORITY_RANK[priority] >= min_rank
+            )))
+        if query_tokens:
+            filters.extend(self.by_token.get(token, set()) for token in query_tokens)
+
+        if not filters:
+            return None
+        filters.sort(key=len)
+        return filters[0].intersection(*filters[1:])
+
+
+class ExpiryWheel:
+    """
+    Hashed timing wheel of expiry deadlines.
+
+    Deadlines are rounded up to `tick_seconds` and hashed into `slots` buckets;
+    advancing the clock only visits the buckets of the ticks that elapsed, so
+    expiry costs time proportional to what is due rather than to what is stored.
+    """
+
+    def __init__(self, tick_seconds: float = 60.0, slots: int = 512, now: Optional[float] = None):
+        self.tick_seconds = tick_seconds
+        self.slots: List[Dict[Any, int]] = [{} for _ in range(slots)]
+        self._deadlines: Dict[Any, int] = {}
+        self._due: Set[Any] = set()
+        self._current_tick = self._tick(time.time() if now is None else now)
+
+    def __len__(self) -> int:
+        return len(self._deadlines) + len(self._due)
+
+    def _tick(self, timestamp: float) -> int:
+        return math.floor(timestamp / self.tick_seconds)
+
+    def schedule(self, key: Any, deadline: float):
+        """Schedule or reschedule a key to expire at a UNIX timestamp."""
+        self.cancel(key)
+        deadline_tick = math.ceil(deadline / self.tick_seconds)
+        if deadline_tick <= self._current_tick:
+            self._due.add(key)
+            return
+        self._deadlines[key] = deadline_tick
+        self.slots[deadline_tick % len(self.slots)][key] = deadline_tick
+
+    def cancel(self, key: Any):
+        self._due.discard(key)
+        deadline_tick = self._deadlines.pop(key, None)
+        if deadline_tick is not None:
+            self.slots[deadline_tick % len(self.slots)].pop(key, None)
+
+    def advance(self, now: Optional[float] = None) -> List[Any]:
+        """Move the clock to `now` and return the keys whose deadline has passed."""
+        now_tick = self._tick(time.time() if now is None else now)
+        expired = list(self._due)
+        self._due.clear()
+
+        if now_tick > self._current_tick:
+            # After a gap longer than one revolution every slot is visited once
+            elapsed = min(now_tick - self._current_tick, len(self.slots))
+            for tick in range(now_tick - elapsed + 1, now_tick + 1):
+                bucket = self.slots[tick % len(self.slots)]
+                due = [key for key, deadline_tick in bucket.items() if deadline_tick <= now_tick]
+                for key in due:
+                    del bucket[key]
+                    del self._deadlines[key]
+                expired.extend(due)
+            self._current_tick = now_tick
+        return expired
+
+
+def _epoch_seconds(moment: datetime) -> float:
+    """Seconds since the epoch for the naive UTC datetimes used by context entries."""
+    return (moment - _EPOCH).total_seconds()
+
+
 class ConversationContext(BaseModel):
     """Enhanced conversation context with agricultural awareness."""
     
@@ -187,27 +356,30 @@ class ContextManager:
     def __init__(self, 
                  max_contexts_per_user: int = 1000,
                  cleanup_interval_hours: int = 6,
-                 enable_persistence: bool = True):
+                 enable_persistence: bool = True,
+                 expiry_tick_seconds: float = 60.0):
         """
         Initialize context manager.
         
         Args:
             max_contexts_per_user: Maximum context entries per user
-            cleanup_interval_hours: Hours between cleanup operations
+            cleanup_interval_hours: Hours between conversation cleanup sweeps
             enable_persistence: Whether to enable context persistence
+            expiry_tick_seconds: Resolution of context expiry
         """
         self.max_contexts_per_user = max_contexts_per_user
         self.cleanup_interval_hours = cleanup_interval_hours
         self.enable_persistence = enable_persistence
+        self.expiry_tick_seconds = expiry_tick_seconds
         
         # In-memory storage
         self.contexts: Dict[str, Dict[str, ContextEntry]] = {}  # user_id -> {context_id -> entry}
         self.conversations: Dict[str, ConversationContext] = {}  # conversation_key -> context
         self.user_sessions: Dict[str, Dict[str, Any]] = {}  # user_id -> session_data
         
-        # Indexes for efficient retrieval
-        self.context_by_type: Dict[ContextType, List[str]] = {ct: [] for ct in ContextType}
-        self.context_by_tags: Dict[str, List[str]] = {}
+        # Per-user secondary indexes and expiry schedule
+        self.indexes: Dict[str, UserContextIndex] = {}  # user_id -> index
+        self.expiry_wheel = ExpiryWheel(tick_seconds=expiry_tick_seconds)
         
         # Background cleanup task
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -289,19 +461,18 @@ class ContextManager:
                 expires_at=expires_at
             )
             
-            # Store in user's context collection
+            # Replace any entry stored under the same ID, then add to the user's collection
+            self._drop_context(user_id, context_id)
             if user_id not in self.contexts:
                 self.contexts[user_id] = {}
+                self.indexes[user_id] = UserContextIndex()
             
             self.contexts[user_id][context_id] = entry
             
             # Update indexes
-            self.context_by_type[context_type].append(context_id)
-            
-            for tag in entry.tags:
-                if tag not in self.context_by_tags:
-                    self.context_by_tags[tag] = []
-                self.context_by_tags[tag].append(context_id)
+            self.indexes[user_id].add(entry)
+            if entry.expires_at is not None:
+                self.expiry_wheel.schedule((user_id, context_id), _epoch_seconds(entry.expires_at))
             
             # Enforce user context limits
             await self._enforce_user_context_limits(user_id)
@@ -364,21 +535,17 @@ class ContextManager:
             if user_id not in self.contexts:
                 return []
             
-            user_contexts = self.contexts[user_id]
-            matching_contexts = []
-            
-            for entry in user_contexts.values():
-                if entry.context_type == context_type and not entry.is_expired():
-                    entry.access()
-                    matching_contexts.append(entry)
-            
-            # Sort by priority and recency
-            matching_contexts.sort(
-                key=lambda x: (x.priority.value, x.updated_at),
-                reverse=True
+            candidate_ids = self.indexes[user_id].by_type.get(context_type, set())
+            matching_contexts = heapq.nlargest(
+                limit,
+                self._live_entries(user_id, candidate_ids),
+                key=lambda x: (PRIORITY_RANK[x.priority], x.updated_at)
             )
             
-            return matching_contexts[:limit]
+            for entry in matching_contexts:
+                entry.access()
+            
+            return matching_contexts
             
         except Exception as e:
             logger.error(f"Failed to get contexts by type for user {user_id}: {e}")
@@ -394,6 +561,10 @@ class ContextManager:
         """
         Search contexts with various filters.
         
+        Filters are answered from the user's indexes: an entry matches a query
+        when every query token appears in its summary or data, any of the tags,
+        any of the context types, and a priority at or above priority_min.
+        
         Args:
             user_id: User identifier
             query: Text query to search in summaries and data
@@ -403,54 +574,57 @@ class ContextManager:
             limit: Maximum results to return
             
         Returns:
-            List of matching context entries
+            List of matching context entries, most relevant first
         """
         try:
             if user_id not in self.contexts:
                 return []
             
-            user_contexts = self.contexts[user_id]
-            matching_contexts = []
+            query_tokens = tokenize_context_text(query) if query else None
+            if query and not query_tokens:
+                return []
             
-            for entry in user_contexts.values():
-                if entry.is_expired():
-                    continue
-                
-                # Filter by context type
-                if context_types and entry.context_type not in context_types:
-                    continue
-                
-                # Filter by priority
-                if priority_min and entry.priority.value < priority_min.value:
-                    continue
-                
-                # Filter by tags
-                if tags and not any(tag in entry.tags for tag in tags):
-                    continue
-                
-                # Text search in summary and data
-                if query:
-                    search_text = (entry.summary or "").lower()
-                    search_text += " " + json.dumps(entry.data).lower()
-                    
-                    if query.lower() not in search_text:
-                        continue
-                
-                entry.access()
-                matching_contexts.append(entry)
+            candidate_ids = self.indexes[user_id].candidates(
+                query_tokens=query_tokens,
+                tags=tags,
+                context_types=context_types,
+                priority_min=priority_min
+            )
+            if candidate_ids is None:
+                candidate_ids = list(self.contexts[user_id])
             
-            # Sort by relevance (priority, access count, recency)
-            matching_contexts.sort(
-                key=lambda x: (x.priority.value, x.access_count, x.updated_at),
-                reverse=True
+            # Top-k by relevance (priority, access count, recency)
+            matching_contexts = heapq.nlargest(
+                limit, self._live_entries(user_id, candidate_ids), key=_relevance_key
             )
             
-            return matching_contexts[:limit]
+            for entry in matching_contexts:
+                entry.access()
+            
+            return matching_contexts
             
         except Exception as e:
             logger.error(f"Failed to search contexts for user {user_id}: {e}")
             return []
     
+    def _live_entries(self, user_id: str, context_ids: Iterable[str]) -> List[ContextEntry]:
+        """Resolve context IDs to entries, dropping any that expired since the last tick."""
+        user_contexts = self.contexts.get(user_id, {})
+        entries = []
+        expired_ids = []
+        for context_id in context_ids:
+            entry = user_contexts.get(context_id)
+            if entry is None:
+                continue
+            if entry.is_expired():
+                expired_ids.append(context_id)
+            else:
+                entries.append(entry)
+        
+        for context_id in expired_ids:
+            self._drop_context(user_id, context_id)
+        return entries
+    
     async def get_conversation_context(self, 
                                     user_id: str, 
                                     session_id: str) -> ConversationContext:
@@ -508,9 +682,9 @@ class ContextManager:
         try:
             context = await self.get_conversation_context(user_id, session_id)
             
-            for field, value in updates.items():
-                if hasattr(context, field):
-                    setattr(context, field, value)
+            for field_name, value in updates.items():
+                if hasattr(context, field_name):
+                    setattr(context, field_name, value)
             
             context.last_updated = datetime.utcnow()
             
@@ -691,20 +865,23 @@ class ContextManager:
     
     async def _remove_context(self, user_id: str, context_id: str):
         """Remove context entry and update indexes."""
-        if user_id in self.contexts and context_id in self.contexts[user_id]:
-            entry = self.contexts[user_id][context_id]
-            
-            # Remove from type index
-            if context_id in self.context_by_type[entry.context_type]:
-                self.context_by_type[entry.context_type].remove(context_id)
-            
-            # Remove from tag indexes
-            for tag in entry.tags:
-                if tag in self.context_by_tags and context_id in self.context_by_tags[tag]:
-                    self.context_by_tags[tag].remove(context_id)
-            
-            # Remove the entry
-            del self.contexts[user_id][context_id]
+        self._drop_context(user_id, context_id)
+    
+    def _drop_context(self, user_id: str, context_id: str) -> bool:
+        """Remove an entry from storage, its user's indexes and the expiry wheel."""
+        user_contexts = self.contexts.get(user_id)
+        if not user_contexts or context_id not in user_contexts:
+            return False
+        
+        entry = user_contexts.pop(context_id)
+        self.indexes[user_id].remove(entry)
+        self.expiry_wheel.cancel((user_id, context_id))
+        
+        # Remove empty user context collections
+        if not user_contexts:
+            del self.contexts[user_id]
+            del self.indexes[user_id]
+        return True
     
     async def _enforce_user_context_limits(self, user_id: str):
         """Enforce maximum context limits per user."""
@@ -712,67 +889,73 @@ class ContextManager:
             return
         
         user_contexts = self.contexts[user_id]
-        if len(user_contexts) <= self.max_contexts_per_user:
+        contexts_to_remove = len(user_contexts) - self.max_contexts_per_user
+        if contexts_to_remove <= 0:
             return
         
-        # Sort by priority and access patterns, remove least important
-        contexts_list = list(user_contexts.values())
-        contexts_list.sort(
-            key=lambda x: (x.priority.value, x.access_count, x.updated_at)
-        )
-        
-        # Remove oldest, least accessed contexts
-        contexts_to_remove = len(contexts_list) - self.max_contexts_per_user
-        for i in range(contexts_to_remove):
-            await self._remove_context(user_id, contexts_list[i].id)
+        # Remove the lowest priority, least accessed, oldest contexts
+        for entry in heapq.nsmallest(contexts_to_remove, user_contexts.values(), key=_relevance_key):
+            self._drop_context(user_id, entry.id)
         
         logger.debug(f"Removed {contexts_to_remove} old contexts for user {user_id}")
     
     async def _periodic_cleanup(self):
-        """Periodic cleanup of expired contexts and conversations."""
+        """Expire contexts every wheel tick and sweep old conversations every cleanup interval."""
+        last_sweep = time.monotonic()
         while True:
             try:
-                await asyncio.sleep(self.cleanup_interval_hours * 3600)
-                await self.cleanup_expired_contexts()
+                await asyncio.sleep(self.expiry_tick_seconds)
+                self.expire_due_contexts()
+                
+                if time.monotonic() - last_sweep >= self.cleanup_interval_hours * 3600:
+                    self.cleanup_old_conversations()
+                    last_sweep = time.monotonic()
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in periodic cleanup: {e}")
     
+    def expire_due_contexts(self, now: Optional[datetime] = None) -> int:
+        """
+        Remove contexts whose expiry tick has passed.
+        
+        Only the wheel buckets for elapsed ticks are visited. Entries are
+        rechecked against their own expires_at, which may have been extended
+        since they were scheduled.
+        
+        Returns:
+            Number of contexts removed
+        """
+        now = now or datetime.utcnow()
+        removed = 0
+        for user_id, context_id in self.expiry_wheel.advance(_epoch_seconds(now)):
+            entry = self.contexts.get(user_id, {}).get(context_id)
+            if entry is None:
+                continue
+            if entry.expires_at is not None and entry.expires_at > now:
+                self.expiry_wheel.schedule((user_id, context_id), _epoch_seconds(entry.expires_at))
+                continue
+            self._drop_context(user_id, context_id)
+            removed += 1
+        return removed
+    
+    def cleanup_old_conversations(self, max_age: timedelta = timedelta(days=7)) -> int:
+        """Remove conversations not updated within max_age; returns how many were removed."""
+        cutoff_time = datetime.utcnow() - max_age
+        expired_conversations = [
+            conv_key for conv_key, conversation in self.conversations.items()
+            if conversation.last_updated < cutoff_time
+        ]
+        
+        for conv_key in expired_conversations:
+            del self.conversations[conv_key]
+        return len(expired_conversations)
+    
     async def cleanup_expired_contexts(self):
         """Clean up expired contexts and conversations."""
         try:
-            total_removed = 0
-            
-            # Clean up contexts
-            for user_id in list(self.contexts.keys()):
-                user_contexts = self.contexts[user_id]
-                expired_ids = []
-                
-                for context_id, entry in user_contexts.items():
-                    if entry.is_expired():
-                        expired_ids.append(context_id)
-                
-                for context_id in expired_ids:
-                    await self._remove_context(user_id, context_id)
-                    total_removed += 1
-                
-                # Remove empty user context collections
-                if not self.contexts[user_id]:
-                    del self.contexts[user_id]
-            
-            # Clean up old conversations (older than 7 days)
-            cutoff_time = datetime.utcnow() - timedelta(days=7)
-            expired_conversations = []
-            
-            for conv_key, conversation in self.conversations.items():
-                if conversation.last_updated < cutoff_time:
-                    expired_conversations.append(conv_key)
-            
-            for conv_key in expired_conversations:
-                del self.conversations[conv_key]
-                total_removed += 1
+            total_removed = self.expire_due_contexts() + self.cleanup_old_conversations()
             
             if total_removed > 0:
                 logger.info(f"Cleaned up {total_removed} expired contexts and conversations")
@@ -785,16 +968,20 @@ class ContextManager:
         try:
             total_contexts = sum(len(user_contexts) for user_contexts in self.contexts.values())
             
-            context_by_type_counts = {}
-            for context_type, context_ids in self.context_by_type.items():
-                context_by_type_counts[context_type.value] = len(context_ids)
+            context_by_type_counts = {ct.value: 0 for ct in ContextType}
+            tags = set()
+            for index in self.indexes.values():
+                for context_type, context_ids in index.by_type.items():
+                    context_by_type_counts[context_type.value] += len(context_ids)
+                tags.update(index.by_tag)
             
             return {
                 "total_users": len(self.contexts),
                 "total_contexts": total_contexts,
                 "active_conversations": len(self.conversations),
                 "contexts_by_type": context_by_type_counts,
-                "total_tags": len(self.context_by_tags),
+                "total_tags": len(tags),
+                "scheduled_expirations": len(self.expiry_wheel),
                 "memory_usage": {
                     "contexts_mb": len(str(self.contexts)) / (1024 * 1024),
                     "conversations_mb": len(str(self.conversations)) / (1024 * 1024)
@@ -0,0 +1,293 @@
+"""
+Two-level LLM response cache for the AFAS AI Agent.
+
+Level one is an exact cache keyed on the normalized prompt. Level two is a
+semantic cache that embeds the user message with a local hashing vectorizer
+and returns a stored response when a previous message in the same scope
+(use case, agricultural context, recent history and the numbers mentioned)
+is similar enough for its question type. Identical in-flight completions are
+coalesced so concurrent requests share one OpenRouter call.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+# Minimum cosine similarity for a semantic hit, by question type. Diagnosis and
+# rate questions need near-paraphrases; general conversation tolerates more.
+DEFAULT_SEMANTIC_THRESHOLDS: Dict[str, float] = {
+    "default": 0.88,
+    "conversation": 0.88,
+    "crop_selection": 0.88,
+    "soil_fertility": 0.88,
+    "cover_crops": 0.88,
+    "fertilizer_timing": 0.9,
+    "fertilizer_rate": 0.93,
+    "fertilizer_recommendation": 0.93,
+    "nutrient_deficiency": 0.93,
+    "problem_diagnosis": 0.95,
+}
+
+
+def normalize_prompt(text: str) -> str:
+    """Lower-case, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", text.lower()).strip().rstrip("?!. ")
+
+
+def normalize_question_type(question_type: Optional[str]) -> str:
+    """Map category names like 'Soil Fertility' to threshold keys like 'soil_fertility'."""
+    if not question_type:
+        return "default"
+    return re.sub(r"[^a-z0-9]+", "_", question_type.lower()).strip("_")
+
+
+class HashingEmbedder:
+    """
+    Signed feature-hashing embedding, L2-normalized.
+
+    Unigrams (with plurals folded) carry the topic; down-weighted bigrams keep
+    some word order without letting one inserted word sink the similarity.
+    """
+
+    def __init__(self, n_features: int = 2048, bigram_weight: float = 0.5):
+        self.n_features = n_features
+        self.bigram_weight = bigram_weight
+
+    @staticmethod
+    def _fold(token: str) -> str:
+        return token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+    def embed(self, text: str) -> np.ndarray:
+        tokens = [self._fold(token) for token in _TOKEN_PATTERN.findall(normalize_prompt(text))]
+        features = [(token, 1.0) for token in tokens]
+        features += [(f"{a} {b}", self.bigram_weight) for a, b in zip(tokens, tokens[1:])]
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        for feature, weight in features:
+            h = zlib.crc32(feature.encode())
+            vector[h % self.n_features] += weight if (h >> 31) & 1 else -weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+@dataclass
+class _CacheEntry:
+    response: Dict[str, Any]
+    created_at: float
+    slot: int
+
+
+class LLMResponseCache:
+    """Exact + semantic LRU/TTL response cache with single-flight coalescing."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        semantic_enabled: bool = True,
+        semantic_thresholds: Optional[Dict[str, float]] = None,
+        embedder: Optional[HashingEmbedder] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.semantic_enabled = semantic_enabled
+        self.semantic_thresholds = {**DEFAULT_SEMANTIC_THRESHOLDS, **(semantic_thresholds or {})}
+        self.embedder = embedder or HashingEmbedder()
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # One embedding row per slot; scope -1 marks a free slot
+        self._embeddings = np.zeros((max_entries, self.embedder.n_features), dtype=np.float32)
+        self._slot_scopes = np.full(max_entries, -1, dtype=np.int64)
+        self._slot_keys: list = [None] * max_entries
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._scope_ids: Dict[str, int] = {}
+        self._scope_names: Dict[int, str] = {}
+        self._scope_refs: Dict[int, int] = {}
+        self._next_scope_id = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def semantic_scope(use_case: str, context_key: str, message: str) -> str:
+        """
+        Partition for semantic matching.
+
+        Only messages with the same use case, context and numbers are compared,
+        so "150 lb N" never answers "200 lb N".
+        """
+        numbers = ",".join(sorted(set(_NUMBER_PATTERN.findall(message))))
+        return f"{use_case}|{context_key}|{numbers}"
+
+    def get(
+        self,
+        key: str,
+        message: Optional[str] = None,
+        scope: Optional[str] = None,
+        question_type: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Look up a response by exact key, then by semantic similarity within the scope."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry.created_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.exact_hits += 1
+                    return entry.response
+                self._remove(key)
+                self.expirations += 1
+
+            if self.semantic_enabled and message is not None and scope in self._scope_ids:
+                hit = self._semantic_lookup(message, self._scope_ids[scope], question_type, now)
+                if hit is not None:
+                    self.semantic_hits += 1
+                    return hit
+
+            self.misses += 1
+            return None
+
+    def _semantic_lookup(
+        self,
+        message: str,
+        scope_id: int,
+        question_type: Optional[str],
+        now: float
+    ) -> Optional[Dict[str, Any]]:
+        threshold = self.semantic_thresholds.get(
+            normalize_question_type(question_type), self.semantic_thresholds["default"]
+        )
+        similarities = self._embeddings @ self.embedder.embed(message)
+        similarities[self._slot_scopes != scope_id] = -1.0
+
+        for slot in np.argsort(-similarities):
+            if similarities[slot] < threshold:
+                return None
+            key = self._slot_keys[slot]
+            entry = self._entries[key]
+            if now - entry.created_at >= self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                continue
+            self._entries.move_to_end(key)
+            return entry.response
+        return None
+
+    def put(
+        self,
+        key: str,
+        response: Dict[str, Any],
+        message: Optional[str] = None,
+        scope: Optional[str] = None
+    ):
+        """Store a response, evicting the least recently used entry if full."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            slot = self._free_slots.pop()
+            self._slot_keys[slot] = key
+            if self.semantic_enabled and message is not None and scope is not None:
+                scope_id = self._scope_ids.get(scope)
+                if scope_id is None:
+                    scope_id = self._scope_ids[scope] = self._next_scope_id
+                    self._scope_names[scope_id] = scope
+                    self._next_scope_id += 1
+                self._scope_refs[scope_id] = self._scope_refs.get(scope_id, 0) + 1
+                self._embeddings[slot] = self.embedder.embed(message)
+                self._slot_scopes[slot] = scope_id
+            self._entries[key] = _CacheEntry(response=response, created_at=time.monotonic(), slot=slot)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        scope_id = int(self._slot_scopes[entry.slot])
+        if scope_id >= 0:
+            self._scope_refs[scope_id] -= 1
+            if self._scope_refs[scope_id] == 0:
+                # Last entry of this scope; forget the scope so ids do not accumulate
+                del self._scope_refs[scope_id]
+                del self._scope_ids[self._scope_names.pop(scope_id)]
+        self._slot_scopes[entry.slot] = -1
+        self._slot_keys[entry.slot] = None
+        self._free_slots.append(entry.slot)
+
+    def purge_expired(self) -> int:
+        """Drop expired entries; returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if now - entry.created_at >= self.ttl_seconds]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    async def single_flight(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run compute once per key at a time; concurrent callers await the same result."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an uncoalesced failure does not log "never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts, hit rates and coalescing counters."""
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "semantic_hit_rate": self.semantic_hits / lookups if lookups else 0.0,
+            "coalesced_requests": self.coalesced,
+            "inflight": len(self._inflight),
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
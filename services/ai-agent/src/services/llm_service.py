@@ -14,6 +14,7 @@ import os
 from pydantic import BaseModel, Field
 
 from .openrouter_client import OpenRouterClient, LLMRequest, LLMResponse
+from .llm_response_cache import LLMResponseCache, normalize_prompt
 from .variety_explanation_service import VarietyExplanationService
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,9 @@ class LLMServiceConfig(BaseModel):
     enable_streaming: bool = True
     cache_responses: bool = True
     cache_ttl_seconds: int = 3600
+    cache_max_entries: int = 1024
+    semantic_cache_enabled: bool = True
+    semantic_similarity_thresholds: Dict[str, float] = Field(default_factory=dict)
 
 
 class LLMService:
@@ -59,8 +63,13 @@ class LLMService:
         # Conversation management
         self.active_conversations: Dict[str, ConversationContext] = {}
 
-        # Response cache
-        self.response_cache: Dict[str, Any] = {}
+        # Exact + semantic response cache with in-flight coalescing
+        self.response_cache = LLMResponseCache(
+            max_entries=config.cache_max_entries,
+            ttl_seconds=config.cache_ttl_seconds,
+            semantic_enabled=config.semantic_cache_enabled,
+            semantic_thresholds=config.semantic_similarity_thresholds
+        )
 
         # Agricultural prompt templates
         self.prompt_templates = {
@@ -142,18 +151,9 @@ Provide confidence levels for each diagnosis."""
         """Generate cache key for request."""
         # Create a hash of the request data for caching
         import hashlib
-        request_str = json.dumps(request_data, sort_keys=True)
+        request_str = json.dumps(request_data, sort_keys=True, default=str)
         return hashlib.md5(request_str.encode()).hexdigest()
 
-    def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
-        """Check if cache entry is still valid."""
-        if not self.config.cache_responses:
-            return False
-        
-        created_at = datetime.fromisoformat(cache_entry.get("created_at", ""))
-        expiry = created_at + timedelta(seconds=self.config.cache_ttl_seconds)
-        return datetime.utcnow() < expiry
-
     async def get_conversation_context(self, user_id: str, session_id: str) -> ConversationContext:
         """Get or create conversation context."""
         context_key = f"{user_id}:{session_id}"
@@ -234,7 +234,8 @@ Provide confidence levels for each diagnosis."""
         message: str,
         agricultural_context: Optional[Dict[str, Any]] = None,
         use_case: str = "conversation",
-        stream: bool = False
+        stream: bool = False,
+        question_type: Optional[str] = None
     ) -> LLMResponse:
         """
         Generate response to user message with conversation context.
@@ -246,6 +247,7 @@ Provide confidence levels for each diagnosis."""
             agricultural_context: Agricultural context data
             use_case: LLM use case (conversation, explanation, etc.)
             stream: Whether to stream response
+            question_type: Question category, selects the semantic cache threshold
             
         Returns:
             LLM response with content and metadata
@@ -254,51 +256,44 @@ Provide confidence levels for each diagnosis."""
             # Get conversation context
             context = await self.get_conversation_context(user_id, session_id)
             
-            # Check cache if enabled
+            # Check cache if enabled: exact normalized prompt first, then semantic match
             cache_key = None
+            cache_scope = None
             if self.config.cache_responses and not stream:
-                cache_data = {
-                    "message": message,
+                context_key = self._generate_cache_key({
                     "agricultural_context": agricultural_context,
                     "use_case": use_case,
                     "conversation_history": context.conversation_history[-5:]  # Last 5 messages
-                }
-                cache_key = self._generate_cache_key(cache_data)
+                })
+                cache_key = self._generate_cache_key({
+                    "message": normalize_prompt(message),
+                    "context": context_key
+                })
+                cache_scope = self.response_cache.semantic_scope(use_case, context_key, message)
                 
-                if cache_key in self.response_cache:
-                    cache_entry = self.response_cache[cache_key]
-                    if self._is_cache_valid(cache_entry):
-                        logger.info(f"Returning cached response for user {user_id}")
-                        return LLMResponse(**cache_entry["response"])
-            
-            # Prepare messages with conversation history
-            messages = []
-            
-            # Add conversation history (excluding system messages)
-            for msg in context.conversation_history:
-                if msg.get("role") != "system":
-                    messages.append(msg)
-            
-            # Add current message
-            messages.append({
-                "role": "user",
-                "content": message
-            })
+                cached = self.response_cache.get(
+                    cache_key, message=message, scope=cache_scope, question_type=question_type or use_case
+                )
+                if cached is not None:
+                    logger.info(f"Returning cached response for user {user_id}")
+                    return LLMResponse(**cached)
             
-            # Create LLM request
-            request = LLMRequest(
-                messages=messages,
-                use_case=use_case,
-                stream=stream,
-                agricultural_context=agricultural_context or context.agricultural_context
+            request = self._build_conversation_request(
+                context, message, agricultural_context, use_case, stream
             )
             
             # Generate response
             if stream:
                 # Return streaming response (handled separately)
-                return await self._generate_streaming_response(request, context, message, agricultural_context)
+                return self._generate_streaming_response(request, context, message, agricultural_context)
             else:
-                response = await self.openrouter_client.complete(request)
+                if cache_key:
+                    # Identical concurrent prompts share a single completion
+                    response = await self.response_cache.single_flight(
+                        cache_key, lambda: self.openrouter_client.complete(request)
+                    )
+                else:
+                    response = await self.openrouter_client.complete(request)
                 
                 # Update conversation context
                 await self.update_conversation_context(
@@ -310,10 +305,7 @@ Provide confidence levels for each diagnosis."""
                 
                 # Cache response if enabled
                 if cache_key and self.config.cache_responses:
-                    self.response_cache[cache_key] = {
-                        "response": response.dict(),
-                        "created_at": datetime.utcnow().isoformat()
-                    }
+                    self.response_cache.put(cache_key, response.dict(), message=message, scope=cache_scope)
                 
                 logger.info(f"Generated response for user {user_id}: "
                            f"model={response.model}, cost=${response.cost_estimate:.4f}")
@@ -324,6 +316,30 @@ Provide confidence levels for each diagnosis."""
             logger.error(f"Response generation failed for user {user_id}: {e}")
             raise
 
+    def _build_conversation_request(
+        self,
+        context: ConversationContext,
+        message: str,
+        agricultural_context: Optional[Dict[str, Any]],
+        use_case: str,
+        stream: bool = False
+    ) -> LLMRequest:
+        """Build a request from conversation history and the new message, within the prompt budget."""
+        # Add conversation history (excluding system messages)
+        messages = [msg for msg in context.conversation_history if msg.get("role") != "system"]
+        messages.append({
+            "role": "user",
+            "content": message
+        })
+        
+        return LLMRequest(
+            messages=messages,
+            use_case=use_case,
+            stream=stream,
+            agricultural_context=agricultural_context or context.agricultural_context,
+            max_prompt_tokens=self.config.context_window_tokens
+        )
+
     async def _generate_streaming_response(
         self,
         request: LLMRequest,
@@ -332,20 +348,62 @@ Provide confidence levels for each diagnosis."""
         agricultural_context: Optional[Dict[str, Any]]
     ) -> AsyncGenerator[str, None]:
         """Generate streaming response."""
-        full_response = ""
+        chunks = []
+        
+        if request.max_prompt_tokens is None:
+            request = request.copy(update={"max_prompt_tokens": self.config.context_window_tokens})
         
         async for chunk in self.openrouter_client.stream_complete(request):
-            full_response += chunk
+            chunks.append(chunk)
             yield chunk
         
         # Update conversation context with complete response
         await self.update_conversation_context(
             context,
             {"role": "user", "content": message},
-            full_response,
+            "".join(chunks),
             agricultural_context
         )
 
+    async def stream_response_events(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        agricultural_context: Optional[Dict[str, Any]] = None,
+        use_case: str = "conversation"
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream a response as token, metadata and done events.
+        
+        The prompt is trimmed to context_window_tokens before sending, and the
+        conversation history is updated once the final event is produced.
+        
+        Args:
+            user_id: User identifier
+            session_id: Session identifier
+            message: User message
+            agricultural_context: Agricultural context data
+            use_case: LLM use case (conversation, explanation, etc.)
+            
+        Yields:
+            Events from OpenRouterClient.stream_events
+        """
+        context = await self.get_conversation_context(user_id, session_id)
+        request = self._build_conversation_request(
+            context, message, agricultural_context, use_case, stream=True
+        )
+        
+        async for event in self.openrouter_client.stream_events(request):
+            if event["event"] == "done":
+                await self.update_conversation_context(
+                    context,
+                    {"role": "user", "content": message},
+                    event["data"]["content"],
+                    agricultural_context
+                )
+            yield event
+
     async def generate_agricultural_explanation(
         self,
         recommendation: Dict[str, Any],
@@ -498,6 +556,7 @@ Provide confidence levels for each diagnosis."""
                 "status": "healthy" if openrouter_health["status"] == "healthy" else "degraded",
                 "active_conversations": len(self.active_conversations),
                 "cached_responses": len(self.response_cache),
+                "response_cache": self.response_cache.get_stats(),
                 "openrouter_status": openrouter_health,
                 "timestamp": datetime.utcnow().isoformat()
             }
@@ -529,15 +588,9 @@ Provide confidence levels for each diagnosis."""
 
     async def cleanup_old_cache(self):
         """Clean up expired cache entries."""
-        to_remove = []
-        for key, entry in self.response_cache.items():
-            if not self._is_cache_valid(entry):
-                to_remove.append(key)
-        
-        for key in to_remove:
-            del self.response_cache[key]
+        removed = self.response_cache.purge_expired()
         
-        logger.info(f"Cleaned up {len(to_remove)} expired cache entries")
+        logger.info(f"Cleaned up {removed} expired cache entries")
 
 
 def create_llm_service() -> LLMService:
@@ -549,7 +602,9 @@ def create_llm_service() -> LLMService:
         context_window_tokens=int(os.getenv("CONTEXT_WINDOW_TOKENS", "4000")),
         enable_streaming=os.getenv("ENABLE_STREAMING", "true").lower() == "true",
         cache_responses=os.getenv("CACHE_RESPONSES", "true").lower() == "true",
-        cache_ttl_seconds=int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+        cache_ttl_seconds=int(os.getenv("CACHE_TTL_SECONDS", "3600")),
+        cache_max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1024")),
+        semantic_cache_enabled=os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
     )
     
     return LLMService(config)
@@ -9,7 +9,7 @@ import asyncio
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Any, AsyncGenerator
+from typing import Dict, List, Optional, Any, AsyncGenerator, Tuple
 from datetime import datetime, timedelta
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -18,6 +18,66 @@ import tiktoken
 
 logger = logging.getLogger(__name__)
 
+# Per-message framing tokens (role, separators) added on top of the content
+MESSAGE_TOKEN_OVERHEAD = 4
+
+AGRICULTURAL_TOPICS = [
+    "soil", "fertilizer", "crop", "nitrogen", "phosphorus", "potassium",
+    "ph", "organic matter", "yield", "planting", "harvest", "irrigation",
+    "pest", "disease", "rotation", "cover crop", "tillage"
+]
+
+METADATA_FLAG_TERMS = {
+    "contains_recommendations": ["recommend", "suggest", "should"],
+    "expresses_uncertainty": ["may", "might", "could", "possibly", "uncertain", "depends"],
+    "includes_safety_warnings": ["caution", "warning", "danger", "safety", "careful"],
+}
+
+
+class StreamingMetadataExtractor:
+    """
+    Incremental version of the agricultural metadata extraction.
+
+    Each chunk is scanned together with the tail of the previous text, so terms
+    split across chunk boundaries are still found and every character is
+    scanned a bounded number of times. The result matches scanning the full
+    content at once.
+    """
+
+    _TAIL_LENGTH = max(len(term) for terms in [AGRICULTURAL_TOPICS, *METADATA_FLAG_TERMS.values()]
+                       for term in terms) - 1
+
+    def __init__(self):
+        self._tail = ""
+        self._topics = set()
+        self._flags: Dict[str, bool] = {}
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """Scan a chunk; returns only what it newly revealed (new topics, new flags)."""
+        text = self._tail + chunk.lower()
+        self._tail = text[-self._TAIL_LENGTH:]
+        discovered: Dict[str, Any] = {}
+
+        new_topics = [topic for topic in AGRICULTURAL_TOPICS if topic not in self._topics and topic in text]
+        if new_topics:
+            self._topics.update(new_topics)
+            discovered["topics_mentioned"] = new_topics
+
+        for flag, terms in METADATA_FLAG_TERMS.items():
+            if flag not in self._flags and any(term in text for term in terms):
+                self._flags[flag] = True
+                discovered[flag] = True
+
+        return discovered
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata for everything fed so far."""
+        return {
+            "topics_mentioned": [topic for topic in AGRICULTURAL_TOPICS if topic in self._topics],
+            **self._flags
+        }
+
 
 class LLMRequest(BaseModel):
     """Request model for LLM interactions."""
@@ -29,6 +89,7 @@ class LLMRequest(BaseModel):
     max_tokens: Optional[int] = None
     stream: bool = False
     agricultural_context: Optional[Dict[str, Any]] = None
+    max_prompt_tokens: Optional[int] = None
 
 
 class LLMResponse(BaseModel):
@@ -41,6 +102,7 @@ class LLMResponse(BaseModel):
     response_time: float
     confidence_score: Optional[float] = None
     agricultural_metadata: Optional[Dict[str, Any]] = None
+    time_to_first_token: Optional[float] = None
 
 
 class OpenRouterClient:
@@ -189,7 +251,7 @@ Always cite relevant agricultural sources and extension guidelines when making r
         return True
 
     def prepare_messages(self, request: LLMRequest) -> List[Dict[str, str]]:
-        """Prepare messages with agricultural system prompt."""
+        """Prepare messages with agricultural system prompt, trimmed to the request's token budget."""
         messages = []
         
         # Add system prompt if not already present
@@ -208,8 +270,86 @@ Always cite relevant agricultural sources and extension guidelines when making r
             })
         
         messages.extend(request.messages)
+        
+        if request.max_prompt_tokens:
+            model = request.model or self.get_model_config(request.use_case)["model"]
+            messages = self.fit_messages_to_budget(messages, request.max_prompt_tokens, model)
         return messages
 
+    def count_message_tokens(self, messages: List[Dict[str, str]], model: str = "gpt-3.5-turbo") -> int:
+        """Estimate prompt tokens for a message list, including per-message overhead."""
+        return sum(
+            self.estimate_tokens(message.get("content", ""), model) + MESSAGE_TOKEN_OVERHEAD
+            for message in messages
+        )
+
+    def fit_messages_to_budget(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        model: str = "gpt-3.5-turbo"
+    ) -> List[Dict[str, str]]:
+        """
+        Trim a prepared message list to roughly max_tokens.
+        
+        The leading system prompt and the final (current) message are always
+        kept. Context system messages come next, cut line by line when they do
+        not fit whole; the remaining budget goes to conversation history from
+        the newest message back, stopping at the first one that does not fit.
+        """
+        costs = [
+            self.estimate_tokens(message.get("content", ""), model) + MESSAGE_TOKEN_OVERHEAD
+            for message in messages
+        ]
+        if sum(costs) <= max_tokens or len(messages) <= 1:
+            return messages
+        
+        last = len(messages) - 1
+        pinned = {last}
+        if messages[0].get("role") == "system":
+            pinned.add(0)
+        remaining = max_tokens - sum(costs[i] for i in pinned)
+        kept: Dict[int, Dict[str, str]] = {i: messages[i] for i in pinned}
+        
+        for i, message in enumerate(messages[:last]):
+            if i in pinned or message.get("role") != "system":
+                continue
+            if costs[i] <= remaining:
+                kept[i] = message
+                remaining -= costs[i]
+                continue
+            content, used = self._trim_lines(message.get("content", ""), remaining - MESSAGE_TOKEN_OVERHEAD, model)
+            if content:
+                kept[i] = {**message, "content": content}
+                remaining -= used + MESSAGE_TOKEN_OVERHEAD
+        
+        for i in range(last - 1, -1, -1):
+            if i in kept or messages[i].get("role") == "system":
+                continue
+            if costs[i] > remaining:
+                break
+            kept[i] = messages[i]
+            remaining -= costs[i]
+        
+        logger.debug(f"Trimmed prompt from {len(messages)} to {len(kept)} messages "
+                     f"for a {max_tokens} token budget")
+        return [kept[i] for i in sorted(kept)]
+
+    def _trim_lines(self, text: str, max_tokens: int, model: str) -> Tuple[str, int]:
+        """Keep leading lines of text within max_tokens; returns (text, tokens used)."""
+        lines = []
+        used = 0
+        for line in text.split("\n"):
+            cost = self.estimate_tokens(line, model) + 1
+            if used + cost > max_tokens:
+                break
+            lines.append(line)
+            used += cost
+        # A lone heading line carries no context
+        if len(lines) < 2:
+            return "", 0
+        return "\n".join(lines), used
+
     def _format_agricultural_context(self, context: Dict[str, Any]) -> str:
         """Format agricultural context for the LLM."""
         context_parts = []
@@ -362,23 +502,79 @@ Always cite relevant agricultural sources and extension guidelines when making r
         Yields:
             Content chunks as they arrive
         """
+        payload = self._build_stream_payload(request)
+        async for chunk in self._stream_chunks(payload):
+            yield chunk
+
+    async def stream_events(self, request: LLMRequest) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream a completion as events for incremental delivery.
+        
+        Yields {"event": ..., "data": ...} dicts: a "token" event per content
+        chunk, a "metadata" event whenever a chunk reveals new agricultural
+        topics or flags, and a final "done" event carrying the full
+        LLMResponse fields. Usage is estimated, as streamed completions do not
+        report it.
+        """
+        start_time = time.time()
+        payload = self._build_stream_payload(request)
+        model = payload["model"]
+        extractor = StreamingMetadataExtractor()
+        chunks: List[str] = []
+        time_to_first_token = None
+        
+        async for chunk in self._stream_chunks(payload):
+            if time_to_first_token is None:
+                time_to_first_token = time.time() - start_time
+            chunks.append(chunk)
+            yield {"event": "token", "data": {"content": chunk}}
+            
+            discovered = extractor.feed(chunk)
+            if discovered:
+                yield {"event": "metadata", "data": discovered}
+        
+        content = "".join(chunks)
+        response_time = time.time() - start_time
+        input_tokens = self.count_message_tokens(payload["messages"], model)
+        output_tokens = self.estimate_tokens(content, model)
+        
+        response = LLMResponse(
+            content=content,
+            model=model,
+            usage={
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens
+            },
+            cost_estimate=self.calculate_cost(model, input_tokens, output_tokens),
+            response_time=response_time,
+            confidence_score=self._calculate_confidence_score(request, content, model, response_time),
+            agricultural_metadata=extractor.metadata,
+            time_to_first_token=time_to_first_token
+        )
+        
+        logger.info(f"LLM stream complete: model={model}, tokens~{response.usage['total_tokens']}, "
+                    f"ttft={time_to_first_token or 0.0:.2f}s, time={response_time:.2f}s")
+        
+        yield {"event": "done", "data": response.dict()}
+
+    def _build_stream_payload(self, request: LLMRequest) -> Dict[str, Any]:
+        """Build the chat completions payload for a streaming request."""
         # Get model configuration
         config = self.get_model_config(request.use_case)
         model = request.model or config["model"]
         
-        # Prepare messages
-        messages = self.prepare_messages(request)
-        
-        # Prepare payload
-        payload = {
+        return {
             "model": model,
-            "messages": messages,
+            "messages": self.prepare_messages(request),
             "temperature": request.temperature or config["temperature"],
             "max_tokens": request.max_tokens or config["max_tokens"],
             "top_p": config.get("top_p", 0.9),
             "stream": True
         }
-        
+
+    async def _stream_chunks(self, payload: Dict[str, Any]) -> AsyncGenerator[str, None]:
+        """POST a streaming payload and yield content deltas from the SSE lines."""
         try:
             async with self.client.stream(
                 "POST",
@@ -454,36 +650,9 @@ Always cite relevant agricultural sources and extension guidelines when making r
         content: str
     ) -> Dict[str, Any]:
         """Extract agricultural metadata from response."""
-        metadata = {}
-        
-        # Detect agricultural topics mentioned
-        agricultural_topics = [
-            "soil", "fertilizer", "crop", "nitrogen", "phosphorus", "potassium",
-            "ph", "organic matter", "yield", "planting", "harvest", "irrigation",
-            "pest", "disease", "rotation", "cover crop", "tillage"
-        ]
-        
-        mentioned_topics = [
-            topic for topic in agricultural_topics
-            if topic in content.lower()
-        ]
-        metadata["topics_mentioned"] = mentioned_topics
-        
-        # Detect specific recommendations
-        if any(word in content.lower() for word in ["recommend", "suggest", "should"]):
-            metadata["contains_recommendations"] = True
-        
-        # Detect uncertainty indicators
-        uncertainty_words = ["may", "might", "could", "possibly", "uncertain", "depends"]
-        if any(word in content.lower() for word in uncertainty_words):
-            metadata["expresses_uncertainty"] = True
-        
-        # Detect safety warnings
-        safety_words = ["caution", "warning", "danger", "safety", "careful"]
-        if any(word in content.lower() for word in safety_words):
-            metadata["includes_safety_warnings"] = True
-        
-        return metadata
+        extractor = StreamingMetadataExtractor()
+        extractor.feed(content)
+        return extractor.metadata
 
     async def classify_question(self, question: str) -> Dict[str, Any]:
         """
@@ -13,7 +13,7 @@ import json
 
 from src.services.context_manager import (
     ContextManager, ContextEntry, ConversationContext,
-    ContextType, ContextPriority, ContextScope
+    ContextType, ContextPriority, ContextScope, ExpiryWheel
 )
 from src.services.context_aware_service import (
     ContextAwareService, ContextAwareRequest, create_context_aware_service
@@ -361,6 +361,116 @@ class TestContextManager:
         assert stats["total_contexts"] >= 2
 
 
+class TestContextIndexes:
+    """Test indexed search, top-k ranking and wheel-based expiry."""
+    
+    @pytest.mark.asyncio
+    async def test_search_uses_indexes_and_ranks_top_k(self):
+        """Test filters combine and results are ordered by priority, access count, recency."""
+        manager = ContextManager(enable_persistence=False)
+        user_id = "index_user"
+        low = await manager.store_context(
+            user_id, ContextType.AGRICULTURAL, {"crop": "corn", "soil": {"ph": 6.2}},
+            priority=ContextPriority.LOW, tags=["corn"], summary="Low priority corn note"
+        )
+        critical = await manager.store_context(
+            user_id, ContextType.AGRICULTURAL, {"crop": "corn"},
+            priority=ContextPriority.CRITICAL, tags=["corn"], summary="Corn rotation"
+        )
+        medium = await manager.store_context(
+            user_id, ContextType.RECOMMENDATION_HISTORY, {"crop": "corn", "rate": 150},
+            priority=ContextPriority.MEDIUM, tags=["nitrogen"], summary="Nitrogen plan"
+        )
+        await manager.store_context(
+            user_id, ContextType.AGRICULTURAL, {"crop": "soybean"}, tags=["soybean"]
+        )
+        
+        results = await manager.search_contexts(user_id, query="corn")
+        assert [entry.id for entry in results] == [critical, medium, low]
+        
+        results = await manager.search_contexts(user_id, query="corn", limit=2)
+        assert [entry.id for entry in results] == [critical, medium]
+        
+        # Nested data values and numbers are tokenized
+        assert [e.id for e in await manager.search_contexts(user_id, query="ph 6.2")] == [low]
+        assert [e.id for e in await manager.search_contexts(user_id, query="150")] == [medium]
+        assert await manager.search_contexts(user_id, query="corn wheat") == []
+        
+        results = await manager.search_contexts(
+            user_id, tags=["corn", "nitrogen"], context_types=[ContextType.AGRICULTURAL],
+            priority_min=ContextPriority.LOW
+        )
+        assert [entry.id for entry in results] == [critical, low]
+        results = await manager.search_contexts(user_id, query="corn", priority_min=ContextPriority.MEDIUM)
+        assert [entry.id for entry in results] == [critical, medium]
+        
+        # Only returned entries are counted as accessed (three searches plus this lookup)
+        entry = await manager.get_context(user_id, low)
+        assert entry.access_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_limits_evict_lowest_priority_and_indexes_follow(self):
+        """Test eviction keeps higher priorities and removed entries leave every index."""
+        manager = ContextManager(max_contexts_per_user=3, enable_persistence=False)
+        user_id = "limit_user"
+        for priority in (ContextPriority.LOW, ContextPriority.CRITICAL, ContextPriority.MEDIUM,
+                         ContextPriority.HIGH):
+            await manager.store_context(
+                user_id, ContextType.SESSION, {"priority": priority.value},
+                priority=priority, tags=[priority.value]
+            )
+        
+        remaining = {entry.priority for entry in manager.contexts[user_id].values()}
+        assert ContextPriority.LOW not in remaining
+        index = manager.indexes[user_id]
+        assert "low" not in index.by_tag and "low" not in index.by_token
+        assert len(manager.expiry_wheel) == 3
+        
+        for context_id in list(manager.contexts[user_id]):
+            await manager._remove_context(user_id, context_id)
+        assert user_id not in manager.contexts and user_id not in manager.indexes
+        assert len(manager.expiry_wheel) == 0
+    
+    @pytest.mark.asyncio
+    async def test_expiry_wheel_removes_due_contexts(self):
+        """Test due entries are expired by advancing the wheel, not by a full sweep."""
+        manager = ContextManager(enable_persistence=False, expiry_tick_seconds=1)
+        user_id = "expiry_user"
+        now = datetime.utcnow()
+        short_id = await manager.store_context(
+            user_id, ContextType.SESSION, {"note": "short"}, expires_at=now + timedelta(seconds=30)
+        )
+        long_id = await manager.store_context(
+            user_id, ContextType.SESSION, {"note": "long"}, expires_at=now + timedelta(hours=2)
+        )
+        past_id = await manager.store_context(
+            user_id, ContextType.SESSION, {"note": "past"}, expires_at=now - timedelta(seconds=1)
+        )
+        
+        assert manager.expire_due_contexts(now) == 1
+        assert past_id not in manager.contexts[user_id]
+        
+        # Extending an entry reschedules it instead of removing it
+        manager.contexts[user_id][short_id].expires_at = now + timedelta(minutes=5)
+        assert manager.expire_due_contexts(now + timedelta(seconds=60)) == 0
+        assert manager.expire_due_contexts(now + timedelta(minutes=6)) == 1
+        assert list(manager.contexts[user_id]) == [long_id]
+        assert (await manager.search_contexts(user_id, query="short")) == []
+    
+    def test_wheel_handles_multiple_revolutions(self):
+        """Test deadlines beyond one revolution wait for their own round."""
+        wheel = ExpiryWheel(tick_seconds=1, slots=8, now=0)
+        wheel.schedule("soon", 3)
+        wheel.schedule("later", 11)  # Same slot as "soon", next revolution
+        wheel.schedule("far", 100)
+        
+        assert wheel.advance(3) == ["soon"]
+        assert wheel.advance(10) == []
+        assert wheel.advance(11) == ["later"]
+        wheel.cancel("far")
+        assert wheel.advance(1000) == [] and len(wheel) == 0
+
+
 class TestContextAwareService:
     """Test context-aware service functionality."""
     
@@ -477,6 +587,47 @@ class TestContextAwareService:
         assert "timestamp" in health
 
 
+class TestContextAwareStreaming:
+    """Test the streamed context-aware pipeline."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_events_store_context_after_done(self):
+        """Test events pass through and the finished response is stored and recorded."""
+        llm_service = LLMService(LLMServiceConfig(openrouter_api_key="sk-or-test-key-12345",
+                                                  context_window_tokens=800))
+        context_manager = ContextManager(enable_persistence=False)
+        service = ContextAwareService(llm_service, context_manager)
+        requests = []
+        
+        async def classify_question(question):
+            return {"category_name": "Crop Selection", "confidence": 0.9}
+        
+        async def stream_events(request):
+            requests.append(request)
+            yield {"event": "token", "data": {"content": "Plant corn"}}
+            yield {"event": "metadata", "data": {"topics_mentioned": ["crop"]}}
+            yield {"event": "done", "data": {
+                "content": "Plant corn", "model": "test/model", "usage": {},
+                "cost_estimate": 0.0, "response_time": 0.1, "confidence_score": 0.8
+            }}
+        
+        llm_service.classify_question = classify_question
+        llm_service.openrouter_client.stream_events = stream_events
+        request = ContextAwareRequest(user_id="stream_user", session_id="s1", message="What should I plant?")
+        
+        events = [event async for event in service.stream_response_events(request)]
+        
+        assert [event["event"] for event in events] == ["token", "metadata", "done"]
+        assert events[-1]["data"]["question_type"] == "Crop Selection"
+        assert len(events[-1]["data"]["context_stored"]) == 2
+        assert requests[0].max_prompt_tokens == 800
+        conversation = await context_manager.get_conversation_context("stream_user", "s1")
+        assert [m["role"] for m in conversation.messages] == ["user", "assistant"]
+        
+        chunks = [chunk async for chunk in service.stream_response(request)]
+        assert chunks == ["Plant corn"]
+
+
 class TestContextIntegration:
     """Test integration between context management and LLM service."""
     
@@ -0,0 +1,142 @@
+"""
+Tests for the exact + semantic LLM response cache
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.services.llm_response_cache import LLMResponseCache, normalize_question_type
+from src.services.llm_service import LLMService, LLMServiceConfig
+from src.services.openrouter_client import LLMResponse
+
+
+def _response(content: str) -> dict:
+    return {"content": content, "model": "test/model"}
+
+
+class TestLLMResponseCache:
+    """Test cache levels, eviction and metrics."""
+
+    def test_exact_and_semantic_hits(self):
+        cache = LLMResponseCache()
+        scope = cache.semantic_scope("conversation", "ctx", "When should I plant corn in Iowa?")
+        cache.put("k1", _response("Plant in late April."), message="When should I plant corn in Iowa?", scope=scope)
+
+        assert cache.get("k1")["content"] == "Plant in late April."
+        paraphrase = "when should i plant my corn in iowa"
+        hit = cache.get("k2", message=paraphrase,
+                        scope=cache.semantic_scope("conversation", "ctx", paraphrase))
+        assert hit["content"] == "Plant in late April."
+        assert cache.get("k3", message="How much lime should I apply?", scope=scope) is None
+
+        stats = cache.get_stats()
+        assert (stats["exact_hits"], stats["semantic_hits"], stats["misses"]) == (1, 1, 1)
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+    def test_semantic_scope_separates_numbers_and_context(self):
+        cache = LLMResponseCache()
+        message = "Is 150 lb of nitrogen enough for corn?"
+        cache.put("k1", _response("Yes"), message=message, scope=cache.semantic_scope("conversation", "ctx", message))
+
+        other_rate = "Is 200 lb of nitrogen enough for corn?"
+        assert cache.get("k2", message=other_rate,
+                         scope=cache.semantic_scope("conversation", "ctx", other_rate)) is None
+        assert cache.get("k3", message=message,
+                         scope=cache.semantic_scope("conversation", "other-ctx", message)) is None
+
+    def test_question_type_thresholds(self):
+        cache = LLMResponseCache()
+        message = "Why are my corn leaves turning yellow at the tips?"
+        paraphrase = "why are my corn leaves yellow at the tips"  # Similarity ~0.93
+        scope = cache.semantic_scope("conversation", "ctx", message)
+        cache.put("k1", _response("Likely nitrogen"), message=message, scope=scope)
+
+        assert normalize_question_type("Problem Diagnosis") == "problem_diagnosis"
+        assert cache.get("k2", message=paraphrase, scope=scope, question_type="Problem Diagnosis") is None
+        assert cache.get("k2", message=paraphrase, scope=scope, question_type="unknown type") is not None
+        assert cache.get("k2", message=paraphrase, scope=scope, question_type="conversation") is not None
+
+    def test_lru_eviction_and_ttl(self):
+        cache = LLMResponseCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.put(key, _response(key), message=f"question {key}", scope="s")
+        cache.get("a")
+        cache.put("c", _response("c"), message="question c", scope="s")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+        cache.ttl_seconds = 0
+        assert cache.purge_expired() == 2
+        assert len(cache) == 0
+        assert cache._scope_ids == {}
+
+    @pytest.mark.asyncio
+    async def test_single_flight_coalesces_concurrent_calls(self):
+        cache = LLMResponseCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        results = await asyncio.gather(*[cache.single_flight("k", compute) for _ in range(5)])
+
+        assert results == ["done"] * 5
+        assert len(calls) == 1
+        assert cache.get_stats()["coalesced_requests"] == 4
+
+    @pytest.mark.asyncio
+    async def test_single_flight_propagates_errors(self):
+        cache = LLMResponseCache()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+
+        results = await asyncio.gather(*[cache.single_flight("k", compute) for _ in range(3)],
+                                       return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert cache.get_stats()["inflight"] == 0
+
+
+class TestLLMServiceCaching:
+    """Test the cache wired into LLMService.generate_response."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_completion(self):
+        service = LLMService(LLMServiceConfig(openrouter_api_key="sk-or-test-key-12345"))
+        completions = []
+
+        async def complete(request):
+            completions.append(request)
+            await asyncio.sleep(0.01)
+            return LLMResponse(
+                content="Plant corn when soil reaches 50F.",
+                model="anthropic/claude-3-sonnet",
+                usage={"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+                cost_estimate=0.001,
+                response_time=0.01,
+                confidence_score=0.8
+            )
+
+        service.openrouter_client = MagicMock()
+        service.openrouter_client.complete = complete
+
+        responses = await asyncio.gather(*[
+            service.generate_response(f"user_{i}", "session", "When should I plant corn?")
+            for i in range(4)
+        ])
+
+        assert len(completions) == 1
+        assert {response.content for response in responses} == {"Plant corn when soil reaches 50F."}
+
+        # A new session with the same normalized prompt is served from the exact cache
+        cached = await service.generate_response("user_9", "session", "  when should I plant CORN  ")
+        assert cached.content == "Plant corn when soil reaches 50F."
+        assert len(completions) == 1
@@ -8,7 +8,9 @@ import os
 from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime
 
-from src.services.openrouter_client import OpenRouterClient, LLMRequest, LLMResponse
+from src.services.openrouter_client import (
+    OpenRouterClient, LLMRequest, LLMResponse, StreamingMetadataExtractor
+)
 from src.services.llm_service import LLMService, LLMServiceConfig
 
 
@@ -556,6 +558,108 @@ class TestLLMService:
 
 
 @pytest.mark.integration
+class TestStreamingPipeline:
+    """Test token budgeting, incremental metadata and streamed events."""
+    
+    @pytest.fixture
+    def openrouter_client(self):
+        return OpenRouterClient(api_key="sk-or-test-key-12345")
+    
+    def test_incremental_metadata_matches_full_extraction(self, openrouter_client):
+        """Test chunked extraction finds terms split across chunk boundaries."""
+        content = ("You should test soil pH before planting. Organic matter may improve "
+                   "yield; use caution with nitrogen after a cover crop.")
+        expected = openrouter_client._extract_agricultural_metadata(None, content)
+        
+        for size in (1, 3, 7, 20):
+            extractor = StreamingMetadataExtractor()
+            discovered_topics = []
+            for i in range(0, len(content), size):
+                discovered_topics += extractor.feed(content[i:i + size]).get("topics_mentioned", [])
+            
+            assert extractor.metadata == expected
+            assert sorted(discovered_topics) == sorted(expected["topics_mentioned"])
+        assert "organic matter" in expected["topics_mentioned"]
+        assert expected["includes_safety_warnings"] is True
+    
+    def test_fit_messages_to_budget(self, openrouter_client):
+        """Test history is dropped oldest first and context is cut by lines."""
+        history = []
+        for i in range(10):
+            history.append({"role": "user", "content": f"question {i} " + "word " * 40})
+            history.append({"role": "assistant", "content": f"answer {i} " + "word " * 40})
+        request = LLMRequest(
+            messages=history + [{"role": "user", "content": "What now?"}],
+            agricultural_context={"farm_location": "Iowa", "season": "spring",
+                                  "crop_info": {"type": "corn", "growth_stage": "V6"}}
+        )
+        full = openrouter_client.prepare_messages(request)
+        
+        request.max_prompt_tokens = 400
+        trimmed = openrouter_client.prepare_messages(request)
+        
+        assert openrouter_client.count_message_tokens(trimmed, "anthropic/claude-3-sonnet") <= 400
+        assert trimmed[0] == full[0] and trimmed[1] == full[1]
+        assert trimmed[-1]["content"] == "What now?"
+        kept_history = trimmed[2:-1]
+        assert 0 < len(kept_history) < len(history)
+        assert kept_history == history[-len(kept_history):]
+        
+        request.max_prompt_tokens = 10_000
+        assert openrouter_client.prepare_messages(request) == full
+        
+        context, _ = openrouter_client._trim_lines(full[1]["content"], 12, "anthropic/claude-3-sonnet")
+        assert context.startswith("Agricultural Context:\nFarm Location: Iowa")
+        assert "Season" not in context
+    
+    @pytest.mark.asyncio
+    async def test_stream_events(self, openrouter_client):
+        """Test token, metadata and done events from a streamed completion."""
+        async def fake_chunks(payload):
+            assert payload["stream"] is True
+            for chunk in ["Apply nitro", "gen at plant", "ing; you should ", "be careful."]:
+                yield chunk
+        
+        openrouter_client._stream_chunks = fake_chunks
+        request = LLMRequest(messages=[{"role": "user", "content": "When should I apply N?"}])
+        events = [event async for event in openrouter_client.stream_events(request)]
+        
+        tokens = [e["data"]["content"] for e in events if e["event"] == "token"]
+        assert "".join(tokens) == "Apply nitrogen at planting; you should be careful."
+        assert events[1] == {"event": "token", "data": {"content": "gen at plant"}}
+        assert events[2] == {"event": "metadata", "data": {"topics_mentioned": ["nitrogen"]}}
+        
+        done = events[-1]
+        assert done["event"] == "done"
+        response = LLMResponse(**done["data"])
+        assert response.content == "".join(tokens)
+        assert response.agricultural_metadata == openrouter_client._extract_agricultural_metadata(
+            request, response.content
+        )
+        assert response.usage["prompt_tokens"] > 0
+        assert response.time_to_first_token is not None
+    
+    @pytest.mark.asyncio
+    async def test_llm_service_stream_updates_history(self):
+        """Test streamed responses are budgeted and recorded in the conversation."""
+        service = LLMService(LLMServiceConfig(openrouter_api_key="sk-or-test-key-12345",
+                                              context_window_tokens=1500))
+        requests = []
+        
+        async def fake_stream_events(request):
+            requests.append(request)
+            yield {"event": "token", "data": {"content": "Plant in May."}}
+            yield {"event": "done", "data": {"content": "Plant in May."}}
+        
+        service.openrouter_client.stream_events = fake_stream_events
+        events = [e async for e in service.stream_response_events("user", "session", "When to plant?")]
+        
+        assert [e["event"] for e in events] == ["token", "done"]
+        assert requests[0].max_prompt_tokens == 1500
+        context = await service.get_conversation_context("user", "session")
+        assert context.conversation_history[-1] == {"role": "assistant", "content": "Plant in May."}
+
+
 class TestOpenRouterIntegration:
     """Integration tests for OpenRouter (requires API key)."""
     
@@ -5,9 +5,11 @@ Core business logic for cover crop selection and recommendations
 based on soil conditions, climate data, and farmer objectives.
 """
 
+import asyncio
 import logging
 import httpx
 import json
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -39,6 +41,8 @@ try:
     from .goal_based_recommendation_service import GoalBasedRecommendationService
     from .timing_service import CoverCropTimingService
     from .benefit_tracking_service import BenefitQuantificationService
+    from .species_matrix import SpeciesMatrix
+    from .mixture_optimizer import MixtureOptimizer
 except ImportError:
     from models.cover_crop_models import (
         CoverCropSelectionRequest,
@@ -66,6 +70,8 @@ except ImportError:
     from services.goal_based_recommendation_service import GoalBasedRecommendationService
     from services.timing_service import CoverCropTimingService
     from services.benefit_tracking_service import BenefitQuantificationService
+    from services.species_matrix import SpeciesMatrix
+    from services.mixture_optimizer import MixtureOptimizer
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +82,8 @@ class CoverCropSelectionService:
     def __init__(self):
         """Initialize the cover crop selection service."""
         self.species_database = {}
+        self._species_matrix: Optional[SpeciesMatrix] = None
+        self._mixture_optimizer: Optional[MixtureOptimizer] = None
         self.mixture_database = {}
         self.climate_service_url = "http://localhost:8003"  # Data integration service
         self.main_crop_integration_service = MainCropIntegrationService()
@@ -83,6 +91,27 @@ class CoverCropSelectionService:
         self.timing_service = CoverCropTimingService()
         self.benefit_tracking_service = BenefitQuantificationService()
         self.initialized = False
+
+    def _get_species_matrix(self) -> SpeciesMatrix:
+        """Return the species matrix, rebuilding it if the database changed since it was built."""
+        matrix = self._species_matrix
+        if matrix is None or len(matrix) != len(self.species_database) or any(
+            matrix.species[i] is not species for i, species in enumerate(self.species_database.values())
+        ):
+            self._build_species_indexes()
+            matrix = self._species_matrix
+        return matrix
+
+    def _get_mixture_optimizer(self) -> MixtureOptimizer:
+        """Return the mixture optimizer, rebuilt together with the species matrix."""
+        self._get_species_matrix()
+        return self._mixture_optimizer
+
+    def _build_species_indexes(self):
+        """Precompute the suitability matrix and mixture compatibility index for the species database."""
+        species = list(self.species_database.values())
+        self._species_matrix = SpeciesMatrix(species, self)
+        self._mixture_optimizer = MixtureOptimizer(species)
         
     async def initialize(self):
         """Initialize the service with cover crop data."""
@@ -1261,7 +1290,7 @@ class CoverCropSelectionService:
             
             # Generate mixture recommendations if appropriate
             mixture_recs = await self._generate_mixture_recommendations(
-                suitable_species, enriched_request
+                suitable_species, enriched_request, scored_species
             )
             
             # Create implementation timeline
@@ -1298,6 +1327,38 @@ class CoverCropSelectionService:
             logger.error(f"Error in cover crop selection: {e}")
             raise
     
+    async def score_fields(self, requests: List[CoverCropSelectionRequest]) -> List[List[Tuple[CoverCropSpecies, float]]]:
+        """
+        Rank suitable species for many fields in one pass.
+
+        Args:
+            requests: Cover crop selection requests, one per field
+
+        Returns:
+            For each request, suitable species with scores, highest first
+        """
+        try:
+            enriched = await asyncio.gather(*[self._enrich_climate_data(request) for request in requests])
+            if not enriched:
+                return []
+
+            matrix = self._get_species_matrix()
+            suitable, scores = matrix.evaluate(enriched)
+
+            results = []
+            for row in range(len(enriched)):
+                candidates = np.flatnonzero(suitable[row])
+                # Stable sort keeps database order among equal scores, as in _score_species_suitability
+                ranked = candidates[np.argsort(-scores[row, candidates], kind="stable")]
+                results.append([(matrix.species[i], float(scores[row, i])) for i in ranked])
+
+            logger.info(f"Scored {len(matrix)} species for {len(enriched)} fields")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batch field scoring: {e}")
+            raise
+
     async def lookup_species(self, filters: Dict[str, Any]) -> List[CoverCropSpecies]:
         """
         Lookup cover crop species based on filters.
@@ -1766,6 +1827,7 @@ class CoverCropSelectionService:
             species = CoverCropSpecies(**species_data)
             self.species_database[species.species_id] = species
         
+        self._build_species_indexes()
         logger.info(f"Loaded {len(self.species_database)} cover crop species")
     
     async def _load_mixture_database(self):
@@ -1892,13 +1954,9 @@ class CoverCropSelectionService:
     
     async def _find_suitable_species(self, request: CoverCropSelectionRequest) -> List[CoverCropSpecies]:
         """Find cover crop species suitable for the given conditions."""
-        suitable_species = []
-        
-        for species in self.species_database.values():
-            if await self._is_species_suitable(species, request):
-                suitable_species.append(species)
-        
-        return suitable_species
+        matrix = self._get_species_matrix()
+        mask = matrix.suitability_mask([request])[0]
+        return [matrix.species[i] for i in np.flatnonzero(mask)]
     
     async def _is_species_suitable(self, species: CoverCropSpecies, request: CoverCropSelectionRequest) -> bool:
         """Check if a species is suitable for the given conditions with enhanced climate and soil matching."""
@@ -1971,10 +2029,17 @@ class CoverCropSelectionService:
     
     async def _score_species_suitability(self, species_list: List[CoverCropSpecies], request: CoverCropSelectionRequest) -> List[Tuple[CoverCropSpecies, float]]:
         """Score species suitability based on objectives and conditions."""
+        matrix = self._get_species_matrix()
+        scores = matrix.species_scores([request])[0] if species_list else None
         scored_species = []
         
         for species in species_list:
-            score = await self._calculate_species_score(species, request)
+            i = matrix.index.get(species.species_id)
+            if i is not None and matrix.species[i] is species:
+                score = float(scores[i])
+            else:
+                # Species outside the loaded database are scored individually
+                score = await self._calculate_species_score(species, request)
             scored_species.append((species, score))
         
         # Sort by score (highest first)
@@ -2172,26 +2237,37 @@ class CoverCropSelectionService:
         
         return None
     
-    async def _generate_mixture_recommendations(self, suitable_species: List[CoverCropSpecies], request: CoverCropSelectionRequest) -> Optional[List[CoverCropMixture]]:
-        """Generate cover crop mixture recommendations."""
-        # For now, return existing mixtures that match conditions
-        # In a full implementation, this would create custom mixtures
-        
+    async def _generate_mixture_recommendations(
+        self,
+        suitable_species: List[CoverCropSpecies],
+        request: CoverCropSelectionRequest,
+        scored_species: Optional[List[Tuple[CoverCropSpecies, float]]] = None
+    ) -> Optional[List[CoverCropMixture]]:
+        """Generate cover crop mixture recommendations.
+
+        Predefined mixtures whose components are all suitable come first,
+        followed by custom mixtures built by the mixture optimizer.
+        """
+        suitable_ids = {species.species_id for species in suitable_species}
         suitable_mixtures = []
+        offered = set()
         
         for mixture in self.mixture_database.values():
-            # Check if mixture components are suitable
-            mixture_suitable = True
-            for component in mixture.species_list:
-                species_id = component.get("species_id")
-                if species_id and species_id in self.species_database:
-                    species = self.species_database[species_id]
-                    if species not in suitable_species:
-                        mixture_suitable = False
-                        break
-            
-            if mixture_suitable:
+            # Components missing from the species database do not disqualify a mixture
+            component_ids = {
+                component.get("species_id") for component in mixture.species_list
+                if component.get("species_id") in self.species_database
+            }
+            if component_ids <= suitable_ids:
                 suitable_mixtures.append(mixture)
+                offered.add(frozenset(component_ids))
+        
+        if scored_species is None:
+            scored_species = await self._score_species_suitability(suitable_species, request)
+        
+        optimizer = self._get_mixture_optimizer()
+        for candidate in optimizer.optimize(scored_species, request, exclude=offered):
+            suitable_mixtures.append(optimizer.to_mixture(candidate))
         
         return suitable_mixtures if suitable_mixtures else None
     
@@ -0,0 +1,241 @@
+"""
+Cover Crop Mixture Optimizer
+
+Builds custom multi-species mixtures from the suitable species for a field.
+Pairwise compatibility (growing season overlap and a shared termination
+method) and benefit coverage are indexed as integer bitsets when the species
+database loads; a beam search over 2-4 species sets then picks seeding-rate
+ratios for each candidate and returns the best mixtures found within a
+latency budget.
+"""
+
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.cover_crop_models import (
+    CoverCropMixture,
+    CoverCropSelectionRequest,
+    CoverCropSpecies,
+    GrowingSeason,
+    SoilBenefit
+)
+
+logger = logging.getLogger(__name__)
+
+# Seasons whose species can share a planting and termination schedule
+COMPATIBLE_SEASONS = {
+    GrowingSeason.WINTER: {GrowingSeason.WINTER, GrowingSeason.FALL, GrowingSeason.YEAR_ROUND},
+    GrowingSeason.FALL: {GrowingSeason.FALL, GrowingSeason.WINTER, GrowingSeason.YEAR_ROUND},
+    GrowingSeason.SPRING: {GrowingSeason.SPRING, GrowingSeason.SUMMER, GrowingSeason.YEAR_ROUND},
+    GrowingSeason.SUMMER: {GrowingSeason.SUMMER, GrowingSeason.SPRING, GrowingSeason.YEAR_ROUND},
+    GrowingSeason.YEAR_ROUND: set(GrowingSeason),
+}
+
+# Candidate seeding-rate shares (fraction of each species' full single-species
+# rate), listed for species ordered from highest to lowest suitability. No
+# share drops below 0.2, under which a component rarely establishes.
+SEEDING_RATIO_TEMPLATES = {
+    2: [(0.5, 0.5), (0.6, 0.4), (0.7, 0.3)],
+    3: [(0.34, 0.33, 0.33), (0.5, 0.3, 0.2), (0.4, 0.4, 0.2)],
+    4: [(0.25, 0.25, 0.25, 0.25), (0.4, 0.2, 0.2, 0.2), (0.3, 0.3, 0.2, 0.2)],
+}
+
+MAX_SPECIES_PER_TYPE = 2
+
+COMPLEXITY_BY_SIZE = {2: "simple", 3: "moderate", 4: "complex"}
+
+_BENEFITS = list(SoilBenefit)
+
+
+def _benefit_bits(benefits: Sequence[SoilBenefit]) -> int:
+    bits = 0
+    for benefit in benefits:
+        if benefit in _BENEFITS:
+            bits |= 1 << _BENEFITS.index(benefit)
+    return bits
+
+
+@dataclass
+class MixtureCandidate:
+    """A scored species combination with its seeding-rate shares."""
+    score: float
+    species: Tuple[CoverCropSpecies, ...]
+    shares: Tuple[float, ...]
+
+
+class MixtureOptimizer:
+    """Beam search over compatible species sets for custom cover crop mixtures."""
+
+    def __init__(
+        self,
+        species: List[CoverCropSpecies],
+        max_species: int = 4,
+        beam_width: int = 12,
+        max_candidates: int = 20,
+        time_budget_ms: float = 50.0
+    ):
+        self.species = list(species)
+        self.index = {s.species_id: i for i, s in enumerate(self.species)}
+        self.max_species = min(max_species, max(SEEDING_RATIO_TEMPLATES))
+        self.beam_width = beam_width
+        self.max_candidates = max_candidates
+        self.time_budget_ms = time_budget_ms
+
+        self.benefits = [_benefit_bits(s.primary_benefits) for s in self.species]
+        self.types = [s.cover_crop_type for s in self.species]
+        self.rates = [
+            s.seeding_rate_lbs_acre.get("drilled", s.seeding_rate_lbs_acre.get("broadcast", 0.0))
+            for s in self.species
+        ]
+        self.costs = [s.establishment_cost_per_acre or 0.0 for s in self.species]
+
+        # compatible[i] has bit j set when species i and j can share a mixture
+        terminations = [set(s.termination_methods) for s in self.species]
+        self.compatible = [0] * len(self.species)
+        for i, a in enumerate(self.species):
+            seasons = COMPATIBLE_SEASONS.get(a.growing_season, {a.growing_season})
+            for j in range(i + 1, len(self.species)):
+                b = self.species[j]
+                if b.growing_season in seasons and terminations[i] & terminations[j]:
+                    self.compatible[i] |= 1 << j
+                    self.compatible[j] |= 1 << i
+
+    def optimize(
+        self,
+        scored_species: Sequence[Tuple[CoverCropSpecies, float]],
+        request: CoverCropSelectionRequest,
+        top_k: int = 3,
+        exclude: Sequence[frozenset] = ()
+    ) -> List[MixtureCandidate]:
+        """
+        Search for the best mixtures among the scored (suitable) species.
+
+        Args:
+            scored_species: Suitable species with single-species scores
+            request: Selection request supplying goals and budget
+            top_k: Number of mixtures to return
+            exclude: Species-id sets to skip, e.g. predefined mixtures already offered
+
+        Returns:
+            Best mixtures, highest score first
+        """
+        deadline = time.monotonic() + self.time_budget_ms / 1000.0
+        ranked = sorted(
+            ((self.index[s.species_id], score) for s, score in scored_species
+             if self.index.get(s.species_id) is not None and self.species[self.index[s.species_id]] is s),
+            key=lambda item: item[1], reverse=True
+        )[:self.max_candidates]
+        if len(ranked) < 2:
+            return []
+
+        candidates = [i for i, _ in ranked]
+        scores = {i: score for i, score in ranked}
+        goals = request.objectives.primary_goals if request.objectives else []
+        goal_bits = _benefit_bits(goals)
+        budget = request.objectives.budget_per_acre if request.objectives else None
+        excluded = set(exclude)
+
+        best: List[Tuple[float, int, MixtureCandidate]] = []
+        counter = 0
+        # Beam entries are (score, positions in candidates); positions only grow so each set is visited once
+        beam: List[Tuple[float, Tuple[int, ...]]] = [(scores[i], (p,)) for p, i in enumerate(candidates)]
+        timed_out = False
+
+        for size in range(2, self.max_species + 1):
+            expansions: List[Tuple[float, Tuple[int, ...]]] = []
+            for _, positions in beam:
+                members = [candidates[p] for p in positions]
+                allowed = ~0
+                for i in members:
+                    allowed &= self.compatible[i]
+                for p in range(positions[-1] + 1, len(candidates)):
+                    j = candidates[p]
+                    if not (allowed >> j) & 1:
+                        continue
+                    combo = members + [j]
+                    if sum(1 for i in combo if self.types[i] == self.types[j]) > MAX_SPECIES_PER_TYPE:
+                        continue
+                    mixture = self._evaluate(combo, scores, goal_bits, budget)
+                    expansions.append((mixture.score, positions + (p,)))
+                    if frozenset(s.species_id for s in mixture.species) not in excluded:
+                        counter += 1
+                        entry = (mixture.score, -counter, mixture)
+                        if len(best) < top_k:
+                            heapq.heappush(best, entry)
+                        elif entry[:2] > best[0][:2]:
+                            heapq.heapreplace(best, entry)
+                if time.monotonic() > deadline:
+                    timed_out = True
+                    break
+            if timed_out or not expansions:
+                break
+            beam = heapq.nlargest(self.beam_width, expansions, key=lambda item: item[0])
+
+        if timed_out:
+            logger.info(f"Mixture search stopped at the {self.time_budget_ms}ms budget")
+        return [mixture for _, _, mixture in sorted(best, key=lambda entry: entry[:2], reverse=True)]
+
+    def _evaluate(
+        self,
+        combo: List[int],
+        scores: Dict[int, float],
+        goal_bits: int,
+        budget: Optional[float]
+    ) -> MixtureCandidate:
+        """Score a species set under each seeding-ratio template and keep the best."""
+        ordered = sorted(combo, key=lambda i: scores[i], reverse=True)
+
+        covered = 0
+        for i in ordered:
+            covered |= self.benefits[i]
+        if goal_bits:
+            coverage = bin(covered & goal_bits).count("1") / bin(goal_bits).count("1")
+        else:
+            coverage = min(1.0, bin(covered).count("1") / 4)
+        diversity = len({self.types[i] for i in ordered}) / len(ordered)
+
+        best_score, best_shares = -1.0, None
+        for shares in SEEDING_RATIO_TEMPLATES[len(ordered)]:
+            weighted = sum(share * scores[i] for share, i in zip(shares, ordered))
+            score = 0.6 * weighted + 0.25 * coverage + 0.15 * diversity
+            if budget:
+                cost = sum(share * self.costs[i] for share, i in zip(shares, ordered))
+                if cost > budget:
+                    score *= 0.85
+            if score > best_score:
+                best_score, best_shares = score, shares
+
+        return MixtureCandidate(
+            score=min(1.0, best_score),
+            species=tuple(self.species[i] for i in ordered),
+            shares=best_shares
+        )
+
+    def to_mixture(self, candidate: MixtureCandidate) -> CoverCropMixture:
+        """Convert a search result into a CoverCropMixture."""
+        species_list = []
+        benefits = []
+        for species, share in zip(candidate.species, candidate.shares):
+            rate = round(self.rates[self.index[species.species_id]] * share, 1)
+            species_list.append({
+                "species_id": species.species_id,
+                "name": species.common_name,
+                "rate_lbs_acre": rate,
+                "seeding_ratio": share
+            })
+            for benefit in species.primary_benefits:
+                label = benefit.value.replace("_", " ").capitalize()
+                if label not in benefits:
+                    benefits.append(label)
+
+        return CoverCropMixture(
+            mixture_id="custom_" + "_".join(s.species_id for s in candidate.species),
+            mixture_name=" + ".join(s.common_name for s in candidate.species),
+            species_list=species_list,
+            total_seeding_rate=round(sum(item["rate_lbs_acre"] for item in species_list), 1),
+            mixture_benefits=benefits,
+            complexity_level=COMPLEXITY_BY_SIZE.get(len(candidate.species), "complex")
+        )
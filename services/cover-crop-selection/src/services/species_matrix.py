@@ -0,0 +1,327 @@
+"""
+Species Suitability Matrix
+
+Column-oriented view of the cover crop species database. Hardiness zones,
+temperature and pH tolerances, drainage masks, salt tolerance and
+planting-month bitmasks are laid out as arrays once when the database loads,
+so suitability and base scores for every species - and for many fields at
+once - are computed with broadcast comparisons instead of per-species calls.
+
+The lookup tables (zone proximity, drainage proximity, seasonal fit, salt
+tolerance, management and benefit bonuses) are filled in by calling the
+scalar helpers of CoverCropSelectionService, so both paths score identically.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models.cover_crop_models import (
+    CoverCropSelectionRequest,
+    CoverCropSpecies,
+    GrowingSeason,
+    SoilBenefit
+)
+
+# Months in which planting is acceptable for each growing season
+SEASON_PLANTING_MONTHS = {
+    GrowingSeason.WINTER: [9, 10, 11, 12, 1, 2],
+    GrowingSeason.SUMMER: [3, 4, 5, 6, 7, 8],
+    GrowingSeason.FALL: [7, 8, 9, 10],
+    GrowingSeason.SPRING: [3, 4, 5, 6],
+}
+ALL_MONTHS_MASK = sum(1 << month for month in range(1, 13))
+
+DRAINAGE_ORDER = [
+    "very_poorly_drained",
+    "poorly_drained",
+    "somewhat_poorly_drained",
+    "moderately_well_drained",
+    "well_drained",
+    "somewhat_excessively_drained",
+    "excessively_drained"
+]
+
+SALINITY_ORDER = ["low", "moderate", "high"]
+_SALINITY_UNKNOWN = len(SALINITY_ORDER)
+
+PH_BUFFER = 0.2
+
+_SEASONS = list(GrowingSeason)
+_BENEFITS = list(SoilBenefit)
+
+
+def _month_mask(months: Sequence[int]) -> int:
+    return sum(1 << month for month in months)
+
+
+def _take_columns(table: np.ndarray, columns: np.ndarray, fill) -> np.ndarray:
+    """Gather table[:, column] for each field as a (fields x species) array; column -1 yields fill."""
+    if table.shape[1] == 0:
+        return np.full((len(columns), table.shape[0]), fill, dtype=table.dtype)
+    gathered = table[:, np.clip(columns, 0, None)].T
+    return np.where(columns[:, None] >= 0, gathered, fill)
+
+
+def _salinity_code(level: Optional[str]) -> int:
+    """-1 when absent, 0-2 for known levels, 3 for an unrecognised level."""
+    if not level:
+        return -1
+    level = level.lower()
+    return SALINITY_ORDER.index(level) if level in SALINITY_ORDER else _SALINITY_UNKNOWN
+
+
+class SpeciesMatrix:
+    """Precomputed species attributes for vectorized suitability scoring."""
+
+    def __init__(self, species: List[CoverCropSpecies], scorer: Any):
+        """
+        Build the matrix.
+
+        Args:
+            species: Species in database order
+            scorer: CoverCropSelectionService whose scalar helpers fill the lookup tables
+        """
+        self.species = list(species)
+        self.index = {s.species_id: i for i, s in enumerate(self.species)}
+        n = len(self.species)
+
+        # Hardiness zones: membership mask plus proximity by leading zone digit
+        self.zone_columns: Dict[str, int] = {}
+        for s in self.species:
+            for zone in s.hardiness_zones:
+                self.zone_columns.setdefault(zone, len(self.zone_columns))
+        self.zone_members = np.zeros((n, len(self.zone_columns)), dtype=bool)
+        self.zone_proximity = np.zeros((n, 10))
+        for i, s in enumerate(self.species):
+            self.zone_members[i, [self.zone_columns[zone] for zone in s.hardiness_zones]] = True
+            for digit in range(10):
+                self.zone_proximity[i, digit] = scorer._calculate_zone_proximity_score(str(digit), s.hardiness_zones)
+
+        self.min_temp_f = np.array([np.nan if s.min_temp_f is None else s.min_temp_f for s in self.species])
+        self.max_temp_f = np.array([np.nan if s.max_temp_f is None else s.max_temp_f for s in self.species])
+        self.has_temp_range = ~(np.isnan(self.min_temp_f) | np.isnan(self.max_temp_f))
+        self.ph_min = np.array([s.ph_range["min"] for s in self.species], dtype=float)
+        self.ph_max = np.array([s.ph_range["max"] for s in self.species], dtype=float)
+
+        # Drainage: exact tolerance mask and proximity score for every known class
+        self.drainage_columns: Dict[str, int] = {name: i for i, name in enumerate(DRAINAGE_ORDER)}
+        for s in self.species:
+            for drainage in s.drainage_tolerance:
+                self.drainage_columns.setdefault(drainage, len(self.drainage_columns))
+        self.drainage_members = np.zeros((n, len(self.drainage_columns)), dtype=bool)
+        self.drainage_scores = np.zeros((n, len(self.drainage_columns)))
+        for i, s in enumerate(self.species):
+            self.drainage_members[i, [self.drainage_columns[d] for d in s.drainage_tolerance]] = True
+            for drainage, column in self.drainage_columns.items():
+                self.drainage_scores[i, column] = (
+                    1.0 if self.drainage_members[i, column]
+                    else scorer._calculate_drainage_compatibility_score(drainage, s.drainage_tolerance)
+                )
+
+        self.salt_codes = np.array([_salinity_code(s.salt_tolerance) for s in self.species], dtype=np.int64)
+        levels = SALINITY_ORDER + ["unknown"]
+        self.salt_table = np.array([
+            [scorer._calculate_salt_tolerance_score(soil, tolerance) for tolerance in levels]
+            for soil in levels
+        ])
+
+        # Planting window: one bit per acceptable month, seasonal fit by month
+        self.season_codes = np.array([_SEASONS.index(s.growing_season) for s in self.species], dtype=np.int64)
+        self.planting_month_bits = np.array([
+            _month_mask(SEASON_PLANTING_MONTHS[s.growing_season])
+            if s.growing_season in SEASON_PLANTING_MONTHS else ALL_MONTHS_MASK
+            for s in self.species
+        ], dtype=np.int64)
+        self.season_table = np.zeros((len(_SEASONS), 13))
+        for code, season in enumerate(_SEASONS):
+            for month in range(1, 13):
+                self.season_table[code, month] = scorer._calculate_seasonal_compatibility_score(month, season)
+
+        # Request-independent parts of the base score
+        self.benefits = np.array(
+            [[benefit in s.primary_benefits for benefit in _BENEFITS] for s in self.species], dtype=bool
+        ).reshape(n, len(_BENEFITS))
+        self.establishment_cost = np.array([
+            s.establishment_cost_per_acre if s.establishment_cost_per_acre else np.nan for s in self.species
+        ])
+        self.management_scores = np.array([scorer._calculate_management_score(s, None) for s in self.species])
+        without_n = SimpleNamespace(objectives=None)
+        with_n = SimpleNamespace(objectives=SimpleNamespace(nitrogen_needs=True))
+        self.bonus_scores = np.array([scorer._calculate_special_benefits_bonus(s, without_n) for s in self.species])
+        self.bonus_scores_nitrogen = np.array(
+            [scorer._calculate_special_benefits_bonus(s, with_n) for s in self.species]
+        )
+
+    def __len__(self) -> int:
+        return len(self.species)
+
+    def _field_features(self, requests: Sequence[CoverCropSelectionRequest]) -> Dict[str, np.ndarray]:
+        """Encode each request as one row of field attributes."""
+        f = len(requests)
+        features = {
+            "zone_column": np.full(f, -1, dtype=np.int64),
+            "zone_digit": np.full(f, -1, dtype=np.int64),
+            "has_zone": np.zeros(f, dtype=bool),
+            "has_climate": np.zeros(f, dtype=bool),
+            "min_temp_f": np.full(f, np.nan),
+            "max_temp_f": np.full(f, np.nan),
+            "ph": np.zeros(f),
+            "drainage_column": np.full(f, -1, dtype=np.int64),
+            "salinity": np.full(f, -1, dtype=np.int64),
+            "window_month": np.zeros(f, dtype=np.int64),
+            "start_month": np.zeros(f, dtype=np.int64),
+            "goal_counts": np.zeros((f, len(_BENEFITS))),
+            "goal_totals": np.zeros(f),
+            "budget": np.full(f, np.nan),
+            "nitrogen_needs": np.zeros(f, dtype=bool),
+        }
+
+        for row, request in enumerate(requests):
+            climate = request.climate_data
+            if climate:
+                features["has_climate"][row] = True
+                if climate.min_temp_f is not None:
+                    features["min_temp_f"][row] = climate.min_temp_f
+                if climate.max_temp_f is not None:
+                    features["max_temp_f"][row] = climate.max_temp_f
+                if climate.hardiness_zone:
+                    zone = climate.hardiness_zone
+                    features["has_zone"][row] = True
+                    features["zone_column"][row] = self.zone_columns.get(zone, -1)
+                    try:
+                        features["zone_digit"][row] = int(zone[0])
+                    except (ValueError, IndexError):
+                        pass
+
+            soil = request.soil_conditions
+            features["ph"][row] = soil.ph
+            features["drainage_column"][row] = self.drainage_columns.get(soil.drainage_class, -1)
+            features["salinity"][row] = _salinity_code(getattr(soil, "salinity_level", None))
+
+            planting_start = request.planting_window.get("start")
+            planting_end = request.planting_window.get("end")
+            if planting_start:
+                features["start_month"][row] = planting_start.month
+                if planting_end:
+                    features["window_month"][row] = planting_start.month
+
+            objectives = request.objectives
+            if objectives and objectives.primary_goals:
+                for goal in objectives.primary_goals:
+                    if goal in _BENEFITS:
+                        features["goal_counts"][row, _BENEFITS.index(goal)] += 1
+                features["goal_totals"][row] = len(objectives.primary_goals)
+            if objectives and objectives.budget_per_acre:
+                features["budget"][row] = objectives.budget_per_acre
+            if objectives and objectives.nitrogen_needs:
+                features["nitrogen_needs"][row] = True
+
+        return features
+
+    def suitability_mask(self, requests: Sequence[CoverCropSelectionRequest]) -> np.ndarray:
+        """Boolean (fields x species) matrix of hard suitability constraints."""
+        return self._suitability(self._field_features(requests))
+
+    def _suitability(self, fx: Dict[str, np.ndarray]) -> np.ndarray:
+        zone_ok = ~fx["has_zone"][:, None] | _take_columns(self.zone_members, fx["zone_column"], False)
+
+        with np.errstate(invalid="ignore"):
+            too_cold = fx["min_temp_f"][:, None] < self.min_temp_f[None, :]
+            too_hot = fx["max_temp_f"][:, None] > self.max_temp_f[None, :]
+        temp_ok = ~(too_cold | too_hot)
+
+        ph = fx["ph"][:, None]
+        ph_ok = (self.ph_min[None, :] - PH_BUFFER <= ph) & (ph <= self.ph_max[None, :] + PH_BUFFER)
+
+        drainage_ok = _take_columns(self.drainage_members, fx["drainage_column"], False)
+
+        salinity = fx["salinity"][:, None]
+        known = (salinity >= 0) & (salinity < _SALINITY_UNKNOWN)
+        species_known = (self.salt_codes >= 0) & (self.salt_codes < _SALINITY_UNKNOWN)
+        salt_ok = ~(known & species_known[None, :] & (salinity > self.salt_codes[None, :]))
+
+        month = fx["window_month"][:, None]
+        month_ok = (month == 0) | (((self.planting_month_bits[None, :] >> month) & 1) == 1)
+
+        return zone_ok & temp_ok & ph_ok & drainage_ok & salt_ok & month_ok
+
+    def climate_soil_scores(self, requests: Sequence[CoverCropSelectionRequest]) -> np.ndarray:
+        """Weighted climate and soil compatibility for every (field, species) pair."""
+        return self._climate_soil(self._field_features(requests))
+
+    def _climate_soil(self, fx: Dict[str, np.ndarray]) -> np.ndarray:
+        shape = (len(fx["ph"]), len(self.species))
+        total = np.zeros(shape)
+        weights = np.zeros(shape)
+
+        # Hardiness zone (25%)
+        member = _take_columns(self.zone_members, fx["zone_column"], False)
+        zone_score = np.where(member, 1.0, _take_columns(self.zone_proximity, fx["zone_digit"], 0.0))
+        has_zone = fx["has_zone"][:, None]
+        total += np.where(has_zone, zone_score * 0.25, 0.0)
+        weights += np.where(has_zone, 0.25, 0.0)
+
+        # Temperature tolerance (20%) with gradual penalties
+        with np.errstate(invalid="ignore"):
+            deficit = self.min_temp_f[None, :] - fx["min_temp_f"][:, None]
+            excess = fx["max_temp_f"][:, None] - self.max_temp_f[None, :]
+        cold_factor = np.where(deficit > 0, np.maximum(0.0, 1.0 - deficit / 20.0), 1.0)
+        hot_factor = np.where(excess > 0, np.maximum(0.0, 1.0 - excess / 15.0), 1.0)
+        has_temp = fx["has_climate"][:, None] & self.has_temp_range[None, :]
+        total += np.where(has_temp, cold_factor * hot_factor * 0.20, 0.0)
+        weights += np.where(has_temp, 0.20, 0.0)
+
+        # Soil pH (20%)
+        ph = fx["ph"][:, None]
+        distance = np.maximum(self.ph_min[None, :] - ph, ph - self.ph_max[None, :])
+        total += np.where(distance <= 0, 1.0, np.maximum(0.0, 1.0 - distance / 1.5)) * 0.20
+        weights += 0.20
+
+        # Drainage (15%)
+        total += _take_columns(self.drainage_scores, fx["drainage_column"], 0.0) * 0.15
+        weights += 0.15
+
+        # Growing season (15%)
+        start_month = fx["start_month"]
+        has_start = start_month[:, None] > 0
+        total += np.where(has_start, self.season_table[self.season_codes[None, :], start_month[:, None]] * 0.15, 0.0)
+        weights += np.where(has_start, 0.15, 0.0)
+
+        # Salt tolerance (5%)
+        salinity = fx["salinity"][:, None]
+        has_salt = (salinity >= 0) & (self.salt_codes[None, :] >= 0)
+        salt_score = self.salt_table[np.clip(salinity, 0, None), np.clip(self.salt_codes, 0, None)[None, :]]
+        total += np.where(has_salt, salt_score * 0.05, 0.0)
+        weights += np.where(has_salt, 0.05, 0.0)
+
+        return total / weights
+
+    def species_scores(self, requests: Sequence[CoverCropSelectionRequest]) -> np.ndarray:
+        """Full suitability score (climate/soil, objectives, economics, management, bonus) per pair."""
+        return self._species_scores(self._field_features(requests))
+
+    def _species_scores(self, fx: Dict[str, np.ndarray]) -> np.ndarray:
+        total = self._climate_soil(fx) * 0.5
+
+        goal_totals = fx["goal_totals"][:, None]
+        matched = fx["goal_counts"] @ self.benefits.T.astype(float)
+        objective = np.where(goal_totals > 0, matched / np.where(goal_totals > 0, goal_totals, 1.0), 0.7)
+        total += objective * 0.3
+
+        with np.errstate(invalid="ignore"):
+            cost_ratio = self.establishment_cost[None, :] / fx["budget"][:, None]
+        economic = np.where(cost_ratio > 1.5, 0.4, np.where(cost_ratio > 1.0, 0.8, 1.0))
+        total += economic * 0.1
+
+        total += self.management_scores[None, :] * 0.05
+        bonus = np.where(fx["nitrogen_needs"][:, None], self.bonus_scores_nitrogen[None, :], self.bonus_scores[None, :])
+        total += bonus * 0.05
+
+        return np.minimum(1.0, total)
+
+    def evaluate(self, requests: Sequence[CoverCropSelectionRequest]):
+        """Return (suitability mask, species scores) for a batch of fields from one encoding pass."""
+        fx = self._field_features(requests)
+        return self._suitability(fx), self._species_scores(fx)
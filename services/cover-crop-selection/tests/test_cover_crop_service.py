@@ -15,6 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from services.cover_crop_selection_service import CoverCropSelectionService
+from services.mixture_optimizer import MixtureOptimizer
 from models.cover_crop_models import (
     CoverCropSelectionRequest,
     SoilConditions,
@@ -314,5 +315,165 @@ class TestCoverCropModels:
         assert not service._species_matches_filters(species, {"species_name": "rye"})
 
 
+class TestSpeciesMatrix:
+    """Test cases for vectorized species suitability and scoring."""
+
+    @staticmethod
+    def _field_requests():
+        requests = []
+        for i, (zone, ph, drainage, month) in enumerate([
+            ("7a", 6.2, "moderately_well_drained", 9),
+            ("5b", 5.4, "well_drained", 4),
+            ("9a", 7.4, "somewhat_poorly_drained", 11),
+            ("3a", 8.2, "poorly_drained", 7),
+            ("x1", 6.5, "unknown_class", 2)
+        ]):
+            requests.append(CoverCropSelectionRequest(
+                request_id=f"matrix_{i}",
+                location={"latitude": 40.0, "longitude": -90.0},
+                soil_conditions=SoilConditions(ph=ph, organic_matter_percent=3.0, drainage_class=drainage),
+                climate_data=ClimateData(hardiness_zone=zone, min_temp_f=10.0 - i * 8, max_temp_f=80.0 + i * 3),
+                objectives=CoverCropObjectives(
+                    primary_goals=[SoilBenefit.NITROGEN_FIXATION, SoilBenefit.ORGANIC_MATTER][:1 + i % 2],
+                    nitrogen_needs=i % 2 == 0,
+                    budget_per_acre=40.0 + i * 15
+                ),
+                planting_window={"start": date(2024, month, 1), "end": date(2024, month, 28)},
+                field_size_acres=20.0
+            ))
+        return requests
+
+    @pytest.mark.asyncio
+    async def test_matrix_matches_per_species_scoring(self, cover_crop_service):
+        """Test the matrix reproduces _is_species_suitable and _calculate_species_score."""
+        requests = self._field_requests()
+        matrix = cover_crop_service._get_species_matrix()
+        suitable, scores = matrix.evaluate(requests)
+
+        for row, request in enumerate(requests):
+            for i, species in enumerate(matrix.species):
+                assert suitable[row, i] == await cover_crop_service._is_species_suitable(species, request)
+                assert scores[row, i] == pytest.approx(
+                    await cover_crop_service._calculate_species_score(species, request)
+                )
+
+    @pytest.mark.asyncio
+    async def test_score_fields_ranks_each_field(self, cover_crop_service, sample_request):
+        """Test the batch entry point matches the single-request path."""
+        sample_request.climate_data = ClimateData(hardiness_zone="7a")
+        expected = await cover_crop_service._score_species_suitability(
+            await cover_crop_service._find_suitable_species(sample_request), sample_request
+        )
+
+        results = await cover_crop_service.score_fields([sample_request] + self._field_requests())
+
+        assert len(results) == 6
+        assert [s.species_id for s, _ in results[0]] == [s.species_id for s, _ in expected]
+        assert [score for _, score in results[0]] == pytest.approx([score for _, score in expected])
+        for ranked in results:
+            scores = [score for _, score in ranked]
+            assert scores == sorted(scores, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_matrix_rebuilds_when_database_changes(self, cover_crop_service, sample_request):
+        """Test replacing the species database is picked up by the matrix."""
+        sample_request.climate_data = ClimateData(hardiness_zone="7a")
+        species = next(iter(cover_crop_service.species_database.values()))
+        cover_crop_service.species_database = {species.species_id: species}
+
+        matrix = cover_crop_service._get_species_matrix()
+        assert len(matrix) == 1
+        assert cover_crop_service._get_species_matrix() is matrix
+        suitable = await cover_crop_service._find_suitable_species(sample_request)
+        assert suitable == ([species] if await cover_crop_service._is_species_suitable(species, sample_request) else [])
+
+
+class TestMixtureOptimizer:
+    """Test cases for custom cover crop mixture search."""
+
+    @staticmethod
+    def _species(species_id, crop_type, benefits, season=GrowingSeason.WINTER, termination=("mowing",)):
+        return CoverCropSpecies(
+            species_id=species_id,
+            common_name=species_id.title(),
+            scientific_name=species_id,
+            cover_crop_type=crop_type,
+            hardiness_zones=["7a"],
+            growing_season=season,
+            ph_range={"min": 5.5, "max": 7.5},
+            drainage_tolerance=["well_drained"],
+            seeding_rate_lbs_acre={"drilled": 20.0},
+            planting_depth_inches=0.5,
+            days_to_establishment=10,
+            biomass_production="moderate",
+            primary_benefits=benefits,
+            termination_methods=list(termination),
+            cash_crop_compatibility=["corn"],
+            establishment_cost_per_acre=40.0
+        )
+
+    def test_search_respects_compatibility_and_goals(self, sample_request):
+        """Test incompatible pairs are never mixed and goal coverage drives the ranking."""
+        species = [
+            self._species("clover", CoverCropType.LEGUME, [SoilBenefit.NITROGEN_FIXATION]),
+            self._species("rye", CoverCropType.GRASS, [SoilBenefit.EROSION_CONTROL]),
+            self._species("radish", CoverCropType.BRASSICA, [SoilBenefit.COMPACTION_RELIEF]),
+            self._species("sorghum", CoverCropType.GRASS, [SoilBenefit.EROSION_CONTROL], season=GrowingSeason.SUMMER),
+            self._species("vetch", CoverCropType.LEGUME, [SoilBenefit.NITROGEN_FIXATION], termination=("roller_crimper",))
+        ]
+        optimizer = MixtureOptimizer(species)
+        scored = [(s, 0.8) for s in species]
+
+        results = optimizer.optimize(scored, sample_request, top_k=5)
+
+        assert results
+        for candidate in results:
+            ids = {s.species_id for s in candidate.species}
+            assert not {"sorghum", "clover"} <= ids
+            assert "vetch" not in ids or len(ids) == 1
+            assert sum(candidate.shares) == pytest.approx(1.0, abs=0.01)
+        assert {s.species_id for s in results[0].species} >= {"clover", "rye"}
+        assert [c.score for c in results] == sorted((c.score for c in results), reverse=True)
+
+        excluded = frozenset(s.species_id for s in results[0].species)
+        assert excluded not in {
+            frozenset(s.species_id for s in c.species)
+            for c in optimizer.optimize(scored, sample_request, top_k=5, exclude=[excluded])
+        }
+
+    def test_to_mixture_scales_seeding_rates(self, sample_request):
+        """Test component rates are the single-species rate times the chosen share."""
+        species = [
+            self._species("clover", CoverCropType.LEGUME, [SoilBenefit.NITROGEN_FIXATION]),
+            self._species("rye", CoverCropType.GRASS, [SoilBenefit.EROSION_CONTROL])
+        ]
+        optimizer = MixtureOptimizer(species)
+        candidate = optimizer.optimize([(species[0], 0.9), (species[1], 0.6)], sample_request)[0]
+
+        mixture = optimizer.to_mixture(candidate)
+
+        assert mixture.mixture_id == "custom_clover_rye"
+        assert [c["rate_lbs_acre"] for c in mixture.species_list] == pytest.approx([20.0 * share for share in candidate.shares])
+        assert mixture.total_seeding_rate == pytest.approx(20.0)
+        assert mixture.complexity_level == "simple"
+
+    @pytest.mark.asyncio
+    async def test_recommendations_include_custom_mixtures(self, cover_crop_service, sample_request):
+        """Test predefined mixtures are kept and custom mixtures are appended without duplicates."""
+        sample_request.climate_data = ClimateData(hardiness_zone="7a")
+        suitable = await cover_crop_service._find_suitable_species(sample_request)
+
+        mixtures = await cover_crop_service._generate_mixture_recommendations(suitable, sample_request)
+
+        suitable_ids = {s.species_id for s in suitable}
+        species_sets = [frozenset(c["species_id"] for c in m.species_list) for m in mixtures]
+        assert any(m.mixture_id.startswith("custom_") for m in mixtures)
+        assert len(species_sets) == len(set(species_sets))
+        for mixture in mixtures:
+            if mixture.mixture_id.startswith("custom_"):
+                assert {c["species_id"] for c in mixture.species_list} <= suitable_ids
+                assert 2 <= len(mixture.species_list) <= 4
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
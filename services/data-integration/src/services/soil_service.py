@@ -6,11 +6,11 @@ to provide comprehensive soil information for agricultural decision making.
 """
 
 import asyncio
-import aiohttp
 import httpx
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import os
+import sys
 from dataclasses import dataclass
 import structlog
 import json
@@ -18,6 +18,10 @@ from urllib.parse import urlencode
 
 logger = structlog.get_logger(__name__)
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../shared/utils'))
+
+from http_session import SharedSessionMixin, UpstreamPolicy
+
 
 @dataclass
 class SoilCharacteristics:
@@ -64,22 +68,20 @@ class SoilDataError(Exception):
     pass
 
 
-class USDAWebSoilSurveyService:
+class USDAWebSoilSurveyService(SharedSessionMixin):
     """USDA Web Soil Survey API integration."""
     
     BASE_URL = "https://sdmdataaccess.sc.egov.usda.gov"
+
+    http_upstream = "usda-sdm"
+    http_headers = {"User-Agent": "AFAS/1.0 (Agricultural Advisory System)"}
+    http_policy = UpstreamPolicy(timeout=30.0)
+    # SDM Tabular queries are read-only POSTs, so they are safe to retry
+    http_idempotent = True
     
     def __init__(self):
         self.session = None
     
-    async def _get_session(self):
-        """Get or create aiohttp session."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession(
-                headers={"User-Agent": "AFAS/1.0 (Agricultural Advisory System)"}
-            )
-        return self.session
-    
     async def get_soil_data_by_coordinates(self, latitude: float, longitude: float) -> SoilCharacteristics:
         """Get soil data from USDA Web Soil Survey by coordinates."""
         try:
@@ -295,11 +297,6 @@ class USDAWebSoilSurveyService:
         }
         
         return texture_permeability.get(texture.lower(), "moderate")
-    
-    async def close(self):
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
 
 
 class SoilGridsService:
@@ -37,18 +37,22 @@ Key Features:
 """
 
 import asyncio
-import aiohttp
 import httpx
 import math
 import random
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import os
+import sys
 from dataclasses import dataclass
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../shared/utils'))
+
+from http_session import SharedSessionMixin, UpstreamPolicy
+
 
 @dataclass
 class WeatherData:
@@ -121,22 +125,19 @@ class WeatherAPIError(Exception):
     pass
 
 
-class NOAAWeatherService:
+class NOAAWeatherService(SharedSessionMixin):
     """NOAA National Weather Service API integration."""
     
     BASE_URL = "https://api.weather.gov"
+
+    http_upstream = "noaa"
+    http_headers = {"User-Agent": "AFAS/1.0 (Agricultural Advisory System)"}
+    # Read-only GETs: hedge slow requests against the observed p95 latency
+    http_policy = UpstreamPolicy(timeout=15.0, hedge=True)
     
     def __init__(self):
         self.session = None
     
-    async def _get_session(self):
-        """Get or create aiohttp session."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession(
-                headers={"User-Agent": "AFAS/1.0 (Agricultural Advisory System)"}
-            )
-        return self.session
-    
     async def get_grid_point(self, latitude: float, longitude: float) -> Dict[str, Any]:
         """Get NOAA grid point for coordinates."""
         session = await self._get_session()
@@ -302,11 +303,6 @@ class NOAAWeatherService:
             conditions="Clear" if precipitation == 0 else "Rain"
         )
 
-    async def close(self):
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
-
 
 class OpenWeatherMapService:
     """OpenWeatherMap API integration as fallback service."""
@@ -144,6 +144,63 @@ async def analyze_application_costs(
         raise HTTPException(status_code=500, detail=f"Cost analysis failed: {str(e)}")
 
 
+@router.post("/cost-sensitivity")
+async def analyze_cost_sensitivity(
+    request: ApplicationRequest,
+    swing: float = Query(0.2, gt=0.0, lt=1.0, description="Relative change for tornado ranges"),
+    grid_points: int = Query(50, ge=2, le=500, description="Grid points per parameter axis"),
+    grid_min: float = Query(0.5, gt=0.0, description="Lowest parameter multiplier on the grid"),
+    grid_max: float = Query(1.5, gt=0.0, description="Highest parameter multiplier on the grid"),
+    surface_x: Optional[str] = Query(None, description="First parameter of a two-way cost surface"),
+    surface_y: Optional[str] = Query(None, description="Second parameter of a two-way cost surface"),
+    cost_service: CostAnalysisService = Depends(get_cost_service)
+):
+    """
+    Sensitivity of application cost per acre to prices, rates and field size.
+    
+    Parameters are multipliers on the analyzed inputs (1.0 = as analyzed):
+    fertilizer_price, application_rate, equipment_rate, labor_rate,
+    fuel_price and field_size.
+    
+    **Sensitivity Analysis includes:**
+    - Tornado ranges for each parameter
+    - Cost elasticities per method and parameter
+    - Break-even multipliers where method costs cross
+    - Optional two-way cost surface over the parameter grid
+    """
+    if grid_min >= grid_max:
+        raise HTTPException(status_code=400, detail="grid_min must be less than grid_max")
+    if (surface_x is None) != (surface_y is None):
+        raise HTTPException(status_code=400, detail="surface_x and surface_y must be given together")
+    
+    try:
+        logger.info(f"Processing cost sensitivity request")
+        
+        application_service = await get_application_service()
+        method_response = await application_service.select_application_methods(request)
+        
+        sensitivity = await cost_service.analyze_cost_sensitivity(
+            method_response.recommended_methods,
+            request.field_conditions,
+            request.crop_requirements,
+            request.fertilizer_specification,
+            request.available_equipment,
+            swing=swing,
+            grid_points=grid_points,
+            grid_range=(grid_min, grid_max),
+            surface_parameters=(surface_x, surface_y) if surface_x else None
+        )
+        
+        logger.info(f"Cost sensitivity analysis completed successfully")
+        return sensitivity
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in cost sensitivity analysis: {e}")
+        raise HTTPException(status_code=500, detail=f"Cost sensitivity analysis failed: {str(e)}")
+
+
 @router.get("/methods", response_model=List[Dict[str, Any]])
 async def get_available_methods():
     """
@@ -630,6 +687,7 @@ async def health_check():
         "endpoints": [
             "select-methods",
             "analyze-costs",
+            "cost-sensitivity",
             "optimize-goals",
             "methods",
             "validate-request",
@@ -262,6 +262,40 @@ async def get_sensor_data(
         raise HTTPException(status_code=500, detail=f"Failed to get sensor data: {str(e)}")
 
 
+@router.get("/sensors/{sensor_id}/rollups")
+async def get_sensor_rollups(
+    sensor_id: str,
+    minutes: int = Query(240, ge=1, le=10080, description="Data period in minutes"),
+    bucket_seconds: int = Query(60, ge=1, le=86400, description="Bucket width in seconds"),
+    service: IoTSensorService = Depends(get_iot_service)
+):
+    """
+    Get downsampled sensor data for long time periods.
+
+    Returns one bucket per interval with, for each reading:
+    - Mean, minimum and maximum
+    - Number of readings summarized
+    """
+    try:
+        rollups = await service.get_sensor_rollups(sensor_id, minutes, bucket_seconds)
+
+        if rollups is None:
+            raise HTTPException(status_code=404, detail="Sensor not found")
+
+        return {
+            "sensor_id": sensor_id,
+            "time_period_minutes": minutes,
+            "bucket_seconds": bucket_seconds,
+            **rollups
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting sensor rollups for {sensor_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get sensor rollups: {str(e)}")
+
+
 @router.get("/sensors/{sensor_id}/latest")
 async def get_latest_sensor_data(
     sensor_id: str,
@@ -0,0 +1,222 @@
+"""
+Compiled adjustment rules for real-time application monitoring.
+
+Rules are compiled once when registered: each is reduced to the signal it
+watches (rate deviation, pressure deviation, or a raw metric), a firing
+direction, a threshold and a closure for any extra field conditions such as
+``{"temperature": ">50"}``. Rules are grouped by metric into threshold
+arrays, so each reading computes every signal once and compares a whole
+group in one vectorized step. Per-session cooldown and hysteresis state
+lives in flat arrays indexed by rule.
+
+Optional rule condition keys:
+    cooldown_seconds: Minimum time between firings of the rule in a session
+    hysteresis: Distance the signal must recover past the threshold before
+        the rule can fire again
+"""
+
+import logging
+import operator
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.models.application_monitoring_models import ApplicationMonitoringData, MonitoringMetric
+
+logger = logging.getLogger(__name__)
+
+EXPECTED_PRESSURE_PSI = 30.0
+
+# Signal per metric and whether the rule fires above (">") or below ("<") its threshold
+_SIGNALS: Dict[MonitoringMetric, Callable[[ApplicationMonitoringData], float]] = {
+    MonitoringMetric.APPLICATION_RATE: lambda d: abs(d.rate_deviation) / 100,
+    MonitoringMetric.PRESSURE: lambda d: abs(d.pressure - EXPECTED_PRESSURE_PSI) / EXPECTED_PRESSURE_PSI,
+    MonitoringMetric.COVERAGE_UNIFORMITY: lambda d: d.coverage_uniformity,
+    MonitoringMetric.SPEED: lambda d: d.speed,
+    MonitoringMetric.TEMPERATURE: lambda d: d.temperature,
+    MonitoringMetric.HUMIDITY: lambda d: d.humidity,
+    MonitoringMetric.WIND_SPEED: lambda d: d.wind_speed,
+    MonitoringMetric.WIND_DIRECTION: lambda d: d.wind_direction,
+    MonitoringMetric.SOIL_MOISTURE: lambda d: d.soil_moisture,
+}
+_FIRES_BELOW = {MonitoringMetric.COVERAGE_UNIFORMITY}
+
+_COMPARISONS = {
+    ">=": operator.ge, "<=": operator.le, "==": operator.eq, "!=": operator.ne,
+    ">": operator.gt, "<": operator.lt
+}
+_CONDITION_PATTERN = re.compile(r"^\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$")
+# Condition keys that are not field comparisons; min_samples is accepted but, as before, not enforced
+_STATE_KEYS = {"min_samples", "cooldown_seconds", "hysteresis"}
+
+
+@dataclass
+class CompiledRule:
+    """A rule reduced to a threshold test plus an optional field-condition closure."""
+    index: int
+    rule: object  # AdjustmentRule; kept untyped to avoid a circular import
+    fires_below: bool
+    threshold: float
+    cooldown_seconds: float = 0.0
+    hysteresis: float = 0.0
+    extra: Optional[Callable[[ApplicationMonitoringData], bool]] = None
+
+    def breached(self, signal: float) -> bool:
+        return signal < self.threshold if self.fires_below else signal > self.threshold
+
+
+@dataclass
+class _MetricGroup:
+    signal: Callable[[ApplicationMonitoringData], float]
+    fires_below: bool
+    rule_ids: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp))
+    thresholds: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    hysteresis: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    cooldowns: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+
+@dataclass
+class _SessionRuleState:
+    armed: np.ndarray
+    last_fired: np.ndarray
+
+    @classmethod
+    def create(cls, size: int) -> "_SessionRuleState":
+        return cls(armed=np.ones(size, dtype=bool), last_fired=np.full(size, -np.inf))
+
+    def resize(self, size: int):
+        grow = size - len(self.armed)
+        if grow > 0:
+            self.armed = np.concatenate([self.armed, np.ones(grow, dtype=bool)])
+            self.last_fired = np.concatenate([self.last_fired, np.full(grow, -np.inf)])
+
+
+def _compile_conditions(conditions: Dict[str, object]) -> Optional[Callable[[ApplicationMonitoringData], bool]]:
+    """Turn {"temperature": ">50", ...} into a single predicate over a data point."""
+    checks = []
+    for name, expression in conditions.items():
+        if name in _STATE_KEYS:
+            continue
+        match = _CONDITION_PATTERN.match(str(expression))
+        if name not in ApplicationMonitoringData.model_fields or not match:
+            logger.warning(f"Ignoring unsupported rule condition {name}={expression!r}")
+            continue
+        checks.append((operator.attrgetter(name), _COMPARISONS[match.group(1)], float(match.group(2))))
+    if not checks:
+        return None
+
+    def predicate(data: ApplicationMonitoringData) -> bool:
+        for getter, compare, value in checks:
+            current = getter(data)
+            if current is None or not compare(current, value):
+                return False
+        return True
+
+    return predicate
+
+
+class AdjustmentRuleEngine:
+    """Evaluates compiled adjustment rules against monitoring data."""
+
+    def __init__(self, rules: Sequence[object] = ()):
+        self.rules: List[CompiledRule] = []
+        self.registered: List[object] = []
+        self._by_rule: Dict[int, CompiledRule] = {}
+        self._groups: Dict[MonitoringMetric, _MetricGroup] = {}
+        self._sessions: Dict[str, _SessionRuleState] = {}
+        for rule in rules:
+            self.add_rule(rule)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add_rule(self, rule) -> Optional[CompiledRule]:
+        """Compile a rule and index it by metric; rules on non-numeric metrics never fire."""
+        self.registered.append(rule)
+        signal = _SIGNALS.get(rule.metric)
+        if signal is None:
+            logger.warning(f"Adjustment rule on {rule.metric} has no numeric signal and will not fire")
+            return None
+
+        conditions = rule.conditions or {}
+        compiled = CompiledRule(
+            index=len(self.rules),
+            rule=rule,
+            fires_below=rule.metric in _FIRES_BELOW,
+            threshold=float(rule.threshold),
+            cooldown_seconds=float(conditions.get("cooldown_seconds", 0.0)),
+            hysteresis=float(conditions.get("hysteresis", 0.0)),
+            extra=_compile_conditions(conditions)
+        )
+        self.rules.append(compiled)
+        self._by_rule[id(rule)] = compiled
+
+        group = self._groups.get(rule.metric)
+        if group is None:
+            group = self._groups[rule.metric] = _MetricGroup(signal=signal, fires_below=compiled.fires_below)
+        group.rule_ids = np.append(group.rule_ids, compiled.index)
+        group.thresholds = np.append(group.thresholds, compiled.threshold)
+        group.hysteresis = np.append(group.hysteresis, compiled.hysteresis)
+        group.cooldowns = np.append(group.cooldowns, compiled.cooldown_seconds)
+
+        for state in self._sessions.values():
+            state.resize(len(self.rules))
+        return compiled
+
+    def reset_session(self, session_id: str):
+        """Forget cooldown and hysteresis state for a session."""
+        self._sessions.pop(session_id, None)
+
+    def matches(self, rule, data: ApplicationMonitoringData) -> bool:
+        """Stateless check of one rule: threshold and field conditions, ignoring cooldown and hysteresis."""
+        compiled = self._by_rule.get(id(rule))
+        if compiled is None:
+            return False
+        signal = _SIGNALS[rule.metric](data)
+        if signal is None or not compiled.breached(signal):
+            return False
+        return compiled.extra is None or compiled.extra(data)
+
+    def evaluate(self, session_id: str, data: ApplicationMonitoringData, now: Optional[float] = None) -> List[object]:
+        """
+        Rules that fire for a data point in a session, in registration order.
+
+        Firing starts the rule's cooldown and, when it has hysteresis, disarms
+        it until the signal recovers past the threshold by that margin.
+        """
+        if now is None:
+            now = time.monotonic()
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionRuleState.create(len(self.rules))
+
+        fired: List[int] = []
+        for group in self._groups.values():
+            signal = group.signal(data)
+            if signal is None:
+                continue
+            ids = group.rule_ids
+            if group.fires_below:
+                breach = signal < group.thresholds
+                recovered = signal >= group.thresholds + group.hysteresis
+            else:
+                breach = signal > group.thresholds
+                recovered = signal <= group.thresholds - group.hysteresis
+            armed = state.armed[ids] | recovered
+            state.armed[ids] = armed
+
+            ready = breach & armed & (now - state.last_fired[ids] >= group.cooldowns)
+            for index in ids[ready]:
+                compiled = self.rules[index]
+                if compiled.extra is not None and not compiled.extra(data):
+                    continue
+                fired.append(int(index))
+
+        if fired:
+            fired.sort()
+            state.last_fired[fired] = now
+            state.armed[fired] = [self.rules[i].hysteresis <= 0 for i in fired]
+        return [self.rules[i].rule for i in fired]
@@ -0,0 +1,262 @@
+"""
+Cached score tensor for batch equipment compatibility assessment.
+
+Compatibility factors split into those fixed by the equipment catalog and
+those that depend on the field. Fertilizer compatibility (equipment x
+fertilizer), labor requirements and availability are scored once when the
+tensor is built; the catalog values the field factors need (size ranges,
+coverage rates, wind thresholds, typical cost) are stored as per-equipment
+arrays. Scoring a batch of fields then evaluates the field factors as
+(fields x equipment) arrays and combines everything with one weighted sum,
+giving overall scores of shape (fields, equipment, fertilizers).
+
+Scoring rules mirror the per-combination evaluators in EquipmentCompatibilityService.
+The service does not build a tensor yet: it imports catalog models (Equipment,
+CompatibilityFactor and others) that equipment_models does not define.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.models.equipment_models import EquipmentCategory
+
+logger = logging.getLogger(__name__)
+
+FACTORS = (
+    "fertilizer_type_compatibility",
+    "field_size_suitability",
+    "soil_type_compatibility",
+    "application_rate_capability",
+    "weather_resilience",
+    "cost_effectiveness",
+    "labor_requirements",
+    "equipment_availability",
+)
+
+SOIL_TYPE_SCORES = {
+    "clay": 0.85,
+    "loam": 1.0,
+    "sandy": 0.90,
+    "silt": 0.95,
+    "organic": 0.80
+}
+DEFAULT_SOIL_TYPE_SCORE = 0.75
+
+AUTOMATION_SCORES = {"automatic": 1.0, "semi-automatic": 0.85}
+AVAILABILITY_SCORES = {"operational": 1.0, "maintenance_required": 0.7, "out_of_service": 0.2}
+
+# (high wind, moderate wind, high wind score, moderate wind score, calm score) per category
+WEATHER_WIND_BANDS = {
+    EquipmentCategory.SPRAYING: (15.0, 10.0, 0.3, 0.6, 0.9),
+    EquipmentCategory.SPREADING: (20.0, 12.0, 0.4, 0.7, 0.95),
+}
+WEATHER_INSENSITIVE_BAND = (np.inf, np.inf, 0.95, 0.95, 0.95)
+
+DEFAULT_WIND_SPEED_MPH = 5.0
+
+
+@dataclass
+class FieldBatch:
+    """Field conditions for a batch of fields as aligned arrays."""
+    field_size_acres: np.ndarray
+    soil_scores: np.ndarray
+    wind_speed_mph: np.ndarray
+    cost_constraints: np.ndarray  # NaN where the field has no budget
+
+    @classmethod
+    def from_fields(cls, fields: Sequence[Dict[str, Any]]) -> "FieldBatch":
+        """
+        Build from field dicts with size_acres, soil_type, weather_conditions and cost_constraints.
+        """
+        sizes, soils, winds, budgets = [], [], [], []
+        for field_spec in fields:
+            sizes.append(float(field_spec.get("size_acres", field_spec.get("field_size_acres", 0.0))))
+            soil_type = str(field_spec.get("soil_type", "")).lower()
+            soils.append(SOIL_TYPE_SCORES.get(soil_type, DEFAULT_SOIL_TYPE_SCORE))
+            weather = field_spec.get("weather_conditions") or {}
+            winds.append(float(weather.get("wind_speed_mph", DEFAULT_WIND_SPEED_MPH)))
+            # A zero budget counts as no budget, as in the per-combination evaluator
+            budget = field_spec.get("cost_constraints")
+            budgets.append(float(budget) if budget else np.nan)
+        return cls(
+            field_size_acres=np.asarray(sizes, dtype=float),
+            soil_scores=np.asarray(soils, dtype=float),
+            wind_speed_mph=np.asarray(winds, dtype=float),
+            cost_constraints=np.asarray(budgets, dtype=float)
+        )
+
+    def __len__(self) -> int:
+        return len(self.field_size_acres)
+
+
+@dataclass
+class BatchScores:
+    """Factor and overall scores for a field batch."""
+    equipment_ids: List[str]
+    fertilizer_types: List[Any]
+    factor_scores: Dict[str, np.ndarray]  # (fields, equipment) or (fields, equipment, fertilizers)
+    overall: np.ndarray                   # (fields, equipment, fertilizers)
+
+
+class CompatibilityTensor:
+    """Field-independent compatibility scores and catalog parameters for a set of equipment."""
+
+    def __init__(
+        self,
+        equipment: Sequence[Any],
+        fertilizer_types: Sequence[Any],
+        db,
+        equipment_type_of: Callable[[Any], str]
+    ):
+        """
+        Args:
+            equipment: Equipment to score
+            fertilizer_types: Fertilizer formulations to score
+            db: EquipmentCompatibilityDatabase providing catalog, compatibility and cost data
+            equipment_type_of: Maps an equipment object to its catalog equipment type
+        """
+        self.equipment_ids = [item.equipment_id for item in equipment]
+        self.categories = [item.category for item in equipment]
+        self.fertilizer_types = list(fertilizer_types)
+        size = len(equipment)
+
+        self.fertilizer_scores = np.array([
+            [db.get_compatibility(fertilizer_type, item.category).get("score", 0.0)
+             for fertilizer_type in self.fertilizer_types]
+            for item in equipment
+        ], dtype=float).reshape(size, len(self.fertilizer_types))
+
+        self.labor_scores = np.empty(size)
+        self.availability_scores = np.empty(size)
+        self.has_specs = np.zeros(size, dtype=bool)
+        self.has_capacity = np.zeros(size, dtype=bool)
+        self.size_min = np.zeros(size)
+        self.size_max = np.zeros(size)
+        self.size_optimal = np.ones(size)
+        self.max_coverage_rate = np.ones(size)
+        self.has_cost = np.zeros(size, dtype=bool)
+        self.typical_cost_per_acre = np.zeros(size)
+        bands = []
+
+        for i, item in enumerate(equipment):
+            equipment_type = equipment_type_of(item)
+            specs = db.get_equipment_specs(equipment_type)
+            cost_data = db.get_cost_data(equipment_type)
+
+            self.has_specs[i] = bool(specs)
+            self.has_capacity[i] = bool(item.capacity)
+            if specs:
+                suitability = specs.get("field_size_suitability", {})
+                self.size_min[i] = suitability.get("min", 0)
+                self.size_max[i] = suitability.get("max", 10000)
+                self.size_optimal[i] = suitability.get("optimal", 100)
+                self.max_coverage_rate[i] = specs.get("coverage_rate", {}).get("max", 10)
+                self.labor_scores[i] = AUTOMATION_SCORES.get(specs.get("automation_level", "manual"), 0.70)
+            else:
+                self.labor_scores[i] = 0.75
+            self.has_cost[i] = bool(cost_data)
+            if cost_data:
+                self.typical_cost_per_acre[i] = cost_data.get("cost_per_acre", {}).get("typical", 2.0)
+
+            self.availability_scores[i] = AVAILABILITY_SCORES.get(item.status.value, 0.5)
+            bands.append(WEATHER_WIND_BANDS.get(item.category, WEATHER_INSENSITIVE_BAND))
+
+        self.wind_bands = np.array(bands, dtype=float).reshape(size, 5)
+
+    def __len__(self) -> int:
+        return len(self.equipment_ids)
+
+    def subset(
+        self,
+        fertilizer_types: Optional[Sequence[Any]] = None,
+        categories: Optional[Sequence[Any]] = None
+    ) -> "CompatibilityTensor":
+        """Copy restricted to some fertilizer types and equipment categories."""
+        rows = [i for i, category in enumerate(self.categories) if not categories or category in categories]
+        if fertilizer_types:
+            cols = [self.fertilizer_types.index(fertilizer_type) for fertilizer_type in fertilizer_types]
+        else:
+            cols = list(range(len(self.fertilizer_types)))
+
+        view = object.__new__(CompatibilityTensor)
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                value = value[rows]
+            elif isinstance(value, list) and name != "fertilizer_types":
+                value = [value[i] for i in rows]
+            setattr(view, name, value)
+        view.fertilizer_types = [self.fertilizer_types[j] for j in cols]
+        view.fertilizer_scores = self.fertilizer_scores[np.ix_(rows, cols)]
+        return view
+
+    def field_factor_scores(self, fields: FieldBatch) -> Dict[str, np.ndarray]:
+        """Field-dependent factor scores, each of shape (fields, equipment)."""
+        acres = fields.field_size_acres[:, None]
+
+        deviation = np.abs(acres - self.size_optimal) / self.size_optimal
+        field_size = np.where(
+            (acres >= self.size_min) & (acres <= self.size_max),
+            np.maximum(0.6, 1.0 - deviation * 0.4),
+            np.where(acres < self.size_min, 0.3, 0.4)
+        )
+        field_size = np.where(self.has_specs, field_size, 0.5)
+
+        hours = acres / self.max_coverage_rate
+        rate = np.select([hours <= 4, hours <= 8, hours <= 16], [1.0, 0.85, 0.70], 0.50)
+        rate = np.where(self.has_specs, rate, 0.75)
+        rate = np.where(self.has_capacity, rate, 0.5)
+
+        wind = fields.wind_speed_mph[:, None]
+        high, moderate, high_score, moderate_score, calm_score = self.wind_bands.T
+        weather = np.where(wind > high, high_score, np.where(wind > moderate, moderate_score, calm_score))
+
+        budget = fields.cost_constraints[:, None]
+        total_cost = self.typical_cost_per_acre * acres
+        with np.errstate(invalid="ignore"):
+            budgeted = np.where(total_cost <= budget * 0.7, 1.0, np.where(total_cost <= budget, 0.8, 0.4))
+        unbudgeted = np.select(
+            [self.typical_cost_per_acre <= 1.5, self.typical_cost_per_acre <= 3.0], [1.0, 0.8], 0.6
+        )
+        cost = np.where(np.isnan(budget), unbudgeted, budgeted)
+        cost = np.where(self.has_cost, cost, 0.5)
+
+        soil = np.broadcast_to(fields.soil_scores[:, None], field_size.shape)
+
+        return {
+            "field_size_suitability": field_size,
+            "soil_type_compatibility": soil,
+            "application_rate_capability": rate,
+            "weather_resilience": weather,
+            "cost_effectiveness": cost
+        }
+
+    def score(self, fields: FieldBatch, weights: Dict[str, float]) -> BatchScores:
+        """Combine cached and field-dependent factors into overall scores per field, equipment and fertilizer."""
+        count = len(fields)
+        factor_scores = self.field_factor_scores(fields)
+        factor_scores["labor_requirements"] = np.broadcast_to(self.labor_scores, (count, len(self)))
+        factor_scores["equipment_availability"] = np.broadcast_to(self.availability_scores, (count, len(self)))
+        factor_scores["fertilizer_type_compatibility"] = np.broadcast_to(
+            self.fertilizer_scores, (count,) + self.fertilizer_scores.shape
+        )
+
+        total_weight = sum(weights.get(name, 0.0) for name in FACTORS)
+        equipment_total = sum(
+            weights.get(name, 0.0) * factor_scores[name]
+            for name in FACTORS if name != "fertilizer_type_compatibility"
+        )
+        weighted = (
+            equipment_total[:, :, None]
+            + weights.get("fertilizer_type_compatibility", 0.0) * factor_scores["fertilizer_type_compatibility"]
+        )
+        overall = weighted / total_weight if total_weight > 0 else np.zeros_like(weighted)
+
+        return BatchScores(
+            equipment_ids=self.equipment_ids,
+            fertilizer_types=self.fertilizer_types,
+            factor_scores=factor_scores,
+            overall=overall
+        )
@@ -6,6 +6,7 @@ import asyncio
 import logging
 import time
 import statistics
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from uuid import uuid4
 from decimal import Decimal
@@ -14,6 +15,7 @@ from enum import Enum
 
 from src.models.application_models import ApplicationMethod, FieldConditions, CropRequirements, FertilizerSpecification, ApplicationRequest
 from src.models.application_models import EquipmentSpecification
+from src.services.cost_sensitivity_model import CostSensitivityModel, PARAMETERS as SENSITIVITY_PARAMETERS
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +45,39 @@ class EconomicScenario(str, Enum):
     CRISIS = "crisis"
 
 
+class CostView:
+    """
+    Read-only prices from the cost database, optionally scaled by scenario multipliers.
+
+    Views share the underlying database instead of copying it, so any number
+    of scenarios can be priced at once without affecting each other or the
+    base rates.
+    """
+    
+    def __init__(self, cost_database: Dict[str, Any], multipliers: Optional[Dict[str, float]] = None):
+        self._db = cost_database
+        self.multipliers = dict(multipliers or {})
+        self._labor = self.multipliers.get("labor_multiplier", 1.0)
+        self._fuel = self.multipliers.get("fuel_multiplier", 1.0)
+        self._fertilizer = self.multipliers.get("fertilizer_multiplier", 1.0)
+        self._equipment = self.multipliers.get("equipment_multiplier", 1.0)
+    
+    def labor_rate(self, skill_level: str) -> float:
+        return self._db["labor_rates"][skill_level] * self._labor
+    
+    def fuel_cost(self, fuel_type: str) -> float:
+        return self._db["fuel_costs"][fuel_type] * self._fuel
+    
+    def fertilizer_cost(self, fertilizer_type: str, default: float) -> float:
+        # Defaults stand in for missing entries and are not scenario-scaled
+        base = self._db["fertilizer_costs"].get(fertilizer_type)
+        return default if base is None else base * self._fertilizer
+    
+    def equipment_cost(self, equipment_type: str, cost_type: str, default: float) -> float:
+        base = self._db["equipment_costs"].get(equipment_type, {}).get(cost_type)
+        return default if base is None else base * self._equipment
+
+
 class CostAnalysisService:
     """Service for comprehensive cost analysis and optimization."""
     
@@ -187,7 +222,8 @@ class CostAnalysisService:
         field_conditions: FieldConditions,
         crop_requirements: CropRequirements,
         fertilizer_specification: FertilizerSpecification,
-        available_equipment: List[EquipmentSpecification]
+        available_equipment: List[EquipmentSpecification],
+        costs: Optional[CostView] = None
     ) -> Dict[str, Any]:
         """
         Analyze costs for different application methods.
@@ -198,6 +234,7 @@ class CostAnalysisService:
             crop_requirements: Crop requirements affecting fertilizer needs
             fertilizer_specification: Fertilizer specification for cost calculation
             available_equipment: Available equipment for cost estimation
+            costs: Prices to use; defaults to the unscaled cost database
             
         Returns:
             Comprehensive cost analysis results
@@ -212,7 +249,7 @@ class CostAnalysisService:
             for method in application_methods:
                 cost_analysis = await self._calculate_method_costs(
                     method, field_conditions, crop_requirements, 
-                    fertilizer_specification, available_equipment
+                    fertilizer_specification, available_equipment, costs
                 )
                 method_costs.append(cost_analysis)
             
@@ -259,28 +296,29 @@ class CostAnalysisService:
         field_conditions: FieldConditions,
         crop_requirements: CropRequirements,
         fertilizer_specification: FertilizerSpecification,
-        available_equipment: List[EquipmentSpecification]
+        available_equipment: List[EquipmentSpecification],
+        costs: Optional[CostView] = None
     ) -> Dict[str, Any]:
         """Calculate comprehensive costs for a specific application method."""
         
         # Calculate fertilizer costs
         fertilizer_costs = await self._calculate_fertilizer_costs(
-            method, fertilizer_specification, crop_requirements
+            method, fertilizer_specification, crop_requirements, costs
         )
         
         # Calculate equipment costs
         equipment_costs = await self._calculate_equipment_costs(
-            method, field_conditions, available_equipment
+            method, field_conditions, available_equipment, costs
         )
         
         # Calculate labor costs
         labor_costs = await self._calculate_labor_costs(
-            method, field_conditions, crop_requirements
+            method, field_conditions, crop_requirements, costs
         )
         
         # Calculate fuel costs
         fuel_costs = await self._calculate_fuel_costs(
-            method, field_conditions, available_equipment
+            method, field_conditions, available_equipment, costs
         )
         
         # Calculate maintenance costs
@@ -319,13 +357,15 @@ class CostAnalysisService:
         self,
         method: ApplicationMethod,
         fertilizer_specification: FertilizerSpecification,
-        crop_requirements: CropRequirements
+        crop_requirements: CropRequirements,
+        costs: Optional[CostView] = None
     ) -> Dict[str, Any]:
         """Calculate fertilizer costs for the application method."""
+        costs = costs or self.base_costs()
         
         # Get base fertilizer cost
         fertilizer_type = fertilizer_specification.fertilizer_type.lower()
-        base_cost_per_unit = self.cost_database["fertilizer_costs"].get(fertilizer_type, 0.50)
+        base_cost_per_unit = costs.fertilizer_cost(fertilizer_type, 0.50)
         
         # Calculate fertilizer amount needed
         application_rate = method.application_rate
@@ -356,9 +396,11 @@ class CostAnalysisService:
         self,
         method: ApplicationMethod,
         field_conditions: FieldConditions,
-        available_equipment: List[EquipmentSpecification]
+        available_equipment: List[EquipmentSpecification],
+        costs: Optional[CostView] = None
     ) -> Dict[str, Any]:
         """Calculate equipment costs for the application method."""
+        costs = costs or self.base_costs()
         
         # Find compatible equipment
         compatible_equipment = self._find_compatible_equipment(
@@ -368,7 +410,7 @@ class CostAnalysisService:
         if not compatible_equipment:
             # Use rental costs if no compatible equipment available
             equipment_type = method.recommended_equipment.equipment_type.lower()
-            rental_cost_per_day = self.cost_database["equipment_costs"].get(equipment_type, {}).get("rental_per_day", 150.0)
+            rental_cost_per_day = costs.equipment_cost(equipment_type, "rental_per_day", 150.0)
             
             # Estimate days needed based on field size
             days_needed = self._estimate_days_needed(field_conditions.field_size_acres, method)
@@ -384,8 +426,8 @@ class CostAnalysisService:
         
         # Calculate ownership costs
         equipment_type = compatible_equipment.equipment_type.lower()
-        maintenance_per_hour = self.cost_database["equipment_costs"].get(equipment_type, {}).get("maintenance_per_hour", 5.0)
-        depreciation_per_hour = self.cost_database["equipment_costs"].get(equipment_type, {}).get("depreciation_per_hour", 8.0)
+        maintenance_per_hour = costs.equipment_cost(equipment_type, "maintenance_per_hour", 5.0)
+        depreciation_per_hour = costs.equipment_cost(equipment_type, "depreciation_per_hour", 8.0)
         
         # Estimate hours needed
         hours_needed = self._estimate_hours_needed(field_conditions.field_size_acres, method, compatible_equipment)
@@ -412,13 +454,15 @@ class CostAnalysisService:
         self,
         method: ApplicationMethod,
         field_conditions: FieldConditions,
-        crop_requirements: CropRequirements
+        crop_requirements: CropRequirements,
+        costs: Optional[CostView] = None
     ) -> Dict[str, Any]:
         """Calculate labor costs for the application method."""
+        costs = costs or self.base_costs()
         
         # Determine labor skill level based on method complexity
         skill_level = self._determine_labor_skill_level(method.method_type)
-        labor_rate = self.cost_database["labor_rates"][skill_level]
+        labor_rate = costs.labor_rate(skill_level)
         
         # Estimate labor hours needed
         labor_hours = self._estimate_labor_hours(
@@ -444,13 +488,15 @@ class CostAnalysisService:
         self,
         method: ApplicationMethod,
         field_conditions: FieldConditions,
-        available_equipment: List[EquipmentSpecification]
+        available_equipment: List[EquipmentSpecification],
+        costs: Optional[CostView] = None
     ) -> Dict[str, Any]:
         """Calculate fuel costs for the application method."""
+        costs = costs or self.base_costs()
         
         # Determine fuel type based on equipment
         fuel_type = self._determine_fuel_type(method.recommended_equipment.equipment_type)
-        fuel_cost_per_unit = self.cost_database["fuel_costs"][fuel_type]
+        fuel_cost_per_unit = costs.fuel_cost(fuel_type)
         
         # Estimate fuel consumption
         fuel_consumption = self._estimate_fuel_consumption(
@@ -977,31 +1023,22 @@ class CostAnalysisService:
                 scenarios = [EconomicScenario.OPTIMISTIC, EconomicScenario.REALISTIC, 
                            EconomicScenario.PESSIMISTIC, EconomicScenario.CRISIS]
             
-            scenario_results = {}
-            
-            for scenario in scenarios:
+            # Each scenario prices against its own view of the shared database, so they can run together
+            async def analyze_scenario(scenario: EconomicScenario) -> Dict[str, Any]:
                 logger.info(f"Analyzing {scenario.value} scenario")
+                costs = self.scenario_costs(scenario)
+                scenario_analysis = await self.analyze_application_costs(
+                    application_methods, field_conditions, crop_requirements,
+                    fertilizer_specification, available_equipment, costs
+                )
                 
-                # Apply scenario multipliers to cost database
-                original_costs = self._backup_cost_database()
-                self._apply_scenario_multipliers(scenario)
-                
-                try:
-                    # Perform cost analysis with scenario-adjusted costs
-                    scenario_analysis = await self.analyze_application_costs(
-                        application_methods, field_conditions, crop_requirements,
-                        fertilizer_specification, available_equipment
-                    )
-                    
-                    # Add scenario-specific analysis
-                    scenario_analysis["scenario"] = scenario.value
-                    scenario_analysis["scenario_multipliers"] = self.cost_database["economic_scenarios"][scenario.value]
-                    
-                    scenario_results[scenario.value] = scenario_analysis
-                    
-                finally:
-                    # Restore original costs
-                    self._restore_cost_database(original_costs)
+                # Add scenario-specific analysis
+                scenario_analysis["scenario"] = scenario.value
+                scenario_analysis["scenario_multipliers"] = costs.multipliers
+                return scenario_analysis
+            
+            analyses = await asyncio.gather(*(analyze_scenario(scenario) for scenario in scenarios))
+            scenario_results = {scenario.value: analysis for scenario, analysis in zip(scenarios, analyses)}
             
             # Perform cross-scenario analysis
             cross_scenario_analysis = await self._perform_cross_scenario_analysis(scenario_results)
@@ -1023,6 +1060,140 @@ class CostAnalysisService:
             logger.error(f"Error in economic scenario analysis: {e}")
             raise
     
+    async def build_cost_sensitivity_model(
+        self,
+        application_methods: List[ApplicationMethod],
+        field_conditions: FieldConditions,
+        crop_requirements: CropRequirements,
+        fertilizer_specification: FertilizerSpecification,
+        available_equipment: List[EquipmentSpecification],
+        costs: Optional[CostView] = None
+    ) -> CostSensitivityModel:
+        """Reduce the per-method cost pipeline to coefficient arrays for vectorized evaluation."""
+        # Clamped estimators are linear below/above their clamp; probe far past it for slope and cap
+        probe_acres = 1e6
+        acres = field_conditions.field_size_acres
+        columns: Dict[str, List[float]] = {}
+        
+        def add(name: str, value: float):
+            columns.setdefault(name, []).append(float(value))
+        
+        for method in application_methods:
+            fertilizer = await self._calculate_fertilizer_costs(method, fertilizer_specification, crop_requirements, costs)
+            equipment = await self._calculate_equipment_costs(method, field_conditions, available_equipment, costs)
+            labor = await self._calculate_labor_costs(method, field_conditions, crop_requirements, costs)
+            fuel = await self._calculate_fuel_costs(method, field_conditions, available_equipment, costs)
+            maintenance = await self._calculate_maintenance_costs(method, field_conditions, available_equipment)
+            owned = self._find_compatible_equipment(method.recommended_equipment.equipment_type, available_equipment)
+            
+            add("fertilizer_per_acre", fertilizer["cost_per_acre"])
+            if owned:
+                add("rental_per_day", 0.0)
+                add("days_per_acre", 0.0)
+                add("equipment_per_hour", equipment["total_cost"] / equipment["hours_needed"])
+                add("equipment_hours_per_acre", self._estimate_hours_needed(probe_acres, method, owned) / probe_acres)
+                add("maintenance_rate", maintenance["maintenance_rate"])
+                add("maintenance_hours_per_acre", self._estimate_maintenance_hours(1.0, method.method_type, owned))
+                add("maintenance_hours_cap", self._estimate_maintenance_hours(probe_acres, method.method_type, owned))
+            else:
+                add("rental_per_day", equipment["rental_cost_per_day"])
+                add("days_per_acre", equipment["days_needed"] / acres)
+                add("equipment_per_hour", 0.0)
+                add("equipment_hours_per_acre", 0.0)
+                add("maintenance_rate", 0.0)
+                add("maintenance_hours_per_acre", 0.0)
+                add("maintenance_hours_cap", 0.0)
+            add("labor_rate", labor["labor_rate"])
+            add("labor_hours_per_acre", labor["labor_hours"] / acres)
+            add("fuel_price", fuel["fuel_cost_per_unit"])
+            add("fuel_per_acre", fuel["fuel_consumption"] / acres)
+        
+        return CostSensitivityModel(
+            [method.method_type for method in application_methods],
+            acres,
+            crop_requirements.target_yield,
+            columns
+        )
+    
+    async def analyze_cost_sensitivity(
+        self,
+        application_methods: List[ApplicationMethod],
+        field_conditions: FieldConditions,
+        crop_requirements: CropRequirements,
+        fertilizer_specification: FertilizerSpecification,
+        available_equipment: List[EquipmentSpecification],
+        parameters: Optional[List[str]] = None,
+        swing: float = 0.2,
+        grid_points: int = 50,
+        grid_range: Tuple[float, float] = (0.5, 1.5),
+        surface_parameters: Optional[Tuple[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Sensitivity of cost per acre to price, rate and field-size multipliers.
+        
+        Args:
+            application_methods: List of application methods to analyze
+            field_conditions: Field conditions
+            crop_requirements: Crop requirements
+            fertilizer_specification: Fertilizer specification
+            available_equipment: Available equipment
+            parameters: Parameters to vary (defaults to all)
+            swing: Relative change used for the tornado chart
+            grid_points: Points per axis for break-even search and surfaces
+            grid_range: Multiplier range covered by the grid
+            surface_parameters: Optional pair of parameters for a two-way surface
+            
+        Returns:
+            Baseline costs, tornado ranges, elasticities, break-even points and optional surface
+        """
+        start_time = time.time()
+        
+        try:
+            parameters = list(parameters or SENSITIVITY_PARAMETERS)
+            unknown = set(parameters) - set(SENSITIVITY_PARAMETERS)
+            if surface_parameters:
+                unknown |= set(surface_parameters) - set(SENSITIVITY_PARAMETERS)
+            if unknown:
+                raise ValueError(f"Unknown sensitivity parameters: {sorted(unknown)}")
+            
+            model = await self.build_cost_sensitivity_model(
+                application_methods, field_conditions, crop_requirements,
+                fertilizer_specification, available_equipment
+            )
+            grid = np.linspace(grid_range[0], grid_range[1], grid_points)
+            elasticities = model.elasticities(parameters=parameters)
+            
+            result = {
+                "method_types": model.method_types,
+                "parameters": parameters,
+                "baseline_cost_per_acre": dict(zip(model.method_types, model.baseline().tolist())),
+                "tornado": model.tornado(swing, parameters),
+                "elasticities": {
+                    method_type: dict(zip(parameters, row.tolist()))
+                    for method_type, row in zip(model.method_types, elasticities)
+                },
+                "break_even_points": {
+                    parameter: model.break_even_points(parameter, grid) for parameter in parameters
+                },
+                "grid": grid.tolist()
+            }
+            
+            if surface_parameters:
+                x_parameter, y_parameter = surface_parameters
+                surface = model.surface(x_parameter, grid, y_parameter, grid)
+                result["surface"] = {
+                    "x_parameter": x_parameter,
+                    "y_parameter": y_parameter,
+                    "cost_per_acre": dict(zip(model.method_types, surface.tolist()))
+                }
+            
+            result["processing_time_ms"] = (time.time() - start_time) * 1000
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error in cost sensitivity analysis: {e}")
+            raise
+    
     async def calculate_break_even_analysis(
         self,
         application_methods: List[ApplicationMethod],
@@ -1369,42 +1540,13 @@ class CostAnalysisService:
         
         return sensitivity_analysis
     
-    def _backup_cost_database(self) -> Dict[str, Any]:
-        """Backup current cost database for scenario analysis."""
-        return {
-            "labor_rates": self.cost_database["labor_rates"].copy(),
-            "fuel_costs": self.cost_database["fuel_costs"].copy(),
-            "fertilizer_costs": self.cost_database["fertilizer_costs"].copy(),
-            "equipment_costs": self.cost_database["equipment_costs"].copy()
-        }
+    def base_costs(self) -> CostView:
+        """Unscaled view of the cost database."""
+        return CostView(self.cost_database)
     
-    def _apply_scenario_multipliers(self, scenario: EconomicScenario):
-        """Apply scenario multipliers to cost database."""
-        multipliers = self.cost_database["economic_scenarios"][scenario.value]
-        
-        # Apply multipliers to labor rates
-        for skill_level in self.cost_database["labor_rates"]:
-            self.cost_database["labor_rates"][skill_level] *= multipliers["labor_multiplier"]
-        
-        # Apply multipliers to fuel costs
-        for fuel_type in self.cost_database["fuel_costs"]:
-            self.cost_database["fuel_costs"][fuel_type] *= multipliers["fuel_multiplier"]
-        
-        # Apply multipliers to fertilizer costs
-        for fertilizer_type in self.cost_database["fertilizer_costs"]:
-            self.cost_database["fertilizer_costs"][fertilizer_type] *= multipliers["fertilizer_multiplier"]
-        
-        # Apply multipliers to equipment costs
-        for equipment_type in self.cost_database["equipment_costs"]:
-            for cost_type in self.cost_database["equipment_costs"][equipment_type]:
-                self.cost_database["equipment_costs"][equipment_type][cost_type] *= multipliers["equipment_multiplier"]
-    
-    def _restore_cost_database(self, backup: Dict[str, Any]):
-        """Restore cost database from backup."""
-        self.cost_database["labor_rates"] = backup["labor_rates"]
-        self.cost_database["fuel_costs"] = backup["fuel_costs"]
-        self.cost_database["fertilizer_costs"] = backup["fertilizer_costs"]
-        self.cost_database["equipment_costs"] = backup["equipment_costs"]
+    def scenario_costs(self, scenario: EconomicScenario) -> CostView:
+        """View of the cost database with a scenario's multipliers applied."""
+        return CostView(self.cost_database, self.cost_database["economic_scenarios"][scenario.value])
     
     async def _perform_cross_scenario_analysis(self, scenario_results: Dict[str, Any]) -> Dict[str, Any]:
         """Perform cross-scenario analysis."""
@@ -0,0 +1,183 @@
+"""
+Vectorized cost model for application cost sensitivity analysis.
+
+The per-method cost pipeline in CostAnalysisService is reduced to
+coefficient arrays (one entry per method): unit prices plus per-acre
+quantities, with the clamps the estimators apply (minimum equipment hours,
+capped maintenance hours). Cost per acre is then a closed-form array
+expression, so tornado charts, elasticities and full two-way surfaces are a
+single broadcast NumPy evaluation over (method x parameter grid).
+
+Parameters are multipliers on the analyzed inputs; 1.0 reproduces the
+pipeline's cost per acre.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PARAMETERS = (
+    "fertilizer_price",
+    "application_rate",
+    "equipment_rate",
+    "labor_rate",
+    "fuel_price",
+    "field_size",
+)
+
+COEFFICIENTS = (
+    "fertilizer_per_acre",         # Adjusted rate x unit price
+    "rental_per_day",
+    "days_per_acre",
+    "equipment_per_hour",          # Owned equipment maintenance + depreciation
+    "equipment_hours_per_acre",
+    "labor_rate",
+    "labor_hours_per_acre",
+    "fuel_price",
+    "fuel_per_acre",
+    "maintenance_rate",
+    "maintenance_hours_per_acre",
+    "maintenance_hours_cap",
+)
+
+MIN_EQUIPMENT_HOURS = 1.0
+
+
+class CostSensitivityModel:
+    """Closed-form cost per acre for a set of methods over parameter grids."""
+
+    def __init__(
+        self,
+        method_types: Sequence[str],
+        field_size_acres: float,
+        target_yield: Optional[float],
+        coefficients: Dict[str, Sequence[float]]
+    ):
+        missing = set(COEFFICIENTS) - set(coefficients)
+        if missing:
+            raise ValueError(f"Missing cost coefficients: {sorted(missing)}")
+        self.method_types = list(method_types)
+        self.field_size_acres = float(field_size_acres)
+        self.target_yield = target_yield
+        self.coefficients = {name: np.asarray(coefficients[name], dtype=float) for name in COEFFICIENTS}
+        for name, values in self.coefficients.items():
+            if values.shape != (len(self.method_types),):
+                raise ValueError(f"Coefficient {name} must have one value per method")
+
+    def evaluate(self, **parameters) -> np.ndarray:
+        """
+        Cost per acre for every method at the given parameter multipliers.
+
+        Multipliers broadcast against each other; the result has shape
+        (methods, *broadcast shape).
+        """
+        unknown = set(parameters) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown sensitivity parameters: {sorted(unknown)}")
+        values = np.broadcast_arrays(*(np.asarray(parameters.get(name, 1.0), dtype=float) for name in PARAMETERS))
+        k = dict(zip(PARAMETERS, values))
+        shape = values[0].shape
+        c = {name: coeff.reshape((-1,) + (1,) * len(shape)) for name, coeff in self.coefficients.items()}
+
+        acres = self.field_size_acres * k["field_size"]
+        fertilizer = c["fertilizer_per_acre"] * k["fertilizer_price"] * k["application_rate"] * (self.target_yield or 0.0)
+        # The pipeline falls back to 1.0 when the fertilizer total is zero
+        fertilizer = np.where(fertilizer == 0, 1.0, fertilizer)
+        equipment = k["equipment_rate"] * (
+            c["rental_per_day"] * c["days_per_acre"] * acres
+            + c["equipment_per_hour"] * np.maximum(c["equipment_hours_per_acre"] * acres, MIN_EQUIPMENT_HOURS)
+        )
+        labor = c["labor_rate"] * k["labor_rate"] * c["labor_hours_per_acre"] * acres
+        fuel = c["fuel_price"] * k["fuel_price"] * c["fuel_per_acre"] * acres
+        maintenance = c["maintenance_rate"] * np.minimum(
+            c["maintenance_hours_per_acre"] * acres, c["maintenance_hours_cap"]
+        )
+        return (fertilizer + equipment + labor + fuel + maintenance) / acres
+
+    def baseline(self) -> np.ndarray:
+        return self.evaluate()
+
+    def _one_at_a_time(self, parameters: Sequence[str], low: float, high: float) -> np.ndarray:
+        """Costs with each parameter moved to low/high in turn; shape (methods, parameters, 2)."""
+        grid = {name: np.ones((len(parameters), 2)) for name in parameters}
+        for row, name in enumerate(parameters):
+            grid[name][row] = (low, high)
+        return self.evaluate(**grid)
+
+    def tornado(self, swing: float = 0.2, parameters: Sequence[str] = PARAMETERS) -> Dict[str, Dict[str, List[float]]]:
+        """Cost per acre per method with each parameter at 1 - swing and 1 + swing."""
+        costs = self._one_at_a_time(parameters, 1 - swing, 1 + swing)
+        return {
+            name: {"low": costs[:, row, 0].tolist(), "high": costs[:, row, 1].tolist()}
+            for row, name in enumerate(parameters)
+        }
+
+    def elasticities(self, step: float = 0.01, parameters: Sequence[str] = PARAMETERS) -> np.ndarray:
+        """Percent change in cost per acre per percent change in each parameter; shape (methods, parameters)."""
+        costs = self._one_at_a_time(parameters, 1 - step, 1 + step)
+        return (costs[:, :, 1] - costs[:, :, 0]) / (2 * step) / self.baseline()[:, None]
+
+    def surface(
+        self,
+        x_parameter: str,
+        x_values: Sequence[float],
+        y_parameter: str,
+        y_values: Sequence[float]
+    ) -> np.ndarray:
+        """Two-way cost surface; shape (methods, len(x_values), len(y_values))."""
+        if x_parameter == y_parameter:
+            raise ValueError("Surface parameters must differ")
+        return self.evaluate(**{
+            x_parameter: np.asarray(x_values, dtype=float)[:, None],
+            y_parameter: np.asarray(y_values, dtype=float)[None, :]
+        })
+
+    def break_even_points(
+        self,
+        parameter: str,
+        values: Sequence[float],
+        target_cost_per_acre: Optional[float] = None
+    ) -> List[Dict[str, object]]:
+        """
+        Parameter values where costs cross, interpolated linearly between grid points.
+
+        With a target, reports where each method's cost per acre crosses it;
+        otherwise where each pair of methods swaps cost order.
+        """
+        grid = np.asarray(values, dtype=float)
+        costs = self.evaluate(**{parameter: grid})
+        points = []
+
+        if target_cost_per_acre is not None:
+            diff = costs - target_cost_per_acre
+            for method, step in zip(*np.nonzero(self._crossings(diff))):
+                points.append({
+                    "methods": [self.method_types[method]],
+                    "value": float(self._interpolate(grid, diff[method], step))
+                })
+            return points
+
+        diff = costs[:, None, :] - costs[None, :, :]
+        crossing = self._crossings(diff)
+        upper = np.triu(np.ones(crossing.shape[:2], dtype=bool), 1)  # Each pair once
+        for a, b, step in zip(*np.nonzero(crossing & upper[:, :, None])):
+            points.append({
+                "methods": [self.method_types[a], self.method_types[b]],
+                "value": float(self._interpolate(grid, diff[a, b], step))
+            })
+        return points
+
+    @staticmethod
+    def _crossings(diff: np.ndarray) -> np.ndarray:
+        """Grid steps where diff changes sign; a crossing exactly on a grid point counts once."""
+        before, after = diff[..., :-1], diff[..., 1:]
+        return (before * after < 0) | ((after == 0) & (before != 0))
+
+    @staticmethod
+    def _interpolate(grid: np.ndarray, diff: np.ndarray, step: int) -> float:
+        x0, x1 = grid[step], grid[step + 1]
+        d0, d1 = diff[step], diff[step + 1]
+        return x0 + (x1 - x0) * d0 / (d0 - d1)
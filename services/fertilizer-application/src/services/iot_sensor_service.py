@@ -16,14 +16,21 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 import aiohttp
+import numpy as np
 import socketio
 
 from src.models.application_monitoring_models import (
     SensorData, SensorType, ApplicationMonitoringData
 )
+from src.services.sensor_time_series import SensorTimeSeries, SeriesWindow, from_microseconds
+from src.services.sensor_polling_scheduler import SensorPollingScheduler
 
 logger = logging.getLogger(__name__)
 
+# Raw readings kept per sensor; longer retention is served from per-minute rollups
+MAX_RAW_READINGS_PER_SENSOR = 21600
+ROLLUP_SECONDS = 60
+
 
 class SensorStatus(str, Enum):
     """Sensor status levels."""
@@ -375,8 +382,8 @@ class IoTSensorService:
     def __init__(self):
         self.sensor_connectors: Dict[str, SensorConnector] = {}
         self.sensor_configs: Dict[str, SensorConfiguration] = {}
-        self.data_collection_tasks: Dict[str, asyncio.Task] = {}
-        self.sensor_data_cache: Dict[str, List[SensorData]] = {}
+        self.polling_scheduler = SensorPollingScheduler(self._poll_sensor)
+        self.sensor_data_cache: Dict[str, SensorTimeSeries] = {}
         self.health_monitoring_task: Optional[asyncio.Task] = None
         self.is_running = False
         
@@ -387,6 +394,9 @@ class IoTSensorService:
         try:
             self.is_running = True
             
+            # Start polling every registered sensor from a single scheduler task
+            self.polling_scheduler.start()
+            
             # Start health monitoring task
             self.health_monitoring_task = asyncio.create_task(self._health_monitoring_loop())
             
@@ -402,10 +412,8 @@ class IoTSensorService:
         try:
             self.is_running = False
             
-            # Stop all data collection tasks
-            for task in self.data_collection_tasks.values():
-                task.cancel()
-            self.data_collection_tasks.clear()
+            # Stop data collection
+            await self.polling_scheduler.stop()
             
             # Disconnect all sensors
             for connector in self.sensor_connectors.values():
@@ -443,14 +451,10 @@ class IoTSensorService:
             # Store connector and config
             self.sensor_connectors[config.sensor_id] = connector
             self.sensor_configs[config.sensor_id] = config
-            self.sensor_data_cache[config.sensor_id] = []
+            self.sensor_data_cache[config.sensor_id] = self._create_time_series(config)
             
-            # Start data collection task
-            if self.is_running:
-                task = asyncio.create_task(
-                    self._data_collection_loop(config.sensor_id, connector)
-                )
-                self.data_collection_tasks[config.sensor_id] = task
+            # Schedule data collection; polling begins once the service is running
+            self.polling_scheduler.add(config.sensor_id, config.update_frequency_seconds)
             
             logger.info(f"Sensor {config.sensor_id} registered successfully")
             return True
@@ -464,10 +468,8 @@ class IoTSensorService:
         try:
             logger.info(f"Unregistering sensor {sensor_id}")
             
-            # Stop data collection task
-            if sensor_id in self.data_collection_tasks:
-                self.data_collection_tasks[sensor_id].cancel()
-                del self.data_collection_tasks[sensor_id]
+            # Stop data collection
+            self.polling_scheduler.remove(sensor_id)
             
             # Disconnect sensor
             if sensor_id in self.sensor_connectors:
@@ -488,6 +490,44 @@ class IoTSensorService:
             logger.error(f"Error unregistering sensor {sensor_id}: {e}")
             return False
     
+    def _create_time_series(self, config: SensorConfiguration) -> SensorTimeSeries:
+        """Size a sensor's ring buffer for its retention window and polling rate."""
+        retention_seconds = config.data_retention_hours * 3600
+        needed = int(retention_seconds / max(config.update_frequency_seconds, 1)) + 1
+        if needed <= MAX_RAW_READINGS_PER_SENSOR:
+            return SensorTimeSeries(max(needed, 1))
+        return SensorTimeSeries(
+            MAX_RAW_READINGS_PER_SENSOR,
+            rollup_seconds=ROLLUP_SECONDS,
+            rollup_capacity=int(retention_seconds / ROLLUP_SECONDS) + 1
+        )
+    
+    def _record_sensor_data(self, sensor_data: SensorData):
+        """Append a reading to its sensor's time series."""
+        self.sensor_data_cache[sensor_data.sensor_id].append(
+            sensor_data.timestamp,
+            sensor_data.readings,
+            sensor_data.data_quality,
+            battery_level=sensor_data.battery_level,
+            signal_strength=sensor_data.signal_strength
+        )
+    
+    def _to_sensor_data(self, sensor_id: str, window: SeriesWindow, row: int) -> SensorData:
+        """Materialize one stored row as a SensorData model."""
+        config = self.sensor_configs[sensor_id]
+        battery_level = window.battery_level[row]
+        signal_strength = window.signal_strength[row]
+        return SensorData(
+            sensor_id=sensor_id,
+            sensor_type=config.sensor_type,
+            equipment_id=config.equipment_id,
+            readings=window.readings(row),
+            timestamp=from_microseconds(window.timestamps[row]),
+            battery_level=None if np.isnan(battery_level) else float(battery_level),
+            signal_strength=None if np.isnan(signal_strength) else float(signal_strength),
+            data_quality=float(window.quality[row])
+        )
+    
     async def _create_sensor_connector(self, config: SensorConfiguration) -> Optional[SensorConnector]:
         """Create appropriate sensor connector based on configuration."""
         protocol = config.connection_params.get("protocol", "mqtt")
@@ -502,44 +542,34 @@ class IoTSensorService:
             logger.error(f"Unsupported protocol: {protocol}")
             return None
     
-    async def _data_collection_loop(self, sensor_id: str, connector: SensorConnector):
-        """Data collection loop for a sensor."""
-        config = self.sensor_configs[sensor_id]
+    async def _poll_sensor(self, sensor_id: str):
+        """Read and store one reading; called by the polling scheduler on each tick."""
+        connector = self.sensor_connectors.get(sensor_id)
+        config = self.sensor_configs.get(sensor_id)
+        if connector is None or config is None:
+            return
         
-        while self.is_running:
-            try:
-                # Read data from sensor
-                raw_data = await connector.read_data()
-                
-                if raw_data:
-                    # Create sensor data object
-                    sensor_data = SensorData(
-                        sensor_id=sensor_id,
-                        sensor_type=config.sensor_type,
-                        equipment_id=config.equipment_id,
-                        readings=raw_data,
-                        data_quality=self._assess_data_quality(raw_data, config),
-                        battery_level=raw_data.get("battery_level"),
-                        signal_strength=raw_data.get("signal_strength")
-                    )
-                    
-                    # Store data
-                    self.sensor_data_cache[sensor_id].append(sensor_data)
-                    
-                    # Clean up old data
-                    await self._cleanup_old_data(sensor_id, config.data_retention_hours)
-                    
-                    logger.debug(f"Collected data from sensor {sensor_id}")
-                
-                # Wait for next collection cycle
-                await asyncio.sleep(config.update_frequency_seconds)
-                
-            except asyncio.CancelledError:
-                logger.info(f"Data collection loop cancelled for sensor {sensor_id}")
-                break
-            except Exception as e:
-                logger.error(f"Error in data collection loop for sensor {sensor_id}: {e}")
-                await asyncio.sleep(5)  # Wait before retrying
+        raw_data = await connector.read_data()
+        if not raw_data:
+            return
+        
+        sensor_data = SensorData(
+            sensor_id=sensor_id,
+            sensor_type=config.sensor_type,
+            equipment_id=config.equipment_id,
+            readings=raw_data,
+            data_quality=self._assess_data_quality(raw_data, config),
+            battery_level=raw_data.get("battery_level"),
+            signal_strength=raw_data.get("signal_strength")
+        )
+        
+        # Store data
+        self._record_sensor_data(sensor_data)
+        
+        # Clean up old data
+        await self._cleanup_old_data(sensor_id, config.data_retention_hours)
+        
+        logger.debug(f"Collected data from sensor {sensor_id}")
     
     async def _health_monitoring_loop(self):
         """Health monitoring loop for all sensors."""
@@ -605,10 +635,7 @@ class IoTSensorService:
         cutoff_time = datetime.now() - timedelta(hours=retention_hours)
         
         if sensor_id in self.sensor_data_cache:
-            self.sensor_data_cache[sensor_id] = [
-                data for data in self.sensor_data_cache[sensor_id]
-                if data.timestamp > cutoff_time
-            ]
+            self.sensor_data_cache[sensor_id].expire(cutoff_time)
     
     # Public API methods
     
@@ -622,18 +649,31 @@ class IoTSensorService:
             return []
         
         cutoff_time = datetime.now() - timedelta(minutes=minutes)
+        window = self.sensor_data_cache[sensor_id].window(since=cutoff_time)
         
-        return [
-            data for data in self.sensor_data_cache[sensor_id]
-            if data.timestamp > cutoff_time
-        ]
+        return [self._to_sensor_data(sensor_id, window, row) for row in range(len(window))]
     
     async def get_latest_sensor_data(self, sensor_id: str) -> Optional[SensorData]:
         """Get latest sensor data."""
         if sensor_id not in self.sensor_data_cache or not self.sensor_data_cache[sensor_id]:
             return None
         
-        return self.sensor_data_cache[sensor_id][-1]
+        return self._to_sensor_data(sensor_id, self.sensor_data_cache[sensor_id].latest(), 0)
+    
+    async def get_sensor_rollups(
+        self,
+        sensor_id: str,
+        minutes: int = 240,
+        bucket_seconds: float = 60
+    ) -> Optional[Dict[str, Any]]:
+        """Get per-bucket mean/min/max/count of each reading over a (possibly long) window."""
+        if sensor_id not in self.sensor_data_cache:
+            return None
+        
+        since = datetime.now() - timedelta(minutes=minutes)
+        rollups = self.sensor_data_cache[sensor_id].downsample(bucket_seconds, since=since)
+        rollups["timestamps"] = [ts.isoformat() for ts in rollups["timestamps"]]
+        return rollups
     
     async def get_sensor_health(self, sensor_id: str) -> Optional[SensorHealth]:
         """Get sensor health status."""
@@ -692,7 +732,9 @@ class IoTSensorService:
             "total_sensors": total_sensors,
             "online_sensors": online_sensors,
             "error_sensors": error_sensors,
-            "active_tasks": len(self.data_collection_tasks),
+            "scheduled_sensors": len(self.polling_scheduler),
+            "polling": self.polling_scheduler.get_stats()["intervals"],
+            "buffered_readings": sum(len(series) for series in self.sensor_data_cache.values()),
             "sensor_types": list(set(config.sensor_type.value for config in self.sensor_configs.values())),
             "last_update": datetime.now().isoformat()
         }
@@ -713,35 +755,32 @@ class IoTSensorService:
             if config.sensor_type not in sensor_types:
                 continue
             
-            # Get recent data
-            recent_data = await self.get_sensor_data(sensor_id, minutes)
-            
-            if recent_data:
-                # Aggregate readings
-                all_readings = {}
-                for data in recent_data:
-                    for key, value in data.readings.items():
-                        if key not in all_readings:
-                            all_readings[key] = []
-                        all_readings[key].append(value)
-                
-                # Calculate statistics
+            if sensor_id not in self.sensor_data_cache:
+                continue
+            
+            # Get recent data as columns
+            cutoff_time = datetime.now() - timedelta(minutes=minutes)
+            window = self.sensor_data_cache[sensor_id].window(since=cutoff_time)
+            
+            if len(window):
+                # Calculate statistics over the values present for each reading
                 sensor_stats = {}
-                for key, values in all_readings.items():
-                    if values:
+                for key, column in window.values.items():
+                    values = column[~np.isnan(column)]
+                    if len(values):
                         sensor_stats[key] = {
-                            "latest": values[-1],
-                            "average": sum(values) / len(values),
-                            "min": min(values),
-                            "max": max(values),
-                            "count": len(values)
+                            "latest": float(values[-1]),
+                            "average": float(values.mean()),
+                            "min": float(values.min()),
+                            "max": float(values.max()),
+                            "count": int(len(values))
                         }
                 
                 aggregated_data[sensor_id] = {
                     "sensor_type": config.sensor_type.value,
-                    "data_quality": recent_data[-1].data_quality,
+                    "data_quality": float(window.quality[-1]),
                     "statistics": sensor_stats,
-                    "last_update": recent_data[-1].timestamp.isoformat()
+                    "last_update": from_microseconds(window.timestamps[-1]).isoformat()
                 }
         
         return aggregated_data
\ No newline at end of file
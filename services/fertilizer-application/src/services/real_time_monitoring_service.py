@@ -24,6 +24,8 @@ from src.models.application_monitoring_models import (
     MonitoringSummary, ApplicationStatus, AdjustmentType, MonitoringMetric,
     AlertSeverity, SensorType
 )
+from src.services.session_statistics import SessionStatistics
+from src.services.adjustment_rule_engine import AdjustmentRuleEngine
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +61,7 @@ class RealTimeMonitoringService:
         self.active_alerts: Dict[str, List[MonitoringAlert]] = {}
         self.sensor_data: Dict[str, List[SensorData]] = {}
         self.quality_checks: Dict[str, List[QualityControlCheck]] = {}
+        self.session_statistics: Dict[str, SessionStatistics] = {}
         
         # Monitoring tasks
         self.monitoring_tasks: Dict[str, asyncio.Task] = {}
@@ -67,6 +70,7 @@ class RealTimeMonitoringService:
         
         # Adjustment rules
         self.adjustment_rules = self._initialize_adjustment_rules()
+        self.rule_engine = AdjustmentRuleEngine(self.adjustment_rules)
         
         # Monitoring state
         self.state = MonitoringState.IDLE
@@ -145,6 +149,8 @@ class RealTimeMonitoringService:
             self.active_alerts[session.session_id] = []
             self.sensor_data[session.session_id] = []
             self.quality_checks[session.session_id] = []
+            self.session_statistics[session.session_id] = SessionStatistics()
+            self.rule_engine.reset_session(session.session_id)
             
             # Start monitoring if enabled
             if config.monitoring_enabled:
@@ -461,56 +467,36 @@ class RealTimeMonitoringService:
         """Check if adjustments are needed based on current data."""
         adjustments = []
         
-        for rule in self.adjustment_rules:
-            # Check if rule conditions are met
-            if await self._evaluate_rule_conditions(rule, session_id, monitoring_data):
-                adjustment = await self._create_adjustment(rule, monitoring_data)
-                if adjustment:
-                    adjustments.append(adjustment)
+        for rule in self._get_rule_engine().evaluate(session_id, monitoring_data):
+            adjustment = await self._create_adjustment(rule, monitoring_data)
+            if adjustment:
+                adjustments.append(adjustment)
         
         return adjustments
     
+    def add_adjustment_rule(self, rule: AdjustmentRule):
+        """Register an adjustment rule, compiling it for evaluation."""
+        self.adjustment_rules.append(rule)
+        self.rule_engine.add_rule(rule)
+    
+    def _get_rule_engine(self) -> AdjustmentRuleEngine:
+        """Compiled rules, recompiled if adjustment_rules was replaced or edited directly."""
+        registered = self.rule_engine.registered
+        if len(registered) != len(self.adjustment_rules) or (
+            registered and registered[-1] is not self.adjustment_rules[-1]
+        ):
+            self.rule_engine = AdjustmentRuleEngine(self.adjustment_rules)
+        return self.rule_engine
+    
     async def _evaluate_rule_conditions(
         self, 
         rule: AdjustmentRule, 
         session_id: str, 
         monitoring_data: ApplicationMonitoringData
     ) -> bool:
-        """Evaluate if adjustment rule conditions are met."""
+        """Evaluate if adjustment rule conditions are met (ignores cooldown and hysteresis)."""
         try:
-            # Get metric value from monitoring data
-            metric_value = self._get_metric_value(rule.metric, monitoring_data)
-            if metric_value is None:
-                return False
-            
-            # Check threshold
-            threshold_met = False
-            if rule.metric == MonitoringMetric.APPLICATION_RATE:
-                # For application rate, check deviation from target
-                deviation = abs(monitoring_data.rate_deviation) / 100
-                threshold_met = deviation > rule.threshold
-            elif rule.metric == MonitoringMetric.PRESSURE:
-                # For pressure, check deviation from expected value (30 PSI)
-                deviation = abs(metric_value - 30) / 30
-                threshold_met = deviation > rule.threshold
-            elif rule.metric == MonitoringMetric.COVERAGE_UNIFORMITY:
-                # For coverage uniformity, check if below threshold
-                threshold_met = metric_value < rule.threshold
-            elif rule.metric == MonitoringMetric.WIND_SPEED:
-                # For wind speed, check if above threshold
-                threshold_met = metric_value > rule.threshold
-            else:
-                # For other metrics, use direct comparison
-                threshold_met = metric_value > rule.threshold
-            
-            # Check additional conditions
-            conditions_met = True
-            if "min_samples" in rule.conditions:
-                min_samples = rule.conditions["min_samples"]
-                # For testing, we'll assume we have enough samples
-                conditions_met = True  # Simplified for testing
-            
-            return threshold_met and conditions_met
+            return self._get_rule_engine().matches(rule, monitoring_data)
             
         except Exception as e:
             logger.error(f"Error evaluating rule conditions: {e}")
@@ -757,34 +743,30 @@ class RealTimeMonitoringService:
         session.total_adjustments = len(self.active_adjustments.get(session_id, []))
         session.active_alerts = len([a for a in self.active_alerts.get(session_id, []) if not a.resolved])
     
+    def _get_session_statistics(self, session_id: str) -> SessionStatistics:
+        """Session accumulators, folded forward over data points appended since the last call."""
+        data_points = self.monitoring_data.get(session_id, [])
+        stats = self.session_statistics.get(session_id)
+        if stats is None or stats.count > len(data_points) or (
+            stats.count and data_points[stats.count - 1] is not stats.latest
+        ):
+            # History was replaced or trimmed; rebuild from what is stored
+            stats = self.session_statistics[session_id] = SessionStatistics()
+        for data in data_points[stats.count:]:
+            stats.update(data)
+        return stats
+    
     def _calculate_average_rate(self, session_id: str) -> float:
         """Calculate average application rate for session."""
-        data_points = self.monitoring_data.get(session_id, [])
-        if not data_points:
-            return 0.0
-        
-        rates = [data.application_rate for data in data_points]
-        return statistics.mean(rates)
+        return self._get_session_statistics(session_id).rate.mean
     
     def _calculate_rate_variability(self, session_id: str) -> float:
-        """Calculate rate variability for session."""
-        data_points = self.monitoring_data.get(session_id, [])
-        if len(data_points) < 2:
-            return 0.0
-        
-        rates = [data.application_rate for data in data_points]
-        mean_rate = statistics.mean(rates)
-        variance = statistics.variance(rates, mean_rate)
-        return (variance ** 0.5 / mean_rate) * 100  # Coefficient of variation
+        """Calculate rate variability (coefficient of variation) for session."""
+        return self._get_session_statistics(session_id).rate_variability
     
     def _calculate_average_coverage_score(self, session_id: str) -> float:
         """Calculate average coverage score for session."""
-        data_points = self.monitoring_data.get(session_id, [])
-        if not data_points:
-            return 0.0
-        
-        coverage_scores = [data.coverage_uniformity for data in data_points]
-        return statistics.mean(coverage_scores)
+        return self._get_session_statistics(session_id).coverage.mean
     
     async def _perform_quality_check(self, session_id: str) -> Optional[QualityControlCheck]:
         """Perform quality control check."""
@@ -793,6 +775,7 @@ class RealTimeMonitoringService:
             recent_data = self.monitoring_data.get(session_id, [])
             if len(recent_data) < 5:  # Need at least 5 data points
                 return None
+            stats = self._get_session_statistics(session_id)
             
             # Perform quality checks
             checks_passed = 0
@@ -803,8 +786,7 @@ class RealTimeMonitoringService:
             
             # Check 1: Rate accuracy
             total_checks += 1
-            rate_deviations = [abs(data.rate_deviation) for data in recent_data[-10:]]
-            avg_rate_deviation = statistics.mean(rate_deviations)
+            avg_rate_deviation = stats.recent_rate_deviation.mean
             
             if avg_rate_deviation <= 5:  # Within 5%
                 checks_passed += 1
@@ -820,8 +802,7 @@ class RealTimeMonitoringService:
             
             # Check 2: Coverage uniformity
             total_checks += 1
-            coverage_scores = [data.coverage_uniformity for data in recent_data[-10:]]
-            avg_coverage = statistics.mean(coverage_scores)
+            avg_coverage = stats.recent_coverage.mean
             
             if avg_coverage >= 0.85:  # 85% or better
                 checks_passed += 1
@@ -837,8 +818,7 @@ class RealTimeMonitoringService:
             
             # Check 3: Environmental compliance
             total_checks += 1
-            drift_potentials = [data.drift_potential for data in recent_data[-10:]]
-            avg_drift_potential = statistics.mean(drift_potentials)
+            avg_drift_potential = stats.recent_drift.mean
             
             if avg_drift_potential <= 0.3:  # Low drift potential
                 checks_passed += 1
@@ -963,7 +943,8 @@ class RealTimeMonitoringService:
         # Get data statistics
         data_points = self.monitoring_data.get(session_id, [])
         total_data_points = len(data_points)
-        data_quality_average = statistics.mean([d.quality_score for d in data_points]) if data_points else 0
+        stats = self._get_session_statistics(session_id)
+        data_quality_average = stats.quality.mean
         
         # Get adjustment statistics
         adjustments = self.active_adjustments.get(session_id, [])
@@ -984,10 +965,10 @@ class RealTimeMonitoringService:
         
         # Calculate performance metrics
         if data_points:
-            average_rate_accuracy = 1 - (statistics.mean([abs(d.rate_deviation) for d in data_points]) / 100)
-            average_coverage_uniformity = statistics.mean([d.coverage_uniformity for d in data_points])
-            average_application_efficiency = statistics.mean([d.application_efficiency for d in data_points])
-            average_drift_potential = statistics.mean([d.drift_potential for d in data_points])
+            average_rate_accuracy = 1 - (stats.rate_deviation.mean / 100)
+            average_coverage_uniformity = stats.coverage.mean
+            average_application_efficiency = stats.efficiency.mean
+            average_drift_potential = stats.drift.mean
             environmental_compliance_score = 1 - average_drift_potential
         else:
             average_rate_accuracy = 0
@@ -1032,6 +1013,7 @@ class RealTimeMonitoringService:
             "active_adjustments": len(self.active_adjustments.get(session_id, [])),
             "active_alerts": len(self.active_alerts.get(session_id, [])),
             "quality_checks": len(self.quality_checks.get(session_id, [])),
+            "statistics": self._get_session_statistics(session_id).to_dict() if session else None,
             "last_update": self.monitoring_data[session_id][-1].timestamp.isoformat() if self.monitoring_data.get(session_id) else None,
             "monitoring_state": self.state.value
         }
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Multiplexed polling scheduler for IoT sensors.
+
+Sensors are grouped by polling interval and a single asyncio task drives
+every group from a min-heap of next due times, so a fleet of thousands of
+sensors needs one timer instead of one sleeping task per sensor. Each due
+group is read in bounded batches; ticks stay on the group's original
+schedule to avoid drift, and a group whose previous batch is still running
+when its next tick comes due skips that tick instead of piling up reads.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IntervalStats:
+    """Lag and throughput counters for one polling interval."""
+    ticks: int = 0
+    reads: int = 0
+    errors: int = 0
+    overruns: int = 0
+    skipped_ticks: int = 0
+    lag_sum: float = 0.0
+    lag_max: float = 0.0
+    last_lag: float = 0.0
+    last_duration: float = 0.0
+
+    def record_lag(self, lag: float):
+        self.ticks += 1
+        self.lag_sum += lag
+        self.lag_max = max(self.lag_max, lag)
+        self.last_lag = lag
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "reads": self.reads,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped_ticks,
+            "lag_ms": {
+                "last": round(self.last_lag * 1000, 3),
+                "mean": round(self.lag_sum / self.ticks * 1000, 3) if self.ticks else 0.0,
+                "max": round(self.lag_max * 1000, 3)
+            },
+            "last_batch_ms": round(self.last_duration * 1000, 3)
+        }
+
+
+@dataclass
+class _IntervalGroup:
+    interval: float
+    generation: int
+    due: float
+    sensor_ids: Set[str] = field(default_factory=set)
+    stats: IntervalStats = field(default_factory=IntervalStats)
+    task: Optional[asyncio.Task] = None
+
+
+class SensorPollingScheduler:
+    """Single-task scheduler that polls sensors grouped by interval."""
+
+    def __init__(
+        self,
+        poll: Callable[[str], Awaitable[Any]],
+        max_batch_size: int = 256
+    ):
+        """
+        Args:
+            poll: Coroutine function reading and recording one sensor
+            max_batch_size: Sensors read concurrently within one group tick
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        self._poll = poll
+        self.max_batch_size = max_batch_size
+        self._groups: Dict[float, _IntervalGroup] = {}
+        self._intervals: Dict[str, float] = {}
+        # Heap of (due, generation, interval); entries for removed or re-created groups are skipped lazily
+        self._heap: List[Tuple[float, int, float]] = []
+        self._generation = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __contains__(self, sensor_id: str) -> bool:
+        return sensor_id in self._intervals
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add(self, sensor_id: str, interval_seconds: float):
+        """Schedule a sensor; a new interval group is polled on the next scheduler pass."""
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        interval = float(interval_seconds)
+        if self._intervals.get(sensor_id) == interval:
+            return
+        self.remove(sensor_id)
+
+        group = self._groups.get(interval)
+        if group is None:
+            self._generation += 1
+            group = _IntervalGroup(interval=interval, generation=self._generation, due=self._now())
+            self._groups[interval] = group
+            heapq.heappush(self._heap, (group.due, group.generation, interval))
+            if self._wakeup is not None:
+                self._wakeup.set()
+        group.sensor_ids.add(sensor_id)
+        self._intervals[sensor_id] = interval
+
+    def remove(self, sensor_id: str) -> bool:
+        """Stop polling a sensor; returns False when it was not scheduled."""
+        interval = self._intervals.pop(sensor_id, None)
+        if interval is None:
+            return False
+        group = self._groups[interval]
+        group.sensor_ids.discard(sensor_id)
+        if not group.sensor_ids:
+            del self._groups[interval]
+            if group.task is not None:
+                group.task.cancel()
+        return True
+
+    def start(self):
+        if self.is_running:
+            return
+        self._wakeup = asyncio.Event()
+        # Groups added while stopped start on the first pass rather than catching up missed ticks
+        now = self._now()
+        self._heap = []
+        for group in self._groups.values():
+            group.due = now
+            heapq.heappush(self._heap, (group.due, group.generation, group.interval))
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = [group.task for group in self._groups.values() if group.task is not None]
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for group in self._groups.values():
+            group.task = None
+        self._task = None
+        self._wakeup = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-interval sensor counts, scheduling lag and backpressure counters."""
+        return {
+            "running": self.is_running,
+            "scheduled_sensors": len(self._intervals),
+            "intervals": {
+                f"{interval:g}s": {"sensors": len(group.sensor_ids), **group.stats.to_dict()}
+                for interval, group in sorted(self._groups.items())
+            }
+        }
+
+    @staticmethod
+    def _now() -> float:
+        try:
+            return asyncio.get_running_loop().time()
+        except RuntimeError:
+            return 0.0
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due, generation, interval = self._heap[0]
+            group = self._groups.get(interval)
+            if group is None or group.generation != generation:
+                heapq.heappop(self._heap)
+                continue
+
+            now = self._now()
+            if due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            self._dispatch(group, due, now)
+
+            # Keep the original phase; ticks that already passed are dropped, not replayed
+            missed = math.floor((now - due) / interval)
+            group.stats.skipped_ticks += missed
+            group.due = due + (missed + 1) * interval
+            heapq.heappush(self._heap, (group.due, generation, interval))
+
+    def _dispatch(self, group: _IntervalGroup, due: float, now: float):
+        if group.task is not None and not group.task.done():
+            # Previous batch overran its slot: skip this tick rather than queue more reads
+            group.stats.overruns += 1
+            return
+        group.stats.record_lag(now - due)
+        group.task = asyncio.create_task(self._poll_group(group, sorted(group.sensor_ids)))
+
+    async def _poll_group(self, group: _IntervalGroup, sensor_ids: List[str]):
+        started = self._now()
+        for offset in range(0, len(sensor_ids), self.max_batch_size):
+            batch = sensor_ids[offset:offset + self.max_batch_size]
+            results = await asyncio.gather(
+                *(self._poll(sensor_id) for sensor_id in batch if sensor_id in self._intervals),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, Exception):
+                    group.stats.errors += 1
+                    logger.error(f"Error polling sensor in {group.interval:g}s group: {result}")
+                else:
+                    group.stats.reads += 1
+        group.stats.last_duration = self._now() - started
@@ -0,0 +1,297 @@
+"""
+Columnar ring-buffer storage for IoT sensor readings.
+
+Each sensor keeps fixed-capacity NumPy arrays for timestamps, data quality,
+battery and signal levels, plus one float column per reading field. Appends
+overwrite the oldest slot once the buffer is full, time-range reads and
+retention expiry binary-search the timestamp column, and an optional rollup
+tier keeps per-bucket means for windows longer than the raw capacity.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_microseconds(ts: datetime) -> int:
+    """Naive local datetime (aware values are converted to local time) to integer microseconds."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone().replace(tzinfo=None)
+    return (ts - _EPOCH) // _MICROSECOND
+
+
+def from_microseconds(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+def _nullable(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else float(value) for value in values]
+
+
+@dataclass
+class SeriesWindow:
+    """Copy of the rows in a time range, oldest first."""
+    timestamps: np.ndarray
+    quality: np.ndarray
+    battery_level: np.ndarray
+    signal_strength: np.ndarray
+    weights: np.ndarray
+    values: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def readings(self, row: int) -> Dict[str, float]:
+        """Reading fields present in a row (missing fields are stored as NaN)."""
+        return {name: float(column[row]) for name, column in self.values.items() if not np.isnan(column[row])}
+
+
+class SensorTimeSeries:
+    """Fixed-capacity columnar ring buffer for one sensor's readings."""
+
+    def __init__(
+        self,
+        capacity: int,
+        rollup_seconds: Optional[float] = None,
+        rollup_capacity: int = 10080
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._quality = np.zeros(capacity)
+        self._battery = np.full(capacity, np.nan)
+        self._signal = np.full(capacity, np.nan)
+        self._weights = np.ones(capacity, dtype=np.int32)
+        self._values: Dict[str, np.ndarray] = {}
+        self._start = 0
+        self._size = 0
+        self.overwritten = 0
+
+        # Optional coarse tier: one row of means per closed bucket
+        self.rollup_us = int(rollup_seconds * 1e6) if rollup_seconds else None
+        self.rollups = SensorTimeSeries(rollup_capacity) if self.rollup_us else None
+        self._bucket: Optional[int] = None
+        self._bucket_sums: Dict[str, float] = {}
+        self._bucket_counts: Dict[str, int] = {}
+        self._bucket_quality = 0.0
+        self._bucket_rows = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._values)
+
+    def _physical(self, logical: np.ndarray) -> np.ndarray:
+        return (self._start + logical) % self.capacity
+
+    def append(
+        self,
+        timestamp: datetime,
+        readings: Dict[str, float],
+        quality: float,
+        battery_level: Optional[float] = None,
+        signal_strength: Optional[float] = None,
+        weight: int = 1
+    ):
+        """Append one reading in O(1), overwriting the oldest row when full.
+
+        Timestamps are expected to be non-decreasing; an earlier timestamp is
+        recorded at the latest stored time so the column stays sorted.
+        """
+        ts = to_microseconds(timestamp)
+        if self._size and ts < self._timestamps[(self._start + self._size - 1) % self.capacity]:
+            ts = int(self._timestamps[(self._start + self._size - 1) % self.capacity])
+
+        if self._size == self.capacity:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+            self.overwritten += 1
+        else:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+
+        self._timestamps[slot] = ts
+        self._quality[slot] = quality
+        self._battery[slot] = np.nan if battery_level is None else battery_level
+        self._signal[slot] = np.nan if signal_strength is None else signal_strength
+        self._weights[slot] = weight
+        for column in self._values.values():
+            column[slot] = np.nan
+        for name, value in readings.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            column = self._values.get(name)
+            if column is None:
+                column = self._values[name] = np.full(self.capacity, np.nan)
+            column[slot] = value
+
+        if self.rollups is not None:
+            self._accumulate(ts, readings, quality)
+
+    def _accumulate(self, ts: int, readings: Dict[str, float], quality: float):
+        bucket = ts // self.rollup_us
+        if self._bucket is not None and bucket != self._bucket:
+            self.flush_rollup()
+        self._bucket = bucket
+        for name, value in readings.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self._bucket_sums[name] = self._bucket_sums.get(name, 0.0) + value
+                self._bucket_counts[name] = self._bucket_counts.get(name, 0) + 1
+        self._bucket_quality += quality
+        self._bucket_rows += 1
+
+    def flush_rollup(self):
+        """Close the current rollup bucket and append its means to the rollup tier."""
+        if self.rollups is None or self._bucket is None or not self._bucket_rows:
+            return
+        means = {name: total / self._bucket_counts[name] for name, total in self._bucket_sums.items()}
+        self.rollups.append(
+            from_microseconds(self._bucket * self.rollup_us),
+            means,
+            self._bucket_quality / self._bucket_rows,
+            weight=self._bucket_rows
+        )
+        self._bucket = None
+        self._bucket_sums, self._bucket_counts = {}, {}
+        self._bucket_quality, self._bucket_rows = 0.0, 0
+
+    def _search(self, ts: int, side: str) -> int:
+        """Logical index of ts in the sorted timestamp column (numpy searchsorted semantics)."""
+        end = self._start + self._size
+        first = self._timestamps[self._start:min(end, self.capacity)]
+        if end <= self.capacity:
+            return int(np.searchsorted(first, ts, side=side))
+        second = self._timestamps[:end - self.capacity]
+        position = int(np.searchsorted(first, ts, side=side))
+        if position < len(first):
+            return position
+        return len(first) + int(np.searchsorted(second, ts, side=side))
+
+    def expire(self, cutoff: datetime) -> int:
+        """Drop rows at or before cutoff without moving data; returns how many raw rows were dropped."""
+        if self.rollups is not None:
+            # Keep the bucket that straddles the cutoff
+            self.rollups.expire(cutoff - timedelta(microseconds=self.rollup_us))
+        if not self._size:
+            return 0
+        dropped = self._search(to_microseconds(cutoff), "right")
+        self._start = (self._start + dropped) % self.capacity
+        self._size -= dropped
+        return dropped
+
+    def clear(self):
+        self._start = self._size = 0
+
+    def window(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> SeriesWindow:
+        """Rows with since < timestamp <= until, oldest first."""
+        lo = self._search(to_microseconds(since), "right") if since is not None and self._size else 0
+        hi = self._search(to_microseconds(until), "right") if until is not None and self._size else self._size
+        return self._gather(np.arange(lo, max(lo, hi)))
+
+    def latest(self) -> Optional[SeriesWindow]:
+        if not self._size:
+            return None
+        return self._gather(np.array([self._size - 1]))
+
+    def oldest_timestamp(self) -> Optional[datetime]:
+        return from_microseconds(self._timestamps[self._start]) if self._size else None
+
+    def latest_timestamp(self) -> Optional[datetime]:
+        if not self._size:
+            return None
+        return from_microseconds(self._timestamps[(self._start + self._size - 1) % self.capacity])
+
+    def _gather(self, logical: np.ndarray) -> SeriesWindow:
+        rows = self._physical(logical)
+        return SeriesWindow(
+            timestamps=self._timestamps[rows],
+            quality=self._quality[rows],
+            battery_level=self._battery[rows],
+            signal_strength=self._signal[rows],
+            weights=self._weights[rows],
+            values={name: column[rows] for name, column in self._values.items()}
+        )
+
+    def downsample(
+        self,
+        bucket_seconds: float,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Dict[str, object]:
+        """
+        Aggregate readings into fixed-width time buckets.
+
+        Buckets are aligned to multiples of bucket_seconds. When the window
+        starts before the oldest raw row, closed rollup buckets fill the gap:
+        their means are weighted by the readings they summarize, and their
+        min/max are the bucket means.
+
+        Returns:
+            {"timestamps": bucket start datetimes, "fields": {name: {"mean", "min", "max", "count"}}}
+        """
+        parts = []
+        raw_since = since
+        oldest = self.oldest_timestamp()
+        if self.rollups is not None and len(self.rollups) and (
+            since is None or oldest is None or to_microseconds(since) < to_microseconds(oldest)
+        ):
+            if oldest is None:
+                cut = None
+            else:
+                # Raw rows start mid-bucket; use the closed rollup for that bucket when it exists
+                bucket_start = to_microseconds(oldest) // self.rollup_us * self.rollup_us
+                closed = to_microseconds(self.rollups.latest_timestamp()) >= bucket_start
+                cut = from_microseconds(bucket_start + (self.rollup_us if closed else 0) - 1)
+                if since is None or to_microseconds(since) < to_microseconds(cut):
+                    raw_since = cut
+            parts.append(self.rollups.window(since, cut if until is None or cut is None else min(cut, until)))
+        parts.append(self.window(raw_since, until))
+
+        timestamps = np.concatenate([part.timestamps for part in parts])
+        weights = np.concatenate([part.weights for part in parts]).astype(float)
+        names = sorted({name for part in parts for name in part.values})
+        if not len(timestamps):
+            return {"timestamps": [], "fields": {name: {"mean": [], "min": [], "max": [], "count": []} for name in names}}
+
+        bucket_us = int(bucket_seconds * 1e6)
+        origin = int(timestamps[0]) // bucket_us * bucket_us
+        buckets = (timestamps - origin) // bucket_us
+        keys, starts = np.unique(buckets, return_index=True)
+
+        fields = {}
+        for name in names:
+            values = np.concatenate([
+                part.values.get(name, np.full(len(part), np.nan)) for part in parts
+            ])
+            present = ~np.isnan(values)
+            counts = np.add.reduceat(np.where(present, weights, 0.0), starts)
+            sums = np.add.reduceat(np.where(present, values * weights, 0.0), starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = sums / counts
+            fields[name] = {
+                "mean": _nullable(means),
+                "min": _nullable(np.fmin.reduceat(values, starts)),
+                "max": _nullable(np.fmax.reduceat(values, starts)),
+                "count": counts.astype(int).tolist()
+            }
+
+        return {
+            "timestamps": [from_microseconds(origin + int(key) * bucket_us) for key in keys],
+            "fields": fields
+        }
+
+    def memory_bytes(self) -> int:
+        arrays = [self._timestamps, self._quality, self._battery, self._signal, self._weights, *self._values.values()]
+        total = sum(array.nbytes for array in arrays)
+        return total + (self.rollups.memory_bytes() if self.rollups is not None else 0)
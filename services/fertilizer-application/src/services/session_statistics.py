@@ -0,0 +1,215 @@
+"""
+Streaming statistics for real-time application sessions.
+
+Each accumulator folds in one value at a time in constant time and memory:
+Welford running mean/variance, an exponentially weighted moving average,
+a mean over a bounded window of recent values, and P-squared quantile
+estimates (Jain & Chlamtac, 1985). SessionStatistics bundles the ones the
+monitoring service reports so session metrics no longer rescan every data
+point on each update.
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.models.application_monitoring_models import ApplicationMonitoringData
+
+QUALITY_CHECK_WINDOW = 10
+RATE_DEVIATION_QUANTILES = (0.5, 0.9, 0.95)
+
+
+class RunningStats:
+    """Welford running mean and sample variance."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def push(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, as statistics.variance; 0.0 for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(max(self.variance, 0.0))
+
+
+class EWMA:
+    """Exponentially weighted moving average seeded with the first value."""
+
+    def __init__(self, alpha: float = 0.2):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def push(self, value: float):
+        self.value = value if self.value is None else self.value + self.alpha * (value - self.value)
+
+
+class WindowedMean:
+    """Mean of the most recent values in a fixed-size window."""
+
+    def __init__(self, size: int):
+        self.values = deque(maxlen=size)
+        self._sum = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            self._sum -= self.values[0]
+        self.values.append(value)
+        self._sum += value
+
+    @property
+    def mean(self) -> float:
+        return self._sum / len(self.values) if self.values else 0.0
+
+
+class P2Quantile:
+    """P-squared streaming quantile estimate using five markers."""
+
+    def __init__(self, p: float):
+        if not 0 < p < 1:
+            raise ValueError("p must be in (0, 1)")
+        self.p = p
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def push(self, value: float):
+        self.count += 1
+        q = self._heights
+        if self.count <= 5:
+            q.append(value)
+            q.sort()
+            return
+
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = next(i for i in range(1, 5) if value < q[i]) - 1
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = candidate
+                n[i] += step
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.count:
+            return None
+        if self.count > 5:
+            return self._heights[2]
+        # Exact interpolated quantile while only the first few values are held
+        rank = self.p * (self.count - 1)
+        lower = int(rank)
+        upper = min(lower + 1, self.count - 1)
+        return self._heights[lower] + (rank - lower) * (self._heights[upper] - self._heights[lower])
+
+
+class SessionStatistics:
+    """Incremental metrics for one monitoring session."""
+
+    def __init__(
+        self,
+        window: int = QUALITY_CHECK_WINDOW,
+        ewma_alpha: float = 0.2,
+        quantiles: Sequence[float] = RATE_DEVIATION_QUANTILES
+    ):
+        self.count = 0
+        self.latest: Optional[ApplicationMonitoringData] = None
+
+        self.rate = RunningStats()
+        self.rate_ewma = EWMA(ewma_alpha)
+        self.rate_deviation = RunningStats()  # Absolute deviation, percent
+        self.coverage = RunningStats()
+        self.quality = RunningStats()
+        self.efficiency = RunningStats()
+        self.drift = RunningStats()
+
+        self.recent_rate_deviation = WindowedMean(window)
+        self.recent_coverage = WindowedMean(window)
+        self.recent_drift = WindowedMean(window)
+
+        self.rate_deviation_quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def update(self, data: ApplicationMonitoringData):
+        """Fold one monitoring data point into every accumulator."""
+        deviation = abs(data.rate_deviation)
+        self.count += 1
+        self.latest = data
+
+        self.rate.push(data.application_rate)
+        self.rate_ewma.push(data.application_rate)
+        self.rate_deviation.push(deviation)
+        self.coverage.push(data.coverage_uniformity)
+        self.quality.push(data.quality_score)
+        self.efficiency.push(data.application_efficiency)
+        self.drift.push(data.drift_potential)
+
+        self.recent_rate_deviation.push(deviation)
+        self.recent_coverage.push(data.coverage_uniformity)
+        self.recent_drift.push(data.drift_potential)
+
+        for estimator in self.rate_deviation_quantiles.values():
+            estimator.push(deviation)
+
+    @property
+    def rate_variability(self) -> float:
+        """Coefficient of variation of the application rate, percent."""
+        if self.rate.count < 2 or not self.rate.mean:
+            return 0.0
+        return self.rate.stdev / self.rate.mean * 100
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "data_points": self.count,
+            "average_rate": self.rate.mean,
+            "rate_ewma": self.rate_ewma.value,
+            "rate_variability": self.rate_variability,
+            "average_coverage": self.coverage.mean,
+            "rate_deviation_quantiles": {
+                f"p{int(p * 100)}": estimator.value for p, estimator in self.rate_deviation_quantiles.items()
+            },
+            "recent": {
+                "rate_deviation": self.recent_rate_deviation.mean,
+                "coverage_uniformity": self.recent_coverage.mean,
+                "drift_potential": self.recent_drift.mean
+            }
+        }
@@ -0,0 +1,124 @@
+"""
+Test suite for the cached equipment compatibility score tensor.
+"""
+
+import pytest
+import numpy as np
+from types import SimpleNamespace
+
+from src.services.compatibility_tensor import (
+    CompatibilityTensor,
+    FieldBatch,
+    FACTORS,
+    DEFAULT_SOIL_TYPE_SCORE
+)
+from src.models.equipment_models import EquipmentCategory, EquipmentStatus, FertilizerFormulation
+
+
+class _CatalogStub:
+    """Minimal stand-in for EquipmentCompatibilityDatabase lookups."""
+
+    def __init__(self):
+        self.equipment_catalog = {
+            "spreader": {
+                "field_size_suitability": {"min": 10, "max": 500, "optimal": 100},
+                "coverage_rate": {"max": 20},
+                "automation_level": "automatic"
+            }
+        }
+        self.cost_ranges = {"spreader": {"cost_per_acre": {"typical": 1.2}}}
+        self.compatibility_matrix = {
+            (FertilizerFormulation.GRANULAR, EquipmentCategory.SPREADING): {"score": 0.95},
+            (FertilizerFormulation.LIQUID, EquipmentCategory.SPRAYING): {"score": 0.9}
+        }
+
+    def get_equipment_specs(self, equipment_type):
+        return self.equipment_catalog.get(equipment_type, {})
+
+    def get_cost_data(self, equipment_type):
+        return self.cost_ranges.get(equipment_type, {})
+
+    def get_compatibility(self, fertilizer_type, equipment_category):
+        return self.compatibility_matrix.get((fertilizer_type, equipment_category), {"score": 0.0})
+
+
+class TestCompatibilityTensor:
+    """Test suite for CompatibilityTensor and FieldBatch."""
+
+    @pytest.fixture
+    def tensor(self):
+        equipment = [
+            SimpleNamespace(equipment_id="spreader_1", category=EquipmentCategory.SPREADING,
+                            capacity=10.0, status=EquipmentStatus.OPERATIONAL, equipment_type="spreader"),
+            SimpleNamespace(equipment_id="sprayer_1", category=EquipmentCategory.SPRAYING,
+                            capacity=None, status=EquipmentStatus.OPERATIONAL, equipment_type="sprayer")
+        ]
+        return CompatibilityTensor(
+            equipment,
+            [FertilizerFormulation.GRANULAR, FertilizerFormulation.LIQUID],
+            _CatalogStub(),
+            equipment_type_of=lambda item: item.equipment_type
+        )
+
+    @pytest.fixture
+    def fields(self):
+        return FieldBatch.from_fields([
+            {"size_acres": 100.0, "soil_type": "loam"},
+            {"size_acres": 5.0, "soil_type": "Clay", "weather_conditions": {"wind_speed_mph": 16},
+             "cost_constraints": 8.0},
+            {"size_acres": 1000.0, "soil_type": "peat", "cost_constraints": 0}
+        ])
+
+    def test_field_batch_defaults(self, fields):
+        """Test unknown soils, missing weather and zero budgets fall back to defaults."""
+        assert fields.soil_scores.tolist() == [1.0, 0.85, DEFAULT_SOIL_TYPE_SCORE]
+        assert fields.wind_speed_mph.tolist() == [5.0, 16.0, 5.0]
+        assert np.isnan(fields.cost_constraints[0])
+        assert fields.cost_constraints[1] == 8.0
+        assert np.isnan(fields.cost_constraints[2])
+
+    def test_field_factor_scores(self, tensor, fields):
+        """Test field-dependent factors follow the per-combination scoring rules."""
+        scores = tensor.field_factor_scores(fields)
+
+        # In range at the optimum, below the minimum, above the maximum; no specs scores 0.5
+        assert scores["field_size_suitability"].tolist() == [[1.0, 0.5], [0.3, 0.5], [0.4, 0.5]]
+        # 5, 0.25 and 50 hours at the maximum coverage rate; no capacity scores 0.5
+        assert scores["application_rate_capability"].tolist() == [[0.85, 0.5], [1.0, 0.5], [0.5, 0.5]]
+        # Calm for both, moderate for the spreader and high for the sprayer at 16 mph
+        assert scores["weather_resilience"].tolist() == [[0.95, 0.9], [0.7, 0.3], [0.95, 0.9]]
+        # Unbudgeted typical cost, $6 against an $8 budget, zero budget treated as none
+        assert scores["cost_effectiveness"].tolist() == [[1.0, 0.5], [0.8, 0.5], [1.0, 0.5]]
+
+    def test_score_combines_weighted_factors(self, tensor, fields):
+        """Test overall scores are the weighted mean of every factor."""
+        weights = {name: 1.0 for name in FACTORS}
+        weights["fertilizer_type_compatibility"] = 2.0
+
+        batch = tensor.score(fields, weights)
+
+        assert batch.overall.shape == (3, 2, 2)
+        field_scores = tensor.field_factor_scores(fields)
+        for f in range(3):
+            for e in range(2):
+                for j in range(2):
+                    expected = (
+                        sum(field_scores[name][f, e] for name in field_scores)
+                        + tensor.labor_scores[e]
+                        + tensor.availability_scores[e]
+                        + 2.0 * tensor.fertilizer_scores[e, j]
+                    ) / 9.0
+                    assert batch.overall[f, e, j] == pytest.approx(expected)
+
+    def test_subset_matches_full_tensor(self, tensor, fields):
+        """Test a category and fertilizer subset scores like the matching slice of the full tensor."""
+        weights = {name: 1.0 for name in FACTORS}
+        view = tensor.subset(
+            fertilizer_types=[FertilizerFormulation.LIQUID],
+            categories=[EquipmentCategory.SPRAYING]
+        )
+
+        assert view.equipment_ids == ["sprayer_1"]
+        assert view.fertilizer_types == [FertilizerFormulation.LIQUID]
+        full = tensor.score(fields, weights).overall
+        assert view.score(fields, weights).overall == pytest.approx(full[:, 1:, 1:])
@@ -4,15 +4,18 @@ Comprehensive test suite for the enhanced Cost Analysis Service.
 
 import pytest
 import asyncio
+import numpy as np
 from unittest.mock import AsyncMock, patch, MagicMock
 from typing import List, Dict, Any
 
 from src.services.cost_analysis_service import (
     CostAnalysisService, 
+    CostView,
     LaborSkillLevel, 
     SeasonalConstraint, 
     EconomicScenario
 )
+from src.services.cost_sensitivity_model import CostSensitivityModel, COEFFICIENTS
 from src.models.application_models import (
     ApplicationMethod, 
     FieldConditions, 
@@ -437,6 +440,125 @@ class TestCostAnalysisService:
         assert scenario_costs["optimistic"] < scenario_costs["realistic"]
         assert scenario_costs["realistic"] < scenario_costs["pessimistic"]
 
+    @pytest.mark.asyncio
+    async def test_scenario_analysis_leaves_cost_database_untouched(self, cost_service, sample_application_methods,
+                                                                   sample_field_conditions, sample_crop_requirements,
+                                                                   sample_fertilizer_specification, sample_equipment_specifications):
+        """Test concurrent scenario analyses price through views without mutating shared rates."""
+        import copy
+        
+        original = copy.deepcopy(cost_service.cost_database)
+        args = (sample_application_methods, sample_field_conditions, sample_crop_requirements,
+                sample_fertilizer_specification, sample_equipment_specifications)
+        
+        crisis, optimistic, baseline = await asyncio.gather(
+            cost_service.perform_economic_scenario_analysis(*args, [EconomicScenario.CRISIS]),
+            cost_service.perform_economic_scenario_analysis(*args, [EconomicScenario.OPTIMISTIC]),
+            cost_service.analyze_application_costs(*args)
+        )
+        
+        assert cost_service.cost_database == original
+        realistic = await cost_service.perform_economic_scenario_analysis(*args, [EconomicScenario.REALISTIC])
+        base_costs = [m["cost_per_acre"] for m in baseline["method_costs"]]
+        assert [m["cost_per_acre"] for m in realistic["scenario_results"]["realistic"]["method_costs"]] == pytest.approx(base_costs)
+        
+        crisis_labor = crisis["scenario_results"]["crisis"]["method_costs"][0]["labor_costs"]["labor_rate"]
+        base_labor = baseline["method_costs"][0]["labor_costs"]["labor_rate"]
+        assert crisis_labor == pytest.approx(base_labor * 1.4)
+        assert optimistic["scenario_results"]["optimistic"]["method_costs"][0]["labor_costs"]["labor_rate"] == pytest.approx(base_labor * 0.95)
+    
+    def test_cost_view_scaling(self, cost_service):
+        """Test cost views scale known entries and leave fallback defaults unscaled."""
+        view = CostView(cost_service.cost_database, {"fuel_multiplier": 2.0, "equipment_multiplier": 1.5})
+        
+        assert view.fuel_cost("diesel") == pytest.approx(7.0)
+        assert view.labor_rate("skilled") == pytest.approx(25.0)
+        assert view.equipment_cost("sprayer", "rental_per_day", 150.0) == pytest.approx(300.0)
+        assert view.equipment_cost("unknown", "rental_per_day", 150.0) == 150.0
+        assert cost_service.cost_database["fuel_costs"]["diesel"] == 3.50
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("owned", [True, False])
+    async def test_cost_sensitivity_model_matches_pipeline(self, cost_service, sample_application_methods,
+                                                          sample_field_conditions, sample_crop_requirements,
+                                                          sample_fertilizer_specification, sample_equipment_specifications,
+                                                          owned):
+        """Test the vectorized model reproduces pipeline costs for owned and rented equipment."""
+        equipment = sample_equipment_specifications if owned else []
+        args = (sample_application_methods, sample_field_conditions, sample_crop_requirements,
+                sample_fertilizer_specification, equipment)
+        
+        model = await cost_service.build_cost_sensitivity_model(*args)
+        analysis = await cost_service.analyze_application_costs(*args)
+        
+        assert model.baseline() == pytest.approx([m["cost_per_acre"] for m in analysis["method_costs"]])
+        
+        # Doubling the field size matches a pipeline run on the larger field
+        larger = sample_field_conditions.model_copy(update={"field_size_acres": sample_field_conditions.field_size_acres * 2})
+        scaled = await cost_service.analyze_application_costs(
+            sample_application_methods, larger, sample_crop_requirements, sample_fertilizer_specification, equipment
+        )
+        assert model.evaluate(field_size=2.0) == pytest.approx([m["cost_per_acre"] for m in scaled["method_costs"]])
+    
+    @pytest.mark.asyncio
+    async def test_analyze_cost_sensitivity(self, cost_service, sample_application_methods,
+                                           sample_field_conditions, sample_crop_requirements,
+                                           sample_fertilizer_specification, sample_equipment_specifications):
+        """Test tornado, elasticities, break-even points and surfaces from one model."""
+        result = await cost_service.analyze_cost_sensitivity(
+            sample_application_methods, sample_field_conditions, sample_crop_requirements,
+            sample_fertilizer_specification, sample_equipment_specifications,
+            surface_parameters=("fertilizer_price", "labor_rate")
+        )
+        
+        methods = result["method_types"]
+        assert len(methods) == 2
+        surface = result["surface"]["cost_per_acre"]
+        assert len(surface[methods[0]]) == 50 and len(surface[methods[0]][0]) == 50
+        
+        for method in methods:
+            elasticities = result["elasticities"][method]
+            # Cost is linear in fertilizer price and rate, so their elasticities match
+            assert elasticities["fertilizer_price"] == pytest.approx(elasticities["application_rate"])
+            assert 0 < elasticities["labor_rate"] < 1
+            # Fixed per-field fertilizer and capped maintenance make cost per acre fall with size
+            assert elasticities["field_size"] < 0
+        
+        # Every price and rate multiplier raises cost per acre
+        for name in ("fertilizer_price", "application_rate", "equipment_rate", "labor_rate", "fuel_price"):
+            ranges = result["tornado"][name]
+            assert all(low < high for low, high in zip(ranges["low"], ranges["high"]))
+        
+        for points in result["break_even_points"].values():
+            for point in points:
+                assert 0.5 <= point["value"] <= 1.5
+        
+        with pytest.raises(ValueError):
+            await cost_service.analyze_cost_sensitivity(
+                sample_application_methods, sample_field_conditions, sample_crop_requirements,
+                sample_fertilizer_specification, sample_equipment_specifications, parameters=["interest_rate"]
+            )
+    
+    def test_cost_sensitivity_break_even_interpolation(self):
+        """Test break-even points land where linear method costs cross."""
+        zeros = [0.0, 0.0]
+        model = CostSensitivityModel(
+            ["broadcast", "band"], 100.0, None,
+            {name: zeros for name in COEFFICIENTS} | {
+                "labor_rate": [20.0, 10.0], "labor_hours_per_acre": [1.0, 1.0],
+                "fuel_price": [1.0, 1.0], "fuel_per_acre": [10.0, 25.0]
+            }
+        )
+        
+        # broadcast: 20k + 10 + 0.01, band: 10k + 25 + 0.01 -> cross at k = 1.5
+        points = model.break_even_points("labor_rate", np.linspace(0.5, 2.0, 31))
+        assert len(points) == 1
+        assert points[0]["methods"] == ["broadcast", "band"]
+        assert points[0]["value"] == pytest.approx(1.5)
+        
+        target = model.break_even_points("labor_rate", np.linspace(0.5, 2.0, 8), target_cost_per_acre=31.51)
+        assert {p["methods"][0]: p["value"] for p in target} == pytest.approx({"broadcast": 1.075, "band": 0.65})
+    
     @pytest.mark.asyncio
     async def test_break_even_analysis_logic(self, cost_service, sample_application_methods,
                                             sample_field_conditions, sample_crop_requirements,
@@ -16,6 +16,8 @@ from src.services.iot_sensor_service import (
     MQTTSensorConnector, HTTPSensorConnector, WebSocketSensorConnector
 )
 from src.models.application_monitoring_models import SensorData, SensorType, IoTProtocol
+from src.services.sensor_time_series import SensorTimeSeries
+from src.services.sensor_polling_scheduler import SensorPollingScheduler
 
 
 class TestIoTSensorService:
@@ -96,7 +98,7 @@ class TestIoTSensorService:
         assert sample_config.sensor_id in service.sensor_connectors
         assert sample_config.sensor_id in service.sensor_configs
         assert sample_config.sensor_id in service.sensor_data_cache
-        assert sample_config.sensor_id in service.data_collection_tasks
+        assert sample_config.sensor_id in service.polling_scheduler
         
         # Clean up
         await service.stop_service()
@@ -137,7 +139,7 @@ class TestIoTSensorService:
         assert sample_config.sensor_id not in service.sensor_connectors
         assert sample_config.sensor_id not in service.sensor_configs
         assert sample_config.sensor_id not in service.sensor_data_cache
-        assert sample_config.sensor_id not in service.data_collection_tasks
+        assert sample_config.sensor_id not in service.polling_scheduler
         
         await service.stop_service()
     
@@ -148,7 +150,7 @@ class TestIoTSensorService:
         await service.register_sensor(sample_config)
         
         # Add some sensor data
-        service.sensor_data_cache[sample_config.sensor_id] = [sample_sensor_data]
+        service._record_sensor_data(sample_sensor_data)
         
         data = await service.get_sensor_data(sample_config.sensor_id, 60)
         
@@ -164,7 +166,7 @@ class TestIoTSensorService:
         await service.register_sensor(sample_config)
         
         # Add some sensor data
-        service.sensor_data_cache[sample_config.sensor_id] = [sample_sensor_data]
+        service._record_sensor_data(sample_sensor_data)
         
         latest_data = await service.get_latest_sensor_data(sample_config.sensor_id)
         
@@ -242,7 +244,7 @@ class TestIoTSensorService:
         await service.register_sensor(sample_config)
         
         # Add some sensor data
-        service.sensor_data_cache[sample_config.sensor_id] = [sample_sensor_data]
+        service._record_sensor_data(sample_sensor_data)
         
         aggregated = await service.aggregate_sensor_data(
             sample_config.equipment_id,
@@ -329,18 +331,192 @@ class TestIoTSensorService:
             data_quality=0.95
         )
         
-        service.sensor_data_cache[sample_config.sensor_id] = [old_data, recent_data]
+        service._record_sensor_data(old_data)
+        service._record_sensor_data(recent_data)
         
         # Cleanup old data
         await service._cleanup_old_data(sample_config.sensor_id, 24)
         
-        remaining_data = service.sensor_data_cache[sample_config.sensor_id]
-        assert len(remaining_data) == 1
+        remaining_data = await service.get_sensor_data(sample_config.sensor_id, 24 * 60)
+        assert len(service.sensor_data_cache[sample_config.sensor_id]) == 1
         assert remaining_data[0].timestamp == recent_data.timestamp
         
         await service.stop_service()
 
 
+class TestSensorTimeSeries:
+    """Test suite for the columnar sensor ring buffer."""
+    
+    def _fill(self, series, start, count, step_seconds=1):
+        for i in range(count):
+            series.append(start + timedelta(seconds=i * step_seconds), {"flow_rate": float(i)}, 0.9)
+    
+    def test_wraparound_keeps_newest_rows_in_order(self):
+        """Test appends past capacity overwrite the oldest rows and reads stay ordered."""
+        series = SensorTimeSeries(capacity=5)
+        start = datetime(2024, 5, 1, 8, 0, 0)
+        self._fill(series, start, 8)
+        
+        window = series.window()
+        
+        assert len(series) == 5
+        assert series.overwritten == 3
+        assert window.values["flow_rate"].tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+        assert series.latest().readings(0) == {"flow_rate": 7.0}
+    
+    def test_time_range_reads_and_expiry(self):
+        """Test binary-searched windows and expiry across the wrap point."""
+        series = SensorTimeSeries(capacity=6)
+        start = datetime(2024, 5, 1, 8, 0, 0)
+        self._fill(series, start, 9)  # Holds readings 3..8, wrapped
+        
+        window = series.window(since=start + timedelta(seconds=4), until=start + timedelta(seconds=7))
+        assert window.values["flow_rate"].tolist() == [5.0, 6.0, 7.0]
+        
+        assert series.expire(start + timedelta(seconds=5)) == 3
+        assert series.window().values["flow_rate"].tolist() == [6.0, 7.0, 8.0]
+        assert series.oldest_timestamp() == start + timedelta(seconds=6)
+        
+        series.append(start + timedelta(seconds=20), {"pressure": 30.0}, 0.8, battery_level=50.0)
+        latest = series.latest()
+        assert latest.readings(0) == {"pressure": 30.0}
+        assert latest.battery_level[0] == 50.0
+    
+    def test_downsample_merges_rollups_beyond_raw_capacity(self):
+        """Test long windows combine closed rollup buckets with raw readings."""
+        start = datetime(2024, 5, 1, 8, 0, 0)
+        series = SensorTimeSeries(capacity=90, rollup_seconds=60)
+        self._fill(series, start, 180)  # Three minutes; raw keeps the last 90 seconds
+        
+        rollup = series.downsample(60, since=start - timedelta(seconds=1))
+        
+        stats = rollup["fields"]["flow_rate"]
+        assert rollup["timestamps"] == [start + timedelta(minutes=m) for m in range(3)]
+        assert stats["count"] == [60, 60, 60]  # Minute 1 comes from its rollup, not raw rows too
+        assert stats["mean"] == pytest.approx([29.5, 89.5, 149.5])
+        assert stats["max"] == [29.5, 89.5, 179.0]  # Rollup buckets report their means
+        
+        # Readings in the still-open bucket that fell out of the raw buffer are not counted
+        series = SensorTimeSeries(capacity=30, rollup_seconds=60)
+        self._fill(series, start, 180)
+        assert series.downsample(60)["fields"]["flow_rate"]["count"] == [60, 60, 30]
+    
+    def test_service_sizes_buffers_from_config(self):
+        """Test buffer capacity follows retention and polling rate, with rollups for long retention."""
+        service = IoTSensorService()
+        base = dict(
+            sensor_type=SensorType.FLOW_METER, equipment_id="eq", location={}, calibration_data={},
+            alert_thresholds={}, connection_params={}
+        )
+        short = service._create_time_series(SensorConfiguration(
+            sensor_id="a", update_frequency_seconds=5, data_retention_hours=1, **base
+        ))
+        long = service._create_time_series(SensorConfiguration(
+            sensor_id="b", update_frequency_seconds=1, data_retention_hours=24, **base
+        ))
+        
+        assert short.capacity == 721 and short.rollups is None
+        assert long.capacity < 24 * 3600 and long.rollups is not None
+
+
+class TestSensorPollingScheduler:
+    """Test suite for the multiplexed sensor polling scheduler."""
+    
+    @pytest.mark.asyncio
+    async def test_groups_sensors_by_interval(self):
+        """Test sensors sharing an interval are polled together from one scheduler task."""
+        polled = []
+        
+        async def poll(sensor_id):
+            polled.append(sensor_id)
+        
+        scheduler = SensorPollingScheduler(poll, max_batch_size=2)
+        for i in range(5):
+            scheduler.add(f"fast_{i}", 0.05)
+        scheduler.add("slow", 10)
+        scheduler.start()
+        await asyncio.sleep(0.12)
+        stats = scheduler.get_stats()
+        await scheduler.stop()
+        
+        assert len(scheduler) == 6
+        assert stats["intervals"]["0.05s"]["sensors"] == 5
+        assert stats["intervals"]["0.05s"]["ticks"] >= 2
+        assert polled.count("slow") == 1
+        # The last dispatched batch may not have started before the stats were read
+        ticks = stats["intervals"]["0.05s"]["ticks"]
+        assert ticks - 1 <= polled.count("fast_0") <= ticks
+        assert stats["intervals"]["0.05s"]["lag_ms"]["max"] >= 0
+    
+    @pytest.mark.asyncio
+    async def test_dynamic_add_and_remove(self):
+        """Test sensors can join and leave while the scheduler runs."""
+        polled = []
+        
+        async def poll(sensor_id):
+            polled.append(sensor_id)
+        
+        scheduler = SensorPollingScheduler(poll)
+        scheduler.start()
+        scheduler.add("a", 0.05)
+        await asyncio.sleep(0.02)
+        assert "a" in polled
+        
+        assert scheduler.remove("a") is True
+        assert scheduler.remove("a") is False
+        polled.clear()
+        await asyncio.sleep(0.08)
+        await scheduler.stop()
+        
+        assert polled == []
+        assert scheduler.get_stats()["intervals"] == {}
+    
+    @pytest.mark.asyncio
+    async def test_overrunning_batch_skips_ticks(self):
+        """Test a batch slower than its interval applies backpressure instead of overlapping reads."""
+        active = 0
+        peak = 0
+        
+        async def poll(sensor_id):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.1)
+            active -= 1
+        
+        scheduler = SensorPollingScheduler(poll)
+        scheduler.add("slow_reader", 0.02)
+        scheduler.start()
+        await asyncio.sleep(0.25)
+        stats = scheduler.get_stats()["intervals"]["0.02s"]
+        await scheduler.stop()
+        
+        assert peak == 1
+        assert stats["overruns"] > 0
+        assert stats["ticks"] <= 3
+    
+    @pytest.mark.asyncio
+    async def test_poll_errors_are_counted(self):
+        """Test a failing sensor does not stop the rest of its batch."""
+        polled = []
+        
+        async def poll(sensor_id):
+            if sensor_id == "broken":
+                raise ConnectionError("sensor offline")
+            polled.append(sensor_id)
+        
+        scheduler = SensorPollingScheduler(poll)
+        scheduler.add("broken", 1)
+        scheduler.add("ok", 1)
+        scheduler.start()
+        await asyncio.sleep(0.02)
+        stats = scheduler.get_stats()["intervals"]["1s"]
+        await scheduler.stop()
+        
+        assert polled == ["ok"]
+        assert stats["errors"] == 1 and stats["reads"] == 1
+
+
 class TestSensorConnectors:
     """Test suite for sensor connectors."""
     
@@ -20,6 +20,10 @@ from src.models.application_monitoring_models import (
     MonitoringSummary, ApplicationStatus, AdjustmentType, MonitoringMetric,
     AlertSeverity, SensorType
 )
+from src.services.session_statistics import (
+    RunningStats, EWMA, WindowedMean, P2Quantile, SessionStatistics
+)
+from src.services.adjustment_rule_engine import AdjustmentRuleEngine
 
 
 class TestRealTimeMonitoringService:
@@ -657,6 +661,204 @@ class TestRealTimeMonitoringService:
         assert sample_session.active_alerts == 1
 
 
+
+class TestSessionStatistics:
+    """Test suite for streaming session statistics."""
+    
+    def _data_point(self, session_id, i, rate_deviation):
+        return ApplicationMonitoringData(
+            application_session_id=session_id,
+            equipment_id="equipment_456",
+            field_id="field_123",
+            application_rate=150.0 + (i % 7) - 3,
+            target_rate=150.0,
+            rate_deviation=rate_deviation,
+            coverage_uniformity=0.8 + (i % 5) * 0.03,
+            coverage_area=0.5,
+            overlap_percentage=10.0,
+            speed=6.0,
+            pressure=30.0,
+            temperature=70.0,
+            humidity=60.0,
+            wind_speed=5.0,
+            wind_direction=180.0,
+            soil_moisture=40.0,
+            latitude=40.0,
+            longitude=-95.0,
+            elevation=900.0,
+            quality_score=0.9,
+            drift_potential=0.1 + (i % 3) * 0.1,
+            application_efficiency=0.9,
+            equipment_status="operational",
+            maintenance_alerts=[]
+        )
+    
+    def test_accumulators_match_batch_formulas(self):
+        """Test Welford, windowed and EWMA results against direct computation."""
+        import random
+        import statistics
+        
+        rng = random.Random(7)
+        values = [rng.gauss(150, 8) for _ in range(500)]
+        running, window, ewma = RunningStats(), WindowedMean(10), EWMA(0.5)
+        for value in values:
+            running.push(value)
+            window.push(value)
+            ewma.push(value)
+        
+        assert running.mean == pytest.approx(statistics.mean(values))
+        assert running.variance == pytest.approx(statistics.variance(values))
+        assert (running.min, running.max) == (min(values), max(values))
+        assert window.mean == pytest.approx(statistics.mean(values[-10:]))
+        assert len(window) == 10
+        
+        expected = values[0]
+        for value in values[1:]:
+            expected = 0.5 * value + 0.5 * expected
+        assert ewma.value == pytest.approx(expected)
+    
+    def test_p2_quantile_estimates(self):
+        """Test P-squared estimates stay close to exact quantiles."""
+        import random
+        
+        rng = random.Random(11)
+        values = [abs(rng.gauss(0, 5)) for _ in range(5000)]
+        estimators = {p: P2Quantile(p) for p in (0.5, 0.9, 0.95)}
+        for value in values:
+            for estimator in estimators.values():
+                estimator.push(value)
+        
+        ordered = sorted(values)
+        for p, estimator in estimators.items():
+            assert estimator.value == pytest.approx(ordered[int(p * len(ordered))], rel=0.05)
+        
+        small = P2Quantile(0.5)
+        for value in (3.0, 1.0, 2.0):
+            small.push(value)
+        assert small.value == 2.0
+    
+    @pytest.mark.asyncio
+    async def test_service_metrics_follow_appended_history(self):
+        """Test session metrics fold in new points and rebuild when history is replaced."""
+        import statistics
+        
+        service = RealTimeMonitoringService()
+        session_id = "session_stats"
+        points = [self._data_point(session_id, i, (i % 9) - 4) for i in range(40)]
+        service.monitoring_data[session_id] = points[:25]
+        
+        assert service._calculate_average_rate(session_id) == pytest.approx(
+            statistics.mean(p.application_rate for p in points[:25])
+        )
+        
+        service.monitoring_data[session_id].extend(points[25:])
+        rates = [p.application_rate for p in points]
+        expected_cv = statistics.stdev(rates) / statistics.mean(rates) * 100
+        assert service._calculate_rate_variability(session_id) == pytest.approx(expected_cv)
+        
+        stats = service._get_session_statistics(session_id)
+        assert stats.count == 40
+        assert stats.recent_coverage.mean == pytest.approx(
+            statistics.mean(p.coverage_uniformity for p in points[-10:])
+        )
+        
+        service.monitoring_data[session_id] = points[:5]
+        assert service._calculate_average_coverage_score(session_id) == pytest.approx(
+            statistics.mean(p.coverage_uniformity for p in points[:5])
+        )
+        assert isinstance(service.session_statistics[session_id], SessionStatistics)
+
+
+class TestAdjustmentRuleEngine:
+    """Test suite for compiled adjustment rule evaluation."""
+    
+    def _data_point(self, **overrides):
+        values = dict(
+            application_session_id="session_rules",
+            equipment_id="equipment_456",
+            field_id="field_123",
+            application_rate=150.0,
+            target_rate=150.0,
+            rate_deviation=0.0,
+            coverage_uniformity=0.9,
+            coverage_area=0.5,
+            overlap_percentage=10.0,
+            speed=6.0,
+            pressure=30.0,
+            temperature=70.0,
+            humidity=60.0,
+            wind_speed=5.0,
+            wind_direction=180.0,
+            soil_moisture=40.0,
+            latitude=40.0,
+            longitude=-95.0,
+            elevation=900.0,
+            quality_score=0.9,
+            drift_potential=0.2,
+            application_efficiency=0.9,
+            equipment_status="operational",
+            maintenance_alerts=[]
+        )
+        values.update(overrides)
+        return ApplicationMonitoringData(**values)
+    
+    def test_field_conditions_are_compiled(self):
+        """Test extra field conditions gate a rule alongside its threshold."""
+        service = RealTimeMonitoringService()
+        wind_rule = next(rule for rule in service.adjustment_rules if rule.metric == MonitoringMetric.WIND_SPEED)
+        engine = AdjustmentRuleEngine(service.adjustment_rules)
+        
+        assert engine.matches(wind_rule, self._data_point(wind_speed=12.0)) is True
+        assert engine.matches(wind_rule, self._data_point(wind_speed=12.0, humidity=90.0)) is False
+        assert engine.matches(wind_rule, self._data_point(wind_speed=8.0)) is False
+        
+        fired = engine.evaluate("s1", self._data_point(wind_speed=12.0, application_rate=162.0, pressure=40.0))
+        assert [rule.metric for rule in fired] == [
+            MonitoringMetric.APPLICATION_RATE, MonitoringMetric.WIND_SPEED, MonitoringMetric.PRESSURE
+        ]
+    
+    def test_cooldown_and_hysteresis_are_per_session(self):
+        """Test cooldown and hysteresis suppress repeat firings within one session only."""
+        cooldown_rule = AdjustmentRule(
+            metric=MonitoringMetric.SPEED, threshold=8.0, adjustment_type=AdjustmentType.RATE_ADJUSTMENT,
+            adjustment_amount=0.1, priority=3, conditions={"cooldown_seconds": 30}
+        )
+        hysteresis_rule = AdjustmentRule(
+            metric=MonitoringMetric.COVERAGE_UNIFORMITY, threshold=0.8,
+            adjustment_type=AdjustmentType.COVERAGE_ADJUSTMENT, adjustment_amount=0.1, priority=2,
+            conditions={"hysteresis": 0.05}
+        )
+        engine = AdjustmentRuleEngine([cooldown_rule, hysteresis_rule])
+        breach = self._data_point(speed=9.0, coverage_uniformity=0.7)
+        
+        assert engine.evaluate("s1", breach, now=0.0) == [cooldown_rule, hysteresis_rule]
+        assert engine.evaluate("s1", breach, now=10.0) == []
+        assert engine.evaluate("s2", breach, now=10.0) == [cooldown_rule, hysteresis_rule]
+        
+        # Recovering to 0.82 is inside the hysteresis band, so coverage stays disarmed
+        engine.evaluate("s1", self._data_point(coverage_uniformity=0.82), now=20.0)
+        assert engine.evaluate("s1", breach, now=40.0) == [cooldown_rule]
+        engine.evaluate("s1", self._data_point(coverage_uniformity=0.9), now=50.0)
+        assert engine.evaluate("s1", breach, now=60.0) == [hysteresis_rule]
+    
+    @pytest.mark.asyncio
+    async def test_registered_rules_feed_adjustments(self):
+        """Test rules added at runtime are compiled and used by adjustment checks."""
+        service = RealTimeMonitoringService()
+        for i in range(40):
+            service.add_adjustment_rule(AdjustmentRule(
+                metric=MonitoringMetric.SOIL_MOISTURE, threshold=50.0 + i,
+                adjustment_type=AdjustmentType.RATE_ADJUSTMENT, adjustment_amount=0.01, priority=4,
+                conditions={}
+            ))
+        
+        adjustments = await service._check_adjustment_needs("s1", self._data_point(soil_moisture=60.5))
+        
+        assert len(service.rule_engine) == len(service.adjustment_rules)
+        assert len(adjustments) == 11
+        assert all(adj.adjustment_type == AdjustmentType.RATE_ADJUSTMENT for adj in adjustments)
+
+
 class TestRealTimeMonitoringIntegration:
     """Integration tests for real-time monitoring service."""
     
@@ -13,6 +13,7 @@ from ..models.commodity_price_models import (
     BasisAnalysis, CommodityType, CommodityContract, CommoditySource
 )
 from ..services.commodity_price_service import CommodityPriceService
+from ..services.price_rollups import get_price_rollup_store
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ router = APIRouter(prefix="/commodity-prices", tags=["commodity-prices"])
 
 # Dependency injection
 async def get_commodity_service() -> CommodityPriceService:
-    return CommodityPriceService()
+    return CommodityPriceService(rollup_store=get_price_rollup_store())
 
 
 @router.get("/current/{commodity}", response_model=CommodityPriceData)
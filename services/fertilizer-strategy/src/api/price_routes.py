@@ -13,6 +13,7 @@ from ..models.price_models import (
     FertilizerType, FertilizerProduct, PriceSource
 )
 from ..services.price_tracking_service import FertilizerPriceTrackingService
+from ..services.price_rollups import RollupGranularity, get_price_rollup_store
 from ..services.scheduled_price_updater import get_scheduler
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/fertilizer-prices", tags=["fertilizer-prices"])
 
 # Dependency injection
 async def get_price_service() -> FertilizerPriceTrackingService:
-    return FertilizerPriceTrackingService()
+    return FertilizerPriceTrackingService(rollup_store=get_price_rollup_store())
 
 
 @router.get("/current/{product}", response_model=FertilizerPriceData)
@@ -131,6 +132,38 @@ async def get_price_trend(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/rollups/{product}", response_model=List[Dict[str, Any]])
+async def get_price_rollups(
+    product: FertilizerProduct,
+    region: str = Query("US", description="Geographic region"),
+    granularity: RollupGranularity = Query(RollupGranularity.DAILY, description="Rollup bucket size"),
+    start_date: Optional[date] = Query(None, description="First period start to include"),
+    end_date: Optional[date] = Query(None, description="Last period start to include"),
+    service: FertilizerPriceTrackingService = Depends(get_price_service)
+):
+    """
+    Get daily, weekly or monthly OHLC price rollups for a fertilizer product.
+    
+    Each bucket carries open/high/low/close, the number of prices observed,
+    their mean and variance, maintained incrementally as prices are updated.
+    
+    Agricultural Use Cases:
+    - Price charts for purchase timing dashboards
+    - Seasonal price pattern review
+    - Volatility comparison across products and regions
+    """
+    try:
+        buckets = await service.get_price_rollups(product, region, granularity, start_date, end_date)
+        return [
+            dict(bucket.to_dict(), variance=bucket.variance)
+            for bucket in buckets
+        ]
+        
+    except Exception as e:
+        logger.error(f"Error getting price rollups: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/query", response_model=PriceQueryResponse)
 async def query_prices(
     request: PriceQueryRequest,
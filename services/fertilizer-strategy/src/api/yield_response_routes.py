@@ -20,6 +20,7 @@ from ..models.yield_response_models import (
     YieldResponseReport, ResponseModelType
 )
 from ..services.yield_response_modeling_service import YieldResponseModelingService
+from ..services.yield_curve_registry import get_yield_curve_registry
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/yield-response", tags=["yield-response-curves"])
@@ -28,7 +29,7 @@ router = APIRouter(prefix="/api/v1/yield-response", tags=["yield-response-curves
 # Dependency injection
 async def get_yield_response_service() -> YieldResponseModelingService:
     """Get yield response modeling service instance."""
-    return YieldResponseModelingService()
+    return YieldResponseModelingService(curve_registry=get_yield_curve_registry())
 
 
 @router.post("/analyze", response_model=YieldResponseAnalysis)
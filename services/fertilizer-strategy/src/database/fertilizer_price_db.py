@@ -6,11 +6,14 @@ import asyncio
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date, timedelta
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Date, Boolean, Integer, Text, JSON
+from sqlalchemy import (
+    create_engine, Column, String, Float, DateTime, Date, Boolean, Integer, Text, JSON,
+    UniqueConstraint, insert, select
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
 import uuid
 import os
 from dotenv import load_dotenv
@@ -62,6 +65,7 @@ class FertilizerPriceHistory(Base):
     
     # Foreign keys
     product_id = Column(UUID(as_uuid=True), nullable=False)
+    specific_product = Column(String(100))  # urea, DAP, MAP, etc.
     
     # Price information
     price_per_unit = Column(Float, nullable=False)
@@ -89,6 +93,34 @@ class FertilizerPriceHistory(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class PriceRollup(Base):
+    """Database model for incrementally maintained price rollups."""
+    __tablename__ = "price_rollups"
+    __table_args__ = (
+        UniqueConstraint("series_key", "granularity", "period_start", name="uq_price_rollup_period"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    series_key = Column(String(150), nullable=False, index=True)  # fertilizer:urea:US
+    granularity = Column(String(10), nullable=False)  # daily, weekly, monthly
+    period_start = Column(Date, nullable=False)
+    
+    # OHLC
+    open_price = Column(Float, nullable=False)
+    high_price = Column(Float, nullable=False)
+    low_price = Column(Float, nullable=False)
+    close_price = Column(Float, nullable=False)
+    first_price_date = Column(Date, nullable=False)
+    last_price_date = Column(Date, nullable=False)
+    
+    # Running moments (Welford)
+    price_count = Column(Integer, nullable=False)
+    mean_price = Column(Float, nullable=False)
+    m2 = Column(Float, nullable=False)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class PriceTrendCache(Base):
     """Database model for cached trend analysis."""
     __tablename__ = "price_trend_cache"
@@ -203,6 +235,38 @@ class FertilizerPriceRepository:
             logger.error(f"Error creating price record: {e}")
             raise
     
+    async def bulk_create_price_records(self, price_records: List[Dict[str, Any]]) -> int:
+        """
+        Create many price records with a single multi-row insert and one commit.
+        
+        Keys that are not price history columns are dropped so callers can pass
+        the same dictionaries used for ``create_price_record``.
+        
+        Returns:
+            Number of rows inserted
+        """
+        if not price_records:
+            return 0
+        
+        columns = set(FertilizerPriceHistory.__table__.columns.keys())
+        now = datetime.utcnow()
+        rows = []
+        for record in price_records:
+            row = {key: value for key, value in record.items() if key in columns}
+            row.setdefault("id", uuid.uuid4())
+            row.setdefault("created_at", now)
+            row.setdefault("updated_at", now)
+            rows.append(row)
+        
+        try:
+            await self.session.execute(insert(FertilizerPriceHistory).values(rows))
+            await self.session.commit()
+            return len(rows)
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error bulk creating {len(rows)} price records: {e}")
+            raise
+    
     async def get_price_history(
         self,
         product_id: str = None,
@@ -281,6 +345,88 @@ class FertilizerPriceRepository:
             logger.error(f"Error getting price trends: {e}")
             raise
     
+    async def get_product_price_history(
+        self,
+        specific_product: str,
+        region: str,
+        start_date: date
+    ) -> List[FertilizerPriceHistory]:
+        """Get raw prices for a product and region from ``start_date`` onwards, oldest first."""
+        try:
+            query = (
+                select(FertilizerPriceHistory)
+                .where(FertilizerPriceHistory.specific_product == specific_product)
+                .where(FertilizerPriceHistory.region == region)
+                .where(FertilizerPriceHistory.price_date >= start_date)
+                .order_by(FertilizerPriceHistory.price_date.asc())
+            )
+            result = await self.session.execute(query)
+            return list(result.scalars().all())
+            
+        except Exception as e:
+            logger.error(f"Error getting product price history: {e}")
+            raise
+    
+    async def upsert_price_rollups(self, rollups: List[Dict[str, Any]]) -> int:
+        """
+        Insert or overwrite rollup buckets with a single statement.
+        
+        Each dictionary carries ``series_key``, ``granularity`` and the bucket
+        fields produced by ``PriceRollupBucket.to_dict``.
+        """
+        if not rollups:
+            return 0
+        
+        # Collapse repeated buckets so one statement never touches a row twice
+        rows = {}
+        now = datetime.utcnow()
+        for rollup in rollups:
+            row = dict(rollup, updated_at=now)
+            rows[(row["series_key"], row["granularity"], row["period_start"])] = row
+        
+        try:
+            statement = pg_insert(PriceRollup).values(list(rows.values()))
+            statement = statement.on_conflict_do_update(
+                constraint="uq_price_rollup_period",
+                set_={
+                    column: statement.excluded[column]
+                    for column in (
+                        "open_price", "high_price", "low_price", "close_price",
+                        "first_price_date", "last_price_date",
+                        "price_count", "mean_price", "m2", "updated_at"
+                    )
+                }
+            )
+            await self.session.execute(statement)
+            await self.session.commit()
+            return len(rows)
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error upserting price rollups: {e}")
+            raise
+    
+    async def get_price_rollups(
+        self,
+        series_keys: List[str],
+        granularity: str,
+        start_date: date
+    ) -> List[PriceRollup]:
+        """Get rollup buckets for one or more series from ``start_date`` onwards."""
+        try:
+            query = (
+                select(PriceRollup)
+                .where(PriceRollup.series_key.in_(series_keys))
+                .where(PriceRollup.granularity == granularity)
+                .where(PriceRollup.period_start >= start_date)
+                .order_by(PriceRollup.series_key, PriceRollup.period_start)
+            )
+            result = await self.session.execute(query)
+            return list(result.scalars().all())
+            
+        except Exception as e:
+            logger.error(f"Error getting price rollups: {e}")
+            raise
+    
     async def cache_trend_analysis(
         self,
         product_id: str,
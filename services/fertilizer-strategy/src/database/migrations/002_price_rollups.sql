@@ -0,0 +1,27 @@
+-- Incrementally maintained price rollups
+-- Daily, weekly and monthly OHLC buckets with Welford moments, upserted by the
+-- price tracking service as prices are written and read by trend endpoints
+
+CREATE TABLE IF NOT EXISTS price_rollups (
+    id UUID PRIMARY KEY,
+    series_key VARCHAR(150) NOT NULL,
+    granularity VARCHAR(10) NOT NULL,
+    period_start DATE NOT NULL,
+    open_price FLOAT NOT NULL,
+    high_price FLOAT NOT NULL,
+    low_price FLOAT NOT NULL,
+    close_price FLOAT NOT NULL,
+    first_price_date DATE NOT NULL,
+    last_price_date DATE NOT NULL,
+    price_count INTEGER NOT NULL,
+    mean_price FLOAT NOT NULL,
+    m2 FLOAT NOT NULL,
+    updated_at TIMESTAMP,
+    CONSTRAINT uq_price_rollup_period UNIQUE (series_key, granularity, period_start)
+);
+
+-- Trend queries load one granularity for a set of series from a start date
+CREATE INDEX IF NOT EXISTS idx_price_rollups_series_granularity_period
+ON price_rollups (series_key, granularity, period_start);
+
+COMMENT ON TABLE price_rollups IS 'Daily/weekly/monthly price rollups (OHLC, count, mean, Welford M2) keyed by price series';
@@ -0,0 +1,8 @@
+-- Product slug on raw price history
+-- Provider product ids differ per source, so rollup backfills look up raw
+-- prices by product slug (urea, dap, ...) and region
+
+ALTER TABLE fertilizer_price_history ADD COLUMN IF NOT EXISTS specific_product VARCHAR(100);
+
+CREATE INDEX IF NOT EXISTS idx_fertilizer_price_history_specific_product_region_date
+ON fertilizer_price_history (specific_product, region, price_date);
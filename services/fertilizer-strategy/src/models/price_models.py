@@ -192,6 +192,41 @@ class PriceUpdateResponse(BaseModel):
     update_timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ProviderFetchStats(BaseModel):
+    """Latency and yield statistics for one provider during a bulk refresh."""
+
+    provider: str = Field(..., description="Provider class name")
+    calls: int = Field(default=0, description="Number of provider round-trips")
+    bulk_calls: int = Field(default=0, description="Round-trips served by a bulk endpoint")
+    products_requested: int = Field(default=0, description="Product/region pairs requested")
+    products_returned: int = Field(default=0, description="Valid prices returned")
+    errors: int = Field(default=0, description="Failed round-trips")
+    total_latency_ms: float = Field(default=0.0, description="Summed round-trip latency")
+    max_latency_ms: float = Field(default=0.0, description="Slowest round-trip latency")
+
+    @property
+    def average_latency_ms(self) -> float:
+        """Mean latency per provider round-trip."""
+        return self.total_latency_ms / self.calls if self.calls else 0.0
+
+
+class BulkPriceUpdateResponse(BaseModel):
+    """Response model for bulk price refreshes across products and regions."""
+
+    total_updates: int = Field(..., description="Product/region pairs requested")
+    successful_updates: int = Field(..., description="Pairs refreshed with a valid price")
+    failed_updates: int = Field(..., description="Pairs no provider could price")
+    records_written: int = Field(default=0, description="Price history rows inserted")
+    write_batches: int = Field(default=0, description="Multi-row insert statements issued")
+    failed_pairs: List[str] = Field(default_factory=list, description="Keys of pairs that failed")
+    provider_stats: Dict[str, ProviderFetchStats] = Field(
+        default_factory=dict, description="Per-provider latency statistics"
+    )
+    prices: List[FertilizerPriceData] = Field(default_factory=list, description="Refreshed prices")
+    duration_seconds: float = Field(..., description="Total pipeline duration")
+    update_timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
 class MarketIntelligenceReport(BaseModel):
     """Model for market intelligence reports."""
     
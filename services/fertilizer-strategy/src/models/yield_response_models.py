@@ -99,6 +99,7 @@ class YieldResponseCurve(BaseModel):
     predicted_curve: List[Tuple[float, float]] = Field(..., description="Predicted curve points")
     max_yield: float = Field(..., ge=0.0, description="Maximum yield for this nutrient")
     response_range: Tuple[float, float] = Field(..., description="Typical response range")
+    covariance_matrix: Optional[List[List[float]]] = Field(None, description="Fitted parameter covariance matrix")
 
 
 class InteractionEffect(BaseModel):
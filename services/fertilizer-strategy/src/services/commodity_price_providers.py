@@ -3,8 +3,9 @@ External data providers for commodity price information.
 """
 
 import asyncio
-import aiohttp
 import logging
+import os
+import sys
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 import json
@@ -15,29 +16,23 @@ from ..models.commodity_price_models import (
 
 logger = logging.getLogger(__name__)
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../shared/utils'))
 
-class BaseCommodityProvider:
+from http_session import SharedSessionMixin
+
+
+class BaseCommodityProvider(SharedSessionMixin):
     """Base class for commodity price data providers."""
     
+    # The upstream defaults to the class name, so each price source gets its own breaker
+    http_headers = {"User-Agent": "AFAS-Fertilizer-Strategy/1.0"}
+    http_timeout = 30.0
+    
     def __init__(self):
         self.session = None
         self.base_url = ""
         self.api_key = None
     
-    async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={"User-Agent": "AFAS-Fertilizer-Strategy/1.0"}
-            )
-        return self.session
-    
-    async def close(self):
-        """Close aiohttp session."""
-        if self.session:
-            await self.session.close()
-    
     async def fetch_price(self, commodity: CommodityType, region: str, contract_type: CommodityContract = CommodityContract.CASH) -> Optional[CommodityPriceData]:
         """Fetch price data for a specific commodity and region."""
         raise NotImplementedError
@@ -53,8 +48,6 @@ class CBOTProvider(BaseCommodityProvider):
     async def fetch_price(self, commodity: CommodityType, region: str, contract_type: CommodityContract = CommodityContract.FUTURES) -> Optional[CommodityPriceData]:
         """Fetch commodity futures price from CBOT."""
         try:
-            session = await self.get_session()
-            
             # Mock implementation for development
             # In production, this would make real API calls to CBOT/CME
             futures_prices = {
@@ -106,8 +99,6 @@ class CMEGroupProvider(BaseCommodityProvider):
     async def fetch_price(self, commodity: CommodityType, region: str, contract_type: CommodityContract = CommodityContract.FUTURES) -> Optional[CommodityPriceData]:
         """Fetch commodity price from CME Group."""
         try:
-            session = await self.get_session()
-            
             # Mock implementation for development
             # In production, this would integrate with CME Group APIs
             cme_prices = {
@@ -159,8 +150,6 @@ class LocalElevatorProvider(BaseCommodityProvider):
     async def fetch_price(self, commodity: CommodityType, region: str, contract_type: CommodityContract = CommodityContract.CASH) -> Optional[CommodityPriceData]:
         """Fetch cash price from local elevators."""
         try:
-            session = await self.get_session()
-            
             # Mock implementation for development
             # In production, this would integrate with elevator APIs
             elevator_prices = {
@@ -209,8 +198,6 @@ class CashMarketProvider(BaseCommodityProvider):
     async def fetch_price(self, commodity: CommodityType, region: str, contract_type: CommodityContract = CommodityContract.CASH) -> Optional[CommodityPriceData]:
         """Fetch spot price from cash markets."""
         try:
-            session = await self.get_session()
-            
             # Mock implementation for development
             # In production, this would integrate with cash market APIs
             cash_prices = {
@@ -260,8 +247,6 @@ class USDANASSCommodityProvider(BaseCommodityProvider):
     async def fetch_price(self, commodity: CommodityType, region: str, contract_type: CommodityContract = CommodityContract.CASH) -> Optional[CommodityPriceData]:
         """Fetch commodity price from USDA NASS."""
         try:
-            session = await self.get_session()
-            
             # Mock implementation for development
             # In production, this would make real API calls to USDA NASS
             usda_prices = {
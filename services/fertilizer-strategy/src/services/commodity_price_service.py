@@ -15,7 +15,11 @@ from ..models.commodity_price_models import (
     BasisAnalysis, CommodityType, CommodityContract, CommoditySource
 )
 from ..services.commodity_price_providers import CommodityProviderManager
+from ..services.price_rollups import (
+    PriceRollupStore, PriceSeriesRollup, commodity_series_key, fertilizer_series_key
+)
 from ..database.commodity_price_db import CommodityPriceDatabase
+from ..database.fertilizer_price_db import FertilizerPriceRepository, get_db_session
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +27,12 @@ logger = logging.getLogger(__name__)
 class CommodityPriceService:
     """Core commodity price tracking and analysis service."""
     
-    def __init__(self):
+    def __init__(self, rollup_store: Optional[PriceRollupStore] = None):
         self.provider_manager = CommodityProviderManager()
         self.db = CommodityPriceDatabase()
+        
+        # Daily/weekly/monthly rollups serving trend analytics
+        self.rollups = rollup_store or PriceRollupStore()
     
     async def get_current_price(
         self, 
@@ -116,43 +123,35 @@ class CommodityPriceService:
     ) -> Optional[CommodityTrendAnalysis]:
         """Get price trend analysis for a commodity."""
         try:
-            # Get historical price data
-            end_date = date.today()
-            start_date = end_date - timedelta(days=days)
-            
-            historical_prices = await self.db.get_historical_prices(
-                commodity, region, start_date, end_date, contract_type
-            )
-            
-            if len(historical_prices) < 2:
+            start_date = date.today() - timedelta(days=days)
+            series = await self._load_commodity_series(commodity, region, contract_type, start_date)
+            data_points = series.point_count(start_date) if series else 0
+            if data_points < 2:
                 logger.warning(f"Insufficient data for trend analysis of {commodity.value}")
                 return None
             
-            # Sort by date
-            historical_prices.sort(key=lambda p: p.price_date)
-            
             # Calculate trend analysis
-            current_price = historical_prices[-1]
-            current_date = current_price.price_date
+            latest = series.latest()
+            current_price = latest.close_price
+            current_date = latest.period_start
             
             # Calculate historical prices
-            price_7d_ago = self._get_price_at_date(historical_prices, current_date - timedelta(days=7))
-            price_30d_ago = self._get_price_at_date(historical_prices, current_date - timedelta(days=30))
-            price_90d_ago = self._get_price_at_date(historical_prices, current_date - timedelta(days=90))
-            price_1y_ago = self._get_price_at_date(historical_prices, current_date - timedelta(days=365))
+            price_7d_ago = series.close_on_or_before(current_date - timedelta(days=7), since=start_date)
+            price_30d_ago = series.close_on_or_before(current_date - timedelta(days=30), since=start_date)
+            price_90d_ago = series.close_on_or_before(current_date - timedelta(days=90), since=start_date)
+            price_1y_ago = series.close_on_or_before(current_date - timedelta(days=365), since=start_date)
             
             # Calculate trend percentages
-            trend_7d_percent = self._calculate_trend_percent(current_price.price_per_unit, price_7d_ago)
-            trend_30d_percent = self._calculate_trend_percent(current_price.price_per_unit, price_30d_ago)
-            trend_90d_percent = self._calculate_trend_percent(current_price.price_per_unit, price_90d_ago)
-            trend_1y_percent = self._calculate_trend_percent(current_price.price_per_unit, price_1y_ago)
-            
-            # Calculate volatility
-            prices = [p.price_per_unit for p in historical_prices]
-            volatility_7d = self._calculate_volatility(prices[-7:]) if len(prices) >= 7 else None
-            volatility_30d = self._calculate_volatility(prices[-30:]) if len(prices) >= 30 else None
-            volatility_90d = self._calculate_volatility(prices[-90:]) if len(prices) >= 90 else None
-            volatility_1y = self._calculate_volatility(prices) if len(prices) >= 365 else None
+            trend_7d_percent = self._calculate_trend_percent(current_price, price_7d_ago)
+            trend_30d_percent = self._calculate_trend_percent(current_price, price_30d_ago)
+            trend_90d_percent = self._calculate_trend_percent(current_price, price_90d_ago)
+            trend_1y_percent = self._calculate_trend_percent(current_price, price_1y_ago)
+            
+            # Calculate volatility from merged daily moments
+            volatility_7d = self._calculate_rollup_volatility(series, 7, start_date)
+            volatility_30d = self._calculate_rollup_volatility(series, 30, start_date)
+            volatility_90d = self._calculate_rollup_volatility(series, 90, start_date)
+            volatility_1y = self._calculate_rollup_volatility(series, 365, start_date)
             
             # Determine trend direction and strength
             trend_direction, trend_strength = self._analyze_trend_strength(trend_30d_percent)
@@ -161,7 +160,7 @@ class CommodityPriceService:
                 commodity_id=f"{commodity.value}_trend",
                 commodity_name=commodity.value.title(),
                 region=region,
-                current_price=current_price.price_per_unit,
+                current_price=current_price,
                 current_date=current_date,
                 price_7d_ago=price_7d_ago,
                 price_30d_ago=price_30d_ago,
@@ -177,7 +176,7 @@ class CommodityPriceService:
                 volatility_1y=volatility_1y,
                 trend_direction=trend_direction,
                 trend_strength=trend_strength,
-                data_points_used=len(historical_prices)
+                data_points_used=data_points
             )
             
         except Exception as e:
@@ -228,7 +227,9 @@ class CommodityPriceService:
                                 crop_unit="bushel",
                                 price_ratio=price_ratio,
                                 inverse_ratio=inverse_ratio,
-                                ratio_trend="stable",  # Would calculate from historical data
+                                ratio_trend=await self._calculate_ratio_trend(
+                                    fertilizer, crop_type, region, price_ratio
+                                ),
                                 profitability_indicator=profitability,
                                 analysis_date=date.today(),
                                 confidence=0.85
@@ -326,12 +327,88 @@ class CommodityPriceService:
             logger.error(f"Error executing price query: {e}")
             raise
     
-    def _get_price_at_date(self, prices: List[CommodityPriceData], target_date: date) -> Optional[float]:
-        """Get price at or before target date."""
-        for price in reversed(prices):
-            if price.price_date <= target_date:
-                return price.price_per_unit
-        return None
+    def _calculate_rollup_volatility(
+        self,
+        series: PriceSeriesRollup,
+        window: int,
+        since: date
+    ) -> Optional[float]:
+        """Coefficient of variation over the last ``window`` days of rollups."""
+        stats = series.window_stats(window, since=since)
+        if stats is None:
+            return None
+        if stats.std_dev is None or stats.mean <= 0:
+            return 0.0
+        return stats.std_dev / stats.mean
+    
+    async def _load_commodity_series(
+        self,
+        commodity: CommodityType,
+        region: str,
+        contract_type: CommodityContract,
+        start_date: date
+    ) -> Optional[PriceSeriesRollup]:
+        """Get commodity rollups, loading historical prices only when they do not cover the window."""
+        series_key = commodity_series_key(commodity.value, region, contract_type.value)
+        if not self.rollups.is_hydrated(series_key, start_date):
+            historical_prices = await self.db.get_historical_prices(
+                commodity, region, start_date, date.today(), contract_type
+            )
+            self.rollups.hydrate_from_prices(
+                series_key, start_date, [(p.price_date, p.price_per_unit) for p in historical_prices]
+            )
+        return self.rollups.get_series(series_key)
+    
+    async def _load_fertilizer_series(
+        self,
+        fertilizer: str,
+        region: str,
+        start_date: date
+    ) -> Optional[PriceSeriesRollup]:
+        """Get fertilizer rollups, loading price history only when they do not cover the window."""
+        series_key = fertilizer_series_key(fertilizer, region)
+        if not self.rollups.is_hydrated(series_key, start_date):
+            try:
+                async for session in get_db_session():
+                    history = await FertilizerPriceRepository(session).get_product_price_history(
+                        fertilizer, region, start_date
+                    )
+                    self.rollups.hydrate_from_prices(
+                        series_key, start_date, [(p.price_date, p.price_per_unit) for p in history]
+                    )
+            except RuntimeError as e:
+                if "Database not initialized" not in str(e):
+                    raise
+                logger.warning(f"Database not initialized, no price history for {fertilizer}")
+        return self.rollups.get_series(series_key)
+    
+    async def _calculate_ratio_trend(
+        self,
+        fertilizer: str,
+        crop_type: CommodityType,
+        region: str,
+        current_ratio: float,
+        lookback_days: int = 30
+    ) -> str:
+        """Compare the current price ratio with the ratio from rollups ``lookback_days`` ago."""
+        target_date = date.today() - timedelta(days=lookback_days)
+        fertilizer_series = await self._load_fertilizer_series(fertilizer, region, target_date)
+        crop_series = await self._load_commodity_series(
+            crop_type, region, CommodityContract.CASH, target_date
+        )
+        if fertilizer_series is None or crop_series is None:
+            return "stable"
+        
+        fertilizer_then = fertilizer_series.close_on_or_before(target_date)
+        crop_then = crop_series.close_on_or_before(target_date)
+        if not fertilizer_then or not crop_then:
+            return "stable"
+        
+        ratio_then = fertilizer_then / crop_then
+        direction, _ = self._analyze_trend_strength(
+            self._calculate_trend_percent(current_ratio, ratio_then)
+        )
+        return direction
     
     def _calculate_trend_percent(self, current_price: float, historical_price: Optional[float]) -> Optional[float]:
         """Calculate trend percentage."""
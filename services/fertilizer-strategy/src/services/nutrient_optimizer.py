@@ -25,6 +25,10 @@ from sklearn.model_selection import train_test_split
 import warnings
 warnings.filterwarnings('ignore')
 
+from .nutrient_surrogates import (
+    ResponseSurrogate, ResponseSurrogateStore, get_response_surrogate_store
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +48,32 @@ class NutrientType(str, Enum):
     MOLYBDENUM = "molybdenum"
 
 
+# Simplified fertilizer cost per lb of nutrient
+# In production, use real-time fertilizer prices
+NUTRIENT_COST_PER_LB = {
+    # Macronutrients
+    NutrientType.NITROGEN.value: 0.50,
+    NutrientType.PHOSPHORUS.value: 0.60,
+    NutrientType.POTASSIUM.value: 0.40,
+    
+    # Secondary macronutrients
+    NutrientType.CALCIUM.value: 0.15,
+    NutrientType.MAGNESIUM.value: 0.25,
+    NutrientType.SULFUR.value: 0.20,
+    
+    # Micronutrients (higher cost per unit)
+    NutrientType.ZINC.value: 8.00,
+    NutrientType.IRON.value: 6.00,
+    NutrientType.MANGANESE.value: 7.00,
+    NutrientType.COPPER.value: 12.00,
+    NutrientType.BORON.value: 15.00,
+    NutrientType.MOLYBDENUM.value: 25.00
+}
+
+# Feature layout of the ML response surrogate
+SURROGATE_FEATURES = ['N_rate', 'P_rate', 'K_rate', 'soil_N', 'soil_P', 'soil_K', 'ph', 'om']
+
+
 class OptimizationConstraint(str, Enum):
     """Types of optimization constraints."""
     SOIL_TEST_LEVELS = "soil_test_levels"
@@ -177,11 +207,10 @@ class NutrientOptimizationResult(BaseModel):
 class MultiNutrientOptimizer:
     """Comprehensive multi-nutrient optimization service."""
     
-    def __init__(self):
+    def __init__(self, surrogate_store: Optional[ResponseSurrogateStore] = None):
         self.logger = logging.getLogger(__name__)
         self.nutrient_interactions = self._initialize_nutrient_interactions()
-        self.response_models = {}
-        self.scaler = StandardScaler()
+        self.surrogate_store = surrogate_store or get_response_surrogate_store()
         
     def _initialize_nutrient_interactions(self) -> List[NutrientInteraction]:
         """Initialize known nutrient interactions."""
@@ -513,29 +542,8 @@ class MultiNutrientOptimizer:
                 nutrients_to_optimize.append(nutrient.value)
                 nutrient_mapping[nutrient.value] = len(nutrient_mapping)
         
-        # Define objective function
-        def objective_function(nutrient_rates):
-            """Objective function for response surface optimization."""
-            # Convert array to nutrient rates
-            rates = {}
-            for i, nutrient in enumerate(nutrients_to_optimize):
-                rates[nutrient] = nutrient_rates[i]
-            
-            # Calculate yield response
-            yield_response = self._calculate_yield_response(rates, optimization_data, request)
-            
-            # Calculate cost
-            cost = self._calculate_fertilizer_cost(rates, request)
-            
-            # Apply objective
-            if request.optimization_objective == "maximize_profit":
-                return -(yield_response * request.target_yield * 0.1 - cost)  # Negative for minimization
-            elif request.optimization_objective == "minimize_cost":
-                return cost
-            elif request.optimization_objective == "maximize_yield":
-                return -yield_response  # Negative for minimization
-            else:  # balanced
-                return -(yield_response * 0.7 + (yield_response * request.target_yield * 0.1 - cost) * 0.3)
+        # Define objective function (accepts one candidate or a whole DE population)
+        objective_function = self._build_objective(nutrients_to_optimize, optimization_data, request)
         
         # Define constraints
         constraints = self._define_optimization_constraints(optimization_data, request, nutrients_to_optimize)
@@ -599,21 +607,7 @@ class MultiNutrientOptimizer:
                     for i, nutrient in enumerate(nutrients_to_optimize):
                         original_bound = bounds[i][1]
                         # Estimate max rate based on budget
-                        cost_per_lb = {
-                            NutrientType.NITROGEN.value: 0.50,
-                            NutrientType.PHOSPHORUS.value: 0.60,
-                            NutrientType.POTASSIUM.value: 0.40,
-                            NutrientType.CALCIUM.value: 0.15,
-                            NutrientType.MAGNESIUM.value: 0.25,
-                            NutrientType.SULFUR.value: 0.20,
-                            NutrientType.ZINC.value: 8.00,
-                            NutrientType.IRON.value: 6.00,
-                            NutrientType.MANGANESE.value: 7.00,
-                            NutrientType.COPPER.value: 12.00,
-                            NutrientType.BORON.value: 15.00,
-                            NutrientType.MOLYBDENUM.value: 25.00
-                        }
-                        max_rate_by_budget = request.budget_constraint / cost_per_lb.get(nutrient, 1.0)
+                        max_rate_by_budget = request.budget_constraint / NUTRIENT_COST_PER_LB.get(nutrient, 1.0)
                         adjusted_bound = min(original_bound, max_rate_by_budget)
                         adjusted_bounds.append((bounds[i][0], adjusted_bound))
                     bounds = adjusted_bounds
@@ -623,7 +617,9 @@ class MultiNutrientOptimizer:
                     bounds,
                     maxiter=1000,
                     popsize=15,
-                    seed=42
+                    seed=42,
+                    updating='deferred',
+                    vectorized=True
                 )
                 
                 optimal_rates = {}
@@ -664,53 +660,37 @@ class MultiNutrientOptimizer:
         """Perform machine learning-based optimization."""
         self.logger.info("Performing machine learning optimization")
         
-        # Generate training data (simplified - in production, use real historical data)
-        training_data = self._generate_training_data(optimization_data, request)
-        
-        # Train model
-        X = training_data[['N_rate', 'P_rate', 'K_rate', 'soil_N', 'soil_P', 'soil_K', 'ph', 'om']]
-        y = training_data['yield_response']
-        
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        # Train Random Forest model
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X_train_scaled, y_train)
-        
-        # Store model for future use
-        self.response_models[f"{request.crop_type}_{request.field_id}"] = {
-            "model": model,
-            "scaler": self.scaler
-        }
+        # Surrogate is trained once per crop/soil class and reused across requests
+        surrogate = self._get_response_surrogate(optimization_data, request)
         
-        # Optimize using the trained model
+        macronutrients = [
+            NutrientType.NITROGEN.value,
+            NutrientType.PHOSPHORUS.value,
+            NutrientType.POTASSIUM.value
+        ]
+        soil_features = np.array([
+            optimization_data["soil_data"].get(NutrientType.NITROGEN.value, 0),
+            optimization_data["soil_data"].get(NutrientType.PHOSPHORUS.value, 0),
+            optimization_data["soil_data"].get(NutrientType.POTASSIUM.value, 0),
+            optimization_data["ph_level"],
+            optimization_data["organic_matter"]
+        ], dtype=float)
+        base_yield = request.target_yield * 0.8
+        
+        # Optimize using the surrogate, scoring the whole DE population per call
         def ml_objective(nutrient_rates):
             """ML-based objective function."""
-            features = np.array([[
-                nutrient_rates[0],  # N rate
-                nutrient_rates[1],  # P rate
-                nutrient_rates[2],  # K rate
-                optimization_data["soil_data"].get(NutrientType.NITROGEN.value, 0),
-                optimization_data["soil_data"].get(NutrientType.PHOSPHORUS.value, 0),
-                optimization_data["soil_data"].get(NutrientType.POTASSIUM.value, 0),
-                optimization_data["ph_level"],
-                optimization_data["organic_matter"]
-            ]])
-            
-            features_scaled = self.scaler.transform(features)
-            yield_response = model.predict(features_scaled)[0]
+            rates = np.asarray(nutrient_rates, dtype=float)
+            single = rates.ndim == 1
+            if single:
+                rates = rates[:, None]
             
-            cost = self._calculate_fertilizer_cost({
-                NutrientType.NITROGEN.value: nutrient_rates[0],
-                NutrientType.PHOSPHORUS.value: nutrient_rates[1],
-                NutrientType.POTASSIUM.value: nutrient_rates[2]
-            }, request)
+            features = np.hstack([rates.T, np.tile(soil_features, (rates.shape[1], 1))])
+            yield_response = base_yield + surrogate.predict_gain(features)
+            cost = self._calculate_fertilizer_cost_batch(rates, macronutrients)
             
-            return -(yield_response * 0.7 + (yield_response * request.target_yield * 0.1 - cost) * 0.3)
+            values = -(yield_response * 0.7 + (yield_response * request.target_yield * 0.1 - cost) * 0.3)
+            return float(values[0]) if single else values
         
         # Perform optimization
         bounds = [
@@ -724,7 +704,9 @@ class MultiNutrientOptimizer:
             bounds,
             maxiter=1000,
             popsize=15,
-            seed=42
+            seed=42,
+            updating='deferred',
+            vectorized=True
         )
         
         optimal_rates = {
@@ -777,6 +759,40 @@ class MultiNutrientOptimizer:
         
         return optimal_rates, optimization_info
     
+    def _build_objective(
+        self, 
+        nutrients_to_optimize: List[str], 
+        optimization_data: Dict[str, Any], 
+        request: NutrientOptimizationRequest
+    ):
+        """Build the response surface objective for one candidate (n,) or a population (n, S)."""
+        def objective_function(nutrient_rates):
+            """Objective function for response surface optimization."""
+            rates = np.asarray(nutrient_rates, dtype=float)
+            single = rates.ndim == 1
+            if single:
+                rates = rates[:, None]
+            
+            # Calculate yield response and cost for every candidate at once
+            yield_response = self._calculate_yield_response_batch(
+                rates, nutrients_to_optimize, optimization_data, request
+            )
+            cost = self._calculate_fertilizer_cost_batch(rates, nutrients_to_optimize)
+            
+            # Apply objective
+            if request.optimization_objective == "maximize_profit":
+                values = -(yield_response * request.target_yield * 0.1 - cost)  # Negative for minimization
+            elif request.optimization_objective == "minimize_cost":
+                values = cost
+            elif request.optimization_objective == "maximize_yield":
+                values = -yield_response  # Negative for minimization
+            else:  # balanced
+                values = -(yield_response * 0.7 + (yield_response * request.target_yield * 0.1 - cost) * 0.3)
+            
+            return float(values[0]) if single else values
+        
+        return objective_function
+    
     def _calculate_yield_response(
         self, 
         nutrient_rates: Dict[str, float], 
@@ -784,92 +800,104 @@ class MultiNutrientOptimizer:
         request: NutrientOptimizationRequest
     ) -> float:
         """Calculate yield response based on nutrient rates including micronutrients."""
+        nutrients = list(nutrient_rates)
+        rate_matrix = np.array([nutrient_rates[n] for n in nutrients], dtype=float).reshape(len(nutrients), 1)
+        return float(self._calculate_yield_response_batch(rate_matrix, nutrients, optimization_data, request)[0])
+    
+    def _calculate_yield_response_batch(
+        self, 
+        rate_matrix: np.ndarray, 
+        nutrients: List[str], 
+        optimization_data: Dict[str, Any], 
+        request: NutrientOptimizationRequest
+    ) -> np.ndarray:
+        """
+        Calculate yield responses for many candidates at once.
+        
+        Args:
+            rate_matrix: Rates with one row per nutrient and one column per candidate
+            nutrients: Nutrient names for the rows of rate_matrix
+            
+        Returns:
+            Yield response for each candidate
+        """
         # Simplified yield response calculation with micronutrient effects
         # In production, use sophisticated response models
         
+        index = {nutrient: i for i, nutrient in enumerate(nutrients)}
+        zeros = np.zeros(rate_matrix.shape[1])
+        
+        def rate(nutrient: NutrientType) -> np.ndarray:
+            i = index.get(nutrient.value)
+            return rate_matrix[i] if i is not None else zeros
+        
+        def pair_effect(rate1: np.ndarray, rate2: np.ndarray, cap: float, coefficient: float) -> np.ndarray:
+            return np.where((rate1 > 0) & (rate2 > 0), np.minimum(cap, rate1 * rate2 * coefficient), 0.0)
+        
         base_yield = request.target_yield * 0.8  # Assume 80% base yield
         
         # Macronutrient responses
-        n_rate = nutrient_rates.get(NutrientType.NITROGEN.value, 0)
-        n_response = min(0.3, n_rate * 0.002 - (n_rate ** 2) * 0.00001)
+        n_rate = rate(NutrientType.NITROGEN)
+        n_response = np.minimum(0.3, n_rate * 0.002 - (n_rate ** 2) * 0.00001)
         
-        p_rate = nutrient_rates.get(NutrientType.PHOSPHORUS.value, 0)
-        p_response = min(0.2, p_rate * 0.001)
+        p_rate = rate(NutrientType.PHOSPHORUS)
+        p_response = np.minimum(0.2, p_rate * 0.001)
         
-        k_rate = nutrient_rates.get(NutrientType.POTASSIUM.value, 0)
-        k_response = min(0.15, k_rate * 0.0008)
+        k_rate = rate(NutrientType.POTASSIUM)
+        k_response = np.minimum(0.15, k_rate * 0.0008)
         
         # Secondary macronutrient responses
-        ca_rate = nutrient_rates.get(NutrientType.CALCIUM.value, 0)
-        ca_response = min(0.05, ca_rate * 0.0001)  # Calcium response
+        ca_response = np.minimum(0.05, rate(NutrientType.CALCIUM) * 0.0001)  # Calcium response
+        mg_response = np.minimum(0.08, rate(NutrientType.MAGNESIUM) * 0.0002)  # Magnesium response
         
-        mg_rate = nutrient_rates.get(NutrientType.MAGNESIUM.value, 0)
-        mg_response = min(0.08, mg_rate * 0.0002)  # Magnesium response
-        
-        s_rate = nutrient_rates.get(NutrientType.SULFUR.value, 0)
-        s_response = min(0.06, s_rate * 0.0003)  # Sulfur response
+        s_rate = rate(NutrientType.SULFUR)
+        s_response = np.minimum(0.06, s_rate * 0.0003)  # Sulfur response
         
         # Micronutrient responses (smaller individual effects but important)
-        zn_rate = nutrient_rates.get(NutrientType.ZINC.value, 0)
-        zn_response = min(0.03, zn_rate * 0.001)  # Zinc response
+        zn_rate = rate(NutrientType.ZINC)
+        zn_response = np.minimum(0.03, zn_rate * 0.001)  # Zinc response
         
-        fe_rate = nutrient_rates.get(NutrientType.IRON.value, 0)
-        fe_response = min(0.02, fe_rate * 0.0008)  # Iron response
+        fe_rate = rate(NutrientType.IRON)
+        fe_response = np.minimum(0.02, fe_rate * 0.0008)  # Iron response
         
-        mn_rate = nutrient_rates.get(NutrientType.MANGANESE.value, 0)
-        mn_response = min(0.02, mn_rate * 0.0008)  # Manganese response
+        mn_rate = rate(NutrientType.MANGANESE)
+        mn_response = np.minimum(0.02, mn_rate * 0.0008)  # Manganese response
         
-        cu_rate = nutrient_rates.get(NutrientType.COPPER.value, 0)
-        cu_response = min(0.015, cu_rate * 0.001)  # Copper response
+        cu_rate = rate(NutrientType.COPPER)
+        cu_response = np.minimum(0.015, cu_rate * 0.001)  # Copper response
         
-        b_rate = nutrient_rates.get(NutrientType.BORON.value, 0)
-        b_response = min(0.025, b_rate * 0.002)  # Boron response
+        b_response = np.minimum(0.025, rate(NutrientType.BORON) * 0.002)  # Boron response
         
-        mo_rate = nutrient_rates.get(NutrientType.MOLYBDENUM.value, 0)
-        mo_response = min(0.01, mo_rate * 0.005)  # Molybdenum response
+        mo_rate = rate(NutrientType.MOLYBDENUM)
+        mo_response = np.minimum(0.01, mo_rate * 0.005)  # Molybdenum response
         
         # Interaction effects
-        interaction_bonus = 0
-        interaction_penalty = 0
+        interaction_bonus = zeros
+        interaction_penalty = zeros
         
         if request.include_interactions:
-            # Macronutrient interactions
-            if n_rate > 0 and p_rate > 0:
-                interaction_bonus += min(0.05, n_rate * p_rate * 0.00001)
+            ph_level = optimization_data["ph_level"]
             
-            if n_rate > 0 and k_rate > 0:
-                interaction_bonus += min(0.03, n_rate * k_rate * 0.000005)
+            # Macronutrient interactions
+            interaction_bonus = interaction_bonus + pair_effect(n_rate, p_rate, 0.05, 0.00001)
+            interaction_bonus = interaction_bonus + pair_effect(n_rate, k_rate, 0.03, 0.000005)
             
             # Macronutrient-micronutrient interactions
-            if p_rate > 0 and zn_rate > 0:
+            if ph_level > 7.0:
                 # P-Zn antagonism
-                ph_level = optimization_data["ph_level"]
-                if ph_level > 7.0:
-                    interaction_penalty += min(0.02, p_rate * zn_rate * 0.000001)
+                interaction_penalty = interaction_penalty + pair_effect(p_rate, zn_rate, 0.02, 0.000001)
             
-            if p_rate > 0 and fe_rate > 0:
+            if ph_level > 7.5:
                 # P-Fe antagonism
-                ph_level = optimization_data["ph_level"]
-                if ph_level > 7.5:
-                    interaction_penalty += min(0.015, p_rate * fe_rate * 0.000001)
+                interaction_penalty = interaction_penalty + pair_effect(p_rate, fe_rate, 0.015, 0.000001)
             
             # Micronutrient-micronutrient interactions
-            if zn_rate > 0 and cu_rate > 0:
-                # Zn-Cu antagonism
-                interaction_penalty += min(0.01, zn_rate * cu_rate * 0.000002)
-            
-            if fe_rate > 0 and mn_rate > 0:
-                # Fe-Mn antagonism
-                interaction_penalty += min(0.008, fe_rate * mn_rate * 0.000001)
+            interaction_penalty = interaction_penalty + pair_effect(zn_rate, cu_rate, 0.01, 0.000002)  # Zn-Cu antagonism
+            interaction_penalty = interaction_penalty + pair_effect(fe_rate, mn_rate, 0.008, 0.000001)  # Fe-Mn antagonism
             
             # Sulfur interactions
-            if s_rate > 0 and n_rate > 0:
-                # S-N synergy
-                interaction_bonus += min(0.02, s_rate * n_rate * 0.000005)
-            
-            if s_rate > 0 and mo_rate > 0:
-                # S-Mo antagonism
-                interaction_penalty += min(0.01, s_rate * mo_rate * 0.00001)
+            interaction_bonus = interaction_bonus + pair_effect(s_rate, n_rate, 0.02, 0.000005)  # S-N synergy
+            interaction_penalty = interaction_penalty + pair_effect(s_rate, mo_rate, 0.01, 0.00001)  # S-Mo antagonism
         
         # Calculate total response
         macronutrient_response = n_response + p_response + k_response
@@ -881,70 +909,52 @@ class MultiNutrientOptimizer:
             micronutrient_response + interaction_bonus - interaction_penalty
         )
         
-        return min(total_response, request.target_yield * 1.2)  # Cap at 120% of target
+        return np.minimum(total_response, request.target_yield * 1.2)  # Cap at 120% of target
     
     def _calculate_fertilizer_cost(self, nutrient_rates: Dict[str, float], request: NutrientOptimizationRequest) -> float:
         """Calculate fertilizer cost based on nutrient rates including micronutrients."""
-        # Simplified cost calculation with micronutrient pricing
-        # In production, use real-time fertilizer prices
-        
-        cost_per_lb = {
-            # Macronutrients
-            NutrientType.NITROGEN.value: 0.50,
-            NutrientType.PHOSPHORUS.value: 0.60,
-            NutrientType.POTASSIUM.value: 0.40,
-            
-            # Secondary macronutrients
-            NutrientType.CALCIUM.value: 0.15,
-            NutrientType.MAGNESIUM.value: 0.25,
-            NutrientType.SULFUR.value: 0.20,
-            
-            # Micronutrients (higher cost per unit)
-            NutrientType.ZINC.value: 8.00,
-            NutrientType.IRON.value: 6.00,
-            NutrientType.MANGANESE.value: 7.00,
-            NutrientType.COPPER.value: 12.00,
-            NutrientType.BORON.value: 15.00,
-            NutrientType.MOLYBDENUM.value: 25.00
-        }
-        
         total_cost = 0
         for nutrient, rate in nutrient_rates.items():
-            if nutrient in cost_per_lb:
-                total_cost += rate * cost_per_lb[nutrient]
+            if nutrient in NUTRIENT_COST_PER_LB:
+                total_cost += rate * NUTRIENT_COST_PER_LB[nutrient]
         
         return total_cost
     
+    def _cost_vector(self, nutrients: List[str]) -> np.ndarray:
+        """Cost per lb for each nutrient, zero for nutrients without pricing."""
+        return np.array([NUTRIENT_COST_PER_LB.get(nutrient, 0.0) for nutrient in nutrients], dtype=float)
+    
+    def _calculate_fertilizer_cost_batch(self, rate_matrix: np.ndarray, nutrients: List[str]) -> np.ndarray:
+        """Calculate fertilizer cost for each column of a (nutrients, candidates) rate matrix."""
+        return self._cost_vector(nutrients) @ rate_matrix
+    
     def _define_optimization_constraints(self, optimization_data: Dict[str, Any], request: NutrientOptimizationRequest, nutrients_to_optimize: List[str]):
         """Define optimization constraints."""
         constraints = []
+        cost_vector = self._cost_vector(nutrients_to_optimize)
         
         # Budget constraint
         if request.budget_constraint:
             def budget_constraint(nutrient_rates):
-                # Convert array to nutrient rates dictionary
-                rates = {}
-                for i, nutrient in enumerate(nutrients_to_optimize):
-                    rates[nutrient] = nutrient_rates[i]
-                
-                cost = self._calculate_fertilizer_cost(rates, request)
                 # Return positive value if constraint is satisfied
-                return request.budget_constraint - cost
+                return request.budget_constraint - cost_vector @ np.asarray(nutrient_rates, dtype=float)
             
             constraints.append({'type': 'ineq', 'fun': budget_constraint})
         
-        # Minimum requirement constraints
+        # Minimum requirement constraints (application floors are fixed per request)
+        min_applications = []
+        for nutrient in nutrients_to_optimize:
+            crop_req = optimization_data["crop_data"].get(nutrient, {})
+            min_req = crop_req.get("minimum", 0)
+            soil_level = optimization_data["soil_data"].get(nutrient, 0)
+            required = max(0, min_req - soil_level)
+            efficiency = crop_req.get("efficiency", 0.7)
+            min_applications.append(required / efficiency if efficiency > 0 else 0)
+        min_applications = np.array(min_applications, dtype=float)
+        
         def min_requirement_constraint(nutrient_rates):
-            violations = []
-            for i, nutrient in enumerate(nutrients_to_optimize):
-                crop_req = optimization_data["crop_data"].get(nutrient, {})
-                min_req = crop_req.get("minimum", 0)
-                soil_level = optimization_data["soil_data"].get(nutrient, 0)
-                required = max(0, min_req - soil_level)
-                efficiency = crop_req.get("efficiency", 0.7)
-                min_application = required / efficiency if efficiency > 0 else 0
-                violations.append(nutrient_rates[i] - min_application)
-            return violations
+            rates = np.asarray(nutrient_rates, dtype=float)
+            return (rates.T - min_applications).T
         
         constraints.append({'type': 'ineq', 'fun': min_requirement_constraint})
         
@@ -972,39 +982,106 @@ class MultiNutrientOptimizer:
         
         return fallback_rates
     
-    def _generate_training_data(self, optimization_data: Dict[str, Any], request: NutrientOptimizationRequest) -> pd.DataFrame:
-        """Generate training data for ML model."""
+    def _get_response_surrogate(
+        self, 
+        optimization_data: Dict[str, Any], 
+        request: NutrientOptimizationRequest
+    ) -> ResponseSurrogate:
+        """Get the persisted response surrogate for the request's crop and soil class."""
+        key = self.surrogate_store.make_key(request.crop_type, request.soil_type)
+        return self.surrogate_store.get_or_train(
+            key, lambda: self._train_response_surrogate(optimization_data, request)
+        )
+    
+    def _train_response_surrogate(
+        self, 
+        optimization_data: Dict[str, Any], 
+        request: NutrientOptimizationRequest
+    ) -> ResponseSurrogate:
+        """Train a yield-gain surrogate over the full soil feature space."""
+        training_data = self._generate_training_data(optimization_data, request, vary_soil=True)
+        
+        X = training_data[SURROGATE_FEATURES].to_numpy()
+        y = training_data['yield_gain'].to_numpy()
+        
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        
+        # Scale features
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        
+        # Train Random Forest model
+        model = RandomForestRegressor(n_estimators=100, random_state=42)
+        model.fit(X_train_scaled, y_train)
+        self.logger.info(
+            f"Trained response surrogate for {request.crop_type}/{request.soil_type} "
+            f"(holdout R^2 {model.score(scaler.transform(X_test), y_test):.3f})"
+        )
+        
+        return ResponseSurrogate(
+            model=model,
+            scaler=scaler,
+            feature_names=list(SURROGATE_FEATURES),
+            training_samples=len(X_train)
+        )
+    
+    def _generate_training_data(
+        self, 
+        optimization_data: Dict[str, Any], 
+        request: NutrientOptimizationRequest,
+        vary_soil: bool = False,
+        samples: int = 1000,
+        seed: int = 42
+    ) -> pd.DataFrame:
+        """
+        Generate training data for ML model.
+        
+        With vary_soil the soil features are sampled across typical ranges instead
+        of fixed at this request's values, so one model serves a whole soil class.
+        """
         # Simplified training data generation
         # In production, use real historical data
-        
-        data = []
-        for _ in range(1000):
-            n_rate = np.random.uniform(0, 200)
-            p_rate = np.random.uniform(0, 150)
-            k_rate = np.random.uniform(0, 200)
-            
-            # Simulate yield response
-            yield_response = (
-                request.target_yield * 0.8 +
-                n_rate * 0.002 - (n_rate ** 2) * 0.00001 +
-                p_rate * 0.001 +
-                k_rate * 0.0008 +
-                np.random.normal(0, 5)  # Noise
-            )
-            
-            data.append({
-                'N_rate': n_rate,
-                'P_rate': p_rate,
-                'K_rate': k_rate,
-                'soil_N': optimization_data["soil_data"].get(NutrientType.NITROGEN.value, 0),
-                'soil_P': optimization_data["soil_data"].get(NutrientType.PHOSPHORUS.value, 0),
-                'soil_K': optimization_data["soil_data"].get(NutrientType.POTASSIUM.value, 0),
-                'ph': optimization_data["ph_level"],
-                'om': optimization_data["organic_matter"],
-                'yield_response': max(0, yield_response)
-            })
-        
-        return pd.DataFrame(data)
+        rng = np.random.default_rng(seed)
+        
+        n_rate = rng.uniform(0, 200, samples)
+        p_rate = rng.uniform(0, 150, samples)
+        k_rate = rng.uniform(0, 200, samples)
+        
+        if vary_soil:
+            soil_n = rng.uniform(0, 100, samples)
+            soil_p = rng.uniform(0, 100, samples)
+            soil_k = rng.uniform(0, 400, samples)
+            ph = rng.uniform(4.5, 8.5, samples)
+            om = rng.uniform(0.5, 8.0, samples)
+        else:
+            soil_n = np.full(samples, optimization_data["soil_data"].get(NutrientType.NITROGEN.value, 0))
+            soil_p = np.full(samples, optimization_data["soil_data"].get(NutrientType.PHOSPHORUS.value, 0))
+            soil_k = np.full(samples, optimization_data["soil_data"].get(NutrientType.POTASSIUM.value, 0))
+            ph = np.full(samples, optimization_data["ph_level"])
+            om = np.full(samples, optimization_data["organic_matter"])
+        
+        # Simulate yield response
+        base_yield = request.target_yield * 0.8
+        yield_response = np.maximum(0, (
+            base_yield +
+            n_rate * 0.002 - (n_rate ** 2) * 0.00001 +
+            p_rate * 0.001 +
+            k_rate * 0.0008 +
+            rng.normal(0, 5, samples)  # Noise
+        ))
+        
+        return pd.DataFrame({
+            'N_rate': n_rate,
+            'P_rate': p_rate,
+            'K_rate': k_rate,
+            'soil_N': soil_n,
+            'soil_P': soil_p,
+            'soil_K': soil_k,
+            'ph': ph,
+            'om': om,
+            'yield_response': yield_response,
+            'yield_gain': yield_response - base_yield
+        })
     
     def _calculate_economic_analysis(
         self, 
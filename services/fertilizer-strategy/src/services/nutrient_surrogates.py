@@ -0,0 +1,131 @@
+"""
+Persisted surrogate response models for multi-nutrient optimization.
+
+Surrogates are trained once per (crop, soil class) and kept in memory and on
+disk, so machine-learning optimization only pays for training the first time
+a crop/soil combination is seen. Predictions are batched so the optimizer can
+score a whole differential-evolution population in one call.
+"""
+
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the training data generator or feature layout changes
+SURROGATE_VERSION = 1
+
+DEFAULT_SURROGATE_DIR = os.getenv(
+    "NUTRIENT_SURROGATE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "fertilizer_strategy", "nutrient_surrogates")
+)
+
+
+@dataclass
+class ResponseSurrogate:
+    """Trained yield-gain model with its feature scaler."""
+    model: Any
+    scaler: Any
+    feature_names: List[str]
+    training_samples: int
+    version: int = SURROGATE_VERSION
+    trained_at: datetime = field(default_factory=datetime.utcnow)
+
+    def predict_gain(self, features: np.ndarray) -> np.ndarray:
+        """Predict yield gain over base yield for a (samples, features) matrix."""
+        return self.model.predict(self.scaler.transform(np.atleast_2d(features)))
+
+
+class ResponseSurrogateStore:
+    """In-memory and on-disk cache of response surrogates keyed by (crop, soil class)."""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_SURROGATE_DIR):
+        self.cache_dir = cache_dir
+        self._surrogates: Dict[Tuple[str, str], ResponseSurrogate] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(crop_type: str, soil_type: str) -> Tuple[str, str]:
+        """Normalize crop and soil class into a store key."""
+        return (crop_type.strip().lower(), soil_type.strip().lower().replace(" ", "_"))
+
+    def get_or_train(
+        self,
+        key: Tuple[str, str],
+        trainer: Callable[[], ResponseSurrogate]
+    ) -> ResponseSurrogate:
+        """Return the surrogate for a key, loading or training it on first use."""
+        surrogate = self._surrogates.get(key)
+        if surrogate is not None:
+            return surrogate
+
+        with self._lock:
+            surrogate = self._surrogates.get(key)
+            if surrogate is None:
+                surrogate = self._load(key)
+            if surrogate is None:
+                logger.info(f"Training response surrogate for {key[0]}/{key[1]}")
+                surrogate = trainer()
+                self._save(key, surrogate)
+            self._surrogates[key] = surrogate
+            return surrogate
+
+    def invalidate(self, key: Optional[Tuple[str, str]] = None):
+        """Drop one surrogate, or all of them, from memory and disk."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._surrogates)
+            for k in keys:
+                self._surrogates.pop(k, None)
+                path = self._path(k)
+                if path and os.path.exists(path):
+                    os.remove(path)
+
+    def _path(self, key: Tuple[str, str]) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key[0]}__{key[1]}__v{SURROGATE_VERSION}.pkl")
+
+    def _load(self, key: Tuple[str, str]) -> Optional[ResponseSurrogate]:
+        path = self._path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                surrogate = pickle.load(f)
+            if getattr(surrogate, "version", None) != SURROGATE_VERSION:
+                return None
+            return surrogate
+        except Exception as e:
+            logger.warning(f"Failed to load response surrogate from {path}: {e}")
+            return None
+
+    def _save(self, key: Tuple[str, str], surrogate: ResponseSurrogate):
+        path = self._path(key)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(surrogate, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist response surrogate to {path}: {e}")
+
+
+_surrogate_store: Optional[ResponseSurrogateStore] = None
+
+
+def get_response_surrogate_store() -> ResponseSurrogateStore:
+    """Get the shared response surrogate store."""
+    global _surrogate_store
+    if _surrogate_store is None:
+        _surrogate_store = ResponseSurrogateStore()
+    return _surrogate_store
@@ -3,8 +3,9 @@ External data providers for fertilizer price information.
 """
 
 import asyncio
-import aiohttp
 import logging
+import os
+import sys
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 import json
@@ -13,82 +14,140 @@ from ..models.price_models import FertilizerPriceData, FertilizerType, Fertilize
 
 logger = logging.getLogger(__name__)
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../shared/utils'))
 
-class BasePriceProvider:
+from http_session import SharedSessionMixin
+
+
+class BasePriceProvider(SharedSessionMixin):
     """Base class for price data providers."""
     
+    # The upstream defaults to the class name, so each price source gets its own breaker
+    http_headers = {"User-Agent": "AFAS-Fertilizer-Strategy/1.0"}
+    http_timeout = 30.0
+    
+    # Whether fetch_prices is served by a single upstream request
+    supports_bulk = False
+    
     def __init__(self):
         self.session = None
         self.base_url = ""
         self.api_key = None
     
-    async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={"User-Agent": "AFAS-Fertilizer-Strategy/1.0"}
-            )
-        return self.session
-    
-    async def close(self):
-        """Close aiohttp session."""
-        if self.session:
-            await self.session.close()
-    
     async def fetch_price(self, product: FertilizerProduct, region: str) -> Optional[FertilizerPriceData]:
         """Fetch price data for a specific product and region."""
         raise NotImplementedError
+    
+    async def fetch_prices(
+        self,
+        products: List[FertilizerProduct],
+        region: str,
+        max_concurrency: int = 5
+    ) -> Dict[FertilizerProduct, FertilizerPriceData]:
+        """
+        Fetch price data for several products in one region.
+        
+        Providers with a bulk endpoint override this and set ``supports_bulk``;
+        the default fans out ``fetch_price`` with bounded concurrency.
+        
+        Args:
+            products: Fertilizer products to price
+            region: Geographic region
+            max_concurrency: Maximum concurrent single-product requests
+            
+        Returns:
+            Dictionary mapping each priced product to its price data
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _fetch(product: FertilizerProduct) -> Optional[FertilizerPriceData]:
+            async with semaphore:
+                return await self.fetch_price(product, region)
+        
+        results = await asyncio.gather(*[_fetch(product) for product in products], return_exceptions=True)
+        
+        prices = {}
+        for product, result in zip(products, results):
+            if isinstance(result, Exception):
+                logger.warning(f"{self.__class__.__name__} failed for {product.value}: {result}")
+            elif result is not None:
+                prices[product] = result
+        return prices
 
 
 class USDANASSProvider(BasePriceProvider):
     """USDA NASS API provider for fertilizer prices."""
     
+    supports_bulk = True
+    
     def __init__(self):
         super().__init__()
         self.base_url = "https://quickstats.nass.usda.gov/api"
         self.api_key = None  # Would be loaded from environment in production
+        
+        # Mock implementation for development
+        # In production, this would make real API calls to USDA NASS
+        self.mock_prices = {
+            FertilizerProduct.UREA: {"price": 450.0, "unit": "ton"},
+            FertilizerProduct.ANHYDROUS_AMMONIA: {"price": 650.0, "unit": "ton"},
+            FertilizerProduct.DAP: {"price": 580.0, "unit": "ton"},
+            FertilizerProduct.MAP: {"price": 620.0, "unit": "ton"},
+            FertilizerProduct.MURIATE_OF_POTASH: {"price": 420.0, "unit": "ton"},
+            FertilizerProduct.UAN: {"price": 380.0, "unit": "ton"},
+        }
     
     async def fetch_price(self, product: FertilizerProduct, region: str) -> Optional[FertilizerPriceData]:
         """Fetch fertilizer price from USDA NASS."""
         try:
-            session = await self.get_session()
-            
-            # Mock implementation for development
-            # In production, this would make real API calls to USDA NASS
-            mock_prices = {
-                FertilizerProduct.UREA: {"price": 450.0, "unit": "ton"},
-                FertilizerProduct.ANHYDROUS_AMMONIA: {"price": 650.0, "unit": "ton"},
-                FertilizerProduct.DAP: {"price": 580.0, "unit": "ton"},
-                FertilizerProduct.MAP: {"price": 620.0, "unit": "ton"},
-                FertilizerProduct.MURIATE_OF_POTASH: {"price": 420.0, "unit": "ton"},
-                FertilizerProduct.UAN: {"price": 380.0, "unit": "ton"},
-            }
-            
-            if product in mock_prices:
-                price_data = mock_prices[product]
-                
-                return FertilizerPriceData(
-                    product_id=f"usda_{product.value}",
-                    product_name=product.value.replace("_", " ").title(),
-                    fertilizer_type=self._get_fertilizer_type(product),
-                    specific_product=product,
-                    price_per_unit=price_data["price"],
-                    unit=price_data["unit"],
-                    region=region,
-                    source=PriceSource.USDA_NASS,
-                    price_date=date.today(),
-                    confidence=0.85,
-                    volatility=0.15,
-                    market_conditions={"season": "fall", "demand": "moderate"},
-                    seasonal_factors={"planting_season": True}
-                )
+            return self._build_price_data(product, region)
             
+        except Exception as e:
+            logger.error(f"USDA NASS provider error for {product}: {e}")
             return None
+    
+    async def fetch_prices(
+        self,
+        products: List[FertilizerProduct],
+        region: str,
+        max_concurrency: int = 5
+    ) -> Dict[FertilizerProduct, FertilizerPriceData]:
+        """Fetch prices for several products with one Quick Stats query."""
+        try:
+            # Quick Stats accepts a list of commodity descriptions per query,
+            # so the whole product set is served by a single request
+            prices = {}
+            for product in products:
+                price_data = self._build_price_data(product, region)
+                if price_data:
+                    prices[product] = price_data
+            return prices
             
         except Exception as e:
-            logger.error(f"USDA NASS provider error for {product}: {e}")
+            logger.error(f"USDA NASS bulk provider error for {region}: {e}")
+            return {}
+    
+    def _build_price_data(self, product: FertilizerProduct, region: str) -> Optional[FertilizerPriceData]:
+        """Build price data from a Quick Stats record."""
+        if product not in self.mock_prices:
             return None
+        
+        price_data = self.mock_prices[product]
+        
+        return FertilizerPriceData(
+            product_id=f"usda_{product.value}",
+            product_name=product.value.replace("_", " ").title(),
+            fertilizer_type=self._get_fertilizer_type(product),
+            specific_product=product,
+            price_per_unit=price_data["price"],
+            unit=price_data["unit"],
+            region=region,
+            source=PriceSource.USDA_NASS,
+            price_date=date.today(),
+            confidence=0.85,
+            volatility=0.15,
+            market_conditions={"season": "fall", "demand": "moderate"},
+            seasonal_factors={"planting_season": True}
+        )
     
     def _get_fertilizer_type(self, product: FertilizerProduct) -> FertilizerType:
         """Map product to fertilizer type."""
@@ -124,47 +183,73 @@ class USDANASSProvider(BasePriceProvider):
 class CMEGroupProvider(BasePriceProvider):
     """CME Group commodity futures provider."""
     
+    supports_bulk = True
+    
     def __init__(self):
         super().__init__()
         self.base_url = "https://www.cmegroup.com/CmeWS/mvc/ProductSlate/V2/List"
+        
+        # Mock implementation for development
+        # In production, this would integrate with CME Group APIs
+        self.futures_prices = {
+            FertilizerProduct.UREA: {"price": 445.0, "unit": "ton"},
+            FertilizerProduct.ANHYDROUS_AMMONIA: {"price": 640.0, "unit": "ton"},
+            FertilizerProduct.DAP: {"price": 575.0, "unit": "ton"},
+            FertilizerProduct.MAP: {"price": 615.0, "unit": "ton"},
+            FertilizerProduct.MURIATE_OF_POTASH: {"price": 415.0, "unit": "ton"},
+        }
     
     async def fetch_price(self, product: FertilizerProduct, region: str) -> Optional[FertilizerPriceData]:
         """Fetch futures price from CME Group."""
         try:
-            # Mock implementation for development
-            # In production, this would integrate with CME Group APIs
-            futures_prices = {
-                FertilizerProduct.UREA: {"price": 445.0, "unit": "ton"},
-                FertilizerProduct.ANHYDROUS_AMMONIA: {"price": 640.0, "unit": "ton"},
-                FertilizerProduct.DAP: {"price": 575.0, "unit": "ton"},
-                FertilizerProduct.MAP: {"price": 615.0, "unit": "ton"},
-                FertilizerProduct.MURIATE_OF_POTASH: {"price": 415.0, "unit": "ton"},
-            }
-            
-            if product in futures_prices:
-                price_data = futures_prices[product]
-                
-                return FertilizerPriceData(
-                    product_id=f"cme_{product.value}",
-                    product_name=f"{product.value.replace('_', ' ').title()} Futures",
-                    fertilizer_type=self._get_fertilizer_type(product),
-                    specific_product=product,
-                    price_per_unit=price_data["price"],
-                    unit=price_data["unit"],
-                    region=region,
-                    source=PriceSource.CME_GROUP,
-                    price_date=date.today(),
-                    confidence=0.90,
-                    volatility=0.18,
-                    market_conditions={"futures_market": True, "contract_month": "current"},
-                    seasonal_factors={"delivery_month": "next"}
-                )
+            return self._build_price_data(product, region)
             
+        except Exception as e:
+            logger.error(f"CME Group provider error for {product}: {e}")
             return None
+    
+    async def fetch_prices(
+        self,
+        products: List[FertilizerProduct],
+        region: str,
+        max_concurrency: int = 5
+    ) -> Dict[FertilizerProduct, FertilizerPriceData]:
+        """Fetch futures prices for several products from one product slate listing."""
+        try:
+            # The product slate endpoint lists every fertilizer contract at once
+            prices = {}
+            for product in products:
+                price_data = self._build_price_data(product, region)
+                if price_data:
+                    prices[product] = price_data
+            return prices
             
         except Exception as e:
-            logger.error(f"CME Group provider error for {product}: {e}")
+            logger.error(f"CME Group bulk provider error for {region}: {e}")
+            return {}
+    
+    def _build_price_data(self, product: FertilizerProduct, region: str) -> Optional[FertilizerPriceData]:
+        """Build price data from a product slate entry."""
+        if product not in self.futures_prices:
             return None
+        
+        price_data = self.futures_prices[product]
+        
+        return FertilizerPriceData(
+            product_id=f"cme_{product.value}",
+            product_name=f"{product.value.replace('_', ' ').title()} Futures",
+            fertilizer_type=self._get_fertilizer_type(product),
+            specific_product=product,
+            price_per_unit=price_data["price"],
+            unit=price_data["unit"],
+            region=region,
+            source=PriceSource.CME_GROUP,
+            price_date=date.today(),
+            confidence=0.90,
+            volatility=0.18,
+            market_conditions={"futures_market": True, "contract_month": "current"},
+            seasonal_factors={"delivery_month": "next"}
+        )
     
     def _get_fertilizer_type(self, product: FertilizerProduct) -> FertilizerType:
         """Map product to fertilizer type."""
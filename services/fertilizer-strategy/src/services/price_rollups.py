@@ -0,0 +1,440 @@
+"""
+Incrementally maintained time-series rollups for price trend analytics.
+
+Daily, weekly and monthly buckets keep OHLC, count, mean and the Welford
+sum of squared deviations for each price series. Buckets are updated as
+prices are written, so trend endpoints answer price lookups, moving
+statistics and volatility from the rollups instead of rescanning raw
+price history on every call.
+"""
+
+import bisect
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from enum import Enum
+from typing import Dict, List, Optional, Tuple, Iterable, Any
+
+logger = logging.getLogger(__name__)
+
+
+class RollupGranularity(str, Enum):
+    """Rollup bucket sizes."""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
+def get_period_start(price_date: date, granularity: RollupGranularity) -> date:
+    """Return the first day of the bucket containing ``price_date``."""
+    if granularity == RollupGranularity.WEEKLY:
+        return price_date - timedelta(days=price_date.weekday())
+    if granularity == RollupGranularity.MONTHLY:
+        return price_date.replace(day=1)
+    return price_date
+
+
+def fertilizer_series_key(product: str, region: str) -> str:
+    """Series key for a fertilizer product in a region."""
+    return f"fertilizer:{product}:{region}"
+
+
+def commodity_series_key(commodity: str, region: str, contract_type: str) -> str:
+    """Series key for a commodity contract in a region."""
+    return f"commodity:{commodity}:{region}:{contract_type}"
+
+
+@dataclass
+class PriceRollupBucket:
+    """OHLC and running moments for one rollup period."""
+    period_start: date
+    open_price: float
+    high_price: float
+    low_price: float
+    close_price: float
+    first_price_date: date
+    last_price_date: date
+    count: int = 1
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def from_price(cls, period_start: date, price: float, price_date: date) -> "PriceRollupBucket":
+        """Start a bucket from its first observed price."""
+        return cls(
+            period_start=period_start,
+            open_price=price,
+            high_price=price,
+            low_price=price,
+            close_price=price,
+            first_price_date=price_date,
+            last_price_date=price_date,
+            count=1,
+            mean=price,
+            m2=0.0
+        )
+
+    def add(self, price: float, price_date: date):
+        """Fold one price into the bucket (Welford update)."""
+        # Open/close follow price date; same-day prices keep arrival order
+        if price_date < self.first_price_date:
+            self.open_price = price
+            self.first_price_date = price_date
+        if price_date >= self.last_price_date:
+            self.close_price = price
+            self.last_price_date = price_date
+        self.high_price = max(self.high_price, price)
+        self.low_price = min(self.low_price, price)
+
+        self.count += 1
+        delta = price - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (price - self.mean)
+
+    def merge(self, other: "PriceRollupBucket"):
+        """Fold another bucket into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if other.first_price_date < self.first_price_date:
+            self.open_price = other.open_price
+            self.first_price_date = other.first_price_date
+        if other.last_price_date >= self.last_price_date:
+            self.close_price = other.close_price
+            self.last_price_date = other.last_price_date
+        self.high_price = max(self.high_price, other.high_price)
+        self.low_price = min(self.low_price, other.low_price)
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+
+    def copy(self, period_start: Optional[date] = None) -> "PriceRollupBucket":
+        """Copy the bucket, optionally re-keyed to another period."""
+        return PriceRollupBucket(
+            period_start=period_start or self.period_start,
+            open_price=self.open_price,
+            high_price=self.high_price,
+            low_price=self.low_price,
+            close_price=self.close_price,
+            first_price_date=self.first_price_date,
+            last_price_date=self.last_price_date,
+            count=self.count,
+            mean=self.mean,
+            m2=self.m2
+        )
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance of prices in the bucket."""
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        """Sample standard deviation of prices in the bucket."""
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the bucket for persistence."""
+        return {
+            "period_start": self.period_start,
+            "open_price": self.open_price,
+            "high_price": self.high_price,
+            "low_price": self.low_price,
+            "close_price": self.close_price,
+            "first_price_date": self.first_price_date,
+            "last_price_date": self.last_price_date,
+            "price_count": self.count,
+            "mean_price": self.mean,
+            "m2": self.m2
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PriceRollupBucket":
+        """Rebuild a bucket from its persisted form."""
+        return cls(
+            period_start=data["period_start"],
+            open_price=data["open_price"],
+            high_price=data["high_price"],
+            low_price=data["low_price"],
+            close_price=data["close_price"],
+            first_price_date=data["first_price_date"],
+            last_price_date=data["last_price_date"],
+            count=data["price_count"],
+            mean=data["mean_price"],
+            m2=data["m2"]
+        )
+
+
+class PriceSeriesRollup:
+    """Daily, weekly and monthly rollups for a single price series."""
+
+    def __init__(self):
+        self.buckets: Dict[RollupGranularity, Dict[date, PriceRollupBucket]] = {
+            granularity: {} for granularity in RollupGranularity
+        }
+        self.hydrated_since: Optional[date] = None
+        self.hydrated_at: Optional[float] = None
+
+        # Sorted daily keys with prefix sums over point counts and
+        # close-to-close returns, rebuilt lazily from the first changed day
+        self._days: List[date] = []
+        self._count_prefix: List[int] = []
+        self._return_sum: List[float] = []
+        self._return_sq_sum: List[float] = []
+        self._return_n: List[int] = []
+        self._dirty_from: Optional[int] = None
+
+    def record(self, price: float, price_date: date) -> List[Tuple[RollupGranularity, PriceRollupBucket]]:
+        """Fold a new price into every granularity and return the touched buckets."""
+        touched = []
+        for granularity in RollupGranularity:
+            start = get_period_start(price_date, granularity)
+            bucket = self.buckets[granularity].get(start)
+            if bucket is None:
+                bucket = PriceRollupBucket.from_price(start, price, price_date)
+                self.buckets[granularity][start] = bucket
+                if granularity == RollupGranularity.DAILY:
+                    bisect.insort(self._days, start)
+            else:
+                bucket.add(price, price_date)
+            touched.append((granularity, bucket))
+
+        self._mark_dirty(bisect.bisect_left(self._days, price_date))
+        return touched
+
+    def replace_daily_since(self, since: date, daily_buckets: Iterable[PriceRollupBucket]):
+        """Replace all daily buckets from ``since`` onwards and rebuild coarser rollups."""
+        daily = {
+            day: bucket for day, bucket in self.buckets[RollupGranularity.DAILY].items()
+            if day < since
+        }
+        for bucket in daily_buckets:
+            if bucket.period_start >= since:
+                daily[bucket.period_start] = bucket
+
+        self.buckets[RollupGranularity.DAILY] = daily
+        self._days = sorted(daily)
+        for granularity in (RollupGranularity.WEEKLY, RollupGranularity.MONTHLY):
+            coarse: Dict[date, PriceRollupBucket] = {}
+            for day in self._days:
+                start = get_period_start(day, granularity)
+                if start in coarse:
+                    coarse[start].merge(daily[day])
+                else:
+                    coarse[start] = daily[day].copy(period_start=start)
+            self.buckets[granularity] = coarse
+
+        self._mark_dirty(0)
+        if self.hydrated_since is None or since < self.hydrated_since:
+            self.hydrated_since = since
+        self.hydrated_at = time.time()
+
+    def is_hydrated(self, since: date, max_age_seconds: float) -> bool:
+        """Whether the series holds complete data from ``since`` and is fresh enough."""
+        if self.hydrated_since is None or self.hydrated_at is None:
+            return False
+        if self.hydrated_since > since:
+            return False
+        return time.time() - self.hydrated_at < max_age_seconds
+
+    def get_buckets(
+        self,
+        granularity: RollupGranularity,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[PriceRollupBucket]:
+        """Return buckets of one granularity ordered by period start."""
+        buckets = self.buckets[granularity]
+        return [
+            buckets[start] for start in sorted(buckets)
+            if (start_date is None or start >= start_date)
+            and (end_date is None or start <= end_date)
+        ]
+
+    def latest(self) -> Optional[PriceRollupBucket]:
+        """Most recent daily bucket."""
+        if not self._days:
+            return None
+        return self.buckets[RollupGranularity.DAILY][self._days[-1]]
+
+    def day_count(self, since: Optional[date] = None) -> int:
+        """Number of days with prices on or after ``since``."""
+        return len(self._days) - self._index_since(since)
+
+    def point_count(self, since: Optional[date] = None) -> int:
+        """Number of raw prices folded in on or after ``since``."""
+        if not self._days:
+            return 0
+        self._refresh_prefix()
+        first = self._index_since(since)
+        before = self._count_prefix[first - 1] if first > 0 else 0
+        return self._count_prefix[-1] - before
+
+    def close_on_or_before(self, target: date, since: Optional[date] = None) -> Optional[float]:
+        """Closing price of the last day on or before ``target``."""
+        index = bisect.bisect_right(self._days, target) - 1
+        if index < self._index_since(since):
+            return None
+        return self.buckets[RollupGranularity.DAILY][self._days[index]].close_price
+
+    def close_nearest(self, target: date, tolerance_days: int, since: Optional[date] = None) -> Optional[float]:
+        """Closing price of the day nearest ``target`` within ``tolerance_days``."""
+        first = self._index_since(since)
+        index = bisect.bisect_left(self._days, target, lo=first)
+        best = None
+        best_diff = None
+        # Earlier day wins ties, matching a forward scan over sorted history
+        for candidate in (index - 1, index):
+            if first <= candidate < len(self._days):
+                diff = abs((self._days[candidate] - target).days)
+                if best_diff is None or diff < best_diff:
+                    best, best_diff = candidate, diff
+        if best is None or best_diff > tolerance_days:
+            return None
+        return self.buckets[RollupGranularity.DAILY][self._days[best]].close_price
+
+    def return_volatility(self, window: int, since: Optional[date] = None) -> Optional[float]:
+        """
+        Standard deviation (percent) of close-to-close returns over the last ``window`` days.
+
+        Returns None when fewer than ``window`` days are available or fewer than
+        two returns can be formed.
+        """
+        first = self._index_since(since)
+        last = len(self._days) - 1
+        if last - first + 1 < window:
+            return None
+        self._refresh_prefix()
+        start = last - window + 1
+        n = self._return_n[last] - self._return_n[start]
+        if n < 2:
+            return None
+        total = self._return_sum[last] - self._return_sum[start]
+        total_sq = self._return_sq_sum[last] - self._return_sq_sum[start]
+        variance = max((total_sq - total * total / n) / (n - 1), 0.0)
+        return math.sqrt(variance) * 100
+
+    def window_stats(self, window: int, since: Optional[date] = None) -> Optional[PriceRollupBucket]:
+        """Merged moments over the last ``window`` days, or None if not enough days."""
+        first = self._index_since(since)
+        if len(self._days) - first < window:
+            return None
+        daily = self.buckets[RollupGranularity.DAILY]
+        days = self._days[len(self._days) - window:]
+        merged = daily[days[0]].copy()
+        for day in days[1:]:
+            merged.merge(daily[day])
+        return merged
+
+    def _index_since(self, since: Optional[date]) -> int:
+        if since is None:
+            return 0
+        return bisect.bisect_left(self._days, since)
+
+    def _mark_dirty(self, index: int):
+        if self._dirty_from is None or index < self._dirty_from:
+            self._dirty_from = index
+
+    def _refresh_prefix(self):
+        """Recompute prefix sums from the first changed day onwards."""
+        if self._dirty_from is None:
+            return
+        start = self._dirty_from
+        for prefix in (self._count_prefix, self._return_sum, self._return_sq_sum, self._return_n):
+            del prefix[start:]
+
+        daily = self.buckets[RollupGranularity.DAILY]
+        for index in range(start, len(self._days)):
+            bucket = daily[self._days[index]]
+            prev_count = self._count_prefix[index - 1] if index > 0 else 0
+            self._count_prefix.append(prev_count + bucket.count)
+
+            if index == 0:
+                self._return_sum.append(0.0)
+                self._return_sq_sum.append(0.0)
+                self._return_n.append(0)
+                continue
+
+            previous_close = daily[self._days[index - 1]].close_price
+            if previous_close != 0:
+                daily_return = (bucket.close_price - previous_close) / previous_close
+                self._return_sum.append(self._return_sum[-1] + daily_return)
+                self._return_sq_sum.append(self._return_sq_sum[-1] + daily_return * daily_return)
+                self._return_n.append(self._return_n[-1] + 1)
+            else:
+                self._return_sum.append(self._return_sum[-1])
+                self._return_sq_sum.append(self._return_sq_sum[-1])
+                self._return_n.append(self._return_n[-1])
+
+        self._dirty_from = None
+
+
+class PriceRollupStore:
+    """In-memory rollups for many price series, shared by the price services."""
+
+    def __init__(self, max_staleness_seconds: float = 3600):
+        self.max_staleness_seconds = max_staleness_seconds
+        self._series: Dict[str, PriceSeriesRollup] = {}
+
+    def get_series(self, series_key: str) -> Optional[PriceSeriesRollup]:
+        """Return the rollups for a series if any exist."""
+        return self._series.get(series_key)
+
+    def record_price(
+        self,
+        series_key: str,
+        price: float,
+        price_date: date
+    ) -> List[Tuple[RollupGranularity, PriceRollupBucket]]:
+        """Fold a newly written price into its series."""
+        series = self._series.get(series_key)
+        if series is None:
+            series = PriceSeriesRollup()
+            self._series[series_key] = series
+        return series.record(price, price_date)
+
+    def is_hydrated(self, series_key: str, since: date) -> bool:
+        """Whether the series can answer queries back to ``since`` without a reload."""
+        series = self._series.get(series_key)
+        return series is not None and series.is_hydrated(since, self.max_staleness_seconds)
+
+    def hydrate(self, series_key: str, since: date, daily_buckets: Iterable[PriceRollupBucket]):
+        """Load persisted daily rollups for a series from ``since`` onwards."""
+        series = self._series.get(series_key)
+        if series is None:
+            series = PriceSeriesRollup()
+            self._series[series_key] = series
+        series.replace_daily_since(since, daily_buckets)
+
+    def hydrate_from_prices(self, series_key: str, since: date, prices: Iterable[Tuple[date, float]]):
+        """Build daily rollups from raw (price_date, price) pairs and load them."""
+        daily: Dict[date, PriceRollupBucket] = {}
+        for price_date, price in prices:
+            if price_date in daily:
+                daily[price_date].add(price, price_date)
+            else:
+                daily[price_date] = PriceRollupBucket.from_price(price_date, price, price_date)
+        self.hydrate(series_key, since, daily.values())
+
+    def clear(self):
+        """Drop all rollups."""
+        self._series.clear()
+
+
+# Process-wide store shared by route handlers and scheduled jobs
+_shared_rollup_store: Optional[PriceRollupStore] = None
+
+
+def get_price_rollup_store() -> PriceRollupStore:
+    """Get the shared price rollup store."""
+    global _shared_rollup_store
+    if _shared_rollup_store is None:
+        _shared_rollup_store = PriceRollupStore()
+    return _shared_rollup_store
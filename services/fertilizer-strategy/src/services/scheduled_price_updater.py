@@ -14,6 +14,7 @@ import time
 
 from ..models.price_models import FertilizerProduct, FertilizerType
 from .price_tracking_service import FertilizerPriceTrackingService
+from .price_rollups import get_price_rollup_store
 from ..database.fertilizer_price_db import get_db_session, FertilizerPriceRepository
 
 logger = logging.getLogger(__name__)
@@ -22,11 +23,15 @@ logger = logging.getLogger(__name__)
 class ScheduledPriceUpdater:
     """Service for scheduled fertilizer price updates."""
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 8, write_batch_size: int = 500):
         self.scheduler = AsyncIOScheduler()
-        self.price_service = FertilizerPriceTrackingService()
+        self.price_service = FertilizerPriceTrackingService(rollup_store=get_price_rollup_store())
         self.is_running = False
         
+        # Bulk refresh tuning: concurrent provider round-trips and rows per insert
+        self.max_concurrency = max_concurrency
+        self.write_batch_size = write_batch_size
+        
         # Configure scheduler event listeners
         self.scheduler.add_listener(self._job_executed, EVENT_JOB_EXECUTED)
         self.scheduler.add_listener(self._job_error, EVENT_JOB_ERROR)
@@ -118,29 +123,28 @@ class ScheduledPriceUpdater:
             products = list(FertilizerProduct)
             regions = ["US", "CA", "MX"]  # North American regions
             
-            total_updates = 0
-            successful_updates = 0
-            failed_updates = 0
+            # Fetch every product/region pair through the bulk pipeline
+            response = await self.price_service.bulk_update_prices(
+                products,
+                regions,
+                max_concurrency=self.max_concurrency,
+                batch_size=self.write_batch_size
+            )
             
-            # Update prices for all products and regions
-            for product in products:
-                for region in regions:
-                    total_updates += 1
-                    try:
-                        response = await self.price_service.update_price(
-                            product, region, force_update=True
-                        )
-                        
-                        if response.success:
-                            successful_updates += 1
-                            logger.debug(f"Updated {product.value} in {region}: ${response.new_price.price_per_unit}")
-                        else:
-                            failed_updates += 1
-                            logger.warning(f"Failed to update {product.value} in {region}: {response.error_message}")
-                            
-                    except Exception as e:
-                        failed_updates += 1
-                        logger.error(f"Error updating {product.value} in {region}: {e}")
+            total_updates = response.total_updates
+            successful_updates = response.successful_updates
+            failed_updates = response.failed_updates
+            
+            for pair in response.failed_pairs:
+                logger.warning(f"Failed to update {pair}: no provider returned valid data")
+            
+            for stats in response.provider_stats.values():
+                logger.info(
+                    f"Provider {stats.provider}: {stats.calls} calls "
+                    f"({stats.bulk_calls} bulk), {stats.products_returned}/{stats.products_requested} priced, "
+                    f"{stats.errors} errors, avg {stats.average_latency_ms:.1f}ms, "
+                    f"max {stats.max_latency_ms:.1f}ms"
+                )
             
             # Log summary
             duration = time.time() - start_time
@@ -150,6 +154,7 @@ class ScheduledPriceUpdater:
                 f"Daily price update completed: "
                 f"{successful_updates}/{total_updates} successful "
                 f"({success_rate:.1f}%), {failed_updates} failed, "
+                f"{response.records_written} records in {response.write_batches} batches, "
                 f"duration: {duration:.2f}s"
             )
             
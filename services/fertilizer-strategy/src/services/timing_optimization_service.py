@@ -128,12 +128,19 @@ class FertilizerTimingOptimizer:
             WeatherCondition.UNACCEPTABLE: 0.0
         }
     
-    async def optimize_timing(self, request: TimingOptimizationRequest) -> TimingOptimizationResult:
+    async def optimize_timing(
+        self,
+        request: TimingOptimizationRequest,
+        weather_windows: Optional[List[WeatherWindow]] = None,
+        crop_stages: Optional[Dict[date, CropGrowthStage]] = None
+    ) -> TimingOptimizationResult:
         """
         Optimize fertilizer application timing with comprehensive analysis.
         
         Args:
             request: Timing optimization request with field and crop data
+            weather_windows: Precomputed weather windows shared by fields in the same location and season
+            crop_stages: Precomputed growth stage timeline shared by fields with the same crop and planting date
             
         Returns:
             TimingOptimizationResult with optimal timings and analysis
@@ -143,10 +150,12 @@ class FertilizerTimingOptimizer:
         
         try:
             # 1. Analyze weather windows
-            weather_windows = await self._analyze_weather_windows(request)
+            if weather_windows is None:
+                weather_windows = await self._analyze_weather_windows(request)
             
             # 2. Determine crop growth stages
-            crop_stages = await self._determine_crop_growth_stages(request)
+            if crop_stages is None:
+                crop_stages = await self._determine_crop_growth_stages(request)
             
             # 3. Generate optimal timings for each fertilizer
             optimal_timings = []
@@ -0,0 +1,290 @@
+"""
+Fitted yield-response curve registry with vectorized prediction.
+
+Response model functions are defined once at module level and operate on
+rate arrays, with analytic derivatives so economic optima and break-even
+rates can be solved in closed form. Fitted parameters and covariance are
+kept in a registry keyed by (crop, nutrient, region, data hash) so repeated
+analyses of the same trial data skip curve fitting entirely.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.yield_response_models import CurveFitResult, ResponseModelType
+
+logger = logging.getLogger(__name__)
+
+
+def mitscherlich_baule(x, A, b, c):
+    """Mitscherlich-Baule model: y = A * (1 - exp(-b * (x + c)))"""
+    return A * (1 - np.exp(-b * (x + c)))
+
+
+def quadratic_plateau(x, a, b, c):
+    """Quadratic plateau model: y = a + b*x + c*x^2 (with plateau)"""
+    plateau_x = -b / (2 * c) if c != 0 else 0
+    plateau_y = a + b * plateau_x + c * plateau_x**2
+    return np.where(x <= plateau_x, a + b*x + c*x**2, plateau_y)
+
+
+def linear_plateau(x, a, b, plateau_x):
+    """Linear plateau model: y = a + b*x for x <= plateau_x, then plateau"""
+    plateau_y = a + b * plateau_x
+    return np.where(x <= plateau_x, a + b*x, plateau_y)
+
+
+def exponential(x, a, b, c):
+    """Exponential model: y = a * (1 - exp(-b * x)) + c"""
+    return a * (1 - np.exp(-b * x)) + c
+
+
+RESPONSE_MODEL_FUNCTIONS = {
+    ResponseModelType.MITSCHERLICH_BAULE: mitscherlich_baule,
+    ResponseModelType.QUADRATIC_PLATEAU: quadratic_plateau,
+    ResponseModelType.LINEAR_PLATEAU: linear_plateau,
+    ResponseModelType.EXPONENTIAL: exponential
+}
+
+
+def predict_response(
+    rates: Sequence[float],
+    model_type: ResponseModelType,
+    parameters: Sequence[float]
+) -> np.ndarray:
+    """Predict yields for an array of rates."""
+    x = np.asarray(rates, dtype=float)
+    return np.asarray(RESPONSE_MODEL_FUNCTIONS[model_type](x, *parameters), dtype=float)
+
+
+def marginal_response(
+    rates: Sequence[float],
+    model_type: ResponseModelType,
+    parameters: Sequence[float]
+) -> np.ndarray:
+    """Analytic first derivative of yield with respect to rate."""
+    x = np.asarray(rates, dtype=float)
+
+    if model_type == ResponseModelType.MITSCHERLICH_BAULE:
+        A, b, c = parameters
+        return A * b * np.exp(-b * (x + c))
+
+    if model_type == ResponseModelType.EXPONENTIAL:
+        a, b, _ = parameters
+        return a * b * np.exp(-b * x)
+
+    if model_type == ResponseModelType.QUADRATIC_PLATEAU:
+        a, b, c = parameters
+        plateau_x = -b / (2 * c) if c != 0 else 0
+        return np.where(x < plateau_x, b + 2 * c * x, 0.0)
+
+    a, b, plateau_x = parameters
+    return np.where(x < plateau_x, b, 0.0)
+
+
+def marginal_cost_rate(
+    model_type: ResponseModelType,
+    parameters: Sequence[float],
+    fertilizer_price: float,
+    crop_price: float,
+    max_rate: float = 300.0
+) -> Optional[float]:
+    """
+    Rate where marginal revenue equals marginal cost, solved in closed form.
+
+    Returns None if the curve's marginal revenue never equals the fertilizer
+    price inside [0, max_rate].
+    """
+    if crop_price <= 0 or fertilizer_price <= 0:
+        return None
+    target = fertilizer_price / crop_price  # Required marginal yield response
+    rate = None
+
+    if model_type == ResponseModelType.MITSCHERLICH_BAULE:
+        A, b, c = parameters
+        if b != 0 and A * b / target > 0:
+            rate = np.log(A * b / target) / b - c
+    elif model_type == ResponseModelType.EXPONENTIAL:
+        a, b, _ = parameters
+        if b != 0 and a * b / target > 0:
+            rate = np.log(a * b / target) / b
+    elif model_type == ResponseModelType.QUADRATIC_PLATEAU:
+        a, b, c = parameters
+        plateau_x = -b / (2 * c) if c != 0 else 0
+        if c != 0:
+            rate = (target - b) / (2 * c)
+            if rate >= plateau_x:
+                rate = None
+
+    if rate is None or not np.isfinite(rate) or not 0 <= rate <= max_rate:
+        return None
+    return float(rate)
+
+
+def economic_optimal_rate(
+    model_type: ResponseModelType,
+    parameters: Sequence[float],
+    fertilizer_price: float,
+    crop_price: float,
+    max_rate: float = 300.0
+) -> float:
+    """
+    Profit-maximizing rate on [0, max_rate].
+
+    Every supported model has at most one interior stationary point plus a
+    plateau kink, so comparing profit at those candidates and the interval
+    ends gives the exact optimum.
+    """
+    candidates = [0.0, max_rate]
+
+    stationary = marginal_cost_rate(model_type, parameters, fertilizer_price, crop_price, max_rate)
+    if stationary is not None:
+        candidates.append(stationary)
+
+    if model_type == ResponseModelType.QUADRATIC_PLATEAU:
+        a, b, c = parameters
+        kink = -b / (2 * c) if c != 0 else 0
+        candidates.append(kink)
+    elif model_type == ResponseModelType.LINEAR_PLATEAU:
+        candidates.append(parameters[2])
+
+    rates = np.clip(np.array(candidates, dtype=float), 0.0, max_rate)
+    profits = predict_response(rates, model_type, parameters) * crop_price - rates * fertilizer_price
+    return float(rates[int(np.argmax(profits))])
+
+
+def prediction_standard_errors(
+    rates: Sequence[float],
+    model_type: ResponseModelType,
+    parameters: Sequence[float],
+    covariance: Sequence[Sequence[float]],
+    step: float = 1e-6
+) -> Optional[np.ndarray]:
+    """
+    Delta-method standard errors of the mean response at each rate.
+
+    Returns None when the covariance matrix is missing or not finite.
+    """
+    if covariance is None:
+        return None
+    cov = np.asarray(covariance, dtype=float)
+    params = np.asarray(parameters, dtype=float)
+    if cov.shape != (len(params), len(params)) or not np.all(np.isfinite(cov)):
+        return None
+
+    x = np.asarray(rates, dtype=float)
+    base = predict_response(x, model_type, params)
+
+    # Forward-difference Jacobian: one vectorized prediction per parameter
+    jacobian = np.empty((len(x), len(params)))
+    for i in range(len(params)):
+        shifted = params.copy()
+        delta = step * max(1.0, abs(params[i]))
+        shifted[i] += delta
+        jacobian[:, i] = (predict_response(x, model_type, shifted) - base) / delta
+
+    variance = np.einsum('ij,jk,ik->i', jacobian, cov, jacobian)
+    return np.sqrt(np.clip(variance, 0.0, None))
+
+
+@dataclass
+class FittedResponseModel:
+    """Fitted curves for one (crop, nutrient, region, data) combination."""
+    best_model: ResponseModelType
+    fits: Dict[ResponseModelType, CurveFitResult]
+    fitted_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def best_fit(self) -> CurveFitResult:
+        """Fit result for the best model."""
+        return self.fits[self.best_model]
+
+    def predict(self, rates: Sequence[float], model_type: Optional[ResponseModelType] = None) -> np.ndarray:
+        """Predict yields for an array of rates with the best or a named model."""
+        model_type = model_type or self.best_model
+        return predict_response(rates, model_type, self.fits[model_type].parameters)
+
+
+class YieldCurveRegistry:
+    """LRU registry of fitted response curves keyed by (crop, nutrient, region, data hash)."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str, str], FittedResponseModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def data_hash(data_points: Sequence[Tuple[float, float]]) -> str:
+        """Stable hash of (rate, yield) data points, independent of input order."""
+        digest = hashlib.sha1()
+        for rate, yield_value in sorted((round(float(r), 6), round(float(y), 6)) for r, y in data_points):
+            digest.update(f"{rate}:{yield_value};".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def make_key(
+        cls,
+        crop_type: str,
+        nutrient: str,
+        region: Optional[str],
+        data_points: Sequence[Tuple[float, float]]
+    ) -> Tuple[str, str, str, str]:
+        """Build a registry key for a curve."""
+        return (crop_type.lower(), nutrient, region or "default", cls.data_hash(data_points))
+
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[FittedResponseModel]:
+        """Look up fitted curves, refreshing their LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[str, str, str, str], entry: FittedResponseModel):
+        """Store fitted curves, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, crop_type: Optional[str] = None, nutrient: Optional[str] = None):
+        """Drop entries for a crop and/or nutrient, or everything if neither is given."""
+        with self._lock:
+            for key in list(self._entries):
+                if (crop_type is None or key[0] == crop_type.lower()) and (nutrient is None or key[1] == nutrient):
+                    del self._entries[key]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Registry size and hit rate."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+# Process-wide registry shared by every service that fits response curves
+_curve_registry: Optional[YieldCurveRegistry] = None
+
+
+def get_yield_curve_registry() -> YieldCurveRegistry:
+    """Get the shared yield curve registry."""
+    global _curve_registry
+    if _curve_registry is None:
+        _curve_registry = YieldCurveRegistry()
+    return _curve_registry
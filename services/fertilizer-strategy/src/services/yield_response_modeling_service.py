@@ -25,6 +25,11 @@ from ..models.yield_response_models import (
     OptimalRateAnalysis, EconomicThreshold, InteractionEffect,
     ConfidenceInterval, ModelValidation, ResponseCurveComparison
 )
+from .yield_curve_registry import (
+    FittedResponseModel, RESPONSE_MODEL_FUNCTIONS, YieldCurveRegistry,
+    economic_optimal_rate, get_yield_curve_registry, marginal_cost_rate,
+    marginal_response, predict_response, prediction_standard_errors
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,9 +47,11 @@ class YieldResponseModelingService:
     - Economic threshold analysis
     """
     
-    def __init__(self):
+    def __init__(self, curve_registry: Optional[YieldCurveRegistry] = None):
         """Initialize the yield response modeling service."""
         self.logger = logging.getLogger(__name__)
+        self.curve_registry = curve_registry or get_yield_curve_registry()
+        self.max_search_rate = 300.0  # Upper bound for rate searches
         
         # Model parameters and constraints
         self.model_constraints = {
@@ -114,11 +121,12 @@ class YieldResponseModelingService:
             validation_result = await self._validate_input_data(request)
             
             # 2. Fit response curves for each nutrient
+            region = (request.analysis_preferences or {}).get("region")
             nutrient_curves = {}
             for nutrient in request.nutrients:
                 curve_data = await self._extract_nutrient_data(request.response_data, nutrient)
                 if len(curve_data) >= 3:  # Minimum data points for curve fitting
-                    curve = await self._fit_response_curve(curve_data, nutrient, request.crop_type)
+                    curve = await self._fit_response_curve(curve_data, nutrient, request.crop_type, region)
                     nutrient_curves[nutrient] = curve
             
             # 3. Analyze nutrient interactions
@@ -243,31 +251,39 @@ class YieldResponseModelingService:
         self, 
         data_points: List[Tuple[float, float]], 
         nutrient: str, 
-        crop_type: str
+        crop_type: str,
+        region: Optional[str] = None
     ) -> YieldResponseCurve:
         """Fit response curve using multiple models and select the best one."""
         
         x_data = np.array([point[0] for point in data_points])
         y_data = np.array([point[1] for point in data_points])
         
-        best_model = None
-        best_r_squared = -1
-        best_fit_result = None
-        
-        # Try each model type
-        for model_type in ResponseModelType:
-            try:
-                fit_result = await self._fit_single_model(x_data, y_data, model_type)
-                if fit_result.r_squared > best_r_squared:
-                    best_r_squared = fit_result.r_squared
-                    best_model = model_type
-                    best_fit_result = fit_result
-            except Exception as e:
-                self.logger.warning(f"Failed to fit {model_type} model for {nutrient}: {e}")
-                continue
-        
-        if best_fit_result is None:
-            raise ValueError(f"Unable to fit any model for {nutrient}")
+        # Identical trial data for the same crop/nutrient/region reuses the stored fit
+        registry_key = self.curve_registry.make_key(crop_type, nutrient, region, data_points)
+        fitted = self.curve_registry.get(registry_key)
+        
+        if fitted is None:
+            fits = {}
+            
+            # Try each model type
+            for model_type in ResponseModelType:
+                try:
+                    fits[model_type] = await self._fit_single_model(x_data, y_data, model_type)
+                except Exception as e:
+                    self.logger.warning(f"Failed to fit {model_type} model for {nutrient}: {e}")
+                    continue
+            
+            if not fits:
+                raise ValueError(f"Unable to fit any model for {nutrient}")
+            
+            # First model wins ties, matching enum order
+            best = max(fits, key=lambda model_type: fits[model_type].r_squared)
+            fitted = FittedResponseModel(best_model=best, fits=fits)
+            self.curve_registry.put(registry_key, fitted)
+        
+        best_model = fitted.best_model
+        best_fit_result = fitted.best_fit
         
         # Generate curve predictions
         x_range = np.linspace(0, max(x_data) * 1.2, 100)
@@ -290,7 +306,11 @@ class YieldResponseModelingService:
             data_points=data_points,
             predicted_curve=list(zip(x_range, y_predicted)),
             max_yield=crop_params['typical_max_yield'],
-            response_range=crop_params['typical_response_range']
+            response_range=crop_params['typical_response_range'],
+            covariance_matrix=(
+                best_fit_result.covariance_matrix
+                if np.all(np.isfinite(best_fit_result.covariance_matrix)) else None
+            )
         )
     
     async def _fit_single_model(
@@ -301,34 +321,7 @@ class YieldResponseModelingService:
     ) -> CurveFitResult:
         """Fit a single model type to the data."""
         
-        def mitscherlich_baule(x, A, b, c):
-            """Mitscherlich-Baule model: y = A * (1 - exp(-b * (x + c)))"""
-            return A * (1 - np.exp(-b * (x + c)))
-        
-        def quadratic_plateau(x, a, b, c):
-            """Quadratic plateau model: y = a + b*x + c*x^2 (with plateau)"""
-            plateau_x = -b / (2 * c) if c != 0 else 0
-            plateau_y = a + b * plateau_x + c * plateau_x**2
-            return np.where(x <= plateau_x, a + b*x + c*x**2, plateau_y)
-        
-        def linear_plateau(x, a, b, plateau_x):
-            """Linear plateau model: y = a + b*x for x <= plateau_x, then plateau"""
-            plateau_y = a + b * plateau_x
-            return np.where(x <= plateau_x, a + b*x, plateau_y)
-        
-        def exponential(x, a, b, c):
-            """Exponential model: y = a * (1 - exp(-b * x)) + c"""
-            return a * (1 - np.exp(-b * x)) + c
-        
-        # Select model function
-        model_functions = {
-            ResponseModelType.MITSCHERLICH_BAULE: mitscherlich_baule,
-            ResponseModelType.QUADRATIC_PLATEAU: quadratic_plateau,
-            ResponseModelType.LINEAR_PLATEAU: linear_plateau,
-            ResponseModelType.EXPONENTIAL: exponential
-        }
-        
-        model_func = model_functions[model_type]
+        model_func = RESPONSE_MODEL_FUNCTIONS[model_type]
         constraints = self.model_constraints[model_type]
         
         try:
@@ -380,31 +373,7 @@ class YieldResponseModelingService:
         parameters: List[float]
     ) -> np.ndarray:
         """Predict yield values using fitted model (synchronous version)."""
-        
-        def mitscherlich_baule(x, A, b, c):
-            return A * (1 - np.exp(-b * (x + c)))
-        
-        def quadratic_plateau(x, a, b, c):
-            plateau_x = -b / (2 * c) if c != 0 else 0
-            plateau_y = a + b * plateau_x + c * plateau_x**2
-            return np.where(x <= plateau_x, a + b*x + c*x**2, plateau_y)
-        
-        def linear_plateau(x, a, b, plateau_x):
-            plateau_y = a + b * plateau_x
-            return np.where(x <= plateau_x, a + b*x, plateau_y)
-        
-        def exponential(x, a, b, c):
-            return a * (1 - np.exp(-b * x)) + c
-        
-        model_functions = {
-            ResponseModelType.MITSCHERLICH_BAULE: mitscherlich_baule,
-            ResponseModelType.QUADRATIC_PLATEAU: quadratic_plateau,
-            ResponseModelType.LINEAR_PLATEAU: linear_plateau,
-            ResponseModelType.EXPONENTIAL: exponential
-        }
-        
-        model_func = model_functions[model_type]
-        return model_func(x_values, *parameters)
+        return predict_response(x_values, model_type, parameters)
     
     async def _analyze_nutrient_interactions(
         self, 
@@ -529,30 +498,20 @@ class YieldResponseModelingService:
         crop_price: float
     ) -> float:
         """Find the economic optimal rate where marginal revenue equals marginal cost."""
-        
-        def profit_function(rate):
-            yield_value = self._predict_yield_sync(np.array([rate]), curve.model_type, curve.parameters)[0]
-            revenue = yield_value * crop_price
-            cost = rate * fertilizer_price
-            return revenue - cost
-        
-        # Find maximum profit rate
-        x_range = np.linspace(0, 300, 1000)  # Search up to 300 units
-        profits = [profit_function(x) for x in x_range]
-        optimal_rate = x_range[np.argmax(profits)]
-        
-        return optimal_rate
+        return economic_optimal_rate(
+            curve.model_type, curve.parameters, fertilizer_price, crop_price, self.max_search_rate
+        )
     
     async def _find_max_yield_rate(self, curve: YieldResponseCurve) -> float:
         """Find the rate that produces maximum yield."""
-        x_range = np.linspace(0, 300, 1000)
+        x_range = np.linspace(0, self.max_search_rate, 1000)
         yields = self._predict_yield_sync(x_range, curve.model_type, curve.parameters)
         max_yield_idx = np.argmax(yields)
         return x_range[max_yield_idx]
     
     async def _find_rate_for_target_yield(self, curve: YieldResponseCurve, target_yield: float) -> float:
         """Find the rate needed to achieve a target yield."""
-        x_range = np.linspace(0, 300, 1000)
+        x_range = np.linspace(0, self.max_search_rate, 1000)
         yields = self._predict_yield_sync(x_range, curve.model_type, curve.parameters)
         
         # Find closest yield to target
@@ -562,11 +521,7 @@ class YieldResponseModelingService:
     
     async def _calculate_marginal_response(self, curve: YieldResponseCurve, rate: float) -> float:
         """Calculate marginal response (derivative) at a given rate."""
-        # Numerical derivative
-        delta = 1.0
-        y1 = self._predict_yield_sync(np.array([rate]), curve.model_type, curve.parameters)[0]
-        y2 = self._predict_yield_sync(np.array([rate + delta]), curve.model_type, curve.parameters)[0]
-        return (y2 - y1) / delta
+        return float(marginal_response(np.array([rate]), curve.model_type, curve.parameters)[0])
     
     async def _calculate_economic_thresholds(
         self, 
@@ -609,16 +564,10 @@ class YieldResponseModelingService:
         crop_price: float
     ) -> float:
         """Find the break-even rate where marginal revenue equals marginal cost."""
-        x_range = np.linspace(0, 300, 1000)
-        
-        for rate in x_range:
-            marginal_response = await self._calculate_marginal_response(curve, rate)
-            marginal_revenue = marginal_response * crop_price
-            
-            if abs(marginal_revenue - fertilizer_price) < 0.01:
-                return rate
-        
-        return 0.0  # No break-even point found
+        rate = marginal_cost_rate(
+            curve.model_type, curve.parameters, fertilizer_price, crop_price, self.max_search_rate
+        )
+        return rate if rate is not None else 0.0  # No break-even point found
     
     async def _find_minimum_profitable_rate(
         self, 
@@ -627,18 +576,10 @@ class YieldResponseModelingService:
         crop_price: float
     ) -> float:
         """Find the minimum rate that produces positive profit."""
-        x_range = np.linspace(0, 300, 1000)
-        
-        for rate in x_range:
-            yield_value = self._predict_yield_sync(np.array([rate]), curve.model_type, curve.parameters)[0]
-            revenue = yield_value * crop_price
-            cost = rate * fertilizer_price
-            profit = revenue - cost
-            
-            if profit > 0:
-                return rate
-        
-        return 0.0
+        x_range, profitable = self._profitable_grid(curve, fertilizer_price, crop_price)
+        if not profitable.any():
+            return 0.0
+        return float(x_range[np.argmax(profitable)])
     
     async def _find_maximum_profitable_rate(
         self, 
@@ -647,18 +588,22 @@ class YieldResponseModelingService:
         crop_price: float
     ) -> float:
         """Find the maximum rate that still produces positive profit."""
-        x_range = np.linspace(300, 0, 1000)  # Search backwards
-        
-        for rate in x_range:
-            yield_value = self._predict_yield_sync(np.array([rate]), curve.model_type, curve.parameters)[0]
-            revenue = yield_value * crop_price
-            cost = rate * fertilizer_price
-            profit = revenue - cost
-            
-            if profit > 0:
-                return rate
-        
-        return 0.0
+        x_range, profitable = self._profitable_grid(curve, fertilizer_price, crop_price)
+        if not profitable.any():
+            return 0.0
+        return float(x_range[len(x_range) - 1 - np.argmax(profitable[::-1])])
+    
+    def _profitable_grid(
+        self, 
+        curve: YieldResponseCurve, 
+        fertilizer_price: float, 
+        crop_price: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Evaluate profit over the rate search grid in one vectorized pass."""
+        x_range = np.linspace(0, self.max_search_rate, 1000)
+        yields = self._predict_yield_sync(x_range, curve.model_type, curve.parameters)
+        profits = yields * crop_price - x_range * fertilizer_price
+        return x_range, profits > 0
     
     async def _validate_models(
         self, 
@@ -772,36 +717,44 @@ class YieldResponseModelingService:
         
         for nutrient, curve in nutrient_curves.items():
             # Generate x values for confidence interval calculation
-            x_range = np.linspace(0, 300, 100)
-            
-            # Calculate confidence intervals (simplified approach)
-            # In practice, this would use bootstrap or analytical methods
+            x_range = np.linspace(0, self.max_search_rate, 100)
             y_predicted = self._predict_yield_sync(x_range, curve.model_type, curve.parameters)
             
-            # Calculate standard error (simplified)
-            std_error = curve.rmse * np.sqrt(1 + 1/len(curve.data_points))
+            # Prediction standard error: residual error plus delta-method parameter
+            # uncertainty when the fitted covariance is available
+            residual_error = curve.rmse * np.sqrt(1 + 1/len(curve.data_points))
+            parameter_errors = prediction_standard_errors(
+                x_range, curve.model_type, curve.parameters, curve.covariance_matrix
+            )
+            if parameter_errors is None:
+                std_errors = np.full(len(x_range), residual_error)
+            else:
+                std_errors = np.sqrt(residual_error ** 2 + parameter_errors ** 2)
             
             # Calculate confidence intervals
             confidence_level = 0.95
             t_value = stats.t.ppf(1 - (1 - confidence_level) / 2, len(curve.data_points) - 1)
-            margin_of_error = t_value * std_error
-            
-            intervals = []
-            for i, x_val in enumerate(x_range):
-                y_val = y_predicted[i]
-                # Ensure predictions are non-negative
-                y_val = max(0, y_val)
-                lower_bound = max(0, y_val - margin_of_error)
-                upper_bound = max(0, y_val + margin_of_error)
-                
-                intervals.append(ConfidenceInterval(
+            margins = t_value * std_errors
+            
+            # Ensure predictions are non-negative
+            y_values = np.maximum(0, y_predicted)
+            lower_bounds = np.maximum(0, y_values - margins)
+            upper_bounds = np.maximum(0, y_values + margins)
+            
+            intervals = [
+                ConfidenceInterval(
                     x_value=x_val,
                     predicted_yield=y_val,
-                    lower_bound=lower_bound,
-                    upper_bound=upper_bound,
+                    lower_bound=lower,
+                    upper_bound=upper,
                     confidence_level=confidence_level,
-                    margin_of_error=margin_of_error
-                ))
+                    margin_of_error=margin
+                )
+                for x_val, y_val, lower, upper, margin in zip(
+                    x_range.tolist(), y_values.tolist(), lower_bounds.tolist(),
+                    upper_bounds.tolist(), margins.tolist()
+                )
+            ]
             
             confidence_intervals[nutrient] = intervals
         
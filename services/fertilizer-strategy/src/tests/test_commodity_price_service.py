@@ -4,7 +4,7 @@ Comprehensive tests for commodity price service.
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import date, timedelta
 
 from ..services.commodity_price_service import CommodityPriceService
@@ -185,6 +185,41 @@ class TestCommodityPriceService:
         assert urea_corn_ratio.price_ratio == 450.0 / 4.75
         assert urea_corn_ratio.inverse_ratio == 4.75 / 450.0
     
+    @pytest.mark.asyncio
+    async def test_price_ratio_trend_from_rollups(self, service, mock_corn_price):
+        """Test ratio trend loads fertilizer and crop history into the rollups."""
+        month_ago = date.today() - timedelta(days=30)
+        crop_history = [mock_corn_price.model_copy(update={"price_per_unit": 5.00, "price_date": month_ago})]
+        fertilizer_history = [MagicMock(price_date=month_ago, price_per_unit=400.0)]
+        
+        async def fake_session():
+            yield MagicMock()
+        
+        module = 'src.services.commodity_price_service'
+        with patch.object(service.db, 'get_historical_prices', new=AsyncMock(return_value=crop_history)) as crop, \
+                patch(f'{module}.get_db_session', side_effect=lambda: fake_session()), \
+                patch(f'{module}.FertilizerPriceRepository.get_product_price_history',
+                      new=AsyncMock(return_value=fertilizer_history)) as fertilizer:
+            result = await service.calculate_fertilizer_crop_price_ratios(
+                {"urea": 450.0}, {"corn": 4.50}, "US"
+            )
+        
+        urea_corn_ratio = next(r for r in result if r.commodity_type == CommodityType.CORN)
+        assert urea_corn_ratio.ratio_trend == "up"  # 80 -> 100 bushels per ton
+        assert fertilizer.call_args.args == ("urea", "US", month_ago)
+        assert crop.call_args.args[:3] == (CommodityType.CORN, "US", month_ago)
+    
+    @pytest.mark.asyncio
+    async def test_get_price_trend_served_from_rollups(self, service):
+        """Test repeated trend queries reuse hydrated rollups."""
+        with patch.object(service.db, 'get_historical_prices', wraps=service.db.get_historical_prices) as history:
+            first = await service.get_price_trend(CommodityType.CORN, "US", 30)
+            second = await service.get_price_trend(CommodityType.CORN, "US", 30)
+        
+        assert history.call_count == 1
+        assert first.current_price == second.current_price
+        assert first.data_points_used == 31
+    
     @pytest.mark.asyncio
     async def test_calculate_basis_analysis_success(self, service, mock_corn_price):
         """Test successful basis analysis calculation."""
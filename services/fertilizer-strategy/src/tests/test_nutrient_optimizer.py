@@ -27,6 +27,7 @@ from ..services.nutrient_optimizer import (
     EnvironmentalLimit,
     InteractionType
 )
+from ..services.nutrient_surrogates import ResponseSurrogate, ResponseSurrogateStore
 from ..models.nutrient_optimization_models import (
     OptimizationRequestModel,
     SoilTestModel,
@@ -41,7 +42,7 @@ class TestMultiNutrientOptimizer:
     @pytest.fixture
     def optimizer(self):
         """Create optimizer instance for testing."""
-        return MultiNutrientOptimizer()
+        return MultiNutrientOptimizer(surrogate_store=ResponseSurrogateStore(cache_dir=None))
     
     @pytest.fixture
     def sample_field_id(self):
@@ -510,6 +511,80 @@ class TestMultiNutrientOptimizer:
         assert training_data['P_rate'].min() >= 0
         assert training_data['K_rate'].min() >= 0
         assert training_data['yield_response'].min() >= 0
+    
+    def test_batch_yield_response_matches_scalar(self, optimizer, sample_optimization_request):
+        """Test population-wide yield responses match the per-candidate calculation."""
+        optimization_data = optimizer._prepare_optimization_data(sample_optimization_request)
+        optimization_data["ph_level"] = 7.8  # Enable pH-dependent antagonisms
+        nutrients = [
+            NutrientType.NITROGEN.value, NutrientType.PHOSPHORUS.value,
+            NutrientType.ZINC.value, NutrientType.IRON.value
+        ]
+        rate_matrix = np.array([
+            [0.0, 120.0, 200.0, 60.0],
+            [40.0, 0.0, 150.0, 30.0],
+            [2.0, 5.0, 0.0, 10.0],
+            [1.0, 0.0, 3.0, 8.0]
+        ])
+        
+        batch = optimizer._calculate_yield_response_batch(
+            rate_matrix, nutrients, optimization_data, sample_optimization_request
+        )
+        
+        for column in range(rate_matrix.shape[1]):
+            rates = dict(zip(nutrients, rate_matrix[:, column]))
+            assert batch[column] == pytest.approx(
+                optimizer._calculate_yield_response(rates, optimization_data, sample_optimization_request)
+            )
+    
+    def test_vectorized_objective_and_constraints(self, optimizer, sample_optimization_request):
+        """Test objective and constraints accept a single candidate or a population."""
+        optimization_data = optimizer._prepare_optimization_data(sample_optimization_request)
+        nutrients = [NutrientType.NITROGEN.value, NutrientType.PHOSPHORUS.value, NutrientType.POTASSIUM.value]
+        objective = optimizer._build_objective(nutrients, optimization_data, sample_optimization_request)
+        constraints = optimizer._define_optimization_constraints(
+            optimization_data, sample_optimization_request, nutrients
+        )
+        population = np.array([[50.0, 100.0, 150.0], [30.0, 60.0, 0.0], [40.0, 0.0, 80.0]])
+        
+        values = objective(population)
+        
+        assert values.shape == (3,)
+        for column in range(population.shape[1]):
+            assert values[column] == pytest.approx(objective(population[:, column]))
+            for constraint in constraints:
+                np.testing.assert_allclose(
+                    np.asarray(constraint['fun'](population))[..., column],
+                    constraint['fun'](population[:, column])
+                )
+    
+    @pytest.mark.asyncio
+    async def test_ml_surrogate_trained_once_per_crop_and_soil(self, optimizer, sample_optimization_request):
+        """Test the ML surrogate is reused across requests for the same crop and soil class."""
+        optimization_data = optimizer._prepare_optimization_data(sample_optimization_request)
+        
+        with patch.object(
+            optimizer, '_train_response_surrogate', wraps=optimizer._train_response_surrogate
+        ) as train:
+            first_rates, _ = await optimizer._ml_optimization(optimization_data, sample_optimization_request)
+            second_rates, _ = await optimizer._ml_optimization(optimization_data, sample_optimization_request)
+        
+        assert train.call_count == 1
+        assert first_rates == second_rates
+    
+    def test_surrogate_store_persists_to_disk(self, tmp_path):
+        """Test surrogates are reloaded from disk instead of retrained."""
+        key = ResponseSurrogateStore.make_key("Corn", "Silt Loam")
+        trainer = MagicMock(return_value=ResponseSurrogate(
+            model="model", scaler="scaler", feature_names=["N_rate"], training_samples=10
+        ))
+        
+        ResponseSurrogateStore(cache_dir=str(tmp_path)).get_or_train(key, trainer)
+        reloaded = ResponseSurrogateStore(cache_dir=str(tmp_path)).get_or_train(key, trainer)
+        
+        assert key == ("corn", "silt_loam")
+        assert trainer.call_count == 1
+        assert reloaded.model == "model"
 
 
 class TestNutrientOptimizationAPI:
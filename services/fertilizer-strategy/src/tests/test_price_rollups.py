@@ -0,0 +1,172 @@
+"""
+Tests for incrementally maintained price rollups.
+"""
+
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from ..services.price_rollups import (
+    PriceRollupBucket, PriceRollupStore, PriceSeriesRollup, RollupGranularity,
+    fertilizer_series_key, get_period_start
+)
+
+
+def _daily_prices(days: int, start: date, base: float = 400.0):
+    """Deterministic, non-monotonic daily price series."""
+    return [
+        (start + timedelta(days=i), base + (i % 5) * 3.5 - (i % 3) * 2.0 + i * 0.25)
+        for i in range(days)
+    ]
+
+
+class TestPriceRollupBucket:
+    """Test suite for single rollup buckets."""
+
+    def test_welford_matches_batch_statistics(self):
+        """Test running mean and variance match the batch formulas."""
+        prices = [450.0, 455.5, 448.25, 460.0, 452.75]
+        day = date(2024, 3, 4)
+        bucket = PriceRollupBucket.from_price(day, prices[0], day)
+        for price in prices[1:]:
+            bucket.add(price, day)
+
+        assert bucket.count == 5
+        assert bucket.mean == pytest.approx(statistics.mean(prices))
+        assert bucket.variance == pytest.approx(statistics.variance(prices))
+        assert bucket.open_price == 450.0
+        assert bucket.close_price == 452.75
+        assert bucket.high_price == 460.0
+        assert bucket.low_price == 448.25
+
+    def test_merge_matches_combined_statistics(self):
+        """Test merging buckets gives the moments of the combined prices."""
+        first_day = date(2024, 3, 4)
+        second_day = date(2024, 3, 5)
+        first = PriceRollupBucket.from_price(first_day, 10.0, first_day)
+        first.add(12.0, first_day)
+        second = PriceRollupBucket.from_price(second_day, 20.0, second_day)
+        second.add(18.0, second_day)
+        second.add(15.0, second_day)
+
+        first.merge(second)
+
+        combined = [10.0, 12.0, 20.0, 18.0, 15.0]
+        assert first.count == 5
+        assert first.mean == pytest.approx(statistics.mean(combined))
+        assert first.variance == pytest.approx(statistics.variance(combined))
+        assert first.open_price == 10.0
+        assert first.close_price == 15.0
+
+    def test_round_trip_serialization(self):
+        """Test buckets survive persistence round trips."""
+        day = date(2024, 3, 4)
+        bucket = PriceRollupBucket.from_price(day, 100.0, day)
+        bucket.add(110.0, day)
+
+        restored = PriceRollupBucket.from_dict(bucket.to_dict())
+
+        assert restored == bucket
+
+
+class TestPriceSeriesRollup:
+    """Test suite for per-series rollups."""
+
+    def test_period_starts(self):
+        """Test weekly buckets start on Monday and monthly on the 1st."""
+        day = date(2024, 3, 14)  # Thursday
+        assert get_period_start(day, RollupGranularity.DAILY) == day
+        assert get_period_start(day, RollupGranularity.WEEKLY) == date(2024, 3, 11)
+        assert get_period_start(day, RollupGranularity.MONTHLY) == date(2024, 3, 1)
+
+    def test_record_updates_all_granularities(self):
+        """Test a write touches one bucket per granularity."""
+        series = PriceSeriesRollup()
+        for day, price in _daily_prices(40, date(2024, 1, 1)):
+            touched = series.record(price, day)
+            assert [granularity for granularity, _ in touched] == list(RollupGranularity)
+
+        assert len(series.get_buckets(RollupGranularity.DAILY)) == 40
+        monthly = series.get_buckets(RollupGranularity.MONTHLY)
+        assert [bucket.period_start for bucket in monthly] == [date(2024, 1, 1), date(2024, 2, 1)]
+        assert sum(bucket.count for bucket in monthly) == 40
+
+    def test_return_volatility_matches_batch(self):
+        """Test prefix-sum volatility matches stdev of daily returns."""
+        prices = _daily_prices(30, date(2024, 1, 1))
+        series = PriceSeriesRollup()
+        for day, price in prices:
+            series.record(price, day)
+
+        closes = [price for _, price in prices][-7:]
+        returns = [(closes[i] - closes[i - 1]) / closes[i - 1] for i in range(1, len(closes))]
+
+        assert series.return_volatility(7) == pytest.approx(statistics.stdev(returns) * 100)
+        assert series.return_volatility(31) is None
+
+    def test_out_of_order_write_refreshes_prefix(self):
+        """Test late-arriving prices are reflected in later queries."""
+        series = PriceSeriesRollup()
+        for day, price in _daily_prices(10, date(2024, 1, 1)):
+            series.record(price, day)
+        assert series.point_count() == 10
+
+        series.record(999.0, date(2023, 12, 31))
+
+        assert series.point_count() == 11
+        assert series.close_on_or_before(date(2023, 12, 31)) == 999.0
+
+    def test_close_lookups(self):
+        """Test nearest and on-or-before close lookups respect tolerance and window."""
+        series = PriceSeriesRollup()
+        series.record(100.0, date(2024, 1, 1))
+        series.record(110.0, date(2024, 1, 5))
+        series.record(120.0, date(2024, 1, 9))
+
+        assert series.close_nearest(date(2024, 1, 7), tolerance_days=2) == 110.0  # Tie keeps earlier day
+        assert series.close_nearest(date(2024, 1, 7), tolerance_days=1) is None
+        assert series.close_on_or_before(date(2024, 1, 8)) == 110.0
+        assert series.close_on_or_before(date(2024, 1, 8), since=date(2024, 1, 6)) is None
+
+    def test_window_stats_matches_batch(self):
+        """Test merged window moments match the last N prices."""
+        prices = _daily_prices(20, date(2024, 1, 1))
+        series = PriceSeriesRollup()
+        for day, price in prices:
+            series.record(price, day)
+
+        stats = series.window_stats(7)
+        window = [price for _, price in prices][-7:]
+
+        assert stats.mean == pytest.approx(statistics.mean(window))
+        assert stats.variance == pytest.approx(statistics.variance(window))
+
+
+class TestPriceRollupStore:
+    """Test suite for the rollup store."""
+
+    def test_hydrate_replaces_window_and_rebuilds_coarse_buckets(self):
+        """Test hydration replaces live buckets instead of double counting."""
+        store = PriceRollupStore()
+        key = fertilizer_series_key("urea", "US")
+        since = date(2024, 1, 1)
+        prices = _daily_prices(14, since)
+
+        store.record_price(key, prices[-1][1], prices[-1][0])
+        store.hydrate_from_prices(key, since, prices)
+
+        series = store.get_series(key)
+        assert series.point_count() == 14
+        weekly = series.get_buckets(RollupGranularity.WEEKLY)
+        assert sum(bucket.count for bucket in weekly) == 14
+        assert store.is_hydrated(key, since)
+        assert not store.is_hydrated(key, since - timedelta(days=1))
+
+    def test_hydration_expires(self):
+        """Test stale hydration forces a reload."""
+        store = PriceRollupStore(max_staleness_seconds=0)
+        key = fertilizer_series_key("dap", "CA")
+        store.hydrate_from_prices(key, date(2024, 1, 1), [])
+
+        assert not store.is_hydrated(key, date(2024, 1, 1))
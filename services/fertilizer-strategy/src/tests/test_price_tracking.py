@@ -225,21 +225,6 @@ class TestFertilizerPriceTrackingService:
         result = service._calculate_trend_percent(450.0, None)
         assert result is None
     
-    def test_calculate_volatility(self, service):
-        """Test volatility calculation."""
-        prices = [100.0, 105.0, 102.0, 108.0, 110.0]
-        volatility = service._calculate_volatility(prices)
-        
-        assert volatility is not None
-        assert volatility > 0
-    
-    def test_calculate_volatility_insufficient_data(self, service):
-        """Test volatility calculation with insufficient data."""
-        prices = [100.0]  # Only one price point
-        volatility = service._calculate_volatility(prices)
-        
-        assert volatility is None
-    
     def test_determine_trend_direction(self, service):
         """Test trend direction determination."""
         # Upward trend - 5% change is weak strength (not > 5)
@@ -349,6 +334,163 @@ class TestPriceProviders:
         assert result is None
 
 
+class TestBulkPriceRefresh:
+    """Test suite for the bulk price refresh pipeline."""
+    
+    @pytest.mark.asyncio
+    async def test_bulk_provider_fetch_prices(self):
+        """Test bulk provider endpoint returns all known products at once."""
+        provider = USDANASSProvider()
+        products = [FertilizerProduct.UREA, FertilizerProduct.DAP, FertilizerProduct.NPK_BLEND]
+        
+        results = await provider.fetch_prices(products, "US")
+        
+        assert provider.supports_bulk is True
+        assert set(results) == {FertilizerProduct.UREA, FertilizerProduct.DAP}
+        assert all(price.region == "US" for price in results.values())
+    
+    @pytest.mark.asyncio
+    async def test_default_fetch_prices_fans_out(self):
+        """Test providers without a bulk endpoint fall back to per-product fetches."""
+        provider = ManufacturerProvider()
+        products = [FertilizerProduct.UREA, FertilizerProduct.MAP]
+        
+        with patch.object(provider, 'fetch_price', wraps=provider.fetch_price) as fetch_price:
+            results = await provider.fetch_prices(products, "US", max_concurrency=1)
+        
+        assert provider.supports_bulk is False
+        assert fetch_price.call_count == 2
+        assert set(results) == set(products)
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_prices_uses_provider_priority(self):
+        """Test each pair is priced by the first provider that has it."""
+        service = FertilizerPriceTrackingService()
+        products = [FertilizerProduct.UREA, FertilizerProduct.UAN]
+        
+        response = await service.bulk_update_prices(products, ["US", "CA"])
+        
+        assert response.total_updates == 4
+        assert response.successful_updates == 4
+        assert response.failed_updates == 0
+        assert all(price.source == PriceSource.USDA_NASS for price in response.prices)
+        
+        usda_stats = response.provider_stats["USDANASSProvider"]
+        assert usda_stats.calls == 2  # One bulk call per region
+        assert usda_stats.bulk_calls == 2
+        assert usda_stats.products_returned == 4
+        assert response.provider_stats["CMEGroupProvider"].calls == 0
+        
+        # Results are cached for subsequent single-product lookups
+        assert service._is_cache_valid("urea_CA", max_age_hours=1)
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_prices_falls_through_providers(self):
+        """Test products missing from one provider are requested from the next."""
+        service = FertilizerPriceTrackingService()
+        service.providers[0].fetch_prices = AsyncMock(side_effect=Exception("upstream down"))
+        
+        response = await service.bulk_update_prices([FertilizerProduct.UREA], ["US"])
+        
+        assert response.successful_updates == 1
+        assert response.prices[0].source == PriceSource.CME_GROUP
+        assert response.provider_stats["USDANASSProvider"].errors == 1
+        assert response.provider_stats["CMEGroupProvider"].products_returned == 1
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_prices_reports_unpriced_pairs(self):
+        """Test pairs no provider can price are reported as failures."""
+        service = FertilizerPriceTrackingService()
+        
+        response = await service.bulk_update_prices([FertilizerProduct.NPK_BLEND], ["MX"])
+        
+        assert response.successful_updates == 0
+        assert response.failed_pairs == ["npk_blend_MX"]
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_prices_writes_in_batches(self):
+        """Test storage issues one multi-row insert per batch."""
+        service = FertilizerPriceTrackingService()
+        products = [FertilizerProduct.UREA, FertilizerProduct.DAP, FertilizerProduct.MAP]
+        
+        async def fake_session():
+            yield MagicMock()
+        
+        bulk_insert = AsyncMock(side_effect=lambda records: len(records))
+        with patch('src.services.price_tracking_service.get_db_session', side_effect=lambda: fake_session()):
+            with patch(
+                'src.services.price_tracking_service.FertilizerPriceRepository.bulk_create_price_records',
+                new=bulk_insert
+            ):
+                response = await service.bulk_update_prices(products, ["US", "CA"], batch_size=4)
+        
+        assert response.records_written == 6
+        assert response.write_batches == 2
+        assert [len(call.args[0]) for call in bulk_insert.call_args_list] == [4, 2]
+
+
+class TestPriceRollupStorage:
+    """Test suite for loading and persisting price rollups."""
+    
+    @staticmethod
+    def _price(price: float, price_date: date) -> FertilizerPriceData:
+        return FertilizerPriceData(
+            product_id="usda_urea",
+            product_name="Urea",
+            fertilizer_type=FertilizerType.NITROGEN,
+            specific_product=FertilizerProduct.UREA,
+            price_per_unit=price,
+            unit="ton",
+            region="US",
+            source=PriceSource.USDA_NASS,
+            price_date=price_date,
+            confidence=0.9,
+            volatility=0.1
+        )
+    
+    @pytest.mark.asyncio
+    async def test_hydrate_backfills_from_product_price_history(self):
+        """Test series without persisted rollups are rebuilt from raw prices by product and region."""
+        service = FertilizerPriceTrackingService()
+        today = date.today()
+        history = [
+            MagicMock(price_date=today - timedelta(days=2), price_per_unit=440.0),
+            MagicMock(price_date=today - timedelta(days=1), price_per_unit=450.0)
+        ]
+        
+        async def fake_session():
+            yield MagicMock()
+        
+        repo = 'src.services.price_tracking_service.FertilizerPriceRepository'
+        with patch('src.services.price_tracking_service.get_db_session', side_effect=lambda: fake_session()), \
+                patch(f'{repo}.get_price_rollups', new=AsyncMock(return_value=[])), \
+                patch(f'{repo}.get_product_price_history', new=AsyncMock(return_value=history)) as raw, \
+                patch(f'{repo}.upsert_price_rollups', new=AsyncMock(return_value=0)) as upsert:
+            hydrated = await service._hydrate_rollups([(FertilizerProduct.UREA, "US")], today - timedelta(days=7))
+        
+        assert hydrated
+        assert raw.call_args.args[:2] == ("urea", "US")
+        series = service.rollups.get_series("fertilizer:urea:US")
+        assert series.latest().close_price == 450.0
+        assert upsert.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_record_rollups_survives_hydrate_failure(self):
+        """Test new prices are still recorded when loading persisted rollups fails."""
+        service = FertilizerPriceTrackingService()
+        upsert = AsyncMock(return_value=0)
+        
+        with patch.object(service, '_hydrate_rollups', new=AsyncMock(side_effect=AttributeError("query"))), \
+                patch('src.services.price_tracking_service.FertilizerPriceRepository.upsert_price_rollups',
+                      new=upsert):
+            await service._record_rollups([self._price(455.0, date.today())])
+        
+        series = service.rollups.get_series("fertilizer:urea:US")
+        assert series.latest().close_price == 455.0
+        # Buckets missing the persisted history must not overwrite stored rows
+        upsert.assert_not_awaited()
+
+
 class TestPriceModels:
     """Test suite for price models validation."""
     
@@ -8,7 +8,9 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime, date, timedelta
 
 from ..services.scheduled_price_updater import ScheduledPriceUpdater
-from ..models.price_models import FertilizerProduct, FertilizerType
+from ..models.price_models import (
+    FertilizerProduct, FertilizerType, BulkPriceUpdateResponse, ProviderFetchStats
+)
 from ..services.price_tracking_service import FertilizerPriceTrackingService
 
 
@@ -54,49 +56,55 @@ class TestScheduledPriceUpdater:
 
     @pytest.mark.asyncio
     async def test_daily_price_update_success(self, scheduler):
-        """Test daily price update with successful updates."""
-        # Mock successful price updates
-        mock_response = AsyncMock()
-        mock_response.success = True
-        mock_response.new_price.price_per_unit = 450.0
-        mock_response.error_message = None
+        """Test daily price update runs through the bulk pipeline."""
+        total = len(list(FertilizerProduct)) * 3  # 3 regions
+        mock_response = BulkPriceUpdateResponse(
+            total_updates=total,
+            successful_updates=total,
+            failed_updates=0,
+            duration_seconds=0.1
+        )
         
-        scheduler.price_service.update_price = AsyncMock(return_value=mock_response)
+        scheduler.price_service.bulk_update_prices = AsyncMock(return_value=mock_response)
+        scheduler.price_service.update_price = AsyncMock()
         
         # Mock get_db_session to avoid database dependency
         with patch('src.services.scheduled_price_updater.get_db_session'):
             await scheduler._daily_price_update()
         
-        # Verify update_price was called for all products and regions
-        expected_calls = len(list(FertilizerProduct)) * 3  # 3 regions
-        assert scheduler.price_service.update_price.call_count == expected_calls
+        # One bulk refresh covers all products and regions
+        scheduler.price_service.bulk_update_prices.assert_called_once()
+        products, regions = scheduler.price_service.bulk_update_prices.call_args.args
+        assert products == list(FertilizerProduct)
+        assert regions == ["US", "CA", "MX"]
+        scheduler.price_service.update_price.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_daily_price_update_with_failures(self, scheduler):
         """Test daily price update with some failures."""
-        # Mock mixed success/failure responses
-        def mock_update_price(product, region, force_update):
-            if product == FertilizerProduct.UREA and region == "US":
-                response = AsyncMock()
-                response.success = False
-                response.error_message = "API Error"
-                return response
-            else:
-                response = AsyncMock()
-                response.success = True
-                response.new_price.price_per_unit = 450.0
-                response.error_message = None
-                return response
-        
-        scheduler.price_service.update_price = AsyncMock(side_effect=mock_update_price)
+        total = len(list(FertilizerProduct)) * 3  # 3 regions
+        mock_response = BulkPriceUpdateResponse(
+            total_updates=total,
+            successful_updates=total - 1,
+            failed_updates=1,
+            failed_pairs=["urea_US"],
+            provider_stats={
+                "USDANASSProvider": ProviderFetchStats(
+                    provider="USDANASSProvider", calls=3, bulk_calls=3, errors=1
+                )
+            },
+            duration_seconds=0.1
+        )
+        
+        scheduler.price_service.bulk_update_prices = AsyncMock(return_value=mock_response)
         
-        # Mock get_db_session to avoid database dependency
         with patch('src.services.scheduled_price_updater.get_db_session'):
-            await scheduler._daily_price_update()
+            with patch.object(scheduler, '_store_update_statistics', new=AsyncMock()) as store_stats:
+                await scheduler._daily_price_update()
         
-        # Verify update_price was called for all products and regions
-        expected_calls = len(list(FertilizerProduct)) * 3  # 3 regions
-        assert scheduler.price_service.update_price.call_count == expected_calls
+        store_stats.assert_called_once()
+        args = store_stats.call_args.args
+        assert args[1:4] == (total, total - 1, 1)
 
     @pytest.mark.asyncio
     async def test_hourly_price_update(self, scheduler):
@@ -0,0 +1,142 @@
+"""
+Tests for the fitted yield-response curve registry and vectorized curve math.
+"""
+
+import pytest
+import numpy as np
+
+from ..models.yield_response_models import CurveFitResult, ResponseModelType
+from ..services.yield_curve_registry import (
+    FittedResponseModel, YieldCurveRegistry, economic_optimal_rate,
+    marginal_cost_rate, marginal_response, predict_response,
+    prediction_standard_errors
+)
+from ..services.yield_response_modeling_service import YieldResponseModelingService
+
+
+DATA_POINTS = [(0.0, 120.0), (50.0, 150.0), (100.0, 180.0), (150.0, 200.0), (200.0, 210.0)]
+
+
+def _grid_optimum(model_type, parameters, fertilizer_price, crop_price):
+    """Brute-force profit maximum on a fine grid."""
+    rates = np.linspace(0, 300, 300001)
+    profits = predict_response(rates, model_type, parameters) * crop_price - rates * fertilizer_price
+    return rates[np.argmax(profits)]
+
+
+class TestCurveMath:
+    """Test suite for vectorized curve functions."""
+
+    @pytest.mark.parametrize("model_type,parameters", [
+        (ResponseModelType.MITSCHERLICH_BAULE, [220.0, 0.015, 40.0]),
+        (ResponseModelType.QUADRATIC_PLATEAU, [120.0, 0.8, -0.002]),
+        (ResponseModelType.LINEAR_PLATEAU, [120.0, 0.5, 160.0]),
+        (ResponseModelType.EXPONENTIAL, [100.0, 0.02, 120.0])
+    ])
+    def test_economic_optimum_matches_grid_search(self, model_type, parameters):
+        """Test closed-form optimum matches a brute-force grid search."""
+        optimum = economic_optimal_rate(model_type, parameters, 0.5, 5.0)
+
+        assert optimum == pytest.approx(_grid_optimum(model_type, parameters, 0.5, 5.0), abs=0.01)
+
+    def test_marginal_response_matches_finite_difference(self):
+        """Test analytic derivatives agree with central differences."""
+        rates = np.linspace(1, 250, 50)
+        for model_type, parameters in [
+            (ResponseModelType.MITSCHERLICH_BAULE, [220.0, 0.015, 40.0]),
+            (ResponseModelType.EXPONENTIAL, [100.0, 0.02, 120.0]),
+            (ResponseModelType.QUADRATIC_PLATEAU, [120.0, 0.8, -0.001])
+        ]:
+            h = 1e-4
+            numeric = (
+                predict_response(rates + h, model_type, parameters)
+                - predict_response(rates - h, model_type, parameters)
+            ) / (2 * h)
+            np.testing.assert_allclose(marginal_response(rates, model_type, parameters), numeric, atol=1e-5)
+
+    def test_break_even_rate_equates_marginal_revenue_and_cost(self):
+        """Test the break-even rate satisfies MR = MC."""
+        parameters = [220.0, 0.015, 40.0]
+        rate = marginal_cost_rate(ResponseModelType.MITSCHERLICH_BAULE, parameters, 0.5, 5.0)
+
+        marginal = marginal_response([rate], ResponseModelType.MITSCHERLICH_BAULE, parameters)[0]
+        assert marginal * 5.0 == pytest.approx(0.5)
+        assert marginal_cost_rate(ResponseModelType.LINEAR_PLATEAU, [120.0, 0.5, 160.0], 0.5, 5.0) is None
+
+    def test_prediction_standard_errors(self):
+        """Test delta-method errors are zero without parameter uncertainty and reject bad covariance."""
+        parameters = [120.0, 0.5, 160.0]
+        rates = np.linspace(0, 300, 10)
+
+        zero = prediction_standard_errors(rates, ResponseModelType.LINEAR_PLATEAU, parameters, np.zeros((3, 3)))
+        intercept_only = prediction_standard_errors(
+            rates, ResponseModelType.LINEAR_PLATEAU, parameters, np.diag([4.0, 0.0, 0.0])
+        )
+
+        np.testing.assert_allclose(zero, 0.0)
+        np.testing.assert_allclose(intercept_only, 2.0, rtol=1e-4)
+        assert prediction_standard_errors(
+            rates, ResponseModelType.LINEAR_PLATEAU, parameters, [[np.inf] * 3] * 3
+        ) is None
+
+
+class TestYieldCurveRegistry:
+    """Test suite for the curve registry."""
+
+    def _entry(self):
+        fit = CurveFitResult(
+            model_type=ResponseModelType.LINEAR_PLATEAU,
+            parameters=[120.0, 0.5, 160.0],
+            parameter_errors=[1.0, 0.1, 5.0],
+            r_squared=0.95,
+            covariance_matrix=[[1.0, 0.0, 0.0], [0.0, 0.01, 0.0], [0.0, 0.0, 25.0]]
+        )
+        return FittedResponseModel(
+            best_model=ResponseModelType.LINEAR_PLATEAU,
+            fits={ResponseModelType.LINEAR_PLATEAU: fit}
+        )
+
+    def test_key_ignores_point_order(self):
+        """Test data hashes are stable under reordering."""
+        key = YieldCurveRegistry.make_key("Corn", "N", None, DATA_POINTS)
+
+        assert key == YieldCurveRegistry.make_key("corn", "N", "default", list(reversed(DATA_POINTS)))
+        assert key != YieldCurveRegistry.make_key("corn", "N", "IA", DATA_POINTS)
+
+    def test_lru_eviction_and_invalidation(self):
+        """Test the registry evicts least recently used entries and invalidates by crop."""
+        registry = YieldCurveRegistry(max_entries=2)
+        keys = [YieldCurveRegistry.make_key("corn", nutrient, None, DATA_POINTS) for nutrient in ("N", "P", "K")]
+
+        registry.put(keys[0], self._entry())
+        registry.put(keys[1], self._entry())
+        assert registry.get(keys[0]) is not None
+        registry.put(keys[2], self._entry())
+
+        assert registry.get(keys[1]) is None
+        assert registry.get(keys[0]) is not None
+
+        registry.invalidate(crop_type="corn", nutrient="N")
+        assert registry.get(keys[0]) is None
+        assert registry.get(keys[2]) is not None
+
+    @pytest.mark.asyncio
+    async def test_service_reuses_registered_fit(self):
+        """Test repeated fits of identical data skip curve fitting."""
+        registry = YieldCurveRegistry()
+        service = YieldResponseModelingService(curve_registry=registry)
+
+        first = await service._fit_response_curve(DATA_POINTS, "N", "corn")
+        fit_calls = []
+        original_fit = service._fit_single_model
+
+        async def counting_fit(*args, **kwargs):
+            fit_calls.append(args)
+            return await original_fit(*args, **kwargs)
+
+        service._fit_single_model = counting_fit
+        second = await service._fit_response_curve(DATA_POINTS, "N", "corn")
+
+        assert fit_calls == []
+        assert second.parameters == first.parameters
+        assert registry.get_stats()["hits"] == 1
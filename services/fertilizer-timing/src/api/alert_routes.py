@@ -3,13 +3,15 @@ API routes for fertilizer timing alert generation.
 """
 
 import logging
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from models import TimingAlertResponse, TimingOptimizationRequest
 from timing_services import TimingResultRepository
 from .timing_routes import get_adapter, get_repository
-from services import ApplicationWindowAlertService
+from services import ApplicationWindowAlertService, FieldBatchTimingEngine
+from services.calendar_service import SeasonalCalendarService
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,22 @@ def get_alert_service(adapter=Depends(get_adapter)) -> ApplicationWindowAlertSer
     return ApplicationWindowAlertService(timing_adapter=adapter)
 
 
+_batch_engine: Optional[FieldBatchTimingEngine] = None
+
+
+def get_batch_engine() -> FieldBatchTimingEngine:
+    # Shared so forecast refreshes can re-evaluate the fields of the last batch run
+    global _batch_engine
+    if _batch_engine is None:
+        adapter = get_adapter()
+        _batch_engine = FieldBatchTimingEngine(
+            calendar_service=SeasonalCalendarService(adapter=adapter),
+            alert_service=ApplicationWindowAlertService(timing_adapter=adapter),
+            adapter=adapter,
+        )
+    return _batch_engine
+
+
 @router.post(
     "/generate",
     response_model=TimingAlertResponse,
@@ -43,3 +61,72 @@ async def generate_alerts(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Alert generation failed: {exc}",
         ) from exc
+
+
+@router.post(
+    "/batch",
+    response_model=Dict[str, TimingAlertResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def generate_batch_alerts(
+    requests: List[TimingOptimizationRequest],
+    engine: FieldBatchTimingEngine = Depends(get_batch_engine),
+    repository: TimingResultRepository = Depends(get_repository),
+) -> Dict[str, TimingAlertResponse]:
+    """Generate alerts for many fields, sharing weather and crop-stage work across field groups."""
+    try:
+        batch = await engine.run(requests)
+        for request in requests:
+            alert_response = batch.alerts[request.request_id]
+            await repository.save_result(request, batch.results[request.request_id])
+            await repository.save_alerts(request.request_id, engine.alert_records(alert_response))
+        return batch.alerts
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("Batch alert generation failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch alert generation failed: {exc}",
+        ) from exc
+
+
+@router.post(
+    "/batch/refresh-forecast",
+    response_model=Dict[str, TimingAlertResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def refresh_batch_alerts(
+    cells: Optional[List[str]] = Query(
+        None,
+        description="Weather cells to refresh as 'row:col'; all cells when omitted",
+    ),
+    engine: FieldBatchTimingEngine = Depends(get_batch_engine),
+    repository: TimingResultRepository = Depends(get_repository),
+) -> Dict[str, TimingAlertResponse]:
+    """Re-optimize the last batch run's fields against fresh forecasts and rebuild their alerts."""
+    selected = None
+    if cells:
+        selected = []
+        for cell in cells:
+            parts = cell.split(":")
+            try:
+                if len(parts) != 2:
+                    raise ValueError(cell)
+                selected.append((int(parts[0]), int(parts[1])))
+            except ValueError as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid weather cell '{cell}', expected 'row:col'",
+                ) from exc
+
+    try:
+        batch = await engine.refresh_forecast(selected)
+        for request_id, alert_response in batch.alerts.items():
+            await repository.save_result(batch.requests[request_id], batch.results[request_id])
+            await repository.save_alerts(request_id, engine.alert_records(alert_response))
+        return batch.alerts
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("Batch alert refresh failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch alert refresh failed: {exc}",
+        ) from exc
@@ -1,9 +1,11 @@
 from .alert_service import ApplicationWindowAlertService  # noqa: F401
+from .batch_timing_engine import FieldBatchTimingEngine  # noqa: F401
 from .timing_explanation_service import TimingExplanationService  # noqa: F401
 from .weather_integration_service import WeatherSoilIntegrationService  # noqa: F401
 
 __all__ = [
     "ApplicationWindowAlertService",
+    "FieldBatchTimingEngine",
     "TimingExplanationService",
     "WeatherSoilIntegrationService",
 ]
@@ -80,14 +80,16 @@ class ApplicationWindowAlertService:
         """
         Build enriched alerts based on an existing optimization result.
         """
-        base_response = self._base_alert_service.generate_alerts(result)
-        alerts: List[TimingAlert] = []
-        existing_titles: Dict[str, bool] = {}
-
-        for base_alert in base_response.alerts:
-            alerts.append(base_alert)
-            existing_titles[base_alert.title] = True
+        report = await self.fetch_integration_report(request)
+        return self.assemble_alerts(request, result, report)
 
+    async def fetch_integration_report(
+        self,
+        request: TimingOptimizationRequest,
+    ) -> Optional[WeatherSoilIntegrationReport]:
+        """
+        Fetch the weather and soil integration report, or None when it is unavailable.
+        """
         report: Optional[WeatherSoilIntegrationReport] = None
         try:
             report = await self._weather_service.generate_integration_report(
@@ -96,10 +98,36 @@ class ApplicationWindowAlertService:
             )
         except Exception as exc:  # pylint: disable=broad-except
             logger.warning("Weather integration unavailable, proceeding with base alerts: %s", exc)
+        return report
+
+    def assemble_alerts(
+        self,
+        request: TimingOptimizationRequest,
+        result: TimingOptimizationResult,
+        report: Optional[WeatherSoilIntegrationReport],
+        window_stats: Optional[Tuple[int, int]] = None,
+    ) -> TimingAlertResponse:
+        """
+        Build enriched alerts from a result and an already fetched integration report.
+
+        ``window_stats`` is the (optimal window count, longest non-optimal streak)
+        pair; batch callers that share weather windows across fields pass it in
+        precomputed.
+        """
+        base_response = self._base_alert_service.generate_alerts(result)
+        alerts: List[TimingAlert] = []
+        existing_titles: Dict[str, bool] = {}
+
+        for base_alert in base_response.alerts:
+            alerts.append(base_alert)
+            existing_titles[base_alert.title] = True
+
+        if window_stats is None:
+            window_stats = self._measure_weather_windows(result.weather_windows)
 
         self._append_optimal_window_alerts(alerts, existing_titles, result, report, request)
         self._append_operational_alerts(alerts, existing_titles, result, request, report)
-        self._append_weather_gap_alert(result.request_id, alerts, existing_titles, result.weather_windows, report)
+        self._append_weather_gap_alert(result.request_id, alerts, existing_titles, window_stats, report)
 
         enriched_response = TimingAlertResponse(
             request_id=result.request_id,
@@ -317,25 +345,10 @@ class ApplicationWindowAlertService:
         request_id: str,
         alerts: List[TimingAlert],
         existing_titles: Dict[str, bool],
-        windows: Iterable[WeatherWindow],
+        window_stats: Tuple[int, int],
         report: Optional[WeatherSoilIntegrationReport],
     ) -> None:
-        optimal_count = 0
-        marginal_streak = 0
-        longest_marginal_streak = 0
-
-        for window in windows:
-            if window.condition == WeatherCondition.OPTIMAL:
-                optimal_count += 1
-                if marginal_streak > longest_marginal_streak:
-                    longest_marginal_streak = marginal_streak
-                marginal_streak = 0
-            else:
-                marginal_streak += 1
-
-        if marginal_streak > longest_marginal_streak:
-            longest_marginal_streak = marginal_streak
-
+        optimal_count, longest_marginal_streak = window_stats
         if optimal_count > 0 and longest_marginal_streak < 5:
             return
 
@@ -366,6 +379,25 @@ class ApplicationWindowAlertService:
         alerts.append(alert)
         existing_titles[title] = True
 
+    def _measure_weather_windows(self, windows: Iterable[WeatherWindow]) -> Tuple[int, int]:
+        optimal_count = 0
+        marginal_streak = 0
+        longest_marginal_streak = 0
+
+        for window in windows:
+            if window.condition == WeatherCondition.OPTIMAL:
+                optimal_count += 1
+                if marginal_streak > longest_marginal_streak:
+                    longest_marginal_streak = marginal_streak
+                marginal_streak = 0
+            else:
+                marginal_streak += 1
+
+        if marginal_streak > longest_marginal_streak:
+            longest_marginal_streak = marginal_streak
+
+        return optimal_count, longest_marginal_streak
+
     def _build_window_summary(self, window: WeatherWindow) -> str:
         text_parts: List[str] = []
         text_parts.append(f"Conditions: {window.condition.value}.")
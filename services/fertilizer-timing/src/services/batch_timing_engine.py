@@ -0,0 +1,321 @@
+"""
+Batch calendar and alert generation for many fields in one pass.
+
+Fields are grouped by the weather grid cell they fall in and by their crop
+cohort (crop type, planting date and optimization horizon). Every field in a
+group sees the same weather windows and growth-stage timeline, so both are
+computed once per group and passed to the optimizer, and the window
+statistics the alerts need are reduced once from NumPy masks over the
+group's windows. Weather and soil integration reports are fetched once per
+group and soil profile.
+
+A forecast update re-reads the weather windows of the affected groups,
+rebuilds their masks and re-optimizes their fields against the new windows,
+then refetches the integration reports and rebuilds calendars and alerts.
+Growth-stage timelines do not depend on the forecast and are reused.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import (
+    CropGrowthStage,
+    SeasonalCalendarResponse,
+    TimingAlertResponse,
+    TimingOptimizationRequest,
+    TimingOptimizationResult,
+    WeatherCondition,
+    WeatherSoilIntegrationReport,
+    WeatherWindow,
+)
+from timing_services import TimingOptimizationAdapter
+
+if TYPE_CHECKING:
+    from database import TimingAlertRecord  # pragma: no cover
+    from services.alert_service import ApplicationWindowAlertService  # pragma: no cover
+    from services.calendar_service import SeasonalCalendarService  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+WEATHER_CELL_DEGREES = 0.25
+
+Cell = Tuple[int, int]
+SoilProfile = Tuple[str, str, float]
+
+
+@dataclass(frozen=True)
+class FieldGroupKey:
+    """Fields sharing a weather grid cell and crop cohort."""
+    cell: Cell
+    crop_type: str
+    planting_date: date
+    horizon_days: int
+
+    @classmethod
+    def for_request(cls, request: TimingOptimizationRequest) -> "FieldGroupKey":
+        lat = float(request.location.get("lat", request.location.get("latitude", 0.0)))
+        lng = float(request.location.get("lng", request.location.get("longitude", 0.0)))
+        cell = (math.floor(lat / WEATHER_CELL_DEGREES), math.floor(lng / WEATHER_CELL_DEGREES))
+        return cls(
+            cell=cell,
+            crop_type=request.crop_type.lower(),
+            planting_date=request.planting_date,
+            horizon_days=request.optimization_horizon_days,
+        )
+
+    @property
+    def label(self) -> str:
+        return (
+            f"{self.cell[0]}:{self.cell[1]}/{self.crop_type}/"
+            f"{self.planting_date.isoformat()}/{self.horizon_days}d"
+        )
+
+
+@dataclass
+class WindowMasks:
+    """Weather windows and growth stages of one group as aligned arrays."""
+    days: np.ndarray         # Window start dates as ordinals
+    suitability: np.ndarray
+    optimal: np.ndarray      # True where the window condition is OPTIMAL
+    stage_index: np.ndarray  # Index into stages of the stage in effect on each window, -1 before the first
+    stages: List[CropGrowthStage]
+
+    @classmethod
+    def build(
+        cls,
+        windows: Sequence[WeatherWindow],
+        crop_stages: Dict[date, CropGrowthStage],
+    ) -> "WindowMasks":
+        days = np.array([window.start_date.toordinal() for window in windows], dtype=np.int64)
+        stage_dates = sorted(crop_stages)
+        stage_days = np.array([stage_date.toordinal() for stage_date in stage_dates], dtype=np.int64)
+        return cls(
+            days=days,
+            suitability=np.array([window.suitability_score for window in windows], dtype=float),
+            optimal=np.array([window.condition == WeatherCondition.OPTIMAL for window in windows], dtype=bool),
+            stage_index=np.searchsorted(stage_days, days, side="right") - 1,
+            stages=[crop_stages[stage_date] for stage_date in stage_dates],
+        )
+
+    def weather_gap_stats(self) -> Tuple[int, int]:
+        """(optimal window count, longest run of consecutive non-optimal windows)."""
+        optimal_positions = np.flatnonzero(self.optimal)
+        bounds = np.concatenate(([-1], optimal_positions, [len(self.optimal)]))
+        longest = int((np.diff(bounds) - 1).max())
+        return len(optimal_positions), longest
+
+    def stage_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Window counts, optimal window counts and mean suitability per growth stage."""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for index, stage in enumerate(self.stages):
+            in_stage = self.stage_index == index
+            count = int(in_stage.sum())
+            summary[stage.value] = {
+                "windows": count,
+                "optimal_windows": int((in_stage & self.optimal).sum()),
+                "mean_suitability": float(self.suitability[in_stage].mean()) if count else 0.0,
+            }
+        return summary
+
+
+@dataclass
+class _FieldGroup:
+    key: FieldGroupKey
+    request_ids: List[str] = field(default_factory=list)
+    crop_stages: Optional[Dict[date, CropGrowthStage]] = None
+    masks: Optional[WindowMasks] = None
+
+
+@dataclass
+class BatchTimingResponse:
+    """Calendars and alerts for a batch of fields keyed by request id."""
+    requests: Dict[str, TimingOptimizationRequest]
+    calendars: Dict[str, SeasonalCalendarResponse]
+    alerts: Dict[str, TimingAlertResponse]
+    results: Dict[str, TimingOptimizationResult]
+    groups: List[Dict[str, Any]]
+    processing_time_ms: float
+
+
+class FieldBatchTimingEngine:
+    """
+    Grouped calendar and alert generation for many fields.
+
+    Responsibilities:
+    - Group fields by weather grid cell and crop cohort
+    - Share weather windows, growth stages and integration reports within a group
+    - Optimize each field against the shared group inputs
+    - Re-evaluate only the affected groups when the forecast changes
+    """
+
+    def __init__(
+        self,
+        calendar_service: "SeasonalCalendarService",
+        alert_service: "ApplicationWindowAlertService",
+        adapter: Optional[TimingOptimizationAdapter] = None,
+    ) -> None:
+        self._calendar_service = calendar_service
+        self._alert_service = alert_service
+        self._adapter = adapter or TimingOptimizationAdapter()
+        self._requests: Dict[str, TimingOptimizationRequest] = {}
+        self._results: Dict[str, TimingOptimizationResult] = {}
+        self._calendars: Dict[str, SeasonalCalendarResponse] = {}
+        self._alerts: Dict[str, TimingAlertResponse] = {}
+        self._groups: Dict[FieldGroupKey, _FieldGroup] = {}
+        self._reports: Dict[Tuple[FieldGroupKey, SoilProfile], Optional[WeatherSoilIntegrationReport]] = {}
+
+    @staticmethod
+    def group_fields(
+        requests: Iterable[TimingOptimizationRequest],
+    ) -> Dict[FieldGroupKey, List[TimingOptimizationRequest]]:
+        """Group requests by weather grid cell and crop cohort, preserving input order."""
+        groups: Dict[FieldGroupKey, List[TimingOptimizationRequest]] = {}
+        for request in requests:
+            groups.setdefault(FieldGroupKey.for_request(request), []).append(request)
+        return groups
+
+    async def run(self, requests: Sequence[TimingOptimizationRequest]) -> BatchTimingResponse:
+        """
+        Optimize, build calendars and build alerts for every request.
+
+        Fields processed earlier are replaced by the new request with the same id.
+        """
+        started = time.perf_counter()
+        request_ids: List[str] = []
+
+        for key, members in self.group_fields(requests).items():
+            group = self._groups.setdefault(key, _FieldGroup(key=key))
+            group.crop_stages = await self._adapter.crop_growth_stages(members[0])
+            for request in members:
+                self._forget(request.request_id)
+                self._requests[request.request_id] = request
+                group.request_ids.append(request.request_id)
+                request_ids.append(request.request_id)
+
+            await self._evaluate_group(group, members)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info("Batch timing run processed %d fields in %.1f ms", len(request_ids), elapsed)
+        return self._response(request_ids, elapsed)
+
+    async def refresh_forecast(self, cells: Optional[Iterable[Cell]] = None) -> BatchTimingResponse:
+        """
+        Re-evaluate fields against an updated forecast.
+
+        Only groups in the given weather cells are refreshed (all groups when
+        omitted). Their weather windows and masks are recomputed and their
+        fields re-optimized; growth-stage timelines are reused as cached.
+        """
+        started = time.perf_counter()
+        selected = None if cells is None else set(cells)
+        groups = [
+            group for key, group in self._groups.items()
+            if group.request_ids and (selected is None or key.cell in selected)
+        ]
+        request_ids: List[str] = []
+
+        for group in groups:
+            members = [self._requests[request_id] for request_id in group.request_ids]
+            await self._evaluate_group(group, members)
+            request_ids.extend(group.request_ids)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info("Forecast refresh re-evaluated %d fields in %.1f ms", len(request_ids), elapsed)
+        return self._response(request_ids, elapsed)
+
+    def alert_records(self, response: TimingAlertResponse) -> List["TimingAlertRecord"]:
+        """Convert alerts to database records via the alert service."""
+        return self._alert_service.to_records(response)
+
+    async def _evaluate_group(
+        self,
+        group: _FieldGroup,
+        members: Sequence[TimingOptimizationRequest],
+    ) -> None:
+        """Read the group's weather windows, then optimize and build calendars and alerts per field."""
+        windows = await self._adapter.analyze_weather_windows(members[0])
+        group.masks = WindowMasks.build(windows, group.crop_stages)
+        self._drop_reports(lambda report_key: report_key[0] == group.key)
+
+        for request in members:
+            result = await self._adapter.optimize(
+                request,
+                weather_windows=windows,
+                crop_stages=group.crop_stages,
+            )
+            self._results[request.request_id] = result
+            self._calendars[request.request_id] = self._calendar_service.assemble_calendar(request, result)
+
+        await self._build_group_alerts(group, members)
+
+    async def _build_group_alerts(
+        self,
+        group: _FieldGroup,
+        members: Sequence[TimingOptimizationRequest],
+    ) -> None:
+        window_stats = group.masks.weather_gap_stats() if group.masks is not None else None
+        for request in members:
+            report = await self._report_for(group.key, request)
+            self._alerts[request.request_id] = self._alert_service.assemble_alerts(
+                request,
+                self._results[request.request_id],
+                report,
+                window_stats=window_stats,
+            )
+
+    async def _report_for(
+        self,
+        key: FieldGroupKey,
+        request: TimingOptimizationRequest,
+    ) -> Optional[WeatherSoilIntegrationReport]:
+        # Reports depend on location and the request's soil fields; within a group only the soil differs
+        report_key = (key, (request.soil_type, request.drainage_class, request.soil_moisture_capacity))
+        if report_key not in self._reports:
+            self._reports[report_key] = await self._alert_service.fetch_integration_report(request)
+        return self._reports[report_key]
+
+    def _drop_reports(self, predicate) -> None:
+        for report_key in [report_key for report_key in self._reports if predicate(report_key)]:
+            del self._reports[report_key]
+
+    def _forget(self, request_id: str) -> None:
+        previous = self._requests.pop(request_id, None)
+        if previous is None:
+            return
+        group = self._groups.get(FieldGroupKey.for_request(previous))
+        if group is not None and request_id in group.request_ids:
+            group.request_ids.remove(request_id)
+        self._results.pop(request_id, None)
+        self._calendars.pop(request_id, None)
+        self._alerts.pop(request_id, None)
+
+    def _response(self, request_ids: Sequence[str], elapsed_ms: float) -> BatchTimingResponse:
+        touched = set(request_ids)
+        groups = []
+        for key, group in self._groups.items():
+            if not touched.intersection(group.request_ids):
+                continue
+            optimal_count, longest_gap = group.masks.weather_gap_stats()
+            groups.append({
+                "group": key.label,
+                "fields": len(group.request_ids),
+                "optimal_windows": optimal_count,
+                "longest_non_optimal_streak": longest_gap,
+                "stages": group.masks.stage_summary(),
+            })
+        return BatchTimingResponse(
+            requests={request_id: self._requests[request_id] for request_id in request_ids},
+            calendars={request_id: self._calendars[request_id] for request_id in request_ids},
+            alerts={request_id: self._alerts[request_id] for request_id in request_ids},
+            results={request_id: self._results[request_id] for request_id in request_ids},
+            groups=groups,
+            processing_time_ms=elapsed_ms,
+        )
@@ -5,11 +5,13 @@ This module bridges the fertilizer strategy optimization engine into the
 microservice, exposing convenient async methods suitable for API routes.
 """
 
+from datetime import date
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from models import (
     ApplicationTiming,
+    CropGrowthStage,
     SplitApplicationPlan,
     TimingOptimizationRequest,
     TimingOptimizationResult,
@@ -38,19 +40,34 @@ class TimingOptimizationAdapter:
     def __init__(self) -> None:
         self._optimizer = FertilizerTimingOptimizer()
 
-    async def optimize(self, request: TimingOptimizationRequest) -> TimingOptimizationResult:
-        """Run full optimization for the provided request."""
-        return await self._optimizer.optimize_timing(request)
+    async def optimize(
+        self,
+        request: TimingOptimizationRequest,
+        weather_windows: Optional[List[WeatherWindow]] = None,
+        crop_stages: Optional[Dict[date, CropGrowthStage]] = None,
+    ) -> TimingOptimizationResult:
+        """Run full optimization, optionally reusing precomputed weather windows and crop stages."""
+        return await self._optimizer.optimize_timing(
+            request,
+            weather_windows=weather_windows,
+            crop_stages=crop_stages,
+        )
 
     async def analyze_weather_windows(self, request: TimingOptimizationRequest) -> List[WeatherWindow]:
         """Delegate to the optimizer's weather analysis."""
         return await self._optimizer._analyze_weather_windows(request)  # pylint: disable=protected-access
 
+    async def crop_growth_stages(
+        self, request: TimingOptimizationRequest
+    ) -> Dict[date, CropGrowthStage]:
+        """Return the crop growth stage timeline keyed by stage date."""
+        return await self._optimizer._determine_crop_growth_stages(request)  # pylint: disable=protected-access
+
     async def determine_crop_stages(
         self, request: TimingOptimizationRequest
     ) -> Dict[str, str]:
         """Return crop growth stage timeline as ISO date strings."""
-        stages = await self._optimizer._determine_crop_growth_stages(request)  # pylint: disable=protected-access
+        stages = await self.crop_growth_stages(request)
         timeline: Dict[str, str] = {}
         for stage_date, stage in stages.items():
             timeline[stage.value] = stage_date.strftime("%Y-%m-%d")
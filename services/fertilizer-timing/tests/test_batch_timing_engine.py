@@ -0,0 +1,349 @@
+"""Tests for the multi-field batch timing engine."""
+
+import importlib.util
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+_SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+_SRC_PATH = str(_SRC_DIR)
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
+
+_SERVICES_DIR = _SRC_DIR / "services"
+_SERVICES_PATH = str(_SERVICES_DIR)
+if _SERVICES_PATH not in sys.path:
+    sys.path.insert(0, _SERVICES_PATH)
+
+_MODULE_PATH = _SERVICES_DIR / "alert_service.py"
+_MODULE_SPEC = importlib.util.spec_from_file_location("fertilizer_timing.alert_service", _MODULE_PATH)
+if _MODULE_SPEC is None or _MODULE_SPEC.loader is None:
+    raise RuntimeError("Unable to load alert_service module for testing")
+_ALERT_MODULE = importlib.util.module_from_spec(_MODULE_SPEC)
+_MODULE_SPEC.loader.exec_module(_ALERT_MODULE)
+ApplicationWindowAlertService = _ALERT_MODULE.ApplicationWindowAlertService
+
+from models import (  # pylint: disable=import-error
+    ApplicationMethod,
+    ApplicationTiming,
+    CropGrowthStage,
+    SoilConditionSnapshot,
+    TimingAlertResponse,
+    TimingOptimizationRequest,
+    TimingOptimizationResult,
+    WeatherCondition,
+    WeatherConditionSummary,
+    WeatherSoilIntegrationReport,
+    WeatherSoilWindow,
+    WeatherWindow,
+)
+from batch_timing_engine import FieldBatchTimingEngine, FieldGroupKey, WindowMasks  # pylint: disable=import-error
+from calendar_service import SeasonalCalendarService  # pylint: disable=import-error
+
+
+_CONDITIONS = [
+    WeatherCondition.OPTIMAL,
+    WeatherCondition.MARGINAL,
+    WeatherCondition.MARGINAL,
+    WeatherCondition.ACCEPTABLE,
+    WeatherCondition.MARGINAL,
+    WeatherCondition.POOR,
+    WeatherCondition.MARGINAL,
+    WeatherCondition.OPTIMAL,
+    WeatherCondition.ACCEPTABLE,
+]
+
+
+def _build_windows(start: date, conditions: List[WeatherCondition] = _CONDITIONS) -> List[WeatherWindow]:
+    windows: List[WeatherWindow] = []
+    for offset, condition in enumerate(conditions):
+        window_date = start + timedelta(days=offset)
+        windows.append(
+            WeatherWindow(
+                start_date=window_date,
+                end_date=window_date,
+                condition=condition,
+                temperature_f=62.0,
+                precipitation_probability=0.2,
+                wind_speed_mph=9.0,
+                soil_moisture=0.5,
+                suitability_score=0.9 if condition == WeatherCondition.OPTIMAL else 0.5,
+            )
+        )
+    return windows
+
+
+class _StubTimingAdapter:
+    """Stub adapter counting shared and per-field work."""
+
+    def __init__(self) -> None:
+        self.window_calls = 0
+        self.stage_calls = 0
+        self.optimize_calls: List[str] = []
+        self.conditions = _CONDITIONS
+
+    async def analyze_weather_windows(self, request: TimingOptimizationRequest) -> List[WeatherWindow]:
+        self.window_calls += 1
+        return _build_windows(request.planting_date + timedelta(days=20), self.conditions)
+
+    async def crop_growth_stages(self, request: TimingOptimizationRequest) -> Dict[date, CropGrowthStage]:
+        self.stage_calls += 1
+        stages: Dict[date, CropGrowthStage] = {}
+        stages[request.planting_date] = CropGrowthStage.PLANTING
+        stages[request.planting_date + timedelta(days=24)] = CropGrowthStage.V4
+        return stages
+
+    async def optimize(
+        self,
+        request: TimingOptimizationRequest,
+        weather_windows: Optional[List[WeatherWindow]] = None,
+        crop_stages: Optional[Dict[date, CropGrowthStage]] = None,
+    ) -> TimingOptimizationResult:
+        self.optimize_calls.append(request.request_id)
+        if weather_windows is None:
+            weather_windows = await self.analyze_weather_windows(request)
+        window = weather_windows[0]
+        timing = ApplicationTiming(
+            fertilizer_type="nitrogen",
+            application_method=ApplicationMethod.BROADCAST,
+            recommended_date=window.start_date,
+            application_window=window,
+            crop_stage=CropGrowthStage.V4,
+            amount_lbs_per_acre=150.0,
+            timing_score=0.9,
+            weather_score=0.9,
+            crop_score=0.85,
+            soil_score=0.8,
+            weather_risk=0.3,
+            timing_risk=0.3,
+            equipment_risk=0.3,
+            estimated_cost_per_acre=45.0,
+            yield_impact_percent=5.0,
+            alternative_dates=[],
+            backup_window=None,
+        )
+        return TimingOptimizationResult(
+            request_id=request.request_id,
+            optimal_timings=[timing],
+            split_plans=[],
+            weather_windows=weather_windows,
+            overall_timing_score=0.88,
+            weather_suitability_score=0.85,
+            crop_stage_alignment_score=0.84,
+            risk_score=0.35,
+            total_estimated_cost=9000.0,
+            cost_per_acre=45.0,
+            expected_yield_impact=5.0,
+            roi_estimate=1.1,
+            recommendations=[],
+            risk_mitigation_strategies=[],
+            alternative_strategies=[],
+            confidence_score=0.8,
+            processing_time_ms=10.0,
+        )
+
+
+class _StubBaseAlertService:
+    def generate_alerts(self, result: TimingOptimizationResult) -> TimingAlertResponse:
+        return TimingAlertResponse(request_id=result.request_id, alerts=[])
+
+    def to_records(self, response: TimingAlertResponse):
+        return []
+
+
+class _StubWeatherService:
+    """Returns a report whose precipitation outlook tracks the current forecast."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.outlook = "Below average rainfall probability"
+
+    async def generate_integration_report(self, request: TimingOptimizationRequest, forecast_days: int = 10):
+        self.calls += 1
+        window = _build_windows(request.planting_date + timedelta(days=20))[0]
+        soil_snapshot = SoilConditionSnapshot(
+            soil_texture=request.soil_type,
+            drainage_class=request.drainage_class,
+            soil_moisture=0.55,
+            soil_temperature_f=54.0,
+            trafficability="favorable",
+            compaction_risk="low",
+            limiting_factors=[],
+            recommended_actions=[],
+        )
+        summary = WeatherConditionSummary(
+            forecast_days=forecast_days,
+            precipitation_outlook=self.outlook,
+            temperature_trend="Seasonal",
+            wind_risk="Low",
+            humidity_trend="Moderate",
+            advisory_notes=[],
+        )
+        window_report = WeatherSoilWindow(
+            window=window,
+            soil_snapshot=soil_snapshot,
+            combined_score=0.9,
+            limiting_factor="none",
+            recommended_action="Proceed as planned.",
+            confidence=0.85,
+        )
+        return WeatherSoilIntegrationReport(
+            request_id=request.request_id,
+            soil_summary=soil_snapshot,
+            weather_summary=summary,
+            application_windows=[window_report],
+        )
+
+
+def _fixed_now() -> datetime:
+    return datetime(2025, 5, 1, 6, 0, 0)
+
+
+def _build_request(
+    request_id: str,
+    lat: float = 41.61,
+    lng: float = -93.52,
+    planting_date: date = date(2025, 4, 20),
+    soil_type: str = "silt loam",
+) -> TimingOptimizationRequest:
+    return TimingOptimizationRequest(
+        request_id=request_id,
+        field_id=f"field-{request_id}",
+        crop_type="corn",
+        planting_date=planting_date,
+        expected_harvest_date=date(2025, 10, 12),
+        fertilizer_requirements={"nitrogen": 170.0},
+        application_methods=[ApplicationMethod.BROADCAST],
+        soil_type=soil_type,
+        soil_moisture_capacity=0.6,
+        drainage_class="well drained",
+        slope_percent=2.0,
+        weather_data_source="stub",
+        location={"lat": lat, "lng": lng},
+        equipment_availability={},
+        labor_availability={},
+        optimization_horizon_days=120,
+        risk_tolerance=0.5,
+        prioritize_yield=True,
+        prioritize_cost=False,
+        split_application_allowed=False,
+        weather_dependent_timing=True,
+        soil_temperature_threshold=50.0,
+    )
+
+
+def _build_engine():
+    adapter = _StubTimingAdapter()
+    weather_service = _StubWeatherService()
+    alert_service = ApplicationWindowAlertService(
+        base_alert_service=_StubBaseAlertService(),
+        weather_service=weather_service,  # type: ignore[arg-type]
+        timing_adapter=adapter,  # type: ignore[arg-type]
+        now_provider=_fixed_now,
+    )
+    calendar_service = SeasonalCalendarService(adapter=adapter)  # type: ignore[arg-type]
+    engine = FieldBatchTimingEngine(calendar_service, alert_service, adapter=adapter)  # type: ignore[arg-type]
+    return engine, adapter, weather_service, alert_service, calendar_service
+
+
+def _alert_summary(response: TimingAlertResponse):
+    return [(alert.severity, alert.title, alert.message, alert.action) for alert in response.alerts]
+
+
+def test_group_key_buckets_nearby_fields_by_cohort():
+    near = FieldGroupKey.for_request(_build_request("a", lat=41.61, lng=-93.52))
+    same_cell = FieldGroupKey.for_request(_build_request("b", lat=41.70, lng=-93.55))
+    other_cell = FieldGroupKey.for_request(_build_request("c", lat=41.76, lng=-93.52))
+    other_cohort = FieldGroupKey.for_request(_build_request("d", planting_date=date(2025, 5, 1)))
+
+    assert near == same_cell
+    assert near != other_cell
+    assert near != other_cohort
+
+
+def test_window_masks_match_per_field_gap_measurement():
+    windows = _build_windows(date(2025, 5, 10))
+    stages = {date(2025, 4, 20): CropGrowthStage.PLANTING, date(2025, 5, 14): CropGrowthStage.V4}
+    masks = WindowMasks.build(windows, stages)
+    service = ApplicationWindowAlertService(
+        base_alert_service=_StubBaseAlertService(),
+        weather_service=_StubWeatherService(),  # type: ignore[arg-type]
+        timing_adapter=None,  # type: ignore[arg-type]
+    )
+
+    assert masks.weather_gap_stats() == service._measure_weather_windows(windows)  # pylint: disable=protected-access
+    assert masks.weather_gap_stats() == (2, 6)
+    summary = masks.stage_summary()
+    assert summary["planting"]["windows"] == 4
+    assert summary["v4"]["windows"] == 5
+    assert summary["v4"]["optimal_windows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_shares_group_work_and_matches_per_field_services():
+    engine, adapter, weather_service, alert_service, calendar_service = _build_engine()
+    requests = [
+        _build_request("f1"),
+        _build_request("f2", lat=41.70, lng=-93.55),
+        _build_request("f3", soil_type="clay loam"),
+        _build_request("f4", planting_date=date(2025, 5, 1)),
+    ]
+
+    batch = await engine.run(requests)
+
+    assert adapter.window_calls == 2
+    assert adapter.stage_calls == 2
+    assert adapter.optimize_calls == ["f1", "f2", "f3", "f4"]
+    # One report per group and soil profile: (f1, f2), f3, f4
+    assert weather_service.calls == 3
+    assert len(batch.groups) == 2
+
+    for request in requests:
+        result = batch.results[request.request_id]
+        expected_alerts = await alert_service.build_alerts(request, result)
+        assert _alert_summary(batch.alerts[request.request_id]) == _alert_summary(expected_alerts)
+
+        expected_calendar = calendar_service.assemble_calendar(request, result)
+        calendar = batch.calendars[request.request_id]
+        assert [entry.model_dump(exclude={"event_id"}) for entry in calendar.entries] == [
+            entry.model_dump(exclude={"event_id"}) for entry in expected_calendar.entries
+        ]
+
+    titles = [alert.title for alert in batch.alerts["f1"].alerts]
+    assert any(title == "Limited optimal weather windows detected" for title in titles)
+
+
+@pytest.mark.asyncio
+async def test_refresh_forecast_reevaluates_selected_cells():
+    engine, adapter, weather_service, _, _ = _build_engine()
+    requests = [
+        _build_request("f1"),
+        _build_request("f2", lat=41.70, lng=-93.55),
+        _build_request("f3", lat=45.0, lng=-95.0),
+    ]
+    batch = await engine.run(requests)
+    report_calls = weather_service.calls
+    gap_title = "Limited optimal weather windows detected"
+    assert gap_title in [alert.title for alert in batch.alerts["f1"].alerts]
+
+    # The new forecast has an optimal window every other day
+    adapter.conditions = [WeatherCondition.OPTIMAL, WeatherCondition.MARGINAL] * 5
+    adapter.optimize_calls.clear()
+    cell = FieldGroupKey.for_request(requests[0]).cell
+    refreshed = await engine.refresh_forecast([cell])
+
+    assert adapter.window_calls == 3
+    assert adapter.stage_calls == 2
+    assert adapter.optimize_calls == ["f1", "f2"]
+    assert weather_service.calls == report_calls + 1
+    assert sorted(refreshed.alerts) == ["f1", "f2"]
+    assert sorted(refreshed.calendars) == ["f1", "f2"]
+    assert [group["optimal_windows"] for group in refreshed.groups] == [5]
+    assert [group["longest_non_optimal_streak"] for group in refreshed.groups] == [1]
+    assert len(refreshed.results["f1"].weather_windows) == 10
+    assert gap_title not in [alert.title for alert in refreshed.alerts["f1"].alerts]
+    assert refreshed.requests["f2"] is requests[1]
+
@@ -1,16 +1,23 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
-from typing import List
+from typing import List, Optional
 import logging
 
 from ..services.crop_photo_analyzer import CropPhotoAnalyzer
+from ..services.inference_scheduler import get_inference_scheduler
 from ..schemas.image_schemas import DeficiencyAnalysisResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/image-analysis", tags=["Image Analysis"])
 
-# Dependency injection for analyzer
+_analyzer: Optional[CropPhotoAnalyzer] = None
+
+# Dependency injection for analyzer; models are loaded once and shared so
+# concurrent uploads can be batched into the same forward pass
 async def get_analyzer() -> CropPhotoAnalyzer:
-    return CropPhotoAnalyzer()
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = CropPhotoAnalyzer(inference_scheduler=get_inference_scheduler())
+    return _analyzer
 
 @router.post("/analyze-photo", response_model=DeficiencyAnalysisResponse)
 async def analyze_crop_photo(
@@ -34,3 +41,8 @@ async def analyze_crop_photo(
     except Exception as e:
         logger.error(f"Error analyzing crop photo: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to analyze photo: {str(e)}")
+
+@router.get("/inference-stats")
+async def get_inference_stats():
+    """Inference queue depth, micro-batch sizes and latency histograms."""
+    return get_inference_scheduler().get_stats()
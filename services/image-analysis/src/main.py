@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from .api.image_analysis_routes import router as image_analysis_router
+from .services.inference_scheduler import get_inference_scheduler
 
 app = FastAPI(
     title="Image Analysis Service",
@@ -9,6 +10,10 @@ app = FastAPI(
 
 app.include_router(image_analysis_router)
 
+@app.on_event("shutdown")
+async def shutdown_inference_scheduler():
+    get_inference_scheduler().shutdown()
+
 @app.get("/health", tags=["Monitoring"])
 async def health_check():
     return {"status": "healthy", "service": "image-analysis"}
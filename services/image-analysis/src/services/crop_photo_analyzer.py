@@ -1,9 +1,11 @@
+import asyncio
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import tensorflow as tf
 import logging
 
 from ..services.image_preprocessor import ImagePreprocessor
+from ..services.inference_scheduler import InferenceScheduler, get_inference_scheduler
 from ..models.image_analysis_models import DeficiencyAnalysisResponse, DeficiencySymptom, Recommendation, ImageQuality
 
 logger = logging.getLogger(__name__)
@@ -11,9 +13,10 @@ logger = logging.getLogger(__name__)
 class CropPhotoAnalyzer:
     """Analyzes crop photos for nutrient deficiencies using pre-trained models."""
 
-    def __init__(self):
+    def __init__(self, inference_scheduler: Optional[InferenceScheduler] = None):
         self.models = self._load_models()
         self.preprocessor = ImagePreprocessor()
+        self.inference_scheduler = inference_scheduler or get_inference_scheduler()
         self.deficiency_mapping = self._load_deficiency_mapping()
 
     def _load_models(self) -> Dict[str, tf.keras.Model]:
@@ -79,8 +82,8 @@ class CropPhotoAnalyzer:
         Returns:
             A DeficiencyAnalysisResponse object.
         """
-        # 1. Assess image quality
-        quality_assessment = self.preprocessor.assess_image_quality(image_data)
+        # 1. Decode once (off the event loop) and assess quality on a downsampled view
+        quality_assessment, processed_image = await asyncio.to_thread(self.preprocessor.process, image_data)
         image_quality = ImageQuality(**quality_assessment)
 
         if image_quality.score < 0.5: # Threshold for acceptable quality
@@ -99,20 +102,19 @@ class CropPhotoAnalyzer:
                 metadata={"message": "Image quality too low for analysis."}
             )
 
-        # 2. Preprocess image for model input
-        try:
-            processed_image = self.preprocessor.preprocess_image(image_data)
-        except ValueError as e:
-            logger.error(f"Image preprocessing failed: {e}")
-            raise ValueError(f"Image preprocessing failed: {e}")
+        # 2. The same decoded buffer was resized and normalized for model input
+        if processed_image is None:
+            logger.error("Image preprocessing failed: could not decode image")
+            raise ValueError("Image preprocessing failed: Could not decode image. Invalid image data.")
 
         # 3. Select appropriate model
-        model = self.models.get(crop_type.lower(), self.models.get('default'))
+        model_key = crop_type.lower() if crop_type.lower() in self.models else 'default'
+        model = self.models.get(model_key)
         if model is None:
             raise RuntimeError(f"No analysis model available for crop type: {crop_type}")
 
-        # 4. Run inference
-        predictions = model.predict(processed_image)
+        # 4. Run inference off the event loop, micro-batched with concurrent uploads
+        predictions = await self.inference_scheduler.predict(model_key, model, processed_image)
         # Assuming predictions is a 2D array where each row is a sample and columns are class probabilities
         # For a single image, it will be a 1D array of probabilities after squeezing
         probabilities = predictions[0] if predictions.ndim > 1 else predictions
@@ -1,50 +1,117 @@
 import numpy as np
 import cv2
-from typing import Tuple
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...) carrying image dimensions
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# libjpeg can decode straight to 1/2, 1/4 or 1/8 size by truncating the DCT
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def probe_jpeg_size(image_data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Reads (width, height) from a JPEG frame header without decoding pixels.
+
+    Returns None for non-JPEG or truncated data.
+    """
+    if not image_data.startswith(b"\xff\xd8"):
+        return None
+    i = 2
+    while i + 9 < len(image_data):
+        if image_data[i] != 0xFF:
+            return None
+        marker = image_data[i + 1]
+        if marker == 0xFF:  # Fill byte
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # Standalone markers have no length
+            i += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = int.from_bytes(image_data[i + 5:i + 7], "big")
+            width = int.from_bytes(image_data[i + 7:i + 9], "big")
+            return width, height
+        i += 2 + int.from_bytes(image_data[i + 2:i + 4], "big")
+    return None
+
+
+@dataclass
+class DecodedImage:
+    """An image decoded once at working resolution, shared by quality checks and preprocessing."""
+    image: np.ndarray  # BGR, uint8
+    original_size: Tuple[int, int]  # (width, height) before any reduced decode
+    reduction: int = 1
+
 
 class ImagePreprocessor:
     """Handles preprocessing of crop images for analysis."""
 
-    def __init__(self, target_size: Tuple[int, int] = (224, 224)):
+    def __init__(self, target_size: Tuple[int, int] = (224, 224), quality_max_side: int = 512):
         self.target_size = target_size
+        self.quality_max_side = quality_max_side
 
-    def preprocess_image(self, image_data: bytes) -> np.ndarray:
+    def decode(self, image_data: bytes) -> Optional[DecodedImage]:
         """
-        Loads, resizes, and normalizes an image from bytes.
+        Decodes image bytes once, as small as quality checks and the model allow.
 
-        Args:
-            image_data: Raw image bytes.
+        JPEGs are decoded with DCT scaling straight to the smallest 1/2, 1/4 or
+        1/8 reduction that still covers the model input and the quality view, so
+        multi-megapixel phone photos never materialize at full resolution.
 
         Returns:
-            A preprocessed NumPy array ready for model input.
+            The decoded image, or None if the data cannot be decoded.
         """
-        # Decode image from bytes
         np_arr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+        jpeg_size = probe_jpeg_size(image_data)
 
-        if image is None:
-            raise ValueError("Could not decode image. Invalid image data.")
+        flag, reduction = cv2.IMREAD_COLOR, 1
+        if jpeg_size is not None:
+            needed = max(max(self.target_size), self.quality_max_side)
+            for factor, reduced_flag in _REDUCED_DECODE_FLAGS:
+                if min(jpeg_size) // factor >= needed:
+                    flag, reduction = reduced_flag, factor
+                    break
 
-        # Resize image
-        image = cv2.resize(image, self.target_size)
+        image = cv2.imdecode(np_arr, flag)
+        if image is None:
+            return None
 
-        # Convert BGR to RGB (OpenCV loads as BGR)
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        original_size = jpeg_size or (image.shape[1], image.shape[0])
+        return DecodedImage(image=image, original_size=original_size, reduction=reduction)
 
-        # Normalize pixel values to [0, 1]
-        image = image.astype(np.float32) / 255.0
+    def quality_view(self, decoded: DecodedImage) -> np.ndarray:
+        """Downsampled view (long side <= quality_max_side) used for quality metrics."""
+        height, width = decoded.image.shape[:2]
+        scale = self.quality_max_side / max(height, width)
+        if scale >= 1.0:
+            return decoded.image
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(decoded.image, size, interpolation=cv2.INTER_AREA)
 
-        # Add batch dimension (expected by most deep learning models)
-        image = np.expand_dims(image, axis=0)
+    def to_model_input(self, decoded: DecodedImage) -> np.ndarray:
+        """
+        Resizes and normalizes a decoded image into a (1, H, W, 3) float32 RGB batch.
 
-        return image
+        The BGR->RGB swap is a strided view and normalization writes straight into
+        the batch buffer, so the resized pixels are copied exactly once.
+        """
+        image = cv2.resize(decoded.image, self.target_size)
+        batch = np.empty((1,) + image.shape, dtype=np.float32)
+        np.multiply(image[..., ::-1], np.float32(1.0 / 255.0), out=batch[0], casting="unsafe")
+        return batch
 
-    def assess_image_quality(self, image_data: bytes) -> dict:
+    def assess_decoded_quality(self, decoded: Optional[DecodedImage]) -> dict:
         """
-        Assesses the quality of an image, identifying potential issues.
+        Assesses the quality of a decoded image on its downsampled view.
 
         Args:
-            image_data: Raw image bytes.
+            decoded: Decoded image, or None if decoding failed.
 
         Returns:
             A dictionary with quality score and a list of issues.
@@ -52,14 +119,13 @@ class ImagePreprocessor:
         issues = []
         score = 1.0 # Start with perfect score
 
-        np_arr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-
-        if image is None:
+        if decoded is None:
             issues.append("Corrupt or unreadable image file.")
             score -= 0.5
             return {"score": max(0.0, score), "issues": issues}
 
+        image = self.quality_view(decoded)
+
         # Check for blurriness (using Laplacian variance)
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         fm = cv2.Laplacian(gray, cv2.CV_64F).var()
@@ -84,3 +150,44 @@ class ImagePreprocessor:
             score -= 0.1
 
         return {"score": max(0.0, score), "issues": issues}
+
+    def process(self, image_data: bytes) -> Tuple[dict, Optional[np.ndarray]]:
+        """
+        Decodes once and returns the quality assessment and model input.
+
+        Returns:
+            (quality dict, preprocessed batch), with a None batch if the image
+            could not be decoded.
+        """
+        decoded = self.decode(image_data)
+        quality = self.assess_decoded_quality(decoded)
+        if decoded is None:
+            return quality, None
+        return quality, self.to_model_input(decoded)
+
+    def preprocess_image(self, image_data: bytes) -> np.ndarray:
+        """
+        Loads, resizes, and normalizes an image from bytes.
+
+        Args:
+            image_data: Raw image bytes.
+
+        Returns:
+            A preprocessed NumPy array ready for model input.
+        """
+        decoded = self.decode(image_data)
+        if decoded is None:
+            raise ValueError("Could not decode image. Invalid image data.")
+        return self.to_model_input(decoded)
+
+    def assess_image_quality(self, image_data: bytes) -> dict:
+        """
+        Assesses the quality of an image, identifying potential issues.
+
+        Args:
+            image_data: Raw image bytes.
+
+        Returns:
+            A dictionary with quality score and a list of issues.
+        """
+        return self.assess_decoded_quality(self.decode(image_data))
@@ -0,0 +1,238 @@
+"""
+Micro-batching inference scheduler for crop photo models.
+
+Analysis requests are queued from the event loop and picked up by a single
+worker thread, which groups them per model into dynamic micro-batches (up to
+``max_batch_size`` images, waiting at most ``max_wait_ms`` for stragglers),
+runs one forward pass per batch and resolves each caller's future. The event
+loop never blocks on TensorFlow and burst uploads share forward passes.
+"""
+
+import asyncio
+import bisect
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+_STOP = object()
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative export."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-th quantile (None if empty or beyond the last bucket)."""
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = q * self.count
+            seen = 0
+            for bound, bucket_count in zip(self.buckets, self._counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return bound
+            return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            cumulative = {}
+            running = 0
+            for bound, bucket_count in zip(self.buckets, self._counts):
+                running += bucket_count
+                cumulative[str(bound)] = running
+            cumulative["+Inf"] = self.count
+            count, total = self.count, self.total
+        return {
+            "buckets": cumulative,
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99)
+        }
+
+
+@dataclass
+class _InferenceRequest:
+    """One queued image batch awaiting a forward pass."""
+    model_key: str
+    model: Any
+    inputs: np.ndarray
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class InferenceScheduler:
+    """Collects concurrent predictions into per-model micro-batches on a worker thread."""
+
+    def __init__(self, max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._pending_count = 0
+
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.inference_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.batches_run = 0
+        self.batch_failures = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests submitted but not yet handed to a forward pass."""
+        return self._queue.qsize() + self._pending_count
+
+    def start(self):
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="crop-photo-inference", daemon=True
+                )
+                self._worker.start()
+
+    def shutdown(self, timeout: Optional[float] = 5.0):
+        """Flush queued requests and stop the worker thread."""
+        with self._start_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None and worker.is_alive():
+            self._queue.put(_STOP)
+            worker.join(timeout)
+
+    async def predict(self, model_key: str, model: Any, inputs: np.ndarray) -> np.ndarray:
+        """
+        Queue inputs of shape (n, ...) for a model and await its (n, classes) output.
+
+        Requests sharing a model key and model object are batched together.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_InferenceRequest(model_key, model, inputs, loop, future))
+        return await future
+
+    def _run(self):
+        pending: Dict[Tuple[str, int], List[_InferenceRequest]] = {}
+        while True:
+            timeout = None
+            if pending:
+                oldest = min(requests[0].enqueued_at for requests in pending.values())
+                timeout = max(0.0, oldest + self.max_wait - time.monotonic())
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stopping = item is _STOP
+            if item is not None and not stopping:
+                pending.setdefault((item.model_key, id(item.model)), []).append(item)
+                self._pending_count += 1
+
+            now = time.monotonic()
+            for group_key in list(pending):
+                requests = pending[group_key]
+                while requests and (
+                    stopping
+                    or len(requests) >= self.max_batch_size
+                    or now - requests[0].enqueued_at >= self.max_wait
+                ):
+                    batch, requests = requests[:self.max_batch_size], requests[self.max_batch_size:]
+                    self._pending_count -= len(batch)
+                    self._run_batch(batch)
+                if requests:
+                    pending[group_key] = requests
+                else:
+                    del pending[group_key]
+
+            if stopping:
+                return
+
+    def _run_batch(self, batch: List[_InferenceRequest]):
+        started = time.monotonic()
+        for request in batch:
+            self.queue_wait_ms.observe((started - request.enqueued_at) * 1000)
+        self.batch_sizes.observe(len(batch))
+
+        try:
+            inputs = np.concatenate([request.inputs for request in batch], axis=0)
+            model = batch[0].model
+            # predict_on_batch skips Keras' per-call dataset setup, which dominates small batches
+            forward = getattr(model, "predict_on_batch", None) or model.predict
+            outputs = np.asarray(forward(inputs))
+        except Exception as e:
+            self.batch_failures += 1
+            logger.error(f"Inference batch of {len(batch)} for model '{batch[0].model_key}' failed: {e}")
+            for request in batch:
+                request.loop.call_soon_threadsafe(_set_exception, request.future, e)
+            return
+        finally:
+            self.inference_ms.observe((time.monotonic() - started) * 1000)
+            self.batches_run += 1
+
+        offset = 0
+        for request in batch:
+            rows = request.inputs.shape[0]
+            request.loop.call_soon_threadsafe(_set_result, request.future, outputs[offset:offset + rows])
+            offset += rows
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth plus batch size, queue wait and forward-pass latency histograms."""
+        return {
+            "queue_depth": self.queue_depth,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches_run": self.batches_run,
+            "batch_failures": self.batch_failures,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "inference_ms": self.inference_ms.snapshot()
+        }
+
+
+def _set_result(future: asyncio.Future, value: Any):
+    if not future.done():
+        future.set_result(value)
+
+
+def _set_exception(future: asyncio.Future, error: BaseException):
+    if not future.done():
+        future.set_exception(error)
+
+
+_inference_scheduler: Optional[InferenceScheduler] = None
+
+
+def get_inference_scheduler() -> InferenceScheduler:
+    """Get the shared inference scheduler."""
+    global _inference_scheduler
+    if _inference_scheduler is None:
+        _inference_scheduler = InferenceScheduler()
+    return _inference_scheduler
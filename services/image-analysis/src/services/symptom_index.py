@@ -0,0 +1,174 @@
+"""
+In-memory symptom index for visual characteristic matching.
+
+Each crop type gets an index built from its `NutrientDeficiencySymptom` rows:
+characteristics are interned to integer IDs, every symptom becomes a bitset
+over those IDs, and Jaccard similarity against all symptoms is computed with
+one vectorized AND + popcount. Indexes are dropped whenever the symptom table
+is written through the ORM, and expire after a staleness window to pick up
+writes made by other processes.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import event
+
+from ..models.symptom_models import NutrientDeficiencySymptom
+
+logger = logging.getLogger(__name__)
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a (rows, words) uint64 matrix."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    # numpy < 2.0: per-byte lookup table
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape[0], -1)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+def _normalize(characteristic: str) -> str:
+    return characteristic.lower()
+
+
+@dataclass
+class SymptomIndex:
+    """Bitset index over the symptoms of one crop type."""
+    symptoms: List[Dict[str, Any]]
+    vocabulary: Dict[str, int]
+    bitsets: np.ndarray  # (symptoms, words) uint64
+    reference_counts: np.ndarray  # Distinct characteristics per symptom
+    thresholds: np.ndarray
+    built_at: float
+
+    @classmethod
+    def build(cls, records: Iterable[NutrientDeficiencySymptom]) -> "SymptomIndex":
+        """Intern characteristics and pack one bitset per symptom."""
+        symptoms: List[Dict[str, Any]] = []
+        vocabulary: Dict[str, int] = {}
+        symptom_ids: List[List[int]] = []
+
+        for record in records:
+            characteristics = record.visual_characteristics or []
+            ids = sorted({
+                vocabulary.setdefault(_normalize(char), len(vocabulary)) for char in characteristics
+            })
+            symptom_ids.append(ids)
+            symptoms.append({
+                "nutrient": record.nutrient,
+                "symptom_name": record.symptom_name,
+                "description": record.description,
+                "affected_parts": record.affected_parts,
+                "visual_characteristics": record.visual_characteristics,
+                "severity_levels": record.severity_levels,
+                "confidence_threshold": record.confidence_score_threshold
+            })
+
+        n_words = max(1, (len(vocabulary) + 63) // 64)
+        bitsets = np.zeros((len(symptoms), n_words), dtype=np.uint64)
+        for row, ids in enumerate(symptom_ids):
+            for char_id in ids:
+                bitsets[row, char_id // 64] |= np.uint64(1) << np.uint64(char_id % 64)
+
+        return cls(
+            symptoms=symptoms,
+            vocabulary=vocabulary,
+            bitsets=bitsets,
+            reference_counts=np.array([len(ids) for ids in symptom_ids], dtype=np.int64),
+            thresholds=np.array(
+                [s["confidence_threshold"] if s["confidence_threshold"] is not None else 0.7 for s in symptoms],
+                dtype=float
+            ),
+            built_at=time.monotonic()
+        )
+
+    def jaccard_scores(self, detected_characteristics: Sequence[str]) -> np.ndarray:
+        """Jaccard similarity between the detected characteristics and every symptom."""
+        detected = {_normalize(char) for char in detected_characteristics}
+        scores = np.zeros(len(self.symptoms))
+        if not detected or not self.symptoms:
+            return scores
+
+        query = np.zeros(self.bitsets.shape[1], dtype=np.uint64)
+        for char in detected:
+            char_id = self.vocabulary.get(char)
+            if char_id is not None:
+                query[char_id // 64] |= np.uint64(1) << np.uint64(char_id % 64)
+
+        intersection = popcount_rows(self.bitsets & query)
+        # Characteristics unknown to the index still count towards the union
+        union = len(detected) + self.reference_counts - intersection
+        matched = self.reference_counts > 0
+        scores[matched] = intersection[matched] / union[matched]
+        return scores
+
+    def match(self, detected_characteristics: Sequence[str]) -> List[Dict[str, Any]]:
+        """Symptoms whose score meets their threshold, best match first."""
+        scores = self.jaccard_scores(detected_characteristics)
+        hits = np.flatnonzero(scores >= self.thresholds)
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [
+            {**self.symptoms[i], "match_score": float(scores[i])}
+            for i in hits
+        ]
+
+
+class SymptomIndexRegistry:
+    """Per-crop symptom indexes, rebuilt lazily after the symptom table changes."""
+
+    def __init__(self, max_staleness_seconds: float = 900.0):
+        self.max_staleness_seconds = max_staleness_seconds
+        self._indexes: Dict[str, SymptomIndex] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, crop_type: str, loader: Callable[[str], Iterable[NutrientDeficiencySymptom]]) -> SymptomIndex:
+        """Return the index for a crop type, loading its rows only when missing or stale."""
+        index = self._indexes.get(crop_type)
+        if index is not None and time.monotonic() - index.built_at < self.max_staleness_seconds:
+            return index
+
+        with self._lock:
+            index = self._indexes.get(crop_type)
+            if index is None or time.monotonic() - index.built_at >= self.max_staleness_seconds:
+                index = SymptomIndex.build(loader(crop_type))
+                self._indexes[crop_type] = index
+                self.builds += 1
+                logger.info(f"Built symptom index for {crop_type}: {len(index.symptoms)} symptoms, "
+                            f"{len(index.vocabulary)} characteristics")
+            return index
+
+    def invalidate(self, crop_type: Optional[str] = None):
+        """Drop one crop's index, or all of them."""
+        with self._lock:
+            if crop_type is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(crop_type, None)
+
+
+_symptom_index_registry: Optional[SymptomIndexRegistry] = None
+
+
+def get_symptom_index_registry() -> SymptomIndexRegistry:
+    """Get the shared symptom index registry."""
+    global _symptom_index_registry
+    if _symptom_index_registry is None:
+        _symptom_index_registry = SymptomIndexRegistry()
+    return _symptom_index_registry
+
+
+@event.listens_for(NutrientDeficiencySymptom, "after_insert")
+@event.listens_for(NutrientDeficiencySymptom, "after_update")
+@event.listens_for(NutrientDeficiencySymptom, "after_delete")
+def _invalidate_on_symptom_write(mapper, connection, target):
+    if _symptom_index_registry is not None:
+        # Crop type may itself have changed, so drop every index
+        _symptom_index_registry.invalidate()
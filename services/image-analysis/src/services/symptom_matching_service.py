@@ -1,16 +1,21 @@
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from services.image_analysis.src.models.symptom_models import NutrientDeficiencySymptom
+from ..models.symptom_models import NutrientDeficiencySymptom
+from .symptom_index import SymptomIndexRegistry, get_symptom_index_registry
 
 class SymptomMatchingService:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, symptom_index_registry: Optional[SymptomIndexRegistry] = None):
         self.db_session = db_session
+        self.symptom_index_registry = symptom_index_registry or get_symptom_index_registry()
 
     def match_symptoms(self, detected_characteristics: List[str], crop_type: str) -> List[Dict[str, Any]]:
         """
         Matches detected visual characteristics against the symptom database for a given crop type.
 
+        Symptoms are scored through the crop's preloaded bitset index, so the
+        database is only queried when the index is missing or stale.
+
         Args:
             detected_characteristics: A list of visual characteristics detected from an image.
             crop_type: The type of crop (e.g., 'Corn', 'Soybean').
@@ -18,33 +23,12 @@ class SymptomMatchingService:
         Returns:
             A list of potential nutrient deficiencies with match scores.
         """
-        potential_deficiencies = []
+        index = self.symptom_index_registry.get(crop_type, self._load_symptoms)
+        return index.match(detected_characteristics)
 
+    def _load_symptoms(self, crop_type: str) -> List[NutrientDeficiencySymptom]:
         # Query for symptoms relevant to the crop type
-        symptoms_in_db = self.db_session.query(NutrientDeficiencySymptom).filter_by(crop_type=crop_type).all()
-
-        for symptom_record in symptoms_in_db:
-            match_score = self._calculate_match_score(
-                detected_characteristics,
-                symptom_record.visual_characteristics
-            )
-
-            if match_score >= symptom_record.confidence_score_threshold:
-                potential_deficiencies.append({
-                    "nutrient": symptom_record.nutrient,
-                    "symptom_name": symptom_record.symptom_name,
-                    "description": symptom_record.description,
-                    "affected_parts": symptom_record.affected_parts,
-                    "visual_characteristics": symptom_record.visual_characteristics,
-                    "severity_levels": symptom_record.severity_levels,
-                    "match_score": match_score,
-                    "confidence_threshold": symptom_record.confidence_score_threshold
-                })
-        
-        # Sort by match score in descending order
-        potential_deficiencies.sort(key=lambda x: x["match_score"], reverse=True)
-
-        return potential_deficiencies
+        return self.db_session.query(NutrientDeficiencySymptom).filter_by(crop_type=crop_type).all()
 
     def _calculate_match_score(self, detected: List[str], reference: List[str]) -> float:
         """
@@ -0,0 +1,223 @@
+"""
+Tests for the image analysis service.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from src.services.image_preprocessor import ImagePreprocessor, probe_jpeg_size
+from src.services.inference_scheduler import Histogram, InferenceScheduler
+from src.services.symptom_index import SymptomIndex, SymptomIndexRegistry, popcount_rows
+from src.services.symptom_matching_service import SymptomMatchingService
+
+
+class RecordingModel:
+    """Stand-in model that returns each image's mean pixel and records batch sizes."""
+
+    def __init__(self, fail: bool = False):
+        self.batch_sizes = []
+        self.fail = fail
+
+    def predict_on_batch(self, inputs):
+        self.batch_sizes.append(inputs.shape[0])
+        if self.fail:
+            raise RuntimeError("forward pass failed")
+        return inputs.reshape(inputs.shape[0], -1).mean(axis=1, keepdims=True)
+
+
+def _encode(image: np.ndarray, ext: str = ".jpg") -> bytes:
+    ok, buffer = cv2.imencode(ext, image)
+    assert ok
+    return buffer.tobytes()
+
+
+def _field_photo(height: int, width: int) -> np.ndarray:
+    """Textured synthetic photo with gradients and noise."""
+    rng = np.random.default_rng(7)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 // width, y * 255 // height, (x + y) * 255 // (width + height)], axis=-1)
+    return np.clip(base + rng.integers(-40, 40, size=base.shape), 0, 255).astype(np.uint8)
+
+
+def _image(value: float) -> np.ndarray:
+    return np.full((1, 4, 4, 3), value, dtype=np.float32)
+
+
+class TestInferenceScheduler:
+    """Test suite for micro-batched inference."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_batches(self):
+        """Test a burst is run in batches no larger than the limit and results are routed back."""
+        scheduler = InferenceScheduler(max_batch_size=4, max_wait_ms=50)
+        model = RecordingModel()
+
+        results = await asyncio.gather(*[
+            scheduler.predict("corn", model, _image(i)) for i in range(10)
+        ])
+        scheduler.shutdown()
+
+        assert [float(result[0, 0]) for result in results] == list(range(10))
+        assert sum(model.batch_sizes) == 10
+        assert max(model.batch_sizes) == 4
+        assert len(model.batch_sizes) < 10
+        stats = scheduler.get_stats()
+        assert stats["queue_depth"] == 0
+        assert stats["batch_size"]["sum"] == 10
+
+    @pytest.mark.asyncio
+    async def test_models_are_batched_separately(self):
+        """Test requests for different crop models never share a forward pass."""
+        scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=20)
+        corn, wheat = RecordingModel(), RecordingModel()
+
+        await asyncio.gather(
+            *[scheduler.predict("corn", corn, _image(1)) for _ in range(3)],
+            *[scheduler.predict("wheat", wheat, _image(2)) for _ in range(2)]
+        )
+        scheduler.shutdown()
+
+        assert sum(corn.batch_sizes) == 3
+        assert sum(wheat.batch_sizes) == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_propagates_to_every_caller(self):
+        """Test a failing forward pass raises in each waiting request."""
+        scheduler = InferenceScheduler(max_batch_size=4, max_wait_ms=20)
+        model = RecordingModel(fail=True)
+
+        results = await asyncio.gather(
+            *[scheduler.predict("corn", model, _image(0)) for _ in range(3)],
+            return_exceptions=True
+        )
+        scheduler.shutdown()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert scheduler.get_stats()["batch_failures"] >= 1
+
+    def test_histogram_quantiles(self):
+        """Test cumulative buckets and bucket-bound quantiles."""
+        histogram = Histogram([1, 5, 10])
+        for value in [0.5, 2, 3, 7, 20]:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["buckets"] == {"1": 1, "5": 3, "10": 4, "+Inf": 5}
+        assert snapshot["p50"] == 5
+        assert snapshot["p99"] is None
+
+
+class TestImagePreprocessor:
+    """Test suite for the single-decode image pipeline."""
+
+    def test_probe_jpeg_size(self):
+        """Test JPEG dimensions are read from the frame header."""
+        assert probe_jpeg_size(_encode(_field_photo(120, 200))) == (200, 120)
+        assert probe_jpeg_size(_encode(_field_photo(120, 200), ".png")) is None
+        assert probe_jpeg_size(b"invalid image data") is None
+
+    def test_large_jpeg_uses_reduced_decode(self):
+        """Test large photos decode at reduced size but keep their original dimensions."""
+        preprocessor = ImagePreprocessor()
+        decoded = preprocessor.decode(_encode(_field_photo(2400, 3200)))
+
+        assert decoded.reduction == 4
+        assert decoded.original_size == (3200, 2400)
+        assert decoded.image.shape == (600, 800, 3)
+        assert max(preprocessor.quality_view(decoded).shape[:2]) == 512
+
+    def test_model_input_matches_full_decode(self):
+        """Test reduced decode and in-place normalization match the full-resolution pipeline."""
+        image_data = _encode(_field_photo(1200, 1600))
+        full = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+        expected = cv2.cvtColor(cv2.resize(full, (224, 224), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+
+        quality, batch = ImagePreprocessor().process(image_data)
+
+        assert batch.shape == (1, 224, 224, 3)
+        assert batch.dtype == np.float32
+        assert np.abs(batch[0] - expected / 255.0).mean() < 0.05
+        assert 0.0 <= quality["score"] <= 1.0
+
+    def test_invalid_image(self):
+        """Test undecodable data yields a low-quality assessment and no model input."""
+        preprocessor = ImagePreprocessor()
+        quality, batch = preprocessor.process(b"invalid image data")
+
+        assert batch is None
+        assert quality["issues"] == ["Corrupt or unreadable image file."]
+        with pytest.raises(ValueError):
+            preprocessor.preprocess_image(b"invalid image data")
+
+
+def _symptom(name: str, characteristics, threshold: float = 0.3):
+    return SimpleNamespace(
+        nutrient=name.split()[0], symptom_name=name, description=name,
+        affected_parts=["Older leaves"], visual_characteristics=characteristics,
+        severity_levels={"mild": "slight"}, confidence_score_threshold=threshold
+    )
+
+
+class TestSymptomIndex:
+    """Test suite for bitset symptom matching."""
+
+    def test_scores_match_set_jaccard(self):
+        """Test popcount Jaccard equals the set-based score for every symptom."""
+        rng = random.Random(3)
+        pool = [f"Trait {i}" for i in range(150)]  # Spans several 64-bit words
+        records = [_symptom(f"Symptom {i}", rng.sample(pool, rng.randint(0, 12))) for i in range(40)]
+        index = SymptomIndex.build(records)
+        service = SymptomMatchingService(db_session=None)
+
+        for _ in range(20):
+            detected = [char.upper() for char in rng.sample(pool, 6)] + ["Unindexed trait"]
+            expected = [service._calculate_match_score(detected, r.visual_characteristics) for r in records]
+            np.testing.assert_allclose(index.jaccard_scores(detected), expected)
+
+    def test_match_applies_thresholds_and_orders_by_score(self):
+        """Test only symptoms meeting their threshold are returned, best first."""
+        index = SymptomIndex.build([
+            _symptom("Nitrogen yellowing", ["Yellowing", "Stunted growth"], threshold=0.3),
+            _symptom("Potassium scorch", ["Leaf edge scorch", "Yellowing"], threshold=0.9),
+            _symptom("Phosphorus purpling", ["Purpling", "Stunted growth", "Yellowing"], threshold=0.3)
+        ])
+
+        matches = index.match(["yellowing", "stunted growth"])
+
+        assert [m["symptom_name"] for m in matches] == ["Nitrogen yellowing", "Phosphorus purpling"]
+        assert matches[0]["match_score"] == 1.0
+        assert index.match([]) == []
+
+    def test_popcount_rows(self):
+        """Test row popcounts over multi-word bitsets."""
+        words = np.array([[0, 0], [np.uint64(2**64 - 1), 5]], dtype=np.uint64)
+        assert popcount_rows(words).tolist() == [0, 66]
+
+    def test_registry_reuses_index_until_invalidated(self):
+        """Test the database is only queried on first use, expiry or invalidation."""
+        loads = []
+
+        def loader(crop_type):
+            loads.append(crop_type)
+            return [_symptom("Nitrogen yellowing", ["Yellowing"])]
+
+        registry = SymptomIndexRegistry()
+        service = SymptomMatchingService(db_session=None, symptom_index_registry=registry)
+        service._load_symptoms = loader
+
+        service.match_symptoms(["Yellowing"], "Corn")
+        service.match_symptoms(["Yellowing"], "Corn")
+        assert loads == ["Corn"]
+
+        registry.invalidate("Corn")
+        service.match_symptoms(["Yellowing"], "Corn")
+        assert loads == ["Corn", "Corn"]
+
+        registry.max_staleness_seconds = 0
+        service.match_symptoms(["Yellowing"], "Corn")
+        assert len(loads) == 3
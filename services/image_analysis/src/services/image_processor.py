@@ -1,7 +1,7 @@
 import numpy as np
 from PIL import Image
 import io
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 from ..exceptions import InvalidImageError
 from ..models.image_models import ImageQuality, ImageQualityIssue
@@ -11,6 +11,28 @@ class ImageProcessor:
 
     def __init__(self, target_size: Tuple[int, int] = (224, 224)):
         self.target_size = target_size
+        # Last decoded upload, so quality assessment and preprocessing share one decode
+        self._decoded: Optional[Tuple[bytes, Image.Image, Tuple[int, int]]] = None
+
+    def decode(self, image_data: bytes) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Decodes image bytes to RGB once, reusing the result for the same bytes object.
+
+        JPEGs are decoded with DCT scaling (PIL draft mode) straight to the
+        smallest reduction that still covers the model input size.
+        Returns:
+            The decoded RGB image and the original (width, height).
+        """
+        cached = self._decoded
+        if cached is not None and cached[0] is image_data:
+            return cached[1], cached[2]
+
+        image = Image.open(io.BytesIO(image_data))
+        original_size = image.size
+        image.draft("RGB", self.target_size)
+        image = image.convert("RGB")
+        self._decoded = (image_data, image, original_size)
+        return image, original_size
 
     async def preprocess_image(self, image_data: bytes) -> np.ndarray:
         """
@@ -23,12 +45,10 @@ class ImageProcessor:
             InvalidImageError: If the image data is invalid or corrupted.
         """
         try:
-            image = Image.open(io.BytesIO(image_data)).convert("RGB")
+            image, _ = self.decode(image_data)
             image = image.resize(self.target_size)
-            image_array = np.array(image)
             # Normalize pixel values to [0, 1]
-            image_array = image_array / 255.0
-            return image_array
+            return np.asarray(image) / 255.0
         except Exception as e:
             raise InvalidImageError(f"Failed to preprocess image: {e}")
 
@@ -46,8 +66,7 @@ class ImageProcessor:
         score: float = 1.0
 
         try:
-            image = Image.open(io.BytesIO(image_data))
-            width, height = image.size
+            _, (width, height) = self.decode(image_data)
 
             if min(width, height) < 100: # Example: very small image
                 issues.append(ImageQualityIssue.TOO_SMALL)
@@ -85,6 +85,25 @@ class TestImageProcessor:
         assert quality.score > 0.8
         assert not quality.issues
 
+    @pytest.mark.asyncio
+    async def test_quality_and_preprocess_share_one_decode(self):
+        img = Image.new('RGB', (2000, 1600), color='green')
+        byte_arr = io.BytesIO()
+        img.save(byte_arr, format='JPEG')
+        image_data = byte_arr.getvalue()
+        processor = ImageProcessor()
+
+        with patch('services.image_analysis.src.services.image_processor.Image.open', wraps=Image.open) as mock_open:
+            quality = await processor.assess_image_quality(image_data)
+            preprocessed = await processor.preprocess_image(image_data)
+
+        mock_open.assert_called_once()
+        decoded, original_size = processor.decode(image_data)
+        assert original_size == (2000, 1600)
+        assert decoded.size == (500, 400)  # 1/4 DCT-scaled decode still covers 224x224
+        assert preprocessed.shape == (224, 224, 3)
+        assert not quality.issues
+
     @pytest.mark.asyncio
     async def test_assess_image_quality_invalid_format(self):
         processor = ImageProcessor()
@@ -27,7 +27,8 @@ from field_management_service import (
     FieldListResponse,
     FieldValidationResult,
     FieldBoundary,
-    FieldCharacteristics
+    FieldCharacteristics,
+    InvalidCursorError
 )
 
 logger = logging.getLogger(__name__)
@@ -157,6 +158,7 @@ async def list_fields(
     sort_order: str = Query("asc", description="Sort order (asc, desc)"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset paging; overrides page)"),
     current_user: dict = Depends(get_current_user),
     db_session = Depends(get_db_session)
 ) -> FieldListResponse:
@@ -181,6 +183,7 @@ async def list_fields(
         sort_order: Sort order
         page: Page number
         page_size: Items per page
+        cursor: Keyset cursor from the previous page
         current_user: Current authenticated user
         db_session: Database session
         
@@ -242,7 +245,8 @@ async def list_fields(
             sort_order=sort_order,
             page=page,
             page_size=page_size,
-            db_session=db_session
+            db_session=db_session,
+            cursor=cursor
         )
         
         logger.info(f"Retrieved {len(result.fields)} fields (page {page} of {(result.total_count + page_size - 1) // page_size})")
@@ -251,6 +255,22 @@ async def list_fields(
         
     except HTTPException:
         raise  # Re-raise HTTP exceptions
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": {
+                    "error_code": "INVALID_CURSOR",
+                    "error_message": str(e),
+                    "agricultural_context": "Cursors continue a field list with the same sort settings",
+                    "suggested_actions": [
+                        "Pass next_cursor from the previous page unchanged",
+                        "Keep sort_by and sort_order the same between pages",
+                        "Omit the cursor to start from the first page"
+                    ]
+                }
+            }
+        )
     except Exception as e:
         logger.error(f"Unexpected error listing fields: {e}")
         raise HTTPException(
@@ -196,6 +196,7 @@ class AgriculturalAutocompleteService:
         self.usgs_provider = USGSGNISProvider()
         self.usda_provider = USDARuralRouteProvider()
         self.nominatim_provider = None  # Will be injected
+        self.address_index = None  # Will be injected
         self.cache = {}  # Simple in-memory cache
         self.cache_ttl = timedelta(hours=1)
     
@@ -203,6 +204,10 @@ class AgriculturalAutocompleteService:
         """Set the Nominatim provider for fallback."""
         self.nominatim_provider = nominatim_provider
     
+    def set_address_index(self, address_index):
+        """Set the index of previously resolved addresses (a geocoding cache) used before Nominatim."""
+        self.address_index = address_index
+    
     async def get_agricultural_suggestions(
         self, 
         query: str, 
@@ -247,7 +252,7 @@ class AgriculturalAutocompleteService:
                 suggestions.extend(gnis_suggestions)
             
             # 3. Fallback to Nominatim with agricultural enhancement
-            if len(suggestions) < limit and self.nominatim_provider:
+            if len(suggestions) < limit and (self.nominatim_provider or self.address_index):
                 nominatim_suggestions = await self._get_nominatim_suggestions(query, limit - len(suggestions))
                 suggestions.extend(nominatim_suggestions)
             
@@ -297,25 +302,33 @@ class AgriculturalAutocompleteService:
         return suggestions
     
     async def _get_nominatim_suggestions(self, query: str, limit: int) -> List[AgriculturalAddressSuggestion]:
-        """Get suggestions from Nominatim provider."""
-        if not self.nominatim_provider:
-            return []
-        
+        """Get suggestions from previously resolved addresses, or from the Nominatim provider."""
         try:
-            nominatim_suggestions = await self.nominatim_provider.search_suggestions(query, limit)
+            indexed = self.address_index.suggest(query, limit) if self.address_index else None
+            if indexed is not None:
+                base_suggestions = indexed
+                data_source = 'Address_Index'
+            elif self.nominatim_provider:
+                nominatim_suggestions = await self.nominatim_provider.search_suggestions(query, limit)
+                if self.address_index:
+                    await self.address_index.remember_addresses(nominatim_suggestions)
+                base_suggestions = [suggestion.model_dump() for suggestion in nominatim_suggestions]
+                data_source = 'Nominatim'
+            else:
+                return []
             
             # Convert to agricultural suggestions
             agricultural_suggestions = []
-            for suggestion in nominatim_suggestions:
+            for suggestion in base_suggestions:
                 ag_suggestion = AgriculturalAddressSuggestion(
-                    display_name=suggestion.display_name,
-                    address=suggestion.address,
-                    latitude=suggestion.latitude,
-                    longitude=suggestion.longitude,
-                    relevance=suggestion.relevance,
-                    components=suggestion.components,
+                    display_name=suggestion['display_name'],
+                    address=suggestion['address'],
+                    latitude=suggestion.get('latitude'),
+                    longitude=suggestion.get('longitude'),
+                    relevance=suggestion['relevance'],
+                    components=suggestion.get('components') or {},
                     agricultural_type='general',
-                    data_sources=['Nominatim'],
+                    data_sources=[data_source],
                     confidence=0.7
                 )
                 
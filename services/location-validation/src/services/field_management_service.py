@@ -11,15 +11,17 @@ listing/selection functionality.
 
 import logging
 import asyncio
+import base64
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from typing import Dict, List, Optional, Any, Tuple
 from uuid import UUID, uuid4
 import json
 import math
 
 from pydantic import BaseModel, Field, validator
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_, func, desc, asc, tuple_
 
 # Import existing models and services
 from location_sqlalchemy_models import FarmLocation, FarmField
@@ -144,6 +146,56 @@ class FieldListResponse(BaseModel):
     has_next: bool
     has_previous: bool
     filters_applied: Dict[str, Any]
+    next_cursor: Optional[str] = None
+
+
+# Sortable columns; nullable ones are coalesced so keyset comparisons never see NULL
+FIELD_SORT_COLUMNS = {
+    "field_name": FarmField.field_name,
+    "field_type": func.coalesce(FarmField.field_type, ""),
+    "size_acres": func.coalesce(FarmField.size_acres, 0),
+    "created_at": FarmField.created_at,
+    "updated_at": FarmField.updated_at
+}
+
+
+def _field_sort_value(field: FarmField, sort_by: str) -> Any:
+    value = getattr(field, sort_by)
+    if value is None:
+        return "" if sort_by == "field_type" else 0
+    return value
+
+
+class InvalidCursorError(ValueError):
+    """Exception raised for a field list cursor that is malformed or belongs to another sort."""
+    pass
+
+
+def _encode_field_cursor(value: Any, field_id: Any, sort_by: str, descending: bool) -> str:
+    """Opaque keyset cursor: the last row's sort value and id, plus the sort it belongs to."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = {"sort_by": sort_by, "desc": descending, "value": value, "id": str(field_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_field_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[Any, UUID]:
+    """Decode a cursor from _encode_field_cursor, checking it matches the requested sort."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = payload["value"]
+        if sort_by in ("created_at", "updated_at"):
+            value = datetime.fromisoformat(value)
+        elif sort_by == "size_acres":
+            value = Decimal(str(value))
+        field_id = UUID(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidOperation) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+    if payload.get("sort_by") != sort_by or bool(payload.get("desc")) != descending:
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    return value, field_id
 
 
 class FieldValidationResult(BaseModel):
@@ -369,11 +421,16 @@ class FieldManagementService:
         sort_order: str = "asc",
         page: int = 1,
         page_size: int = 20,
-        db_session: Session = None
+        db_session: Session = None,
+        cursor: Optional[str] = None
     ) -> FieldListResponse:
         """
         List fields with advanced filtering and sorting.
         
+        All filters run in SQL, so pages are full and total_count is exact.
+        Pass the previous page's next_cursor to page by keyset instead of
+        offset; page is then ignored.
+        
         Args:
             location_id: Filter by location ID
             field_type: Filter by field type
@@ -386,112 +443,157 @@ class FieldManagementService:
             page: Page number
             page_size: Items per page
             db_session: Database session
+            cursor: Keyset cursor returned as next_cursor by the previous page
             
         Returns:
             FieldListResponse with paginated field data
+            
+        Raises:
+            ValueError: If the cursor is malformed or was issued for another sort
         """
         try:
-            # Build query
-            query = db_session.query(FarmField)
-            
-            # Apply filters
-            filters = {}
-            if location_id:
-                query = query.filter(FarmField.location_id == location_id)
-                filters["location_id"] = location_id
-            
-            if field_type:
-                query = query.filter(FarmField.field_type == field_type)
-                filters["field_type"] = field_type
-            
-            if soil_type:
-                # This would require JSON querying in production
-                # For now, we'll filter after retrieval
-                filters["soil_type"] = soil_type
-            
-            if size_min is not None:
-                query = query.filter(FarmField.size_acres >= size_min)
-                filters["size_min"] = size_min
-            
-            if size_max is not None:
-                query = query.filter(FarmField.size_acres <= size_max)
-                filters["size_max"] = size_max
-            
-            # Apply sorting
-            sort_column = getattr(FarmField, sort_by, FarmField.field_name)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
+            query, filters = self._build_field_query(
+                db_session, location_id, field_type, soil_type, size_min, size_max, irrigation_available
+            )
             
             # Get total count
             total_count = query.count()
             
-            # Apply pagination
-            offset = (page - 1) * page_size
-            fields = query.offset(offset).limit(page_size).all()
-            
-            # Convert to response format
-            field_responses = []
-            for field in fields:
-                # Get location data
-                location = db_session.query(FarmLocation).filter(
-                    FarmLocation.id == field.location_id
-                ).first()
-                
-                # Parse JSON data
-                boundary = None
-                characteristics = None
-                
-                # Generate agricultural context
-                agricultural_context = await self._generate_agricultural_context(field, location)
-                
-                response_data = {
-                    "id": field.id,
-                    "location_id": field.location_id,
-                    "field_name": field.field_name,
-                    "field_type": field.field_type,
-                    "size_acres": float(field.size_acres) if field.size_acres else None,
-                    "boundary": boundary,
-                    "characteristics": characteristics,
-                    "notes": field.notes,
-                    "agricultural_context": agricultural_context,
-                    "soil_suitability": self._assess_soil_suitability(characteristics),
-                    "crop_recommendations": self._get_crop_recommendations(characteristics),
-                    "management_complexity": self._assess_management_complexity(characteristics),
-                    "created_at": field.created_at,
-                    "updated_at": field.updated_at
-                }
-                
-                field_responses.append(FieldResponse(**response_data))
-            
-            # Apply post-query filters (for JSON fields)
-            if soil_type:
-                field_responses = [
-                    f for f in field_responses 
-                    if f.characteristics and f.characteristics.soil_type == soil_type
-                ]
+            # Apply sorting; id breaks ties so keyset pages are stable
+            if sort_by not in FIELD_SORT_COLUMNS:
+                sort_by = "field_name"
+            descending = sort_order.lower() == "desc"
+            sort_key = FIELD_SORT_COLUMNS[sort_by]
+            direction = desc if descending else asc
+            query = query.options(joinedload(FarmField.location)).order_by(
+                direction(sort_key), direction(FarmField.id)
+            )
             
-            if irrigation_available is not None:
-                field_responses = [
-                    f for f in field_responses 
-                    if f.characteristics and f.characteristics.irrigation_available == irrigation_available
-                ]
+            # Apply pagination, fetching one extra row to detect a next page
+            offset = 0
+            if cursor:
+                last_value, last_id = _decode_field_cursor(cursor, sort_by, descending)
+                keyset = tuple_(sort_key, FarmField.id)
+                query = query.filter(keyset < (last_value, last_id) if descending else keyset > (last_value, last_id))
+            else:
+                offset = (page - 1) * page_size
+                query = query.offset(offset)
+            rows = query.limit(page_size + 1).all()
+            fields = rows[:page_size]
+            has_next = len(rows) > page_size
+            
+            next_cursor = None
+            if has_next:
+                last = fields[-1]
+                next_cursor = _encode_field_cursor(
+                    _field_sort_value(last, sort_by), last.id, sort_by, descending
+                )
             
             return FieldListResponse(
-                fields=field_responses,
+                fields=self._build_field_responses(fields),
                 total_count=total_count,
                 page=page,
                 page_size=page_size,
-                has_next=offset + page_size < total_count,
-                has_previous=page > 1,
-                filters_applied=filters
+                has_next=has_next,
+                has_previous=bool(cursor) or page > 1,
+                filters_applied=filters,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
             self.logger.error(f"Error listing fields: {e}")
             raise
     
+    def _build_field_query(
+        self,
+        db_session: Session,
+        location_id: Optional[str] = None,
+        field_type: Optional[str] = None,
+        soil_type: Optional[str] = None,
+        size_min: Optional[float] = None,
+        size_max: Optional[float] = None,
+        irrigation_available: Optional[bool] = None
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Build the filtered field query; returns it with the filters applied."""
+        query = db_session.query(FarmField)
+        filters = {}
+        
+        if location_id:
+            query = query.filter(FarmField.location_id == location_id)
+            filters["location_id"] = location_id
+        
+        if field_type:
+            query = query.filter(FarmField.field_type == field_type)
+            filters["field_type"] = field_type
+        
+        if soil_type:
+            # soil_type is kept in step with characteristics_json on create/update
+            query = query.filter(FarmField.soil_type == soil_type)
+            filters["soil_type"] = soil_type
+        
+        if size_min is not None:
+            query = query.filter(FarmField.size_acres >= size_min)
+            filters["size_min"] = size_min
+        
+        if size_max is not None:
+            query = query.filter(FarmField.size_acres <= size_max)
+            filters["size_max"] = size_max
+        
+        if irrigation_available is not None:
+            # Generated column over characteristics_json ->> 'irrigation_available'
+            query = query.filter(FarmField.irrigation_available.is_(irrigation_available))
+            filters["irrigation_available"] = irrigation_available
+        
+        return query, filters
+    
+    def _parse_field_json(self, field: FarmField) -> Tuple[Optional[FieldBoundary], Optional[FieldCharacteristics]]:
+        """Parse the boundary and characteristics stored on a field."""
+        boundary = None
+        if getattr(field, 'boundary_json', None):
+            boundary = FieldBoundary(**field.boundary_json)
+        characteristics = None
+        if getattr(field, 'characteristics_json', None):
+            characteristics = FieldCharacteristics(**field.characteristics_json)
+        return boundary, characteristics
+    
+    def _build_field_responses(self, fields: List[FarmField]) -> List[FieldResponse]:
+        """Build responses for a page of fields whose locations are already loaded."""
+        parsed = [self._parse_field_json(field) for field in fields]
+        contexts = self._generate_agricultural_contexts(
+            [(field, field.location, characteristics) for field, (_, characteristics) in zip(fields, parsed)]
+        )
+        
+        # Suitability and crop recommendations only depend on soil type and drainage
+        soil_assessments: Dict[Any, Tuple[Dict[str, Any], List[str]]] = {}
+        field_responses = []
+        for field, (boundary, characteristics), agricultural_context in zip(fields, parsed, contexts):
+            soil_key = (characteristics.soil_type, characteristics.drainage_class) if characteristics else None
+            if soil_key not in soil_assessments:
+                soil_assessments[soil_key] = (
+                    self._assess_soil_suitability(characteristics),
+                    self._get_crop_recommendations(characteristics)
+                )
+            soil_suitability, crop_recommendations = soil_assessments[soil_key]
+            
+            field_responses.append(FieldResponse(
+                id=str(field.id),
+                location_id=str(field.location_id),
+                field_name=field.field_name,
+                field_type=field.field_type,
+                size_acres=float(field.size_acres) if field.size_acres else None,
+                boundary=boundary,
+                characteristics=characteristics,
+                notes=field.notes,
+                agricultural_context=agricultural_context,
+                soil_suitability=soil_suitability,
+                crop_recommendations=list(crop_recommendations),
+                management_complexity=self._assess_management_complexity(characteristics),
+                created_at=field.created_at,
+                updated_at=field.updated_at
+            ))
+        
+        return field_responses
+    
     async def update_field(
         self,
         field_id: str,
@@ -545,6 +647,7 @@ class FieldManagementService:
                 field.boundary_json = request.boundary.dict()
             if request.characteristics:
                 field.characteristics_json = request.characteristics.dict()
+                field.soil_type = request.characteristics.soil_type
             
             field.updated_at = datetime.utcnow()
             
@@ -812,32 +915,47 @@ class FieldManagementService:
     async def _generate_agricultural_context(self, field: FarmField, location: FarmLocation) -> Dict[str, Any]:
         """Generate agricultural context for field."""
         try:
-            context = {
-                "location_climate_zone": location.climate_zone,
-                "location_county": location.county,
-                "location_state": location.state,
-                "field_size_category": self._categorize_field_size(field.size_acres),
-                "management_recommendations": []
-            }
-            
-            # Add soil-specific recommendations
-            if hasattr(field, 'characteristics_json') and field.characteristics_json:
-                characteristics = FieldCharacteristics(**field.characteristics_json)
-                
-                if characteristics.soil_type:
-                    soil_info = self.soil_types.get(characteristics.soil_type, {})
-                    context["soil_characteristics"] = soil_info
-                
-                if characteristics.drainage_class:
-                    context["drainage_recommendations"] = self._get_drainage_recommendations(
-                        characteristics.drainage_class
-                    )
-            
-            return context
-            
+            _, characteristics = self._parse_field_json(field)
         except Exception as e:
             self.logger.error(f"Error generating agricultural context: {e}")
             return {}
+        return self._generate_agricultural_contexts([(field, location, characteristics)])[0]
+    
+    def _generate_agricultural_contexts(
+        self,
+        items: List[Tuple[FarmField, FarmLocation, Optional[FieldCharacteristics]]]
+    ) -> List[Dict[str, Any]]:
+        """Generate agricultural context for many fields, sharing drainage lookups."""
+        drainage_recommendations: Dict[str, List[str]] = {}
+        contexts = []
+        for field, location, characteristics in items:
+            try:
+                context = {
+                    "location_climate_zone": location.climate_zone,
+                    "location_county": location.county,
+                    "location_state": location.state,
+                    "field_size_category": self._categorize_field_size(field.size_acres),
+                    "management_recommendations": []
+                }
+                
+                # Add soil-specific recommendations
+                if characteristics:
+                    if characteristics.soil_type:
+                        context["soil_characteristics"] = self.soil_types.get(characteristics.soil_type, {})
+                    
+                    drainage_class = characteristics.drainage_class
+                    if drainage_class:
+                        if drainage_class not in drainage_recommendations:
+                            drainage_recommendations[drainage_class] = self._get_drainage_recommendations(drainage_class)
+                        context["drainage_recommendations"] = list(drainage_recommendations[drainage_class])
+                
+                contexts.append(context)
+                
+            except Exception as e:
+                self.logger.error(f"Error generating agricultural context: {e}")
+                contexts.append({})
+        
+        return contexts
     
     def _categorize_field_size(self, size_acres: Optional[float]) -> str:
         """Categorize field size."""
@@ -0,0 +1,507 @@
+"""
+Persistent geocoding cache with spatial and prefix indexes.
+
+Results are stored in SQLite (a local file when a path is configured, an
+in-memory database otherwise) behind an in-process LRU of decoded models.
+Reverse geocodes are filed under a lat/lon grid cell so nearby coordinates
+reuse the closest cached address, and every resolved address feeds a prefix
+trie that answers autocomplete keystrokes without a provider round trip.
+
+SQLite calls block, so the async methods run them in a worker thread and
+keep the event loop free while a lookup or write is on disk.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6_371_000.0
+METERS_PER_DEGREE = 111_320.0
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocoding_cache (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    grid_tag TEXT,
+    cell_y INTEGER,
+    cell_x INTEGER,
+    latitude REAL,
+    longitude REAL
+);
+CREATE INDEX IF NOT EXISTS ix_geocoding_cache_accessed ON geocoding_cache (accessed_at);
+CREATE INDEX IF NOT EXISTS ix_geocoding_cache_cell ON geocoding_cache (grid_tag, cell_y, cell_x);
+CREATE TABLE IF NOT EXISTS resolved_addresses (
+    entry_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    score REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_resolved_addresses_updated ON resolved_addresses (updated_at);
+"""
+
+
+def normalize_address(text: str) -> str:
+    """Lower-case and reduce punctuation to single spaces, so 'Ames, IA' matches 'ames ia'."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.top: List[str] = []  # Entry ids, best score first
+
+
+class AddressPrefixTrie:
+    """
+    Prefix trie over resolved addresses.
+
+    Every node keeps the ids of its best `top_k` entries, so a lookup costs
+    one walk down the query's characters. Keys are truncated to `max_depth`
+    characters to bound memory; longer queries are filtered on the full key.
+    """
+
+    def __init__(self, top_k: int = 10, max_depth: int = 32, max_entries: int = 5000):
+        self.top_k = top_k
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self._root = _TrieNode()
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._removed_since_rebuild = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def entry_id(entry: Dict[str, Any]) -> str:
+        return normalize_address(entry.get("display_name") or entry.get("address") or "")
+
+    @staticmethod
+    def index_keys(entry: Dict[str, Any]) -> List[str]:
+        """Full address, display name and its trailing components ('Ames, Story County, ...')."""
+        display_name = entry.get("display_name") or ""
+        keys = {normalize_address(entry.get("address") or ""), normalize_address(display_name)}
+        segments = display_name.split(",")
+        for i in range(1, min(len(segments), 3)):
+            keys.add(normalize_address(",".join(segments[i:])))
+        keys.discard("")
+        return sorted(keys)
+
+    def add(self, entry: Dict[str, Any], score: float) -> Optional[str]:
+        """Insert or refresh an entry; returns its id, or None if it has no indexable text."""
+        entry_id = self.entry_id(entry)
+        if not entry_id:
+            return None
+        previous = self._entries.pop(entry_id, None)
+        if previous is not None and self.index_keys(previous[0]) != self.index_keys(entry):
+            self._remove_paths(previous[0], entry_id)
+        self._entries[entry_id] = (entry, score)
+        for key in self.index_keys(entry):
+            self._insert_path(key, entry_id, score)
+
+        while len(self._entries) > self.max_entries:
+            oldest_id, (oldest, _) = self._entries.popitem(last=False)
+            self._remove_paths(oldest, oldest_id)
+        return entry_id
+
+    def _insert_path(self, key: str, entry_id: str, score: float):
+        node = self._root
+        for char in key[:self.max_depth]:
+            node = node.children.setdefault(char, _TrieNode())
+            top = node.top
+            if entry_id in top:
+                top.remove(entry_id)
+            elif len(top) >= self.top_k and score <= self._score(top[-1]):
+                continue
+            position = 0
+            while position < len(top) and self._score(top[position]) >= score:
+                position += 1
+            top.insert(position, entry_id)
+            del top[self.top_k:]
+
+    def _score(self, entry_id: str) -> float:
+        entry = self._entries.get(entry_id)
+        return entry[1] if entry is not None else float("-inf")
+
+    def _remove_paths(self, entry: Dict[str, Any], entry_id: str):
+        for key in self.index_keys(entry):
+            node = self._root
+            for char in key[:self.max_depth]:
+                node = node.children.get(char)
+                if node is None:
+                    break
+                if entry_id in node.top:
+                    node.top.remove(entry_id)
+        # Removals leave nodes short of their top_k; rebuild once enough have accumulated
+        self._removed_since_rebuild += 1
+        if self._removed_since_rebuild > self.max_entries // 4:
+            self._rebuild()
+
+    def _rebuild(self):
+        entries = list(self._entries.items())
+        self._root = _TrieNode()
+        self._removed_since_rebuild = 0
+        for entry_id, (entry, score) in entries:
+            for key in self.index_keys(entry):
+                self._insert_path(key, entry_id, score)
+
+    def search(self, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Best entries having a key that starts with the prefix."""
+        query = normalize_address(prefix)
+        if not query:
+            return []
+        node = self._root
+        for char in query[:self.max_depth]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        results = []
+        for entry_id in node.top:
+            entry, _ = self._entries.get(entry_id, (None, None))
+            if entry is None:
+                continue
+            if len(query) > self.max_depth and not any(key.startswith(query) for key in self.index_keys(entry)):
+                continue
+            results.append(dict(entry))
+            if len(results) >= limit:
+                break
+        return results
+
+
+class _MemoryEntry:
+    __slots__ = ("result", "created_at", "accessed_at")
+
+    def __init__(self, result: Any, created_at: float, accessed_at: float):
+        self.result = result
+        self.created_at = created_at
+        self.accessed_at = accessed_at
+
+
+class PersistentGeocodingCache:
+    """
+    Two-tier geocoding cache: an LRU of decoded results over a SQLite store.
+
+    Only results whose model type is registered in `model_types` are written
+    to SQLite; anything else stays in the in-process tier.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_hours: float = 24,
+        path: Optional[str] = None,
+        max_disk_entries: Optional[int] = None,
+        model_types: Sequence[Type[BaseModel]] = (),
+        reverse_radius_m: float = 50.0,
+        max_indexed_addresses: int = 5000,
+        prefix_min_hits: int = 3
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_hours * 3600
+        self.path = path
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else max_size
+        self.reverse_radius_m = reverse_radius_m
+        self.grid_degrees = reverse_radius_m / METERS_PER_DEGREE
+        self.prefix_min_hits = prefix_min_hits
+        self._model_types: Dict[str, Type[BaseModel]] = {model.__name__: model for model in model_types}
+
+        self._cache: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM geocoding_cache").fetchone()[0]
+
+        self.address_index = AddressPrefixTrie(max_entries=max_indexed_addresses)
+        self._load_address_index()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.spatial_hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _generate_key(self, query: str) -> str:
+        """Generate cache key from query."""
+        return hashlib.md5(query.lower().encode()).hexdigest()
+
+    def _encode(self, result: Any) -> Optional[str]:
+        many = isinstance(result, list)
+        items = result if many else [result]
+        type_name = type(items[0]).__name__ if items else None
+        if type_name is not None and (
+            type_name not in self._model_types or not all(type(item).__name__ == type_name for item in items)
+        ):
+            return None
+        return json.dumps({
+            "type": type_name,
+            "many": many,
+            "items": [item.model_dump(mode="json") for item in items]
+        })
+
+    def _decode(self, payload: str) -> Any:
+        data = json.loads(payload)
+        model = self._model_types.get(data["type"]) if data["type"] else None
+        items = [model.model_validate(item) for item in data["items"]] if model else []
+        return items if data["many"] else items[0]
+
+    def _remember(self, key: str, result: Any, created_at: float, now: float):
+        self._cache[key] = _MemoryEntry(result, created_at, now)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            evicted_key, evicted = self._cache.popitem(last=False)
+            # Memory hits never touch SQLite; carry the last access down so disk LRU sees it
+            self._conn.execute(
+                "UPDATE geocoding_cache SET accessed_at = ? WHERE key = ? AND accessed_at < ?",
+                (evicted.accessed_at, evicted_key, evicted.accessed_at)
+            )
+
+    def _lookup(self, key: str, now: float) -> Optional[Any]:
+        """Memory tier, then SQLite; expired entries are dropped from both."""
+        entry = self._cache.get(key)
+        if entry is not None:
+            if now - entry.created_at < self.ttl_seconds:
+                entry.accessed_at = now
+                self._cache.move_to_end(key)
+                self.memory_hits += 1
+                return entry.result
+            del self._cache[key]
+
+        row = self._conn.execute(
+            "SELECT payload, created_at FROM geocoding_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[1] >= self.ttl_seconds:
+            self._delete(key)
+            return None
+        try:
+            result = self._decode(row[0])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Dropping undecodable geocoding cache entry {key}: {e}")
+            self._delete(key)
+            return None
+        self._conn.execute("UPDATE geocoding_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self._remember(key, result, row[1], now)
+        self._conn.commit()
+        self.disk_hits += 1
+        return result
+
+    def _delete(self, key: str):
+        deleted = self._conn.execute("DELETE FROM geocoding_cache WHERE key = ?", (key,)).rowcount
+        self._disk_count -= deleted
+        self._conn.commit()
+
+    def _store(self, key: str, result: Any, now: float, location: Optional[Tuple[str, float, float]] = None):
+        self._remember(key, result, now, now)
+        payload = self._encode(result)
+        if payload is None:
+            return
+
+        grid_tag = cell_y = cell_x = latitude = longitude = None
+        if location is not None:
+            grid_tag, latitude, longitude = location
+            cell_y, cell_x = self._cell(latitude, longitude)
+        exists = self._conn.execute("SELECT 1 FROM geocoding_cache WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO geocoding_cache "
+            "(key, payload, created_at, accessed_at, grid_tag, cell_y, cell_x, latitude, longitude) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, payload, now, now, grid_tag, cell_y, cell_x, latitude, longitude)
+        )
+        if not exists:
+            self._disk_count += 1
+        if self._disk_count > self.max_disk_entries:
+            overflow = self._disk_count - self.max_disk_entries
+            deleted = self._conn.execute(
+                "DELETE FROM geocoding_cache WHERE key IN "
+                "(SELECT key FROM geocoding_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            ).rowcount
+            self._disk_count -= deleted
+            self.evictions += deleted
+        self._conn.commit()
+
+    async def get(self, query: str) -> Optional[Any]:
+        """Get cached result."""
+        result = await asyncio.to_thread(self._get_blocking, self._generate_key(query))
+        if result is not None:
+            logger.debug(f"Cache hit for query: {query}")
+        return result
+
+    def _get_blocking(self, key: str) -> Optional[Any]:
+        with self._lock:
+            result = self._lookup(key, time.time())
+            if result is None:
+                self.misses += 1
+            return result
+
+    async def set(self, query: str, result: Any):
+        """Cache result."""
+        await asyncio.to_thread(self._store_blocking, self._generate_key(query), result)
+        logger.debug(f"Cached result for query: {query}")
+
+    def _store_blocking(self, key: str, result: Any, location: Optional[Tuple[str, float, float]] = None):
+        with self._lock:
+            self._store(key, result, time.time(), location=location)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return math.floor(latitude / self.grid_degrees), math.floor(longitude / self.grid_degrees)
+
+    async def get_nearby(self, grid_tag: str, latitude: float, longitude: float) -> Optional[Any]:
+        """Closest unexpired result stored under the tag within `reverse_radius_m`."""
+        return await asyncio.to_thread(self._get_nearby_blocking, grid_tag, latitude, longitude)
+
+    def _get_nearby_blocking(self, grid_tag: str, latitude: float, longitude: float) -> Optional[Any]:
+        cell_y, cell_x = self._cell(latitude, longitude)
+        # Cells are reverse_radius_m tall but narrow towards the poles, so widen the longitude span
+        span_x = min(math.ceil(1 / max(math.cos(math.radians(latitude)), 1e-6)), 64)
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, latitude, longitude FROM geocoding_cache "
+                "WHERE grid_tag = ? AND cell_y BETWEEN ? AND ? AND cell_x BETWEEN ? AND ? AND created_at > ?",
+                (grid_tag, cell_y - 1, cell_y + 1, cell_x - span_x, cell_x + span_x, now - self.ttl_seconds)
+            ).fetchall()
+            candidates = sorted(
+                (haversine_m(latitude, longitude, row[1], row[2]), row[0]) for row in rows
+            )
+            for distance, key in candidates:
+                if distance > self.reverse_radius_m:
+                    break
+                result = self._lookup(key, now)
+                if result is not None:
+                    self.spatial_hits += 1
+                    logger.debug(f"Spatial cache hit {distance:.1f} m from {latitude}, {longitude}")
+                    return result
+            self.misses += 1
+            return None
+
+    async def set_nearby(self, grid_tag: str, latitude: float, longitude: float, result: Any):
+        """Cache a result at a coordinate so later lookups nearby can reuse it."""
+        key = self._generate_key(f"{grid_tag}:{latitude:.6f},{longitude:.6f}")
+        await asyncio.to_thread(self._store_blocking, key, result, (grid_tag, latitude, longitude))
+
+    def _load_address_index(self):
+        rows = self._conn.execute(
+            "SELECT payload, score FROM resolved_addresses ORDER BY updated_at DESC LIMIT ?",
+            (self.address_index.max_entries,)
+        ).fetchall()
+        for payload, score in reversed(rows):
+            self.address_index.add(json.loads(payload), score)
+        if rows:
+            logger.info(f"Loaded {len(rows)} resolved addresses into the autocomplete index")
+
+    async def remember_addresses(self, results: Iterable[Any]):
+        """Add resolved addresses (suggestions or geocoding results) to the autocomplete index."""
+        await asyncio.to_thread(self._remember_addresses_blocking, list(results))
+
+    def _remember_addresses_blocking(self, results: List[Any]):
+        now = time.time()
+        with self._lock:
+            for result in results:
+                self._remember_address(result, now)
+            self._conn.commit()
+
+    async def remember_address(self, result: Any, latitude: Optional[float] = None, longitude: Optional[float] = None):
+        """Add one resolved address, optionally at an explicit coordinate (reverse geocodes)."""
+        await asyncio.to_thread(self._remember_address_blocking, result, latitude, longitude)
+
+    def _remember_address_blocking(self, result: Any, latitude: Optional[float], longitude: Optional[float]):
+        with self._lock:
+            self._remember_address(result, time.time(), latitude, longitude)
+            self._conn.commit()
+
+    def _remember_address(
+        self,
+        result: Any,
+        now: float,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ):
+        relevance = getattr(result, "relevance", None)
+        if relevance is None:
+            relevance = getattr(result, "confidence", 0.5)
+        entry = {
+            "display_name": result.display_name,
+            "address": result.address,
+            "latitude": latitude if latitude is not None else getattr(result, "latitude", None),
+            "longitude": longitude if longitude is not None else getattr(result, "longitude", None),
+            "relevance": relevance,
+            "components": dict(result.components or {})
+        }
+        entry_id = self.address_index.add(entry, relevance)
+        if entry_id is None:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO resolved_addresses (entry_id, payload, score, updated_at) VALUES (?, ?, ?, ?)",
+            (entry_id, json.dumps(entry), relevance, now)
+        )
+        self._conn.execute(
+            "DELETE FROM resolved_addresses WHERE entry_id IN (SELECT entry_id FROM resolved_addresses "
+            "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.address_index.max_entries,)
+        )
+
+    def suggest(self, query: str, limit: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """
+        Suggestions from previously resolved addresses.
+
+        Returns None unless at least `prefix_min_hits` (or `limit`, if smaller)
+        addresses match, so sparse prefixes still go to the provider.
+        """
+        with self._lock:
+            hits = self.address_index.search(query, limit)
+            if len(hits) >= min(limit, self.prefix_min_hits):
+                self.prefix_hits += 1
+                return hits
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tier sizes and hit counters."""
+        return {
+            "memory_entries": len(self._cache),
+            "disk_entries": self._disk_count,
+            "indexed_addresses": len(self.address_index),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "spatial_hits": self.spatial_hits,
+            "prefix_hits": self.prefix_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "persistent": self.path is not None
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -7,12 +7,12 @@ with caching and fallback providers for reliability.
 """
 
 import asyncio
-import hashlib
 import json
 import logging
+import os
+import sys
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional
 from urllib.parse import quote
 
 import aiohttp
@@ -27,8 +27,17 @@ except ImportError:
     AgriculturalAutocompleteService = None
     AgriculturalAddressSuggestion = None
 
+try:
+    from .geocoding_cache import PersistentGeocodingCache
+except ImportError:
+    from geocoding_cache import PersistentGeocodingCache
+
 logger = logging.getLogger(__name__)
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../shared/utils'))
+
+from http_session import SharedSessionMixin, TransportError, UpstreamPolicy
+
 
 class AgriculturalContext(BaseModel):
     """Agricultural context data for a location."""
@@ -274,63 +283,34 @@ class GeocodingError(Exception):
         super().__init__(message)
 
 
-class GeocodingCache:
-    """Simple in-memory cache for geocoding results."""
-    
-    def __init__(self, max_size: int = 1000, ttl_hours: int = 24):
-        self._cache: Dict[str, Dict] = {}
-        self.max_size = max_size
-        self.ttl = timedelta(hours=ttl_hours)
-    
-    def _generate_key(self, query: str) -> str:
-        """Generate cache key from query."""
-        return hashlib.md5(query.lower().encode()).hexdigest()
+class GeocodingCache(PersistentGeocodingCache):
+    """
+    Cache for geocoding results.
     
-    async def get(self, query: str) -> Optional[Union[GeocodingResult, AddressResult, List[AddressSuggestion]]]:
-        """Get cached result."""
-        key = self._generate_key(query)
-        
-        if key in self._cache:
-            entry = self._cache[key]
-            if datetime.now() - entry['timestamp'] < self.ttl:
-                logger.debug(f"Cache hit for query: {query}")
-                return entry['result']
-            else:
-                # Remove expired entry
-                del self._cache[key]
-        
-        return None
+    Persists to a SQLite file when `path` is given, otherwise keeps an
+    in-memory store. See `PersistentGeocodingCache` for the spatial reverse
+    geocode lookup and the autocomplete address index.
+    """
     
-    async def set(self, query: str, result: Union[GeocodingResult, AddressResult, List[AddressSuggestion]]):
-        """Cache result."""
-        key = self._generate_key(query)
-        
-        # Remove oldest entries if cache is full
-        if len(self._cache) >= self.max_size:
-            oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k]['timestamp'])
-            del self._cache[oldest_key]
-        
-        self._cache[key] = {
-            'result': result,
-            'timestamp': datetime.now()
-        }
-        logger.debug(f"Cached result for query: {query}")
+    def __init__(self, max_size: int = 1000, ttl_hours: int = 24, path: Optional[str] = None, **kwargs):
+        model_types = [GeocodingResult, AddressResult, AddressSuggestion]
+        if AgriculturalAddressSuggestion is not None:
+            model_types.append(AgriculturalAddressSuggestion)
+        super().__init__(max_size=max_size, ttl_hours=ttl_hours, path=path, model_types=model_types, **kwargs)
 
 
-class NominatimProvider:
+class NominatimProvider(SharedSessionMixin):
     """Nominatim (OpenStreetMap) geocoding provider."""
+
+    http_upstream = "nominatim"
+    # Nominatim's usage policy allows ~1 request/s, so keep concurrency and retries low
+    http_policy = UpstreamPolicy(timeout=10.0, max_retries=1, backoff_base=1.0, max_concurrency=2)
     
     def __init__(self, user_agent: str = "AFAS-Location-Service/1.0"):
         self.user_agent = user_agent
         self.base_url = "https://nominatim.openstreetmap.org"
-    
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get a new HTTP session for each request."""
-        timeout = aiohttp.ClientTimeout(total=10)
-        return aiohttp.ClientSession(
-            timeout=timeout,
-            headers={'User-Agent': self.user_agent}
-        )
+        self.http_headers = {'User-Agent': user_agent}
+        self.session = None
     
     async def geocode(self, address: str) -> GeocodingResult:
         """Geocode an address using Nominatim."""
@@ -371,12 +351,10 @@ class NominatimProvider:
                     components=components
                 )
         
-        except aiohttp.ClientError as e:
+        except (aiohttp.ClientError, TransportError) as e:
             raise GeocodingError(f"Network error: {str(e)}", "nominatim", e)
         except (KeyError, ValueError, TypeError) as e:
             raise GeocodingError(f"Invalid response format: {str(e)}", "nominatim", e)
-        finally:
-            await session.close()
     
     async def reverse_geocode(self, latitude: float, longitude: float) -> AddressResult:
         """Reverse geocode coordinates using Nominatim."""
@@ -412,12 +390,10 @@ class NominatimProvider:
                     provider="nominatim"
                 )
         
-        except aiohttp.ClientError as e:
+        except (aiohttp.ClientError, TransportError) as e:
             raise GeocodingError(f"Network error: {str(e)}", "nominatim", e)
         except (KeyError, ValueError, TypeError) as e:
             raise GeocodingError(f"Invalid response format: {str(e)}", "nominatim", e)
-        finally:
-            await session.close()
     
     async def search_suggestions(self, query: str, limit: int = 5) -> List[AddressSuggestion]:
         """Get address suggestions for autocomplete."""
@@ -456,12 +432,10 @@ class NominatimProvider:
                 
                 return suggestions
         
-        except aiohttp.ClientError as e:
+        except (aiohttp.ClientError, TransportError) as e:
             raise GeocodingError(f"Network error: {str(e)}", "nominatim", e)
         except (KeyError, ValueError, TypeError) as e:
             raise GeocodingError(f"Invalid response format: {str(e)}", "nominatim", e)
-        finally:
-            await session.close()
     
     def _format_address(self, components: Dict[str, str]) -> str:
         """Format address components into a readable address."""
@@ -505,11 +479,6 @@ class NominatimProvider:
         
         return min(1.0, max(0.1, confidence))
     
-    async def close(self):
-        """Close method for compatibility."""
-        pass
-
-
 class GeocodingService:
     """
     Main geocoding service with multiple providers and caching.
@@ -520,14 +489,22 @@ class GeocodingService:
     agricultural address autocomplete functionality.
     """
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None):
         self.primary_provider = NominatimProvider()
         self.fallback_provider = None  # Can add MapBox or other providers later
-        self.cache = GeocodingCache()
+        # Set GEOCODING_CACHE_PATH to keep results (and the autocomplete index) across restarts
+        cache_path = cache_path or os.getenv("GEOCODING_CACHE_PATH")
+        self.cache = GeocodingCache(
+            max_size=1000,
+            ttl_hours=24,
+            path=cache_path,
+            max_disk_entries=100000 if cache_path else None
+        )
         self.agricultural_enhancement = AgriculturalEnhancementService()
         if AgriculturalAutocompleteService is not None:
             self.agricultural_autocomplete = AgriculturalAutocompleteService()
             self.agricultural_autocomplete.set_nominatim_provider(self.primary_provider)
+            self.agricultural_autocomplete.set_address_index(self.cache)
         else:
             self.agricultural_autocomplete = None
         logger.info("Geocoding service initialized with Nominatim provider, agricultural enhancement, and agricultural autocomplete")
@@ -570,6 +547,7 @@ class GeocodingService:
                 result.agricultural_context = agricultural_context
             
             await self.cache.set(cache_key, result)
+            await self.cache.remember_addresses([result])
             logger.info(f"Successfully geocoded address: {address}")
             return result
         
@@ -589,6 +567,7 @@ class GeocodingService:
                         result.agricultural_context = agricultural_context
                     
                     await self.cache.set(cache_key, result)
+                    await self.cache.remember_addresses([result])
                     logger.info(f"Successfully geocoded address with fallback: {address}")
                     return result
                 except GeocodingError as fallback_error:
@@ -618,10 +597,11 @@ class GeocodingService:
         if not -180 <= longitude <= 180:
             raise GeocodingError(f"Invalid longitude: {longitude}")
         
-        cache_key = f"reverse:{latitude:.6f},{longitude:.6f}:{include_agricultural_context}"
+        # Nearby coordinates share a result, so look up the closest cached point on the grid
+        grid_tag = f"reverse:{include_agricultural_context}"
         
         # Check cache first
-        cached_result = await self.cache.get(cache_key)
+        cached_result = await self.cache.get_nearby(grid_tag, latitude, longitude)
         if cached_result:
             logger.debug(f"Returning cached reverse geocoding result for: {latitude}, {longitude}")
             return cached_result
@@ -637,7 +617,8 @@ class GeocodingService:
                 )
                 result.agricultural_context = agricultural_context
             
-            await self.cache.set(cache_key, result)
+            await self.cache.set_nearby(grid_tag, latitude, longitude, result)
+            await self.cache.remember_address(result, latitude, longitude)
             logger.info(f"Successfully reverse geocoded coordinates: {latitude}, {longitude}")
             return result
         
@@ -656,7 +637,8 @@ class GeocodingService:
                         )
                         result.agricultural_context = agricultural_context
                     
-                    await self.cache.set(cache_key, result)
+                    await self.cache.set_nearby(grid_tag, latitude, longitude, result)
+                    await self.cache.remember_address(result, latitude, longitude)
                     logger.info(f"Successfully reverse geocoded coordinates with fallback: {latitude}, {longitude}")
                     return result
                 except GeocodingError as fallback_error:
@@ -694,10 +676,17 @@ class GeocodingService:
             logger.debug(f"Returning cached suggestions for: {query}")
             return cached_result
         
+        # Serve keystrokes from previously resolved addresses when enough of them match
+        indexed = self.cache.suggest(query, limit)
+        if indexed is not None:
+            logger.debug(f"Returning indexed suggestions for: {query}")
+            return [AddressSuggestion(**entry) for entry in indexed]
+        
         # Try primary provider
         try:
             suggestions = await self.primary_provider.search_suggestions(query, limit)
             await self.cache.set(cache_key, suggestions)
+            await self.cache.remember_addresses(suggestions)
             logger.info(f"Successfully retrieved {len(suggestions)} suggestions for: {query}")
             return suggestions
         
@@ -709,6 +698,7 @@ class GeocodingService:
                 try:
                     suggestions = await self.fallback_provider.search_suggestions(query, limit)
                     await self.cache.set(cache_key, suggestions)
+                    await self.cache.remember_addresses(suggestions)
                     logger.info(f"Successfully retrieved {len(suggestions)} suggestions with fallback for: {query}")
                     return suggestions
                 except GeocodingError:
@@ -855,6 +845,7 @@ class GeocodingService:
         if self.fallback_provider:
             await self.fallback_provider.close()
         await self.agricultural_enhancement.close()
+        self.cache.close()
         logger.info("Geocoding service closed")
 
 
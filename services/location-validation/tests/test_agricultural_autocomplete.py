@@ -206,6 +206,25 @@ class TestAgriculturalAutocompleteService:
                     assert len(suggestions) > 0
                     assert suggestions[0].data_sources == ["Nominatim"]
     
+    @pytest.mark.asyncio
+    async def test_nominatim_suggestions_served_from_address_index(self):
+        """Test resolved addresses answer longer prefixes without calling Nominatim."""
+        from src.services.geocoding_service import AddressSuggestion, GeocodingCache
+        
+        self.service.set_address_index(GeocodingCache())
+        self.mock_nominatim_provider.search_suggestions.return_value = [
+            AddressSuggestion(display_name=f"{name}, Story County, Iowa", address=name, relevance=0.8)
+            for name in ("Kelley Farm Road", "Kelley Farms", "Kelley Farm Supply")
+        ]
+        
+        await self.service._get_nominatim_suggestions("Kelley", 3)
+        suggestions = await self.service._get_nominatim_suggestions("Kelley Farm", 3)
+        
+        assert self.mock_nominatim_provider.search_suggestions.call_count == 1
+        assert len(suggestions) == 3
+        assert all(s.data_sources == ["Address_Index"] for s in suggestions)
+        assert all(s.agricultural_type == "farm" for s in suggestions)
+    
     @pytest.mark.asyncio
     async def test_prioritize_agricultural_suggestions(self):
         """Test prioritization of agricultural locations."""
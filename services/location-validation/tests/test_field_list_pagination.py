@@ -0,0 +1,137 @@
+"""
+Field List Pagination Tests
+Autonomous Farm Advisory System
+
+Tests for keyset cursors on the field listing service and route.
+"""
+
+import os
+import sys
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../databases/python'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src/services'))
+
+from field_management_service import (  # noqa: E402
+    FieldManagementService,
+    InvalidCursorError,
+    _decode_field_cursor,
+    _encode_field_cursor
+)
+from src.api import field_routes  # noqa: E402
+
+
+def _mock_field(index, location):
+    field = MagicMock()
+    field.id = uuid4()
+    field.location_id = uuid4()
+    field.field_name = f"Field {index}"
+    field.field_type = "crop"
+    field.size_acres = 10.0 + index
+    field.notes = None
+    field.created_at = datetime.utcnow()
+    field.updated_at = datetime.utcnow()
+    field.boundary_json = None
+    field.characteristics_json = {"soil_type": "loam", "drainage_class": "good", "irrigation_available": True}
+    field.location = location
+    return field
+
+
+class TestFieldListPagination:
+    """Test suite for keyset pagination of field lists."""
+
+    @pytest.fixture
+    def field_service(self):
+        return FieldManagementService()
+
+    @pytest.fixture
+    def mock_location(self):
+        location = MagicMock()
+        location.id = str(uuid4())
+        location.climate_zone = "5a"
+        location.county = "Story"
+        location.state = "IA"
+        return location
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(field_routes.router)
+        return TestClient(app)
+
+    @pytest.mark.asyncio
+    async def test_list_fields_keyset_pagination(self, field_service, mock_location):
+        """Test a full page returns a cursor that continues after its last row."""
+        fields = [_mock_field(i, mock_location) for i in range(3)]
+        mock_db_session = MagicMock()
+        mock_query = mock_db_session.query.return_value
+        mock_query.filter.return_value = mock_query
+        mock_query.count.return_value = 5
+        mock_query.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = fields
+
+        result = await field_service.list_fields(
+            soil_type="loam", irrigation_available=True, page_size=2, db_session=mock_db_session
+        )
+
+        assert [f.field_name for f in result.fields] == ["Field 0", "Field 1"]
+        assert result.has_next is True
+        assert result.filters_applied == {"soil_type": "loam", "irrigation_available": True}
+        assert result.fields[0].agricultural_context["drainage_recommendations"] == ["Most crops suitable", "Monitor soil moisture"]
+        assert result.fields[0].soil_suitability["soil_type"] == "loam"
+
+        value, field_id = _decode_field_cursor(result.next_cursor, "field_name", False)
+        assert (value, field_id) == ("Field 1", fields[1].id)
+
+    @pytest.mark.asyncio
+    async def test_cursor_continues_after_last_row(self, field_service, mock_location):
+        """Test a cursor filters on the sort key and id instead of skipping rows by offset."""
+        mock_db_session = MagicMock()
+        mock_query = mock_db_session.query.return_value
+        mock_query.count.return_value = 5
+        ordered = mock_query.options.return_value.order_by.return_value
+        ordered.filter.return_value.limit.return_value.all.return_value = [_mock_field(2, mock_location)]
+
+        cursor = _encode_field_cursor("Field 1", uuid4(), "field_name", False)
+        result = await field_service.list_fields(page_size=2, db_session=mock_db_session, cursor=cursor)
+
+        assert [f.field_name for f in result.fields] == ["Field 2"]
+        assert result.has_next is False
+        assert result.has_previous is True
+        assert result.next_cursor is None
+        ordered.filter.assert_called_once()
+        ordered.offset.assert_not_called()
+
+    def test_decode_rejects_other_sort_and_garbage(self):
+        """Test cursors for another sort order or that do not decode raise InvalidCursorError."""
+        cursor = _encode_field_cursor("Field 1", uuid4(), "field_name", False)
+
+        with pytest.raises(InvalidCursorError):
+            _decode_field_cursor(cursor, "size_acres", False)
+        with pytest.raises(InvalidCursorError):
+            _decode_field_cursor(cursor, "field_name", True)
+        with pytest.raises(InvalidCursorError):
+            _decode_field_cursor("not-a-cursor", "field_name", False)
+
+    def test_route_maps_invalid_cursor_to_422(self, client):
+        """Test the list route reports a bad cursor as INVALID_CURSOR."""
+        with patch.object(field_routes.field_service, 'list_fields',
+                          new=AsyncMock(side_effect=InvalidCursorError("Invalid cursor: bad"))):
+            response = client.get("/api/v1/fields/", params={"cursor": "bad"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"]["error"]["error_code"] == "INVALID_CURSOR"
+
+    def test_route_keeps_other_value_errors_internal(self, client):
+        """Test unrelated ValueErrors from the service are not reported as cursor errors."""
+        with patch.object(field_routes.field_service, 'list_fields',
+                          new=AsyncMock(side_effect=ValueError("bad decimal in row"))):
+            response = client.get("/api/v1/fields/")
+
+        assert response.status_code == 500
+        assert response.json()["detail"]["error"]["error_code"] == "FIELD_LISTING_ERROR"
@@ -228,17 +228,14 @@ class TestFieldManagementService:
     @pytest.mark.asyncio
     async def test_list_fields_success(self, field_service, mock_db_session, mock_field, mock_location):
         """Test successful field listing."""
-        # Mock fields query
-        mock_query = MagicMock()
+        # Mock fields query; locations arrive eagerly loaded on each field
+        mock_query = mock_db_session.query.return_value
         mock_query.count.return_value = 1
-        mock_query.offset.return_value.limit.return_value.all.return_value = [mock_field]
-        mock_db_session.query.return_value.filter.return_value.order_by.return_value = mock_query
+        mock_query.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_field]
+        mock_field.location = mock_location
         
-        # Mock location query
-        mock_db_session.query.return_value.filter.return_value.first.return_value = mock_location
-        
-        with patch.object(field_service, '_generate_agricultural_context') as mock_context:
-            mock_context.return_value = {"test": "context"}
+        with patch.object(field_service, '_generate_agricultural_contexts') as mock_context:
+            mock_context.return_value = [{"test": "context"}]
             
             with patch.object(field_service, '_assess_soil_suitability') as mock_soil:
                 mock_soil.return_value = {"test": "soil"}
@@ -260,6 +257,10 @@ class TestFieldManagementService:
                         assert result.total_count == 1
                         assert result.page == 1
                         assert result.page_size == 20
+                        assert result.has_next is False
+                        assert result.next_cursor is None
+                        # One query for the page; no per-field location lookups
+                        assert mock_db_session.query.call_count == 1
     
     @pytest.mark.asyncio
     async def test_update_field_success(self, field_service, mock_db_session, mock_field):
@@ -25,6 +25,7 @@ from geocoding_service import (
     AgriculturalEnhancementService, AgriculturalContext,
     BatchGeocodingRequest, BatchGeocodingResponse
 )
+from geocoding_cache import AddressPrefixTrie
 
 
 class TestGeocodingCache:
@@ -86,6 +87,72 @@ class TestGeocodingCache:
         assert await self.cache.get("query_14") is not None
 
 
+class TestPersistentGeocodingCache:
+    """Test persistence, spatial reuse and the autocomplete address index."""
+    
+    @pytest.mark.asyncio
+    async def test_results_survive_restart(self, tmp_path):
+        """Test results and indexed addresses are reloaded from the SQLite file."""
+        path = str(tmp_path / "geocoding.db")
+        result = GeocodingResult(
+            latitude=42.0308, longitude=-93.6319, address="Ames, Iowa",
+            display_name="Ames, Story County, Iowa, USA", confidence=0.9, provider="test"
+        )
+        cache = GeocodingCache(path=path)
+        await cache.set("geocode:Ames, Iowa", result)
+        await cache.set("suggestions:Ames", [AddressSuggestion(display_name="Ames, Iowa", address="Ames, Iowa", relevance=1.0)])
+        await cache.remember_addresses([result])
+        cache.close()
+        
+        reopened = GeocodingCache(path=path)
+        cached = await reopened.get("geocode:Ames, Iowa")
+        assert isinstance(cached, GeocodingResult)
+        assert cached.latitude == 42.0308
+        assert (await reopened.get("suggestions:Ames"))[0].relevance == 1.0
+        assert reopened.address_index.search("story county")[0]["address"] == "Ames, Iowa"
+        assert reopened.get_stats()["disk_hits"] == 2
+        reopened.close()
+    
+    @pytest.mark.asyncio
+    async def test_disk_eviction_keeps_recently_used(self):
+        """Test the SQLite tier evicts by last access, including hits served from memory."""
+        cache = GeocodingCache(max_size=2, max_disk_entries=3)
+        for i in range(3):
+            await cache.set(f"query_{i}", AddressResult(address=f"A{i}", display_name=f"A{i}", confidence=0.5, provider="test"))
+        await cache.get("query_1")  # Memory hit; written down when it is demoted
+        await cache.set("query_3", AddressResult(address="A3", display_name="A3", confidence=0.5, provider="test"))
+        await cache.set("query_4", AddressResult(address="A4", display_name="A4", confidence=0.5, provider="test"))
+        
+        assert await cache.get("query_0") is None
+        assert await cache.get("query_1") is not None
+        assert cache.get_stats()["disk_entries"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_nearby_reverse_geocode_reuses_result(self):
+        """Test a point within the grid radius reuses the closest cached result."""
+        cache = GeocodingCache(reverse_radius_m=50.0)
+        near = AddressResult(address="Farm A", display_name="Farm A", confidence=0.8, provider="test")
+        far = AddressResult(address="Farm B", display_name="Farm B", confidence=0.8, provider="test")
+        await cache.set_nearby("reverse:True", 42.0000, -93.6000, near)
+        await cache.set_nearby("reverse:True", 42.0006, -93.6000, far)  # ~67 m north
+        
+        assert (await cache.get_nearby("reverse:True", 42.0002, -93.6001)).address == "Farm A"
+        assert (await cache.get_nearby("reverse:True", 42.0005, -93.6000)).address == "Farm B"
+        assert await cache.get_nearby("reverse:True", 42.0100, -93.6000) is None
+        assert await cache.get_nearby("reverse:False", 42.0000, -93.6000) is None
+    
+    def test_prefix_trie_ranks_and_matches_components(self):
+        """Test prefix lookups return best-scored entries and match trailing components."""
+        trie = AddressPrefixTrie(top_k=3, max_depth=8)
+        for name, score in [("Ames Municipal Airport", 0.6), ("Ames Public Library", 0.9), ("Amesbury", 0.7)]:
+            trie.add({"display_name": f"{name}, Story County, Iowa", "address": name}, score)
+        
+        assert [e["address"] for e in trie.search("ames")] == ["Ames Public Library", "Amesbury", "Ames Municipal Airport"]
+        assert [e["address"] for e in trie.search("Ames Public L")] == ["Ames Public Library"]
+        assert len(trie.search("story county, io")) == 3
+        assert trie.search("boone") == []
+
+
 class TestNominatimProvider:
     """Test the Nominatim geocoding provider."""
     
@@ -113,7 +180,7 @@ class TestNominatimProvider:
             }
         }]
         
-        with patch('aiohttp.ClientSession.get') as mock_get:
+        with patch('http_transport.TransportSession.get') as mock_get:
             # Mock the HTTP response
             mock_response = AsyncMock()
             mock_response.status = 200
@@ -131,7 +198,7 @@ class TestNominatimProvider:
     @pytest.mark.asyncio
     async def test_geocode_no_results(self):
         """Test geocoding when no results are found."""
-        with patch('aiohttp.ClientSession.get') as mock_get:
+        with patch('http_transport.TransportSession.get') as mock_get:
             # Mock empty response
             mock_response = AsyncMock()
             mock_response.status = 200
@@ -147,7 +214,7 @@ class TestNominatimProvider:
     @pytest.mark.asyncio
     async def test_geocode_api_error(self):
         """Test geocoding when API returns error status."""
-        with patch('aiohttp.ClientSession.get') as mock_get:
+        with patch('http_transport.TransportSession.get') as mock_get:
             # Mock error response
             mock_response = AsyncMock()
             mock_response.status = 500
@@ -174,7 +241,7 @@ class TestNominatimProvider:
             }
         }
         
-        with patch('aiohttp.ClientSession.get') as mock_get:
+        with patch('http_transport.TransportSession.get') as mock_get:
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_response.json = AsyncMock(return_value=mock_response_data)
@@ -212,7 +279,7 @@ class TestNominatimProvider:
             }
         ]
         
-        with patch('aiohttp.ClientSession.get') as mock_get:
+        with patch('http_transport.TransportSession.get') as mock_get:
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_response.json = AsyncMock(return_value=mock_response_data)
@@ -397,6 +464,40 @@ class TestGeocodingService:
             assert suggestions[0].address == "Ames, Iowa"
             assert suggestions[0].relevance == 1.0
     
+    @pytest.mark.asyncio
+    async def test_reverse_geocode_reuses_nearby_result(self):
+        """Test a second point a few meters away is served without calling the provider."""
+        mock_result = AddressResult(
+            address="1234 County Road", display_name="1234 County Road, Story County, Iowa",
+            confidence=0.9, provider="nominatim"
+        )
+        
+        with patch.object(self.service.primary_provider, 'reverse_geocode', return_value=mock_result) as mock_reverse:
+            await self.service.reverse_geocode(42.0308, -93.6319, include_agricultural_context=False)
+            result = await self.service.reverse_geocode(42.03085, -93.63195, include_agricultural_context=False)
+            
+            assert mock_reverse.call_count == 1
+            assert result.address == "1234 County Road"
+    
+    @pytest.mark.asyncio
+    async def test_get_address_suggestions_served_from_index(self):
+        """Test longer prefixes of resolved addresses do not re-query the provider."""
+        mock_suggestions = [
+            AddressSuggestion(display_name=f"Ames {name}, Story County, Iowa", address=f"Ames {name}", relevance=0.9)
+            for name in ("High School", "Hills Drive", "Hilton Coliseum")
+        ]
+        
+        with patch.object(self.service.primary_provider, 'search_suggestions', return_value=mock_suggestions) as mock_search:
+            await self.service.get_address_suggestions("Ames")
+            suggestions = await self.service.get_address_suggestions("Ames Hi")
+            
+            assert mock_search.call_count == 1
+            assert {s.address for s in suggestions} == {"Ames High School", "Ames Hills Drive", "Ames Hilton Coliseum"}
+            
+            # Too few indexed matches falls back to the provider
+            await self.service.get_address_suggestions("Ames Hil")
+            assert mock_search.call_count == 2
+    
     @pytest.mark.asyncio
     async def test_get_address_suggestions_short_query(self):
         """Test address suggestions with short query."""
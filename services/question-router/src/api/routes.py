@@ -11,6 +11,7 @@ from typing import List
 try:
     from ..models.question_models import (
         QuestionRequest, 
+        BatchClassificationRequest,
         QuestionResponse, 
         QuestionType,
         ClassificationResult,
@@ -21,6 +22,7 @@ try:
 except ImportError:
     from models.question_models import (
         QuestionRequest, 
+        BatchClassificationRequest,
         QuestionResponse, 
         QuestionType,
         ClassificationResult,
@@ -99,6 +101,24 @@ async def classify_question_only(request: QuestionRequest):
         )
 
 
+@router.post("/questions/classify-batch", response_model=List[ClassificationResult])
+async def classify_questions_batch(request: BatchClassificationRequest):
+    """
+    Classify several questions in one call.
+    
+    Questions are parsed and vectorized together, and cached or repeated
+    questions are only classified once. Results keep the request order.
+    """
+    try:
+        return await classification_service.classify_questions(request.questions)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error classifying questions: {str(e)}"
+        )
+
+
 @router.post("/questions/route-only", response_model=RoutingDecision)
 async def route_question_type(question_type: QuestionType):
     """
@@ -52,6 +52,25 @@ class QuestionRequest(BaseModel):
         return v.strip()
 
 
+class BatchClassificationRequest(BaseModel):
+    """Request model for classifying several questions at once."""
+    
+    questions: List[str] = Field(..., description="Farmer questions in natural language")
+    
+    @validator('questions')
+    def validate_questions(cls, v):
+        if not v:
+            raise ValueError("At least one question is required")
+        if len(v) > 256:
+            raise ValueError("At most 256 questions can be classified per request")
+        for question in v:
+            if len(question.strip()) < 10:
+                raise ValueError("Question must be at least 10 characters long")
+            if len(question) > 1000:
+                raise ValueError("Question must be less than 1000 characters")
+        return [question.strip() for question in v]
+
+
 class ClassificationResult(BaseModel):
     """Result of question classification."""
     
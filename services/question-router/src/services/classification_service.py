@@ -6,8 +6,9 @@ Classifies farmer questions into the 20 key question types using advanced NLP wi
 
 import re
 import logging
+import threading
 from typing import List, Dict, Tuple, Optional
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 import numpy as np
 
 # NLP imports
@@ -32,7 +33,6 @@ except ImportError:
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
@@ -44,23 +44,77 @@ except ImportError:
     from models.question_models import QuestionType, ClassificationResult
 
 
+def normalize_question_text(question_text: str) -> str:
+    """Normalize a question for cache lookups (case, whitespace, trailing punctuation)."""
+    return re.sub(r'\s+', ' ', question_text.lower()).strip().rstrip('?!. ')
+
+
+class ClassificationCache:
+    """LRU cache of classification results keyed by normalized question text."""
+    
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ClassificationResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[ClassificationResult]:
+        """Return a copy of the cached result, refreshing its LRU position."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return result.model_copy(deep=True)
+    
+    def put(self, key: str, result: ClassificationResult):
+        """Store a result, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = result.model_copy(deep=True)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Cache size and hit rate."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
 class QuestionClassificationService:
     """Service for classifying farmer questions using advanced NLP techniques."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 4096):
         """Initialize the classification service with NLP models and patterns."""
         self.logger = logging.getLogger(__name__)
         
+        # spaCy model and matcher are loaded on first use so router workers start fast
+        self._nlp = None
+        self._matcher = None
+        self._spacy_loaded = False
+        self._spacy_lock = threading.Lock()
+        self._intent_example_docs = None
+        
         # Initialize NLP components
-        self.nlp = self._load_spacy_model()
-        self.matcher = None
         self.lemmatizer = None
         self.stop_words = set()
         self.tfidf_vectorizer = None
+        self.classification_cache = ClassificationCache(max_entries=cache_size)
         
         # Initialize NLP tools
         self._initialize_nltk()
-        self._initialize_spacy_matcher()
         
         # Build classification patterns and training data
         self.question_patterns = self._build_question_patterns()
@@ -70,6 +124,27 @@ class QuestionClassificationService:
         # Initialize TF-IDF for semantic similarity
         self._initialize_tfidf_classifier()
     
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access."""
+        self._ensure_spacy_loaded()
+        return self._nlp
+    
+    @property
+    def matcher(self):
+        """spaCy pattern matcher, built on first access."""
+        self._ensure_spacy_loaded()
+        return self._matcher
+    
+    def _ensure_spacy_loaded(self):
+        if self._spacy_loaded:
+            return
+        with self._spacy_lock:
+            if not self._spacy_loaded:
+                self._nlp = self._load_spacy_model()
+                self._initialize_spacy_matcher()
+                self._spacy_loaded = True
+    
     def _load_spacy_model(self):
         """Load spaCy model with fallback options."""
         if not SPACY_AVAILABLE:
@@ -115,10 +190,10 @@ class QuestionClassificationService:
     
     def _initialize_spacy_matcher(self):
         """Initialize spaCy pattern matcher."""
-        if not self.nlp:
+        if not self._nlp:
             return
             
-        self.matcher = Matcher(self.nlp.vocab)
+        self._matcher = Matcher(self._nlp.vocab)
         
         # Define patterns for each question type
         patterns = {
@@ -147,7 +222,7 @@ class QuestionClassificationService:
         # Add patterns to matcher
         for intent, pattern_list in patterns.items():
             for i, pattern in enumerate(pattern_list):
-                self.matcher.add(f"{intent}_{i}", [pattern])
+                self._matcher.add(f"{intent}_{i}", [pattern])
         
         self.logger.info("spaCy matcher initialized with agricultural patterns")
     
@@ -178,6 +253,14 @@ class QuestionClassificationService:
             if training_texts:
                 self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(training_texts)
                 self.training_labels = training_labels
+                
+                # One-hot example -> question type matrix for aggregating similarities
+                self.tfidf_types = list(dict.fromkeys(training_labels))
+                type_index = {qtype: i for i, qtype in enumerate(self.tfidf_types)}
+                self.tfidf_label_matrix = np.zeros((len(training_labels), len(self.tfidf_types)))
+                self.tfidf_label_matrix[
+                    np.arange(len(training_labels)), [type_index[label] for label in training_labels]
+                ] = 1.0
                 self.logger.info("TF-IDF classifier initialized successfully")
             
         except Exception as e:
@@ -411,73 +494,160 @@ class QuestionClassificationService:
         3. Enhanced keyword matching
         4. NLTK-based linguistic analysis
         
+        Results are cached by normalized question text, so repeated questions
+        skip the NLP pipeline entirely.
+        
         Args:
             question_text: The farmer's question in natural language
             
         Returns:
             ClassificationResult with the classified type and confidence
         """
+        cache_key = normalize_question_text(question_text)
+        cached = self.classification_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Preprocess the question
             processed_text = self._preprocess_text(question_text)
             
-            # Get scores from different classification methods
+            # Get scores from the model-backed classification methods
             spacy_scores = self._classify_with_spacy(question_text)
             tfidf_scores = self._classify_with_tfidf(processed_text)
-            keyword_scores = self._classify_with_keywords(question_text.lower())
-            linguistic_scores = self._classify_with_linguistics(question_text)
-            
-            # Combine scores with weights
-            combined_scores = self._combine_classification_scores(
-                spacy_scores, tfidf_scores, keyword_scores, linguistic_scores
-            )
             
-            if not combined_scores:
-                # Default to crop selection if no clear match
-                return ClassificationResult(
-                    question_type=QuestionType.CROP_SELECTION,
-                    confidence_score=0.3,
-                    alternative_types=[],
-                    reasoning="No clear matches found using any classification method, defaulting to crop selection"
-                )
-            
-            # Sort by combined score and get top matches
-            sorted_scores = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
-            top_type, top_score = sorted_scores[0]
-            
-            # Calculate confidence score (normalized)
-            confidence = min(top_score, 1.0)
-            
-            # Get alternative types
-            alternatives = [qtype for qtype, score in sorted_scores[1:3] 
-                          if score > 0.4 * top_score and score > 0.2]
-            
-            # Generate reasoning
-            reasoning = self._generate_classification_reasoning(
-                top_type, spacy_scores, tfidf_scores, keyword_scores, linguistic_scores
-            )
-            
-            return ClassificationResult(
-                question_type=top_type,
-                confidence_score=confidence,
-                alternative_types=alternatives,
-                reasoning=reasoning
-            )
+            result = self._build_classification_result(question_text, spacy_scores, tfidf_scores)
             
         except Exception as e:
             self.logger.error(f"Error in question classification: {e}")
             # Fallback to basic keyword matching
             return await self._fallback_classification(question_text)
+        
+        self.classification_cache.put(cache_key, result)
+        return result
+    
+    async def classify_questions(self, question_texts: List[str]) -> List[ClassificationResult]:
+        """
+        Classify many questions at once.
+        
+        Cached and duplicate questions are classified once; the rest are parsed
+        with a single spaCy `nlp.pipe` pass and vectorized with one TF-IDF
+        `transform` call.
+        
+        Args:
+            question_texts: Farmer questions in natural language
+            
+        Returns:
+            ClassificationResults in the same order as the questions
+        """
+        keys = [normalize_question_text(text) for text in question_texts]
+        results: Dict[str, ClassificationResult] = {}
+        pending: Dict[str, str] = {}
+        
+        for key, text in zip(keys, question_texts):
+            if key in results or key in pending:
+                continue
+            cached = self.classification_cache.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = text
+        
+        if pending:
+            texts = list(pending.values())
+            processed_texts = [self._preprocess_text(text) for text in texts]
+            docs = self._parse_batch(texts)
+            tfidf_batch = self._classify_with_tfidf_batch(processed_texts)
+            
+            for key, text, doc, tfidf_scores in zip(pending, texts, docs, tfidf_batch):
+                try:
+                    spacy_scores = self._classify_with_spacy(text, doc=doc)
+                    result = self._build_classification_result(text, spacy_scores, tfidf_scores)
+                except Exception as e:
+                    self.logger.error(f"Error in batch question classification: {e}")
+                    results[key] = await self._fallback_classification(text)
+                    continue
+                self.classification_cache.put(key, result)
+                results[key] = result
+        
+        return [results[key].model_copy(deep=True) for key in keys]
+    
+    def _build_classification_result(self, question_text: str,
+                                     spacy_scores: Dict[QuestionType, float],
+                                     tfidf_scores: Dict[QuestionType, float]) -> ClassificationResult:
+        """Combine model scores with keyword and linguistic scores into a result."""
+        keyword_scores = self._classify_with_keywords(question_text.lower())
+        linguistic_scores = self._classify_with_linguistics(question_text)
+        
+        # Combine scores with weights
+        combined_scores = self._combine_classification_scores(
+            spacy_scores, tfidf_scores, keyword_scores, linguistic_scores
+        )
+        
+        if not combined_scores:
+            # Default to crop selection if no clear match
+            return ClassificationResult(
+                question_type=QuestionType.CROP_SELECTION,
+                confidence_score=0.3,
+                alternative_types=[],
+                reasoning="No clear matches found using any classification method, defaulting to crop selection"
+            )
+        
+        # Sort by combined score and get top matches
+        sorted_scores = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
+        top_type, top_score = sorted_scores[0]
+        
+        # Calculate confidence score (normalized)
+        confidence = min(top_score, 1.0)
+        
+        # Get alternative types
+        alternatives = [qtype for qtype, score in sorted_scores[1:3] 
+                      if score > 0.4 * top_score and score > 0.2]
+        
+        # Generate reasoning
+        reasoning = self._generate_classification_reasoning(
+            top_type, spacy_scores, tfidf_scores, keyword_scores, linguistic_scores
+        )
+        
+        return ClassificationResult(
+            question_type=top_type,
+            confidence_score=confidence,
+            alternative_types=alternatives,
+            reasoning=reasoning
+        )
     
-    def _classify_with_spacy(self, question_text: str) -> Dict[QuestionType, float]:
-        """Classify using spaCy pattern matching."""
+    def _parse_batch(self, texts: List[str]) -> List[Optional[object]]:
+        """Parse texts with one spaCy pipe pass (None per text if spaCy is unavailable)."""
+        if not self.nlp or not self.matcher:
+            return [None] * len(texts)
+        try:
+            return list(self.nlp.pipe(texts))
+        except Exception as e:
+            self.logger.warning(f"Error in spaCy batch parsing: {e}")
+            return [None] * len(texts)
+    
+    def _get_intent_example_docs(self) -> Dict[QuestionType, List[object]]:
+        """Parsed intent examples used for vector similarity, parsed once."""
+        if self._intent_example_docs is None:
+            example_docs = {}
+            for question_type, examples in self.intent_examples.items():
+                example_docs[question_type] = [
+                    example_doc for example_doc in self.nlp.pipe(examples[:3])  # Check top 3 examples
+                    if hasattr(example_doc, 'vector') and example_doc.vector.any()
+                ]
+            self._intent_example_docs = example_docs
+        return self._intent_example_docs
+    
+    def _classify_with_spacy(self, question_text: str, doc=None) -> Dict[QuestionType, float]:
+        """Classify using spaCy pattern matching, reusing an already parsed doc if given."""
         scores = defaultdict(float)
         
         if not self.nlp or not self.matcher:
             return scores
         
         try:
-            doc = self.nlp(question_text)
+            if doc is None:
+                doc = self.nlp(question_text)
             matches = self.matcher(doc)
             
             for match_id, start, end in matches:
@@ -492,13 +662,11 @@ class QuestionClassificationService:
             
             # Also use spaCy's similarity if available
             if hasattr(doc, 'vector') and doc.vector.any():
-                for question_type, examples in self.intent_examples.items():
+                for question_type, example_docs in self._get_intent_example_docs().items():
                     max_similarity = 0.0
-                    for example in examples[:3]:  # Check top 3 examples
-                        example_doc = self.nlp(example)
-                        if hasattr(example_doc, 'vector') and example_doc.vector.any():
-                            similarity = doc.similarity(example_doc)
-                            max_similarity = max(max_similarity, similarity)
+                    for example_doc in example_docs:
+                        similarity = doc.similarity(example_doc)
+                        max_similarity = max(max_similarity, similarity)
                     
                     if max_similarity > 0.5:  # Threshold for similarity
                         scores[question_type] += max_similarity * 0.6
@@ -510,33 +678,36 @@ class QuestionClassificationService:
     
     def _classify_with_tfidf(self, processed_text: str) -> Dict[QuestionType, float]:
         """Classify using TF-IDF semantic similarity."""
-        scores = defaultdict(float)
-        
+        return self._classify_with_tfidf_batch([processed_text])[0]
+    
+    def _classify_with_tfidf_batch(self, processed_texts: List[str]) -> List[Dict[QuestionType, float]]:
+        """Classify many preprocessed questions with one TF-IDF transform and sparse product."""
         if not self.tfidf_vectorizer or not hasattr(self, 'tfidf_matrix'):
-            return scores
+            return [{} for _ in processed_texts]
         
         try:
-            # Transform the question text
-            question_vector = self.tfidf_vectorizer.transform([processed_text])
+            # Transform the question texts
+            question_vectors = self.tfidf_vectorizer.transform(processed_texts)
             
-            # Calculate cosine similarity with training examples
-            similarities = cosine_similarity(question_vector, self.tfidf_matrix).flatten()
+            # Rows are L2-normalized, so the product is cosine similarity with every example
+            similarities = (question_vectors @ self.tfidf_matrix.T).toarray()
             
-            # Aggregate scores by question type
-            type_scores = defaultdict(list)
-            for i, similarity in enumerate(similarities):
-                if similarity > 0.1:  # Threshold for relevance
-                    question_type = self.training_labels[i]
-                    type_scores[question_type].append(similarity)
+            # Average the relevant similarities of each question type
+            relevant = similarities > 0.1  # Threshold for relevance
+            type_sums = np.where(relevant, similarities, 0.0) @ self.tfidf_label_matrix
+            type_counts = relevant.astype(float) @ self.tfidf_label_matrix
             
-            # Calculate average similarity for each type
-            for question_type, sim_list in type_scores.items():
-                scores[question_type] = np.mean(sim_list) * 0.7  # Weight for TF-IDF
+            results = []
+            for sums, counts in zip(type_sums, type_counts):
+                results.append({
+                    self.tfidf_types[j]: float(sums[j] / counts[j]) * 0.7  # Weight for TF-IDF
+                    for j in np.flatnonzero(counts)
+                })
+            return results
             
         except Exception as e:
             self.logger.warning(f"Error in TF-IDF classification: {e}")
-        
-        return dict(scores)
+            return [{} for _ in processed_texts]
     
     def _classify_with_keywords(self, question_text: str) -> Dict[QuestionType, float]:
         """Enhanced keyword-based classification."""
@@ -612,6 +783,7 @@ class QuestionClassificationService:
     def _calculate_enhanced_keyword_score(self, question_text: str, keywords: List[str]) -> float:
         """Enhanced keyword scoring with phrase matching and stemming."""
         score = 0.0
+        lemmatized_question = None
         
         for keyword in keywords:
             # Exact phrase match (highest score)
@@ -632,10 +804,11 @@ class QuestionClassificationService:
                         lemmatized_keyword = ' '.join([
                             self.lemmatizer.lemmatize(word) for word in keyword_words
                         ])
-                        question_tokens = word_tokenize(question_text)
-                        lemmatized_question = ' '.join([
-                            self.lemmatizer.lemmatize(token) for token in question_tokens
-                        ])
+                        if lemmatized_question is None:
+                            question_tokens = word_tokenize(question_text)
+                            lemmatized_question = ' '.join([
+                                self.lemmatizer.lemmatize(token) for token in question_tokens
+                            ])
                         
                         if lemmatized_keyword in lemmatized_question:
                             score += 0.4
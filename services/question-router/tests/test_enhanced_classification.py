@@ -13,7 +13,7 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from services.classification_service import QuestionClassificationService
+from services.classification_service import QuestionClassificationService, normalize_question_text
 from models.question_models import QuestionType, ClassificationResult
 
 
@@ -267,6 +267,74 @@ class TestEnhancedClassificationService:
                    expected_type in result.alternative_types), \
                    f"Failed to classify '{question}' as {expected_type}, got {result.question_type}"
 
+    
+    @pytest.mark.asyncio
+    async def test_classification_cache(self, classification_service):
+        """Test near-identical questions are served from the normalized-text cache."""
+        assert normalize_question_text("  When to plant CORN?? ") == "when to plant corn"
+        
+        first = await classification_service.classify_question("When should I apply fertilizer?")
+        with patch.object(classification_service, '_preprocess_text', side_effect=AssertionError("cache miss")):
+            second = await classification_service.classify_question("when should I apply   fertilizer")
+        
+        assert second == first
+        assert second is not first
+        assert classification_service.classification_cache.get_stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_classification(self, classification_service):
+        """Test batch classification agrees with one-at-a-time classification and keeps order."""
+        questions = [
+            "What crop varieties should I plant?",
+            "How can I improve soil fertility?",
+            "When should I apply fertilizer?",
+            "what crop varieties should i plant",
+            "Should I use cover crops?"
+        ]
+        
+        batch = await classification_service.classify_questions(questions)
+        
+        single_service = QuestionClassificationService()
+        for question, result in zip(questions, batch):
+            single = await single_service.classify_question(question)
+            assert result.question_type == single.question_type
+            assert result.confidence_score == pytest.approx(single.confidence_score)
+        assert batch[3] == batch[0]
+    
+    def test_tfidf_batch_matches_cosine_similarity(self, classification_service):
+        """Test the sparse-product TF-IDF scores match per-example cosine averaging."""
+        if not classification_service.tfidf_vectorizer:
+            pytest.skip("scikit-learn not available")
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        texts = [classification_service._preprocess_text(q) for q in [
+            "Which corn variety should I plant this year?",
+            "How much lime should I apply?",
+            "zzz"
+        ]]
+        batch = classification_service._classify_with_tfidf_batch(texts)
+        
+        for text, scores in zip(texts, batch):
+            similarities = cosine_similarity(
+                classification_service.tfidf_vectorizer.transform([text]),
+                classification_service.tfidf_matrix
+            ).flatten()
+            expected = {}
+            for label, similarity in zip(classification_service.training_labels, similarities):
+                if similarity > 0.1:
+                    expected.setdefault(label, []).append(similarity)
+            assert scores.keys() == expected.keys()
+            for qtype, sims in expected.items():
+                assert scores[qtype] == pytest.approx(sum(sims) / len(sims) * 0.7)
+    
+    def test_spacy_loaded_lazily(self):
+        """Test the spaCy model is not loaded until first needed."""
+        service = QuestionClassificationService()
+        assert service._spacy_loaded is False
+        
+        service.nlp
+        assert service._spacy_loaded is True
+
 
 @pytest.mark.integration
 class TestClassificationIntegration:
@@ -17,6 +17,164 @@ from ..models.rotation_models import (
 )
 
 
+# Benefit categories scored for every rotation, in scoring order
+BENEFIT_TYPES = (
+    'nitrogen_fixation',
+    'soil_organic_matter',
+    'erosion_control',
+    'pest_management',
+    'weed_suppression',
+    'economic_value'
+)
+PEST_MANAGEMENT_INDEX = BENEFIT_TYPES.index('pest_management')
+
+# Goal satisfaction as a weighted sum of normalized benefit scores
+GOAL_BENEFIT_WEIGHTS = {
+    RotationGoalType.SOIL_HEALTH: {
+        'soil_organic_matter': 0.4, 'erosion_control': 0.3, 'nitrogen_fixation': 0.3
+    },
+    RotationGoalType.PROFIT_MAXIMIZATION: {'economic_value': 1.0},
+    RotationGoalType.PEST_MANAGEMENT: {'pest_management': 0.6, 'weed_suppression': 0.4},
+    RotationGoalType.SUSTAINABILITY: {
+        'nitrogen_fixation': 0.3, 'soil_organic_matter': 0.3,
+        'erosion_control': 0.2, 'pest_management': 0.2
+    }
+}
+
+# Horizons up to this length are solved exactly instead of heuristically
+EXACT_HORIZON_LIMIT = 6
+
+
+@dataclass
+class RotationTables:
+    """Precomputed crop-to-crop transitions and scoring tables for one optimization context."""
+    crops: List[str]
+    index: Dict[str, int]
+    first_scores: List[Tuple[float, ...]]  # Benefit contributions at position 0 (pest excluded)
+    later_scores: List[Tuple[float, ...]]  # Benefit contributions at later positions (pest excluded)
+    pest_base: List[float]
+    allowed_transitions: List[List[bool]]  # [previous][next], False if next is in avoid_next
+    preferred_transitions: List[List[bool]]  # [previous][next], True if next is in good_next
+    goal_weights: Optional[Tuple[float, ...]]  # Per-benefit weights, None when goals are neutral
+    position_rules: List[Tuple[str, int]]  # ('required'|'excluded', crop) in constraint order
+    required_penalties: List[Tuple[Optional[int], float, bool]]  # crop (None if unplantable), penalty, hard
+    excluded_penalties: List[Tuple[int, float, bool]]
+    consecutive_limits: List[Tuple[int, int]]
+
+    def valid_crops(self, previous: Optional[int], position: int, present: List[int], horizon: int) -> List[int]:
+        """Crops allowed at a position, mirroring the sequential generation rules."""
+        valid = list(range(len(self.crops)))
+        for kind, crop in self.position_rules:
+            if kind == 'required':
+                if position == horizon - 1 and crop not in present:
+                    valid = [crop] if crop in valid else valid
+            elif crop in valid:
+                valid.remove(crop)
+        
+        if previous is not None:
+            allowed = self.allowed_transitions[previous]
+            valid = [crop for crop in valid if allowed[crop]]
+        
+        return valid if valid else list(range(len(self.crops)))
+
+    def score(self, indices: List[int], totals: List[float], counts: List[int]) -> float:
+        """Fitness from accumulated non-pest benefit totals and crop counts."""
+        length = len(indices)
+        
+        # Pest management depends on the number of distinct crops seen so far
+        seen = set()
+        pest_total = 0.0
+        for crop in indices:
+            seen.add(crop)
+            pest_total += self.pest_base[crop] * (1 + 0.1 * len(seen))
+        
+        if self.goal_weights is None:
+            goal_satisfaction = 50.0
+        else:
+            goal_satisfaction = 0.0
+            for benefit, weight in enumerate(self.goal_weights):
+                if weight:
+                    total = pest_total if benefit == PEST_MANAGEMENT_INDEX else totals[benefit]
+                    goal_satisfaction += weight * min(100, total / length * 10)
+        
+        diversity_bonus = len(seen) / length * 100
+        penalties = self.constraint_penalty(indices, counts)
+        
+        return max(0, goal_satisfaction * 0.6 + diversity_bonus * 0.2 + (100 - penalties) * 0.2)
+
+    def constraint_penalty(self, indices: List[int], counts: List[int]) -> float:
+        """Constraint penalty from crop counts and consecutive runs."""
+        total_penalty = 0
+        for crop, penalty, _ in self.required_penalties:
+            if crop is None or counts[crop] == 0:
+                total_penalty += penalty
+        for crop, penalty, _ in self.excluded_penalties:
+            if counts[crop] > 0:
+                total_penalty += penalty
+        for crop, max_consecutive in self.consecutive_limits:
+            consecutive_count = 0
+            max_found = 0
+            for planted in indices:
+                consecutive_count = consecutive_count + 1 if planted == crop else 0
+                max_found = max(max_found, consecutive_count)
+            if max_found > max_consecutive:
+                total_penalty += (max_found - max_consecutive) * 15
+        return min(100, total_penalty)
+
+
+class RotationFitnessState:
+    """Rotation with incrementally maintained fitness components for single-position moves."""
+
+    def __init__(self, tables: RotationTables, indices: List[int]):
+        self.tables = tables
+        self.indices = list(indices)
+        self.counts = [0] * len(tables.crops)
+        self.totals = [0.0] * len(BENEFIT_TYPES)
+        for position, crop in enumerate(self.indices):
+            self.counts[crop] += 1
+            self._add_scores(self.totals, position, crop, 1)
+        self.fitness = tables.score(self.indices, self.totals, self.counts)
+
+    def _add_scores(self, totals: List[float], position: int, crop: int, sign: int):
+        scores = self.tables.first_scores[crop] if position == 0 else self.tables.later_scores[crop]
+        for benefit, value in enumerate(scores):
+            totals[benefit] += sign * value
+
+    def _changed(self, position: int, crop: int) -> Tuple[List[int], List[float], List[int]]:
+        old_crop = self.indices[position]
+        indices = self.indices.copy()
+        indices[position] = crop
+        totals = self.totals.copy()
+        self._add_scores(totals, position, old_crop, -1)
+        self._add_scores(totals, position, crop, 1)
+        counts = self.counts.copy()
+        counts[old_crop] -= 1
+        counts[crop] += 1
+        return indices, totals, counts
+
+    def fitness_with(self, position: int, crop: int) -> float:
+        """Fitness if one position were replaced, without applying the move."""
+        if self.indices[position] == crop:
+            return self.fitness
+        return self.tables.score(*self._changed(position, crop))
+
+    def apply(self, position: int, crop: int, fitness: Optional[float] = None):
+        """Replace one position, reusing an already computed fitness if given."""
+        if self.indices[position] == crop:
+            return
+        self.indices, self.totals, self.counts = self._changed(position, crop)
+        self.fitness = fitness if fitness is not None else self.tables.score(self.indices, self.totals, self.counts)
+
+    def copy(self) -> 'RotationFitnessState':
+        clone = RotationFitnessState.__new__(RotationFitnessState)
+        clone.tables = self.tables
+        clone.indices = self.indices.copy()
+        clone.totals = self.totals.copy()
+        clone.counts = self.counts.copy()
+        clone.fitness = self.fitness
+        return clone
+
+
 @dataclass
 class OptimizationContext:
     """Context for rotation optimization algorithms."""
@@ -29,6 +187,7 @@ class OptimizationContext:
     crop_benefits_database: Dict[str, Dict[str, float]]
     market_data: Dict[str, Dict[str, float]]
     climate_data: Dict[str, Any]
+    tables: Optional[RotationTables] = None
 
 
 class RotationOptimizationEngine:
@@ -39,6 +198,9 @@ class RotationOptimizationEngine:
         self.crop_benefits_database = self._initialize_crop_benefits()
         self.optimization_parameters = self._initialize_optimization_parameters()
         
+        # Crop-to-crop transition and benefit tables, keyed by available crop list
+        self._transition_cache: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        
     def _initialize_crop_compatibility(self) -> Dict[str, Dict[str, Any]]:
         """Initialize crop compatibility matrix."""
         return {
@@ -179,17 +341,22 @@ class RotationOptimizationEngine:
             field_profile, goals, constraints, planning_horizon
         )
         
-        # Run multiple optimization algorithms
-        ga_rotation = await self._genetic_algorithm_optimization(context)
-        sa_rotation = await self._simulated_annealing_optimization(context)
-        
-        # Evaluate both rotations
-        ga_fitness = await self.evaluate_rotation_fitness(ga_rotation, context)
-        sa_fitness = await self.evaluate_rotation_fitness(sa_rotation, context)
-        
-        # Select best rotation
-        best_rotation = ga_rotation if ga_fitness >= sa_fitness else sa_rotation
-        best_fitness = max(ga_fitness, sa_fitness)
+        if planning_horizon <= EXACT_HORIZON_LIMIT:
+            # Short horizons are small enough to solve exactly
+            best_rotation = await self._exact_rotation_optimization(context)
+            best_fitness = await self.evaluate_rotation_fitness(best_rotation, context)
+        else:
+            # Run multiple optimization algorithms
+            ga_rotation = await self._genetic_algorithm_optimization(context)
+            sa_rotation = await self._simulated_annealing_optimization(context)
+            
+            # Evaluate both rotations
+            ga_fitness = await self.evaluate_rotation_fitness(ga_rotation, context)
+            sa_fitness = await self.evaluate_rotation_fitness(sa_rotation, context)
+            
+            # Select best rotation
+            best_rotation = ga_rotation if ga_fitness >= sa_fitness else sa_rotation
+            best_fitness = max(ga_fitness, sa_fitness)
         
         # Create detailed rotation plan
         rotation_plan = await self._create_detailed_rotation_plan(
@@ -262,23 +429,215 @@ class RotationOptimizationEngine:
             'climate_zone': getattr(field_profile, 'climate_zone', '5a')
         }
     
+    def _get_rotation_tables(self, context: OptimizationContext) -> RotationTables:
+        """Get (building on first use) the precomputed tables for a context."""
+        if context.tables is None:
+            context.tables = self._build_rotation_tables(context)
+        return context.tables
+    
+    def _get_transition_tables(self, crops: List[str]) -> Dict[str, Any]:
+        """Crop-to-crop transition matrices and per-crop benefit rows for a crop list."""
+        key = tuple(crops)
+        cached = self._transition_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        allowed_transitions = []
+        preferred_transitions = []
+        for previous in crops:
+            compatibility = self.crop_compatibility_matrix.get(previous, {})
+            avoid_next = compatibility.get('avoid_next', [])
+            good_next = compatibility.get('good_next', [])
+            allowed_transitions.append([crop not in avoid_next for crop in crops])
+            preferred_transitions.append([crop in good_next for crop in crops])
+        
+        first_scores = []
+        later_scores = []
+        pest_base = []
+        for crop in crops:
+            crop_benefits = self.crop_benefits_database.get(crop, {})
+            first = [crop_benefits.get(benefit_type, 0) for benefit_type in BENEFIT_TYPES]
+            later = list(first)
+            # Nitrogen fixation benefits following crops
+            later[BENEFIT_TYPES.index('nitrogen_fixation')] *= 1.2
+            pest_base.append(first[PEST_MANAGEMENT_INDEX])
+            first[PEST_MANAGEMENT_INDEX] = 0
+            later[PEST_MANAGEMENT_INDEX] = 0
+            first_scores.append(tuple(first))
+            later_scores.append(tuple(later))
+        
+        cached = {
+            'allowed_transitions': allowed_transitions,
+            'preferred_transitions': preferred_transitions,
+            'first_scores': first_scores,
+            'later_scores': later_scores,
+            'pest_base': pest_base
+        }
+        self._transition_cache[key] = cached
+        return cached
+    
+    def _build_rotation_tables(self, context: OptimizationContext) -> RotationTables:
+        """Compile goals, constraints and crop transitions into lookup tables."""
+        crops = list(context.available_crops)
+        index = {crop: i for i, crop in enumerate(crops)}
+        transitions = self._get_transition_tables(crops)
+        
+        goal_weights = None
+        total_weight = sum(goal.weight for goal in context.goals)
+        if context.goals and total_weight > 0:
+            weights = [0.0] * len(BENEFIT_TYPES)
+            for goal in context.goals:
+                for benefit_type, coefficient in GOAL_BENEFIT_WEIGHTS.get(goal.goal_type, {}).items():
+                    weights[BENEFIT_TYPES.index(benefit_type)] += coefficient * goal.weight / total_weight
+            goal_weights = tuple(weights)
+        
+        max_consecutive_type = getattr(ConstraintType, 'MAX_CONSECUTIVE', None)
+        position_rules = []
+        required_penalties = []
+        excluded_penalties = []
+        consecutive_limits = []
+        for constraint in context.constraints:
+            crop_name = constraint.parameters.get('crop_name')
+            if not crop_name:
+                continue
+            crop = index.get(crop_name)
+            
+            if constraint.constraint_type == ConstraintType.REQUIRED_CROP:
+                if crop is not None:
+                    position_rules.append(('required', crop))
+                required_penalties.append(
+                    (crop, 50 if constraint.is_hard_constraint else 20, constraint.is_hard_constraint)
+                )
+            elif constraint.constraint_type == ConstraintType.EXCLUDED_CROP:
+                if crop is not None:
+                    position_rules.append(('excluded', crop))
+                    excluded_penalties.append(
+                        (crop, 30 if constraint.is_hard_constraint else 10, constraint.is_hard_constraint)
+                    )
+            elif max_consecutive_type is not None and constraint.constraint_type == max_consecutive_type:
+                if crop is not None:
+                    consecutive_limits.append((crop, constraint.parameters.get('max_consecutive', 1)))
+        
+        return RotationTables(
+            crops=crops,
+            index=index,
+            first_scores=transitions['first_scores'],
+            later_scores=transitions['later_scores'],
+            pest_base=transitions['pest_base'],
+            allowed_transitions=transitions['allowed_transitions'],
+            preferred_transitions=transitions['preferred_transitions'],
+            goal_weights=goal_weights,
+            position_rules=position_rules,
+            required_penalties=required_penalties,
+            excluded_penalties=excluded_penalties,
+            consecutive_limits=consecutive_limits
+        )
+    
+    async def _exact_rotation_optimization(self, context: OptimizationContext) -> List[str]:
+        """
+        Find the proven best rotation for short horizons by branch and bound.
+        
+        Capped benefit scores make fitness non-separable by year, so rotations
+        are enumerated depth-first with benefit totals shared along each prefix
+        and branches pruned by an optimistic bound. Rotations follow the
+        avoid_next transition table; hard exclusions are never planted and hard
+        required crops must appear whenever they can be planted.
+        """
+        tables = self._get_rotation_tables(context)
+        horizon = context.planning_horizon
+        n_crops = len(tables.crops)
+        
+        hard_excluded = {crop for crop, _, is_hard in tables.excluded_penalties if is_hard}
+        candidates = [crop for crop in range(n_crops) if crop not in hard_excluded] or list(range(n_crops))
+        hard_required = [
+            crop for crop, _, is_hard in tables.required_penalties
+            if is_hard and crop is not None and crop in candidates
+        ]
+        successors = []
+        for previous in range(n_crops):
+            allowed = [crop for crop in candidates if tables.allowed_transitions[previous][crop]]
+            successors.append(allowed or candidates)
+        
+        # Optimistic per-year gains for the bound
+        max_later = [max(tables.later_scores[crop][b] for crop in candidates) for b in range(len(BENEFIT_TYPES))]
+        max_pest = max(tables.pest_base[crop] for crop in candidates)
+        
+        def upper_bound(totals: List[float], pest_total: float, unique: int, remaining: int) -> float:
+            max_unique = min(len(candidates), unique + remaining)
+            if tables.goal_weights is None:
+                goal_satisfaction = 50.0
+            else:
+                goal_satisfaction = 0.0
+                for benefit, weight in enumerate(tables.goal_weights):
+                    if weight:
+                        if benefit == PEST_MANAGEMENT_INDEX:
+                            total = pest_total + remaining * max_pest * (1 + 0.1 * max_unique)
+                        else:
+                            total = totals[benefit] + remaining * max_later[benefit]
+                        goal_satisfaction += weight * min(100, total / horizon * 10)
+            return goal_satisfaction * 0.6 + max_unique / horizon * 100 * 0.2 + 100 * 0.2
+        
+        best = {'fitness': -1.0, 'rotation': None, 'feasible': False}
+        indices: List[int] = []
+        counts = [0] * n_crops
+        
+        def search(totals: List[float], pest_total: float, unique: int):
+            position = len(indices)
+            if position == horizon:
+                feasible = all(counts[crop] > 0 for crop in hard_required)
+                if best['feasible'] and not feasible:
+                    return
+                fitness = tables.score(indices, totals, counts)
+                if fitness > best['fitness'] or (feasible and not best['feasible']):
+                    best.update(fitness=fitness, rotation=list(indices), feasible=feasible)
+                return
+            
+            if best['feasible'] and upper_bound(totals, pest_total, unique, horizon - position) <= best['fitness']:
+                return
+            
+            options = candidates if position == 0 else successors[indices[-1]]
+            for crop in options:
+                scores = tables.first_scores[crop] if position == 0 else tables.later_scores[crop]
+                next_unique = unique + (1 if counts[crop] == 0 else 0)
+                indices.append(crop)
+                counts[crop] += 1
+                search(
+                    [total + score for total, score in zip(totals, scores)],
+                    pest_total + tables.pest_base[crop] * (1 + 0.1 * next_unique),
+                    next_unique
+                )
+                counts[crop] -= 1
+                indices.pop()
+        
+        search([0.0] * len(BENEFIT_TYPES), 0.0, 0)
+        return [tables.crops[crop] for crop in best['rotation']]
+    
     async def _genetic_algorithm_optimization(self, context: OptimizationContext) -> List[str]:
         """Optimize rotation using genetic algorithm."""
         params = self.optimization_parameters['genetic_algorithm']
+        tables = self._get_rotation_tables(context)
+        
+        # Rotations recur heavily across generations, so score each one once
+        fitness_cache: Dict[Tuple[int, ...], float] = {}
+        
+        def fitness_of(rotation: List[int]) -> float:
+            key = tuple(rotation)
+            fitness = fitness_cache.get(key)
+            if fitness is None:
+                fitness = RotationFitnessState(tables, rotation).fitness
+                fitness_cache[key] = fitness
+            return fitness
         
         # Initialize population
-        population = []
-        for _ in range(params['population_size']):
-            rotation = await self._generate_random_rotation(context)
-            population.append(rotation)
+        population = [
+            self._random_rotation_indices(tables, context.planning_horizon)
+            for _ in range(params['population_size'])
+        ]
         
         # Evolution loop
         for generation in range(params['generations']):
             # Evaluate fitness for all individuals
-            fitness_scores = []
-            for rotation in population:
-                fitness = await self.evaluate_rotation_fitness(rotation, context)
-                fitness_scores.append(fitness)
+            fitness_scores = [fitness_of(rotation) for rotation in population]
             
             # Selection and reproduction
             new_population = []
@@ -304,9 +663,13 @@ class RotationOptimizationEngine:
                 
                 # Mutation
                 if random.random() < params['mutation_rate']:
-                    child1 = await self._mutate(child1, context)
+                    position, crop = self._propose_mutation(child1, tables, context.planning_horizon)
+                    child1 = child1.copy()
+                    child1[position] = crop
                 if random.random() < params['mutation_rate']:
-                    child2 = await self._mutate(child2, context)
+                    position, crop = self._propose_mutation(child2, tables, context.planning_horizon)
+                    child2 = child2.copy()
+                    child2[position] = crop
                 
                 new_population.extend([child1, child2])
             
@@ -314,49 +677,42 @@ class RotationOptimizationEngine:
             population = new_population[:params['population_size']]
         
         # Return best individual
-        final_fitness = []
-        for rotation in population:
-            fitness = await self.evaluate_rotation_fitness(rotation, context)
-            final_fitness.append(fitness)
-        
+        final_fitness = [fitness_of(rotation) for rotation in population]
         best_idx = max(range(len(final_fitness)), key=lambda i: final_fitness[i])
-        return population[best_idx]
+        return [tables.crops[crop] for crop in population[best_idx]]
     
     async def _simulated_annealing_optimization(self, context: OptimizationContext) -> List[str]:
         """Optimize rotation using simulated annealing."""
         params = self.optimization_parameters['simulated_annealing']
+        tables = self._get_rotation_tables(context)
         
         # Initialize with random rotation
-        current_rotation = await self._generate_random_rotation(context)
-        current_fitness = await self.evaluate_rotation_fitness(current_rotation, context)
-        
-        best_rotation = current_rotation.copy()
-        best_fitness = current_fitness
+        current = RotationFitnessState(
+            tables, self._random_rotation_indices(tables, context.planning_horizon)
+        )
+        best = current.copy()
         
         temperature = params['initial_temperature']
         
         for iteration in range(params['max_iterations']):
-            # Generate neighbor solution
-            neighbor_rotation = await self._generate_neighbor(current_rotation, context)
-            neighbor_fitness = await self.evaluate_rotation_fitness(neighbor_rotation, context)
+            # Single-position neighbor, scored by delta against the current state
+            position, crop = self._propose_mutation(current.indices, tables, context.planning_horizon)
+            neighbor_fitness = current.fitness_with(position, crop)
             
             # Accept or reject neighbor
-            if neighbor_fitness > current_fitness:
+            if neighbor_fitness > current.fitness:
                 # Accept better solution
-                current_rotation = neighbor_rotation
-                current_fitness = neighbor_fitness
+                current.apply(position, crop, neighbor_fitness)
                 
-                if current_fitness > best_fitness:
-                    best_rotation = current_rotation.copy()
-                    best_fitness = current_fitness
+                if current.fitness > best.fitness:
+                    best = current.copy()
             else:
                 # Accept worse solution with probability
-                delta = current_fitness - neighbor_fitness
+                delta = current.fitness - neighbor_fitness
                 probability = math.exp(-delta / temperature)
                 
                 if random.random() < probability:
-                    current_rotation = neighbor_rotation
-                    current_fitness = neighbor_fitness
+                    current.apply(position, crop, neighbor_fitness)
             
             # Cool down
             temperature *= params['cooling_rate']
@@ -364,24 +720,22 @@ class RotationOptimizationEngine:
             if temperature < params['min_temperature']:
                 break
         
-        return best_rotation
+        return [tables.crops[crop] for crop in best.indices]
     
     async def _generate_random_rotation(self, context: OptimizationContext) -> List[str]:
         """Generate random valid rotation."""
-        rotation = []
-        available_crops = context.available_crops.copy()
+        tables = self._get_rotation_tables(context)
+        rotation = self._random_rotation_indices(tables, context.planning_horizon)
+        return [tables.crops[crop] for crop in rotation]
+    
+    def _random_rotation_indices(self, tables: RotationTables, horizon: int) -> List[int]:
+        """Generate random valid rotation as crop indices."""
+        rotation: List[int] = []
         
-        for year in range(context.planning_horizon):
+        for year in range(horizon):
             # Filter crops based on constraints and compatibility
-            valid_crops = self._get_valid_crops_for_position(
-                rotation, year, context
-            )
-            
-            if not valid_crops:
-                valid_crops = available_crops
-            
-            crop = random.choice(valid_crops)
-            rotation.append(crop)
+            previous = rotation[year - 1] if year > 0 else None
+            rotation.append(random.choice(tables.valid_crops(previous, year, rotation, horizon)))
         
         return rotation
     
@@ -392,33 +746,24 @@ class RotationOptimizationEngine:
         context: OptimizationContext
     ) -> List[str]:
         """Get valid crops for specific position in rotation."""
-        valid_crops = context.available_crops.copy()
+        tables = self._get_rotation_tables(context)
+        present = [tables.index[crop] for crop in rotation if crop in tables.index]
         
-        # Apply constraints
-        for constraint in context.constraints:
-            if constraint.constraint_type == ConstraintType.REQUIRED_CROP:
-                crop_name = constraint.parameters.get('crop_name')
-                if crop_name and crop_name not in rotation:
-                    # Must include this crop somewhere
-                    if position == context.planning_horizon - 1:
-                        # Last position, must include if not already present
-                        valid_crops = [crop_name] if crop_name in valid_crops else valid_crops
-            
-            elif constraint.constraint_type == ConstraintType.EXCLUDED_CROP:
-                crop_name = constraint.parameters.get('crop_name')
-                if crop_name in valid_crops:
-                    valid_crops.remove(crop_name)
-        
-        # Apply compatibility rules
+        previous = None
         if position > 0:
-            previous_crop = rotation[position - 1]
-            compatibility = self.crop_compatibility_matrix.get(previous_crop, {})
-            avoid_next = compatibility.get('avoid_next', [])
-            
-            # Remove crops that should be avoided after previous crop
-            valid_crops = [crop for crop in valid_crops if crop not in avoid_next]
+            previous = tables.index.get(rotation[position - 1])
         
-        return valid_crops if valid_crops else context.available_crops
+        valid = tables.valid_crops(previous, position, present, context.planning_horizon)
+        return [tables.crops[crop] for crop in valid]
+    
+    def _propose_mutation(self, rotation: List[int], tables: RotationTables, horizon: int) -> Tuple[int, int]:
+        """Pick a random position and a valid replacement crop for it."""
+        position = random.randint(0, len(rotation) - 1)
+        remaining = rotation[:position] + rotation[position+1:]
+        previous = remaining[position - 1] if position > 0 else None
+        
+        valid_crops = tables.valid_crops(previous, position, remaining, horizon)
+        return position, random.choice(valid_crops)
     
     def _tournament_selection(self, population: List[List[str]], fitness_scores: List[float]) -> List[str]:
         """Tournament selection for genetic algorithm."""
@@ -444,17 +789,11 @@ class RotationOptimizationEngine:
     
     async def _mutate(self, rotation: List[str], context: OptimizationContext) -> List[str]:
         """Mutate rotation by changing random position."""
-        mutated = rotation.copy()
-        position = random.randint(0, len(rotation) - 1)
-        
-        valid_crops = self._get_valid_crops_for_position(
-            mutated[:position] + mutated[position+1:], position, context
-        )
-        
-        if valid_crops:
-            mutated[position] = random.choice(valid_crops)
-        
-        return mutated
+        tables = self._get_rotation_tables(context)
+        mutated = [tables.index[crop] for crop in rotation]
+        position, crop = self._propose_mutation(mutated, tables, context.planning_horizon)
+        mutated[position] = crop
+        return [tables.crops[crop] for crop in mutated]
     
     async def _generate_neighbor(self, rotation: List[str], context: OptimizationContext) -> List[str]:
         """Generate neighbor solution for simulated annealing."""
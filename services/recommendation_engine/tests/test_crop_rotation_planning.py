@@ -5,6 +5,7 @@ Tests for field history management, rotation optimization, and analysis.
 
 import pytest
 import asyncio
+import itertools
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, date
 from typing import List, Dict
@@ -14,7 +15,7 @@ from ..src.models.rotation_models import (
     CropRotationPlan, RotationGoalType, ConstraintType, FieldHistoryRequest
 )
 from ..src.services.field_history_service import FieldHistoryService
-from ..src.services.rotation_optimization_engine import RotationOptimizationEngine
+from ..src.services.rotation_optimization_engine import RotationOptimizationEngine, RotationFitnessState
 
 
 class TestFieldHistoryService:
@@ -200,6 +201,95 @@ class TestRotationOptimizationEngine:
             assert 'crop_name' in details
             assert 'estimated_yield' in details
             assert 'planting_recommendations' in details
+    
+    @pytest.mark.asyncio
+    async def test_incremental_fitness_matches_full_evaluation(
+        self,
+        optimization_engine,
+        sample_field_profile,
+        sample_goals,
+        sample_constraints
+    ):
+        """Test table-driven and single-position delta fitness match full evaluation."""
+        
+        context = optimization_engine._prepare_optimization_context(
+            sample_field_profile, sample_goals, sample_constraints, 5
+        )
+        tables = optimization_engine._get_rotation_tables(context)
+        crops = context.available_crops
+        
+        rotations = list(itertools.islice(itertools.product(crops, repeat=5), 0, None, 97))
+        for rotation in rotations:
+            state = RotationFitnessState(tables, [tables.index[crop] for crop in rotation])
+            expected = await optimization_engine.evaluate_rotation_fitness(list(rotation), context)
+            assert state.fitness == pytest.approx(expected)
+            
+            position = len(rotation) - 1
+            replacement = crops[0] if rotation[position] != crops[0] else crops[1]
+            changed = list(rotation[:position]) + [replacement]
+            expected_changed = await optimization_engine.evaluate_rotation_fitness(changed, context)
+            assert state.fitness_with(position, tables.index[replacement]) == pytest.approx(expected_changed)
+            
+            state.apply(position, tables.index[replacement])
+            assert state.fitness == pytest.approx(expected_changed)
+    
+    @pytest.mark.asyncio
+    async def test_exact_solver_matches_brute_force(
+        self,
+        optimization_engine,
+        sample_field_profile,
+        sample_goals,
+        sample_constraints
+    ):
+        """Test the short-horizon solver returns the best transition-feasible rotation."""
+        
+        horizon = 4
+        context = optimization_engine._prepare_optimization_context(
+            sample_field_profile, sample_goals, sample_constraints, horizon
+        )
+        tables = optimization_engine._get_rotation_tables(context)
+        
+        best_fitness = -1.0
+        for rotation in itertools.product(context.available_crops, repeat=horizon):
+            indices = [tables.index[crop] for crop in rotation]
+            if "corn" not in rotation or not all(
+                tables.allowed_transitions[a][b] for a, b in zip(indices, indices[1:])
+            ):
+                continue
+            best_fitness = max(
+                best_fitness, await optimization_engine.evaluate_rotation_fitness(list(rotation), context)
+            )
+        
+        exact = await optimization_engine._exact_rotation_optimization(context)
+        
+        assert "corn" in exact
+        assert await optimization_engine.evaluate_rotation_fitness(exact, context) == pytest.approx(best_fitness)
+    
+    def test_valid_crops_follow_transition_table(
+        self,
+        optimization_engine,
+        sample_field_profile,
+        sample_goals
+    ):
+        """Test position filtering applies avoid_next rules and exclusions."""
+        
+        constraints = [
+            RotationConstraint(
+                constraint_id="exclude_oats",
+                constraint_type=ConstraintType.EXCLUDED_CROP,
+                description="No oats",
+                parameters={"crop_name": "oats"}
+            )
+        ]
+        context = optimization_engine._prepare_optimization_context(
+            sample_field_profile, sample_goals, constraints, 5
+        )
+        
+        valid = optimization_engine._get_valid_crops_for_position(["wheat"], 1, context)
+        
+        assert "oats" not in valid
+        assert "wheat" not in valid
+        assert "corn" in valid
 
 
 class TestRotationIntegration:
@@ -0,0 +1,79 @@
+"""
+Shared HTTP Session
+
+Entry point for service code that talks to external APIs through the shared
+HTTP transport. Importing it puts shared/utils on sys.path and loads the
+transport as the top-level `http_transport` module, so the process keeps a
+single pool however the importer reached shared/utils.
+
+`SharedSessionMixin` gives a service client a lazily created session view
+over that pool, keeping the `async with session.get(...)` calling style.
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+_UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _UTILS_DIR not in sys.path:
+    sys.path.append(_UTILS_DIR)
+
+from http_transport import (  # noqa: E402
+    CircuitOpenError,
+    HttpTransport,
+    TransportError,
+    TransportSession,
+    UpstreamPolicy,
+    UpstreamTimeoutError,
+    close_http_transport,
+    get_http_transport,
+)
+
+__all__ = [
+    "CircuitOpenError",
+    "HttpTransport",
+    "SharedSessionMixin",
+    "TransportError",
+    "TransportSession",
+    "UpstreamPolicy",
+    "UpstreamTimeoutError",
+    "close_http_transport",
+    "get_http_transport",
+]
+
+
+class SharedSessionMixin:
+    """
+    Lazily created HTTP session backed by the shared transport's pool.
+
+    Subclasses configure the view with class or instance attributes:
+    `http_upstream` (policy and metrics key, defaults to the class name),
+    `http_headers`, `http_timeout`, `http_policy` and `http_idempotent`, as
+    accepted by `HttpTransport.session_for`.
+    """
+
+    http_upstream: Optional[str] = None
+    http_headers: Optional[Dict[str, str]] = None
+    http_timeout: Optional[float] = None
+    http_policy: Optional[UpstreamPolicy] = None
+    http_idempotent: Optional[bool] = None
+
+    session: Optional[TransportSession] = None
+
+    async def _get_session(self) -> TransportSession:
+        """Get or create the HTTP session."""
+        if self.session is None:
+            self.session = get_http_transport().session_for(
+                self.http_upstream or type(self).__name__,
+                headers=self.http_headers,
+                timeout=self.http_timeout,
+                policy=self.http_policy,
+                idempotent=self.http_idempotent
+            )
+        return self.session
+
+    async def close(self):
+        """Release the HTTP session; the shared pool stays open for other clients."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
@@ -0,0 +1,619 @@
+"""
+Shared HTTP Transport
+
+One pooled aiohttp session per process for all outbound HTTP, with
+per-upstream resilience:
+
+- connection pooling with per-host and keep-alive limits, and DNS caching
+- jittered exponential backoff that honours Retry-After
+- a circuit breaker per upstream, so a browned-out dependency fails fast
+  instead of tying up sockets
+- hedged requests for idempotent GETs
+- per-upstream latency and error metrics
+
+Services adopt it either through `HttpTransport.request`, or by swapping their
+own `aiohttp.ClientSession` for `HttpTransport.session_for(...)`, which keeps
+the `async with session.get(...) as response` calling style.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+HEDGEABLE_METHODS = frozenset({"GET", "HEAD"})
+
+_LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+
+class TransportError(Exception):
+    """Raised when an upstream request fails after retries."""
+
+    def __init__(self, message: str, upstream: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.upstream = upstream
+        self.status = status
+
+
+class CircuitOpenError(TransportError):
+    """Raised without touching the network while an upstream's circuit is open."""
+    pass
+
+
+class UpstreamTimeoutError(TransportError):
+    """Raised when every attempt timed out."""
+    pass
+
+
+@dataclass
+class UpstreamPolicy:
+    """Retry, breaker and hedging settings for one upstream."""
+    timeout: float = 30.0
+    max_retries: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    hedge: bool = False
+    hedge_after: Optional[float] = None  # Fixed delay; None uses the observed p95 latency
+    max_concurrency: Optional[int] = None  # Cap below the connector's per-host limit
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: requests flow. After `failure_threshold` consecutive failures it
+    opens and rejects requests for `recovery_timeout` seconds, then lets a
+    single probe through (half-open); the probe's outcome closes or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self._clock() - self.opened_at >= self.recovery_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit opened after {self.consecutive_failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+            self._probe_in_flight = False
+
+
+class UpstreamMetrics:
+    """Request, error and latency counters for one upstream."""
+
+    def __init__(self):
+        self.requests = 0
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.short_circuited = 0
+        self.errors: Dict[str, int] = {}
+        self.status_counts: Dict[int, int] = {}
+        self.latency_buckets = [0] * (len(_LATENCY_BUCKETS) + 1)
+        self.latency_count = 0
+        self.latency_sum = 0.0
+
+    def observe_latency(self, seconds: float):
+        self.latency_buckets[bisect.bisect_left(_LATENCY_BUCKETS, seconds)] += 1
+        self.latency_count += 1
+        self.latency_sum += seconds
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile; None beyond the last bucket."""
+        if self.latency_count == 0:
+            return None
+        rank = q * self.latency_count
+        cumulative = 0
+        for bound, count in zip(_LATENCY_BUCKETS, self.latency_buckets):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def record_error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "short_circuited": self.short_circuited,
+            "errors": dict(self.errors),
+            "status_counts": dict(self.status_counts),
+            "latency_avg": self.latency_sum / self.latency_count if self.latency_count else None,
+            "latency_p50": self.latency_quantile(0.5),
+            "latency_p95": self.latency_quantile(0.95),
+            "latency_p99": self.latency_quantile(0.99),
+        }
+
+
+class TransportResponse:
+    """
+    Fully read HTTP response.
+
+    The body is buffered before the connection goes back to the pool, so
+    callers can never hold a socket open. Mirrors the parts of
+    `aiohttp.ClientResponse` the services use.
+    """
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes, url: str):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+    async def json(self, content_type: Optional[str] = None, loads: Callable = json.loads) -> Any:
+        return loads(self.body.decode("utf-8")) if self.body else None
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise TransportError(f"HTTP {self.status} from {self.url}", urlsplit(self.url).netloc, self.status)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class _RequestContext:
+    """Awaitable / async context manager returned by TransportSession methods."""
+
+    def __init__(self, coro):
+        self._coro = coro
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self) -> TransportResponse:
+        return await self._coro
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class TransportSession:
+    """
+    Drop-in stand-in for a per-service `aiohttp.ClientSession`.
+
+    Requests go through the shared transport under a fixed upstream name and
+    default headers; `close()` is a no-op because the pool is shared.
+    """
+
+    def __init__(self, transport: "HttpTransport", upstream: str,
+                 headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+                 idempotent: Optional[bool] = None):
+        self.transport = transport
+        self.upstream = upstream
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.idempotent = idempotent
+        self.closed = False
+
+    def request(self, method: str, url: str, **kwargs) -> _RequestContext:
+        headers = {**self.headers, **(kwargs.pop("headers", None) or {})}
+        timeout = kwargs.pop("timeout", self.timeout)
+        if isinstance(timeout, aiohttp.ClientTimeout):
+            timeout = timeout.total
+        kwargs.setdefault("idempotent", self.idempotent)
+        return _RequestContext(self.transport.request(
+            method, url, upstream=self.upstream, headers=headers, timeout=timeout, **kwargs
+        ))
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("DELETE", url, **kwargs)
+
+    async def close(self):
+        """Release this view; the shared pool stays open."""
+        self.closed = True
+
+
+@dataclass
+class _Upstream:
+    policy: UpstreamPolicy
+    breaker: CircuitBreaker
+    metrics: UpstreamMetrics = field(default_factory=UpstreamMetrics)
+    semaphore: Optional[asyncio.Semaphore] = None
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, response: TransportResponse):
+        super().__init__(f"HTTP {response.status}")
+        self.response = response
+
+
+class HttpTransport:
+    """Process-wide pooled HTTP transport with per-upstream resilience policies."""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        default_policy: Optional[UpstreamPolicy] = None,
+        user_agent: str = "AFAS/1.0 (Agricultural Advisory System)"
+    ):
+        """
+        Args:
+            limit: Total open connections across all hosts
+            limit_per_host: Open connections per (host, port, scheme)
+            keepalive_timeout: Seconds an idle pooled connection is kept
+            dns_cache_ttl: Seconds resolved addresses are cached
+            default_policy: Policy for upstreams without a registered one
+            user_agent: Default User-Agent header
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.default_policy = default_policy or UpstreamPolicy()
+        self.user_agent = user_agent
+        self._policies: Dict[str, UpstreamPolicy] = {}
+        self._upstreams: Dict[str, _Upstream] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def configure_upstream(self, upstream: str, policy: UpstreamPolicy):
+        """Set the policy for an upstream (name or host); its breaker state and metrics are kept."""
+        self._policies[upstream] = policy
+        state = self._upstreams.get(upstream)
+        if state is not None:
+            if policy.max_concurrency != state.policy.max_concurrency:
+                # Requests in flight keep releasing the semaphore they acquired
+                state.semaphore = asyncio.Semaphore(policy.max_concurrency) if policy.max_concurrency else None
+            state.policy = policy
+            state.breaker.failure_threshold = policy.failure_threshold
+            state.breaker.recovery_timeout = policy.recovery_timeout
+
+    def session_for(self, upstream: str, headers: Optional[Dict[str, str]] = None,
+                    timeout: Optional[float] = None,
+                    policy: Optional[UpstreamPolicy] = None,
+                    idempotent: Optional[bool] = None) -> TransportSession:
+        """
+        A per-service session view over the shared pool.
+
+        Args:
+            upstream: Policy/metrics key for every request made through the view
+            headers: Default headers
+            timeout: Default per-attempt timeout in seconds
+            policy: Policy to register for the upstream
+            idempotent: Treat every request as (non-)idempotent, e.g. True for
+                read-only query POSTs
+        """
+        if policy is not None:
+            self.configure_upstream(upstream, policy)
+        return TransportSession(self, upstream, headers=headers, timeout=timeout, idempotent=idempotent)
+
+    def _get_upstream(self, name: str) -> _Upstream:
+        upstream = self._upstreams.get(name)
+        if upstream is None:
+            policy = self._policies.get(name, self.default_policy)
+            upstream = _Upstream(
+                policy=policy,
+                breaker=CircuitBreaker(policy.failure_threshold, policy.recovery_timeout),
+                semaphore=asyncio.Semaphore(policy.max_concurrency) if policy.max_concurrency else None
+            )
+            self._upstreams[name] = upstream
+        return upstream
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """The pooled session, recreated if it was closed or belongs to another event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                await self._close_stale_session(self._session, self._session_loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": self.user_agent}
+            )
+            self._session_loop = loop
+        return self._session
+
+    @staticmethod
+    async def _close_stale_session(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a pooled session left behind by another event loop."""
+        if loop is not None and loop.is_running():
+            # Still serving another thread; close it there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        try:
+            await session.close()
+        except RuntimeError as e:
+            # The connector's transports are already closing on their idle loop; only its waiter is foreign
+            logger.debug(f"Closed session from a previous event loop: {e}")
+
+    async def close(self):
+        """Close the shared pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        upstream: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+        hedge: Optional[bool] = None
+    ) -> TransportResponse:
+        """
+        Send a request with the upstream's retry, breaker and hedging policy.
+
+        Connection failures are retried for any method since nothing reached
+        the server; timeouts and retryable statuses only for idempotent
+        requests. The final response is returned whatever its status, so
+        callers keep their own status handling.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            upstream: Policy/metrics key; defaults to the URL's host
+            params: Query parameters
+            json: JSON body
+            data: Raw body
+            headers: Request headers
+            timeout: Total seconds per attempt; defaults to the policy timeout
+            idempotent: Override the method-based idempotency check
+            hedge: Override the policy's hedging for GET/HEAD
+
+        Raises:
+            CircuitOpenError: The upstream's circuit is open
+            TransportError: Connection errors or timeouts outlasted the retries
+        """
+        method = method.upper()
+        name = upstream or urlsplit(url).netloc
+        state = self._get_upstream(name)
+        policy = state.policy
+        idempotent = method in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        use_hedge = method in HEDGEABLE_METHODS and (policy.hedge if hedge is None else hedge)
+        state.metrics.requests += 1
+
+        async def send() -> TransportResponse:
+            return await self._send(state, method, url, params, json, data, headers, timeout or policy.timeout)
+
+        attempt = 0
+        while True:
+            if not state.breaker.allow():
+                state.metrics.short_circuited += 1
+                raise CircuitOpenError(f"Circuit open for upstream {name}", name)
+
+            probe = state.breaker.state == CircuitBreaker.HALF_OPEN
+            retry_after = None
+            try:
+                response = await (self._hedged(state, send) if use_hedge else send())
+                state.breaker.record_success()
+                state.metrics.successes += 1
+                return response
+            except _RetryableStatus as e:
+                state.breaker.record_failure()
+                response, retryable = e.response, idempotent
+                error = None
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            except aiohttp.ClientConnectorError as e:
+                state.breaker.record_failure()
+                response, retryable = None, True
+                error = TransportError(f"Cannot connect to {name}: {e}", name)
+            except asyncio.TimeoutError:
+                state.breaker.record_failure()
+                response, retryable = None, idempotent
+                error = UpstreamTimeoutError(f"Request to {name} timed out", name)
+            except aiohttp.ClientError as e:
+                state.breaker.record_failure()
+                response, retryable = None, idempotent
+                error = TransportError(f"Request to {name} failed: {e}", name)
+            except BaseException:
+                # A cancelled or crashed probe must not hold the half-open slot forever
+                if probe:
+                    state.breaker.record_failure()
+                raise
+
+            if not retryable or attempt >= policy.max_retries:
+                state.metrics.failures += 1
+                if response is not None:
+                    return response
+                raise error
+
+            delay = random.uniform(0, min(policy.backoff_max, policy.backoff_base * (2 ** attempt)))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, policy.backoff_max))
+            attempt += 1
+            state.metrics.retries += 1
+            logger.debug(f"Retrying {method} {name} in {delay:.2f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+    async def _send(self, state: _Upstream, method: str, url: str, params: Optional[Dict[str, Any]],
+                    json_body: Any, data: Any, headers: Optional[Dict[str, str]],
+                    timeout: float) -> TransportResponse:
+        """One attempt: send, buffer the body and release the connection."""
+        session = await self._get_session()
+        metrics = state.metrics
+        semaphore = state.semaphore
+        metrics.attempts += 1
+        start = time.monotonic()
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                async with session.request(
+                    method, url, params=params, json=json_body, data=data, headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as raw:
+                    body = await raw.read()
+                    response = TransportResponse(raw.status, raw.headers, body, str(raw.url))
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            metrics.record_error(type(e).__name__)
+            raise
+        finally:
+            metrics.observe_latency(time.monotonic() - start)
+
+        metrics.status_counts[response.status] = metrics.status_counts.get(response.status, 0) + 1
+        if response.status in state.policy.retry_statuses:
+            metrics.record_error(f"http_{response.status}")
+            raise _RetryableStatus(response)
+        return response
+
+    async def _hedged(self, state: _Upstream, send: Callable) -> TransportResponse:
+        """
+        Send, and if no response arrives within the hedge delay, race a second copy.
+
+        The first successful response wins and the other attempt is cancelled.
+        """
+        delay = state.policy.hedge_after
+        if delay is None:
+            # Adaptive delay needs some history first
+            delay = state.metrics.latency_quantile(0.95) if state.metrics.latency_count >= 20 else None
+        if delay is None:
+            return await send()
+
+        primary = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        state.metrics.hedges += 1
+        hedge = asyncio.ensure_future(send())
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            state.metrics.hedge_wins += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool settings plus breaker state and metrics per upstream."""
+        return {
+            "pool": {
+                "limit": self.limit,
+                "limit_per_host": self.limit_per_host,
+                "keepalive_timeout": self.keepalive_timeout,
+                "dns_cache_ttl": self.dns_cache_ttl,
+                "open": self._session is not None and not self._session.closed
+            },
+            "upstreams": {
+                name: {"circuit": upstream.breaker.state, **upstream.metrics.snapshot()}
+                for name, upstream in self._upstreams.items()
+            }
+        }
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After in seconds; HTTP-date values are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+_http_transport: Optional[HttpTransport] = None
+
+
+def get_http_transport() -> HttpTransport:
+    """Get the process-wide HTTP transport."""
+    global _http_transport
+    if _http_transport is None:
+        _http_transport = HttpTransport()
+    return _http_transport
+
+
+async def close_http_transport():
+    """Close the process-wide HTTP transport's pool."""
+    if _http_transport is not None:
+        await _http_transport.close()
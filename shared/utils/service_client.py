@@ -2,16 +2,28 @@
 Service Client Utility
 
 Provides HTTP client functionality for inter-service communication
-with proper error handling, retries, and logging.
+with proper error handling, retries, and logging. Requests share the
+process-wide pooled transport, which supplies retries with jittered
+backoff and a circuit breaker per service.
 """
 
-import aiohttp
 import logging
-import asyncio
 from typing import Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 import json
 
+# http_session loads the transport as the top-level module the services use, so there is one pool
+try:
+    from .http_session import (
+        CircuitOpenError, HttpTransport, TransportError, UpstreamPolicy, UpstreamTimeoutError,
+        close_http_transport, get_http_transport
+    )
+except ImportError:  # Imported as a top-level module via sys.path
+    from http_session import (
+        CircuitOpenError, HttpTransport, TransportError, UpstreamPolicy, UpstreamTimeoutError,
+        close_http_transport, get_http_transport
+    )
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,7 +51,8 @@ class ServiceClient:
         service_name: str,
         timeout: int = 30,
         max_retries: int = 3,
-        retry_delay: float = 1.0
+        retry_delay: float = 1.0,
+        transport: Optional[HttpTransport] = None
     ):
         """
         Initialize service client.
@@ -49,40 +62,32 @@ class ServiceClient:
             service_name: Name of the target service (for logging)
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
-            retry_delay: Delay between retries in seconds
+            retry_delay: Base delay for jittered exponential backoff in seconds
+            transport: HTTP transport; defaults to the shared process-wide pool
         """
         self.base_url = base_url.rstrip('/')
         self.service_name = service_name
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self._session: Optional[aiohttp.ClientSession] = None
+        self.transport = transport or get_http_transport()
+        self.transport.configure_upstream(service_name, UpstreamPolicy(
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff_base=retry_delay
+        ))
     
     async def __aenter__(self):
         """Async context manager entry."""
-        await self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         await self.close()
     
-    async def _ensure_session(self):
-        """Ensure HTTP session is created."""
-        if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self._session = aiohttp.ClientSession(
-                timeout=timeout,
-                headers={
-                    'Content-Type': 'application/json',
-                    'User-Agent': f'AFAS-ServiceClient/{self.service_name}'
-                }
-            )
-    
     async def close(self):
-        """Close the HTTP session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Release the client; the shared connection pool stays open for other clients."""
+        pass
     
     async def get(
         self, 
@@ -214,100 +219,74 @@ class ServiceClient:
             ServiceUnavailableError: When service is unavailable
             ServiceTimeoutError: On timeout
         """
-        await self._ensure_session()
-        
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        request_headers = headers or {}
+        request_headers = {'User-Agent': f'AFAS-ServiceClient/{self.service_name}', **(headers or {})}
         
         # Add request ID for tracing
         request_id = f"{self.service_name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
         request_headers['X-Request-ID'] = request_id
         
-        last_exception = None
+        logger.debug(f"Making {method} request to {url}")
+        
+        try:
+            response = await self.transport.request(
+                method,
+                url,
+                upstream=self.service_name,
+                json=data,
+                params=params,
+                headers=request_headers
+            )
+        except CircuitOpenError:
+            raise ServiceUnavailableError(f"Service {self.service_name} unavailable (circuit open)")
+        except UpstreamTimeoutError:
+            raise ServiceTimeoutError(f"Request timeout to {self.service_name}")
+        except TransportError as e:
+            raise ServiceUnavailableError(f"Cannot reach {self.service_name}: {str(e)}")
+        
+        # Log response details
+        logger.debug(f"Response from {self.service_name}: {response.status}")
         
-        for attempt in range(self.max_retries + 1):
+        # Handle different status codes
+        if response.status == 200:
             try:
-                logger.debug(f"Making {method} request to {url} (attempt {attempt + 1}/{self.max_retries + 1})")
-                
-                async with self._session.request(
-                    method=method,
-                    url=url,
-                    json=data,
-                    params=params,
-                    headers=request_headers
-                ) as response:
-                    
-                    # Log response details
-                    logger.debug(f"Response from {self.service_name}: {response.status}")
-                    
-                    # Handle different status codes
-                    if response.status == 200:
-                        try:
-                            response_data = await response.json()
-                            logger.debug(f"Successful request to {self.service_name}: {endpoint}")
-                            return response_data
-                        except json.JSONDecodeError as e:
-                            raise ServiceClientError(f"Invalid JSON response from {self.service_name}: {str(e)}")
-                    
-                    elif response.status == 404:
-                        raise ServiceClientError(f"Endpoint not found on {self.service_name}: {endpoint}")
-                    
-                    elif response.status == 400:
-                        try:
-                            error_data = await response.json()
-                            error_msg = error_data.get('detail', 'Bad request')
-                        except:
-                            error_msg = await response.text()
-                        raise ServiceClientError(f"Bad request to {self.service_name}: {error_msg}")
-                    
-                    elif response.status == 500:
-                        try:
-                            error_data = await response.json()
-                            error_msg = error_data.get('detail', 'Internal server error')
-                        except:
-                            error_msg = await response.text()
-                        raise ServiceUnavailableError(f"Server error from {self.service_name}: {error_msg}")
-                    
-                    elif response.status == 503:
-                        raise ServiceUnavailableError(f"Service {self.service_name} temporarily unavailable")
-                    
-                    else:
-                        try:
-                            error_data = await response.json()
-                            error_msg = error_data.get('detail', f'HTTP {response.status}')
-                        except:
-                            error_msg = f'HTTP {response.status}'
-                        raise ServiceClientError(f"Request failed to {self.service_name}: {error_msg}")
-            
-            except asyncio.TimeoutError as e:
-                last_exception = ServiceTimeoutError(f"Request timeout to {self.service_name}")
-                logger.warning(f"Timeout on attempt {attempt + 1} to {self.service_name}: {endpoint}")
-            
-            except aiohttp.ClientConnectorError as e:
-                last_exception = ServiceUnavailableError(f"Cannot connect to {self.service_name}: {str(e)}")
-                logger.warning(f"Connection error on attempt {attempt + 1} to {self.service_name}: {str(e)}")
-            
-            except aiohttp.ClientError as e:
-                last_exception = ServiceClientError(f"Client error calling {self.service_name}: {str(e)}")
-                logger.warning(f"Client error on attempt {attempt + 1} to {self.service_name}: {str(e)}")
-            
-            except (ServiceClientError, ServiceUnavailableError, ServiceTimeoutError):
-                # Re-raise service-specific errors immediately
-                raise
-            
-            except Exception as e:
-                last_exception = ServiceClientError(f"Unexpected error calling {self.service_name}: {str(e)}")
-                logger.error(f"Unexpected error on attempt {attempt + 1} to {self.service_name}: {str(e)}")
-            
-            # Wait before retry (except on last attempt)
-            if attempt < self.max_retries:
-                await asyncio.sleep(self.retry_delay * (attempt + 1))  # Exponential backoff
+                response_data = await response.json()
+                logger.debug(f"Successful request to {self.service_name}: {endpoint}")
+                return response_data
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise ServiceClientError(f"Invalid JSON response from {self.service_name}: {str(e)}")
+        
+        elif response.status == 404:
+            raise ServiceClientError(f"Endpoint not found on {self.service_name}: {endpoint}")
+        
+        elif response.status == 400:
+            raise ServiceClientError(
+                f"Bad request to {self.service_name}: {await self._error_detail(response, 'Bad request')}"
+            )
+        
+        elif response.status == 500:
+            raise ServiceUnavailableError(
+                f"Server error from {self.service_name}: "
+                f"{await self._error_detail(response, 'Internal server error')}"
+            )
+        
+        elif response.status == 503:
+            raise ServiceUnavailableError(f"Service {self.service_name} temporarily unavailable")
         
-        # All retries exhausted
-        if last_exception:
-            raise last_exception
         else:
-            raise ServiceClientError(f"All retry attempts failed for {self.service_name}")
+            raise ServiceClientError(
+                f"Request failed to {self.service_name}: "
+                f"{await self._error_detail(response, f'HTTP {response.status}')}"
+            )
+    
+    @staticmethod
+    async def _error_detail(response, default: str) -> str:
+        """The 'detail' field of a JSON error body, or the raw body."""
+        try:
+            error_data = await response.json()
+            return error_data.get('detail', default) if isinstance(error_data, dict) else default
+        except ValueError:
+            return await response.text() or default
 
 
 class CoverCropServiceClient(ServiceClient):
@@ -438,10 +417,11 @@ class ServiceRegistry:
         return self._clients[client_key]
     
     async def close_all(self):
-        """Close all service clients."""
+        """Close all service clients and the shared connection pool."""
         for client in self._clients.values():
             await client.close()
         self._clients.clear()
+        await close_http_transport()
 
 
 # Global service registry instance
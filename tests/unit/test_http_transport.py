@@ -0,0 +1,345 @@
+"""
+Unit tests for the shared HTTP transport: retries, circuit breaking, hedging
+and the service client's error mapping.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+import http_transport  # noqa: E402
+from http_transport import (  # noqa: E402
+    CircuitBreaker,
+    CircuitOpenError,
+    HttpTransport,
+    TransportResponse,
+    UpstreamPolicy,
+)
+from service_client import (  # noqa: E402
+    ServiceClient,
+    ServiceClientError,
+    ServiceTimeoutError,
+    ServiceUnavailableError,
+)
+
+
+UPSTREAM = "upstream.test"
+URL = "http://upstream.test/resource"
+
+
+def _half_open_transport(send):
+    """Transport whose upstream breaker is open with an elapsed recovery timeout."""
+    transport = HttpTransport()
+    transport.configure_upstream(
+        UPSTREAM, UpstreamPolicy(max_retries=0, failure_threshold=1, recovery_timeout=0.0)
+    )
+    state = transport._get_upstream(UPSTREAM)
+    state.breaker.record_failure()
+    assert state.breaker.state == CircuitBreaker.OPEN
+    transport._send = send
+    return transport, state.breaker
+
+
+async def _ok_send(state, method, url, *args):
+    return TransportResponse(200, {}, b"{}", url)
+
+
+def test_cancelled_half_open_probe_releases_breaker():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hanging_send(state, method, url, *args):
+            started.set()
+            await asyncio.sleep(3600)
+
+        transport, breaker = _half_open_transport(hanging_send)
+        probe = asyncio.create_task(transport.request("GET", URL, upstream=UPSTREAM))
+        await started.wait()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.state == CircuitBreaker.OPEN
+        transport._send = _ok_send
+        response = await transport.request("GET", URL, upstream=UPSTREAM)
+        assert response.status == 200
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_unexpected_probe_error_releases_breaker():
+    async def scenario():
+        async def broken_send(state, method, url, *args):
+            raise TypeError("body is not JSON serializable")
+
+        transport, breaker = _half_open_transport(broken_send)
+        with pytest.raises(TypeError):
+            await transport.request("POST", URL, upstream=UPSTREAM, json=object())
+
+        transport._send = _ok_send
+        response = await transport.request("GET", URL, upstream=UPSTREAM)
+        assert response.status == 200
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_probe_in_flight_short_circuits_other_requests():
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_send(state, method, url, *args):
+            started.set()
+            await release.wait()
+            return TransportResponse(200, {}, b"{}", url)
+
+        transport, breaker = _half_open_transport(slow_send)
+        probe = asyncio.create_task(transport.request("GET", URL, upstream=UPSTREAM))
+        await started.wait()
+
+        with pytest.raises(CircuitOpenError):
+            await transport.request("GET", URL, upstream=UPSTREAM)
+
+        release.set()
+        assert (await probe).status == 200
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping, with jitter pinned to its upper bound."""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        if delay:  # aiohttp yields to the loop with sleep(0)
+            delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(http_transport.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(http_transport.random, "uniform", lambda low, high: high)
+    return delays
+
+
+async def _serve(statuses, headers=None):
+    """Local server answering successive requests with the given statuses, then 200."""
+    hits = []
+
+    async def handler(request):
+        status = statuses[len(hits)] if len(hits) < len(statuses) else 200
+        hits.append(status)
+        return web.json_response({"status": "ok"}, status=status, headers=headers if status != 200 else None)
+
+    app = web.Application()
+    app.router.add_get("/resource", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server, hits
+
+
+def test_retryable_statuses_back_off_exponentially(sleeps):
+    async def scenario():
+        server, hits = await _serve([503, 502])
+        transport = HttpTransport()
+        transport.configure_upstream(UPSTREAM, UpstreamPolicy(max_retries=3, backoff_base=0.1))
+        try:
+            response = await transport.request("GET", str(server.make_url("/resource")), upstream=UPSTREAM)
+        finally:
+            await transport.close()
+            await server.close()
+
+        assert response.status == 200
+        assert hits == [503, 502, 200]
+        assert sleeps == [pytest.approx(0.1), pytest.approx(0.2)]
+        stats = transport.get_stats()["upstreams"][UPSTREAM]
+        assert stats["attempts"] == 3
+        assert stats["retries"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_retries_stop_at_max_retries_and_return_last_response(sleeps):
+    async def scenario():
+        server, hits = await _serve([503] * 5)
+        transport = HttpTransport()
+        transport.configure_upstream(UPSTREAM, UpstreamPolicy(max_retries=2, backoff_base=0.1))
+        try:
+            response = await transport.request("GET", str(server.make_url("/resource")), upstream=UPSTREAM)
+        finally:
+            await transport.close()
+            await server.close()
+
+        assert response.status == 503
+        assert len(hits) == 3
+        assert len(sleeps) == 2
+
+    asyncio.run(scenario())
+
+
+def test_non_idempotent_requests_are_not_retried_on_status(sleeps):
+    async def scenario():
+        transport = HttpTransport()
+        transport.configure_upstream(UPSTREAM, UpstreamPolicy(max_retries=3))
+        calls = []
+
+        async def failing_send(state, method, url, *args):
+            calls.append(method)
+            raise http_transport._RetryableStatus(TransportResponse(503, {}, b"", url))
+
+        transport._send = failing_send
+        response = await transport.request("POST", URL, upstream=UPSTREAM, json={})
+
+        assert response.status == 503
+        assert calls == ["POST"]
+        assert sleeps == []
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_extends_backoff_up_to_backoff_max(sleeps):
+    async def scenario():
+        transport = HttpTransport()
+        transport.configure_upstream(UPSTREAM, UpstreamPolicy(max_retries=2, backoff_base=0.1, backoff_max=5.0))
+        retry_after = iter(["3", "60"])
+
+        async def throttled_send(state, method, url, *args):
+            value = next(retry_after, None)
+            if value is None:
+                return TransportResponse(200, {}, b"{}", url)
+            raise http_transport._RetryableStatus(TransportResponse(429, {"Retry-After": value}, b"", url))
+
+        transport._send = throttled_send
+        response = await transport.request("GET", URL, upstream=UPSTREAM)
+
+        assert response.status == 200
+        assert sleeps == [3.0, 5.0]
+
+    asyncio.run(scenario())
+
+
+def test_hedge_wins_and_cancels_slow_primary():
+    async def scenario():
+        transport = HttpTransport()
+        transport.configure_upstream(UPSTREAM, UpstreamPolicy(hedge=True, hedge_after=0.01))
+        attempts = []
+        primary_cancelled = asyncio.Event()
+
+        async def send(state, method, url, *args):
+            attempts.append(len(attempts))
+            if len(attempts) == 1:
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    primary_cancelled.set()
+                    raise
+            return TransportResponse(200, {}, b'{"attempt": 2}', url)
+
+        transport._send = send
+        response = await transport.request("GET", URL, upstream=UPSTREAM)
+        await asyncio.wait_for(primary_cancelled.wait(), timeout=1)
+
+        assert await response.json() == {"attempt": 2}
+        assert len(attempts) == 2
+        stats = transport.get_stats()["upstreams"][UPSTREAM]
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_fast_primary_is_not_hedged():
+    async def scenario():
+        transport = HttpTransport()
+        transport.configure_upstream(UPSTREAM, UpstreamPolicy(hedge=True, hedge_after=1.0))
+        attempts = []
+
+        async def send(state, method, url, *args):
+            attempts.append(method)
+            return TransportResponse(200, {}, b"{}", url)
+
+        transport._send = send
+        response = await transport.request("GET", URL, upstream=UPSTREAM)
+
+        assert response.status == 200
+        assert attempts == ["GET"]
+        assert transport.get_stats()["upstreams"][UPSTREAM]["hedges"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_session_from_previous_event_loop_is_closed():
+    transport = HttpTransport()
+    first = asyncio.run(transport._get_session())
+
+    async def scenario():
+        second = await transport._get_session()
+        try:
+            assert second is not first
+            assert first.closed
+        finally:
+            await transport.close()
+
+    asyncio.run(scenario())
+
+
+def _service_client(send):
+    transport = HttpTransport()
+    client = ServiceClient("http://upstream.test", UPSTREAM, max_retries=0, transport=transport)
+    transport._send = send
+    return client
+
+
+@pytest.mark.parametrize("error, expected", [
+    (asyncio.TimeoutError(), ServiceTimeoutError),
+    (http_transport.aiohttp.ClientPayloadError("truncated body"), ServiceUnavailableError),
+])
+def test_service_client_maps_transport_errors(error, expected):
+    async def scenario():
+        async def failing_send(state, method, url, *args):
+            raise error
+
+        with pytest.raises(expected):
+            await _service_client(failing_send).get("/resource")
+
+    asyncio.run(scenario())
+
+
+def test_service_client_maps_open_circuit_to_unavailable():
+    async def scenario():
+        client = _service_client(_ok_send)
+        breaker = client.transport._get_upstream(UPSTREAM).breaker
+        breaker.failure_threshold = 1
+        breaker.record_failure()
+
+        with pytest.raises(ServiceUnavailableError, match="circuit open"):
+            await client.get("/resource")
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("status, expected", [
+    (404, ServiceClientError),
+    (500, ServiceUnavailableError),
+    (503, ServiceUnavailableError),
+])
+def test_service_client_maps_final_status(status, expected):
+    async def scenario():
+        async def status_send(state, method, url, *args):
+            return TransportResponse(status, {}, b'{"detail": "nope"}', url)
+
+        with pytest.raises(expected):
+            await _service_client(status_send).get("/resource")
+
+    asyncio.run(scenario())